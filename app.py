@@ -6,10 +6,9 @@ For new functionality, use `python -m trading_bot` instead.
 """
 import os
 import sys
-import json
 import logging
 import warnings
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 
 # Add the project root to the system path
 project_root = os.path.dirname(os.path.abspath(__file__))
@@ -18,6 +17,13 @@ sys.path.insert(0, project_root)
 # Import new trading bot modules
 from trading_bot.utils.logger import setup_logger
 from trading_bot.api.webhook_handler import webhook_handler
+from trading_bot.api.signal import parse_signal, SignalError
+from trading_bot.api.ingest_queue import ingest_queue, QueueFullError
+from trading_bot.api.signal_journal import signal_journal
+from trading_bot.services.broker.session import broker_session
+from trading_bot.core.order_batcher import order_batcher
+from trading_bot.utils.metrics import metrics
+from trading_bot.config import settings
 
 # Configure logging
 logger = setup_logger("app")
@@ -28,32 +34,65 @@ warnings.filterwarnings("ignore", category=DeprecationWarning)
 # Create Flask application
 app = Flask(__name__)
 
+# Open the persistent broker session before the first signal arrives
+broker_session.start()
+
+# Net bursts of same-ticker orders before they reach the broker
+if settings.ENABLE_ORDER_BATCHING:
+    order_batcher.start()
+
+# Journal accepted signals before they are acknowledged
+signal_journal.start()
+
+# Start the ingest workers in acknowledge-then-process mode
+if settings.ENABLE_ASYNC_INGEST:
+    ingest_queue.start()
+
 @app.route('/webhook', methods=['POST'])
 def webhook():
     """
     Handle webhook requests from signal sources.
     """
     try:
-        # Parse the webhook payload
-        if request.is_json:
-            webhook_data = request.get_json()
-        else:
+        # Parse and validate the webhook payload in a single pass
+        try:
+            signal = parse_signal(request.get_data(cache=False), webhook_handler.passphrase)
+        except SignalError as e:
+            logger.warning("Rejected webhook: %s", e)
+            return jsonify({
+                "success": False,
+                "message": str(e)
+            })
+        
+        # Acknowledge-then-process: queue and return immediately
+        if ingest_queue.running:
+            # Answers repeats and reserves the alert for the worker in one lookup
+            duplicate = webhook_handler.claim(signal)
+            if duplicate is not None:
+                return jsonify(duplicate)
+            
             try:
-                webhook_data = json.loads(request.data)
-            except json.JSONDecodeError:
-                # Try to parse as form data for backward compatibility
-                webhook_data = {
-                    "passphrase": request.form.get("passphrase", ""),
-                    "ticker": request.form.get("ticker", ""),
-                    "strategy": {
-                        "order_action": request.form.get("order_action", ""),
-                        "order_price": float(request.form.get("order_price", 0))
-                    }
-                }
+                ingest_queue.submit(signal, claimed=True)
+            except QueueFullError as e:
+                webhook_handler.release(signal)
+                return jsonify({
+                    "success": False,
+                    "message": str(e)
+                }), 503, {"Retry-After": "1"}
+            except Exception:
+                webhook_handler.release(signal)
+                raise
             
-        # Process the webhook request
-        logger.info(f"Received webhook: {webhook_data}")
-        result = webhook_handler.process_request(webhook_data)
+            return jsonify({
+                "success": True,
+                "message": "Signal queued"
+            }), 202
+        
+        # Process the signal, journaled so it is replayed if we crash midway
+        logger.info("Received signal: %s", signal)
+        entry_id = signal_journal.append(signal)
+        result = webhook_handler.process_signal(signal)
+        signal_journal.complete(entry_id, result)
         
         # Return the result
         return jsonify(result)
@@ -67,6 +106,15 @@ def webhook():
             "message": error_message
         })
 
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """
+    Expose metrics in the Prometheus text format.
+    """
+    if not metrics.enabled:
+        return jsonify({"success": False, "message": "Endpoint not found"}), 404
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
     # Print startup message
     print("Starting Trading Bot (Legacy Mode)")
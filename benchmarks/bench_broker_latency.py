@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+"""
+Benchmark: signal-to-order latency through the broker session.
+
+Runs validated signals through WebhookHandler.process_signal against the
+simulated broker and compares the persistent BrokerSession with a naive
+executor that connects, logs in and looks up symbol info for every signal.
+It then drops the connection and reports how long the session takes to
+recover.
+
+Usage:
+    python benchmarks/bench_broker_latency.py [--signals N] [--connect-latency S] [--order-latency S]
+"""
+import os
+import sys
+import time
+import logging
+import argparse
+
+# Add the project root to the system path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+os.environ.setdefault("BROKER", "simulated")
+os.environ.setdefault("ALLOW_WEEKEND_TRADING", "true")
+os.environ.setdefault("ENABLE_DEDUP", "false")
+
+from trading_bot.api.signal import Signal
+from trading_bot.api.webhook_handler import webhook_handler
+from trading_bot.services.broker.base import Order
+from trading_bot.services.broker.session import BrokerSession
+from trading_bot.services.broker.simulated_broker import SimulatedBroker
+
+# Keep per-signal log lines out of the timings
+logging.getLogger("webhook_handler").setLevel(logging.CRITICAL)
+
+def percentile(values, pct):
+    """
+    Nearest-rank percentile of a sorted list.
+    """
+    index = min(len(values) - 1, max(0, int(round(pct / 100 * len(values))) - 1))
+    return values[index]
+
+def report(name, latencies):
+    latencies = sorted(latencies)
+    print(
+        f"{name:<10} p50 {percentile(latencies, 50) * 1000:8.2f} ms  "
+        f"p99 {percentile(latencies, 99) * 1000:8.2f} ms  "
+        f"mean {sum(latencies) / len(latencies) * 1000:8.2f} ms"
+    )
+
+def naive_execute(signal, args):
+    """
+    Connect, log in and look up the symbol for every signal.
+    """
+    broker = SimulatedBroker(latency=args.order_latency, connect_latency=args.connect_latency)
+    broker.connect()
+    try:
+        info = broker.get_symbol_info(signal.ticker)
+        order = Order(signal.ticker, signal.action, info.normalize_volume(0.01), price=signal.price)
+        return broker.submit_order(order).success
+    finally:
+        broker.disconnect()
+
+def main():
+    parser = argparse.ArgumentParser(description="Signal-to-order latency benchmark")
+    parser.add_argument("--signals", type=int, default=200)
+    parser.add_argument("--connect-latency", type=float, default=0.05)
+    parser.add_argument("--order-latency", type=float, default=0.002)
+    args = parser.parse_args()
+
+    signals = [
+        Signal(f"SYM{i % 20:02d}", "buy" if i % 2 else "sell", 1.1 + i * 1e-5)
+        for i in range(args.signals)
+    ]
+
+    naive = []
+    for signal in signals:
+        start = time.perf_counter()
+        if not naive_execute(signal, args):
+            raise AssertionError("Naive order failed")
+        naive.append(time.perf_counter() - start)
+
+    broker = SimulatedBroker(latency=args.order_latency, connect_latency=args.connect_latency)
+    session = BrokerSession(broker, health_interval=0.05, backoff_initial=0.05, backoff_max=0.5)
+    session.start()
+    webhook_handler.broker = session
+
+    persistent = []
+    for signal in signals:
+        start = time.perf_counter()
+        if not webhook_handler.process_signal(signal)["success"]:
+            raise AssertionError("Session order failed")
+        persistent.append(time.perf_counter() - start)
+
+    print(f"{args.signals} signals, connect {args.connect_latency * 1000:.0f} ms, "
+          f"order {args.order_latency * 1000:.0f} ms")
+    report("naive", naive)
+    report("session", persistent)
+    print(f"session connects: {broker.connects}, symbol cache: {session.symbols.get_stats()}")
+
+    # Drop the connection, fail the first reconnect, and time the recovery
+    broker.fail_next_connects = 1
+    broker.disconnect()
+    start = time.perf_counter()
+    rejected = 0
+    while not webhook_handler.process_signal(signals[0])["success"]:
+        rejected += 1
+        time.sleep(0.001)
+    print(f"recovered after {(time.perf_counter() - start) * 1000:.0f} ms "
+          f"({rejected} fast-failed signals), stats: {session.get_stats()}")
+
+    session.stop()
+
+if __name__ == "__main__":
+    main()
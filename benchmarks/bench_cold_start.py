@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+"""
+Benchmark: time from process start to the first accepted webhook.
+
+Starts `python -m trading_bot` against a simulated broker on a free port,
+posts a valid signal every few milliseconds until one is accepted and
+reports how long that took, along with the startup stage report the bot
+logs. Repeats for several runs and fails if the median exceeds --budget.
+
+Usage:
+    python benchmarks/bench_cold_start.py [--runs N] [--budget SECONDS] [--scheduler] [--importtime]
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import socket
+import argparse
+import tempfile
+import statistics
+import subprocess
+import http.client
+
+# Add the project root to the system path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+def free_port():
+    """
+    Get a free local TCP port.
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def first_webhook(port, body, timeout):
+    """
+    Post the body until the bot accepts it.
+
+    Returns:
+        float: perf_counter() reading when the webhook was accepted
+    """
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        try:
+            conn.request("POST", "/webhook", body=body, headers={"Content-Type": "application/json"})
+            response = conn.getresponse()
+            result = json.loads(response.read() or b"{}")
+            if response.status in (200, 202) and result.get("success"):
+                return time.perf_counter()
+        except (OSError, http.client.HTTPException, ValueError):
+            pass
+        finally:
+            conn.close()
+        time.sleep(0.005)
+    raise TimeoutError(f"No webhook accepted within {timeout}s")
+
+def run_once(env, scheduler, timeout):
+    """
+    Start the bot once and time its first accepted webhook.
+
+    Returns:
+        tuple: (seconds to the first accepted webhook, startup report line)
+    """
+    port = free_port()
+    body = json.dumps({
+        "passphrase": env["WEBHOOK_PASSPHRASE"],
+        "ticker": "EURUSD",
+        "alert_id": f"cold-start-{port}",
+        "strategy": {"order_action": "buy", "order_price": 1.1}
+    })
+    command = [sys.executable, "-m", "trading_bot", "--port", str(port), "--host", "127.0.0.1"]
+    if not scheduler:
+        command.append("--no-scheduler")
+
+    with tempfile.TemporaryFile() as output:
+        start = time.perf_counter()
+        process = subprocess.Popen(command, cwd=project_root, env=env, stdout=output, stderr=subprocess.STDOUT)
+        try:
+            accepted = first_webhook(port, body, timeout)
+        finally:
+            process.terminate()
+            process.wait()
+        output.seek(0)
+        report = next((line.split(" - ", 3)[-1] for line in output.read().decode(errors="replace").splitlines()
+                       if "Startup:" in line and "accepting webhooks" in line), "")
+    return accepted - start, report.strip()
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold start benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=2.0, help="Allowed median seconds to the first webhook")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--scheduler", action="store_true", help="Start the scheduler as well")
+    parser.add_argument("--importtime", action="store_true", help="Show the slowest imports of the web app")
+    args = parser.parse_args()
+
+    journal = tempfile.mkdtemp(prefix="cold-start-journal-")
+    env = dict(os.environ)
+    env.update({
+        "BROKER": "simulated",
+        "WEBHOOK_PASSPHRASE": "cold-start",
+        "ALLOW_WEEKEND_TRADING": "true",
+        "TRADING_SESSIONS": "00:00-23:59",
+        "TRADING_HOLIDAYS": "",
+        "SIGNAL_JOURNAL_DIR": journal,
+        "ENABLE_NOTIFICATIONS": "false",
+        "LOG_FILE": "",
+        "MARKET_DATA_SOURCE": "synthetic"
+    })
+
+    times = []
+    try:
+        for run in range(args.runs):
+            seconds, report = run_once(env, args.scheduler, args.timeout)
+            times.append(seconds)
+            print(f"run {run + 1}: first webhook accepted after {seconds * 1000:.0f} ms")
+            if report:
+                print(f"       {report}")
+    finally:
+        shutil.rmtree(journal, ignore_errors=True)
+
+    median = statistics.median(times)
+    print(f"median {median * 1000:.0f} ms, best {min(times) * 1000:.0f} ms (budget {args.budget * 1000:.0f} ms)")
+
+    if args.importtime:
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import trading_bot.api.app"],
+                                cwd=project_root, env=env, capture_output=True, text=True)
+        rows = []
+        for line in result.stderr.splitlines():
+            if line.startswith("import time:") and "|" in line and "cumulative" not in line:
+                _, cumulative, name = line.split("|")
+                rows.append((int(cumulative), name.strip()))
+        print("slowest imports (cumulative):")
+        for cumulative, name in sorted(rows, reverse=True)[:10]:
+            print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    if median > args.budget:
+        sys.exit(f"Median time to first webhook {median:.2f}s exceeds the {args.budget}s budget")
+
+if __name__ == "__main__":
+    main()
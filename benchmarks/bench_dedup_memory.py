@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+"""
+Benchmark: memory and throughput of the duplicate-alert cache.
+
+Feeds a large number of distinct alerts through the TTLCache used by the
+webhook handler and samples traced memory along the way. Memory must stay
+flat once the cache is full, since every insert past max_entries evicts the
+least recently used alert.
+
+Usage:
+    python benchmarks/bench_dedup_memory.py [--alerts N] [--max-entries N]
+"""
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+
+# Add the project root to the system path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from trading_bot.api.signal import Signal
+from trading_bot.utils.ttl_cache import TTLCache
+
+RESPONSE = {"success": True, "message": "Processed buy signal"}
+
+def main():
+    parser = argparse.ArgumentParser(description="Dedup cache memory benchmark")
+    parser.add_argument("--alerts", type=int, default=1000000)
+    parser.add_argument("--max-entries", type=int, default=10000)
+    parser.add_argument("--samples", type=int, default=10)
+    args = parser.parse_args()
+
+    cache = TTLCache(args.max_entries, ttl=60)
+    step = max(1, args.alerts // args.samples)
+    readings = []
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    for i in range(args.alerts):
+        signal = Signal(f"SYM{i % 500}", "buy", 1.0 + i * 1e-6, alert_id=str(i))
+        if cache.get_or_set(signal.dedup_key(), RESPONSE) is not None:
+            raise AssertionError("Distinct alert reported as duplicate")
+        if (i + 1) % step == 0:
+            readings.append((i + 1, tracemalloc.get_traced_memory()[0]))
+    elapsed = time.perf_counter() - start
+    tracemalloc.stop()
+
+    print(f"{args.alerts} distinct alerts, max_entries {args.max_entries}")
+    print(f"{'alerts':>10} {'traced KiB':>12}")
+    for count, current in readings:
+        print(f"{count:>10} {current / 1024:>12.1f}")
+
+    # Compare the second half of the run, after the cache has filled up
+    steady = [current for count, current in readings if count > args.max_entries]
+    growth = (max(steady) - min(steady)) / max(1, min(steady)) if steady else 0.0
+    print(f"cache size: {len(cache)}, stats: {cache.get_stats()}")
+    print(f"steady-state memory growth: {growth * 100:.1f}%")
+    print(f"throughput: {args.alerts / elapsed:.0f} alerts/s (with tracemalloc)")
+
+    if growth > 0.10:
+        sys.exit("Memory grew by more than 10% after the cache filled up")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+"""
+Benchmark: webhook latency with /events viewers attached.
+
+Serves the app on a local port and posts signals over a keep-alive
+connection, first with no viewers, then with fast viewers reading /events,
+then with the same viewers plus one that never reads its stream. Reports
+webhook p50/p99 for each run, the events each fast viewer received and
+whether the stalled viewer was dropped.
+
+The viewers read in this process, so part of the difference between the
+first run and the others is their own CPU time. A stalled viewer is dropped
+only once the kernel's socket buffers (a few MB on loopback) and then its
+EVENTS_BUFFER_SIZE events have filled up, hence the default request count.
+
+Usage:
+    python benchmarks/bench_events.py [--requests N] [--viewers N]
+"""
+import os
+import sys
+import time
+import socket
+import logging
+import argparse
+import threading
+import http.client
+
+# Add the project root to the system path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+os.environ.setdefault("BROKER", "simulated")
+os.environ.setdefault("ALLOW_WEEKEND_TRADING", "true")
+os.environ.setdefault("ENABLE_SIGNAL_JOURNAL", "false")
+os.environ.setdefault("ENABLE_HISTORY", "false")
+os.environ.setdefault("ENABLE_NOTIFICATIONS", "false")
+os.environ.setdefault("ENABLE_EVENTS", "true")
+os.environ.setdefault("EVENTS_MAX_CLIENTS", "16")
+
+from werkzeug.serving import make_server
+
+from trading_bot.api.app import create_app
+from trading_bot.api.benchmark import build_requests, percentile, QUIET_LOGGERS
+from trading_bot.api.events import event_broadcaster
+from trading_bot.api.webhook_handler import webhook_handler
+from trading_bot.core.risk_gate import risk_gate
+from trading_bot.config import settings
+
+for name in QUIET_LOGGERS + ("api.events",):
+    logging.getLogger(name).setLevel(logging.ERROR)
+
+class Viewer(threading.Thread):
+    """
+    Reads /events and counts the events received.
+    """
+
+    def __init__(self, port):
+        super().__init__(daemon=True)
+        self.connection = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+        self.connection.request("GET", "/events")
+        self.response = self.connection.getresponse()
+        self.events = 0
+
+    def run(self):
+        try:
+            for line in self.response:
+                if line.startswith(b"event: "):
+                    self.events += 1
+        except (OSError, http.client.HTTPException):
+            pass
+
+    def close(self):
+        self.connection.close()
+
+def stalled_viewer(port):
+    """
+    Open /events on a socket with a small receive buffer and never read it.
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    sock.connect(("127.0.0.1", port))
+    sock.sendall(b"GET /events HTTP/1.1\r\nHost: 127.0.0.1\r\n\r\n")
+    return sock
+
+def post(port, requests):
+    """
+    Post the requests over one keep-alive connection.
+
+    Returns:
+        list: Sorted latencies in seconds
+    """
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    latencies = []
+    for _, _, body, content_type in requests:
+        start = time.perf_counter()
+        connection.request("POST", settings.WEBHOOK_ENDPOINT, body=body, headers={"Content-Type": content_type})
+        connection.getresponse().read()
+        latencies.append(time.perf_counter() - start)
+    connection.close()
+    return sorted(latencies)
+
+def main():
+    parser = argparse.ArgumentParser(description="Event stream benchmark")
+    parser.add_argument("--requests", type=int, default=8000)
+    parser.add_argument("--viewers", type=int, default=4)
+    args = parser.parse_args()
+
+    passphrase = webhook_handler.passphrase or "bench"
+    webhook_handler.passphrase = passphrase
+    risk_gate.max_daily_loss = float("inf")
+
+    app = create_app()
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_port
+
+    runs = (("no viewers", 0, False), (f"{args.viewers} viewers", args.viewers, False),
+            (f"{args.viewers} viewers + stalled", args.viewers, True))
+    try:
+        for index, (name, viewers, stalled) in enumerate(runs):
+            clients = [Viewer(port) for _ in range(viewers)]
+            for client in clients:
+                client.start()
+            sock = stalled_viewer(port) if stalled else None
+            time.sleep(0.2)
+            before = event_broadcaster.get_stats()
+
+            requests = build_requests(args.requests, passphrase, {"valid": 1.0}, seed=index,
+                                      prefix=f"events-{index}-{time.time_ns()}")
+            latencies = post(port, requests)
+            time.sleep(0.5)
+
+            after = event_broadcaster.get_stats()
+            received = [client.events for client in clients]
+            print(f"{name:24s} p50 {percentile(latencies, 50) * 1000:7.3f} ms  "
+                  f"p99 {percentile(latencies, 99) * 1000:7.3f} ms  "
+                  f"{after['published'] - before['published']} events published, "
+                  f"received per viewer {min(received, default=0)}-{max(received, default=0)}, "
+                  f"{after['dropped_clients'] - before['dropped_clients']} viewers dropped, "
+                  f"{after['clients']} connected")
+
+            for client in clients:
+                client.close()
+            if sock is not None:
+                sock.close()
+            event_broadcaster.close()
+            time.sleep(0.2)
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+"""
+Benchmark: history store writes and paginated queries.
+
+Bulk-loads a scratch database with the store's schema (--rows trades and as
+many positions, a small share of them open), then times the pages served by
+/api/trades and /api/positions: the newest page, a page filtered by ticker,
+open positions, pages deep in the table reached through a cursor, and, for
+comparison, the same deep page fetched with OFFSET. Prints the query plans to
+show that every page is read from an index in order.
+
+Finally measures what recording costs the request thread and how many rows
+per second the background writer commits.
+
+Usage:
+    python benchmarks/bench_history_store.py [--rows N] [--repeat N] [--records N]
+"""
+import os
+import sys
+import time
+import random
+import shutil
+import logging
+import argparse
+import tempfile
+
+# Add the project root to the system path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+os.environ.setdefault("BROKER", "simulated")
+os.environ.setdefault("ENABLE_SIGNAL_JOURNAL", "false")
+
+from trading_bot.api.benchmark import TICKERS, percentile
+from trading_bot.api.signal import Signal
+from trading_bot.services.history.history_store import (
+    HistoryStore, SCHEMA, INSERT_TRADE, COLUMNS, encode_cursor
+)
+
+logging.getLogger("services.history").setLevel(logging.ERROR)
+
+# Rows per load transaction
+CHUNK = 200000
+
+# Share of the loaded positions still open
+OPEN_SHARE = 0.001
+
+def load(connection, rows, seed):
+    """
+    Fill the trades and positions tables with rows a second apart, ending now.
+
+    Returns:
+        int: Time of the first row in milliseconds
+    """
+    tickers = list(TICKERS)
+    rng = random.Random(seed)
+    first = int(time.time() * 1000) - rows * 1000
+    insert_position = (
+        "INSERT INTO positions (time, ticket, ticker, action, volume, entry, sl, tp, status, closed_time, pnl) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+    )
+
+    for start in range(0, rows, CHUNK):
+        trades = []
+        positions = []
+        for i in range(start, min(rows, start + CHUNK)):
+            ticker = tickers[rng.randrange(len(tickers))]
+            price = TICKERS[ticker]
+            action = "buy" if i % 2 else "sell"
+            row_time = first + i * 1000
+            trades.append((row_time, ticker, action, 0.1, price, price * 0.99, price * 1.02, i, "filled", "webhook"))
+            if rng.random() < OPEN_SHARE:
+                positions.append((row_time, i, ticker, action, 0.1, price, price * 0.99, price * 1.02,
+                                  "open", None, None))
+            else:
+                positions.append((row_time, i, ticker, action, 0.1, price, price * 0.99, price * 1.02,
+                                  "closed", row_time + 60000, rng.uniform(-10, 10)))
+        connection.execute("BEGIN")
+        connection.executemany(INSERT_TRADE, trades)
+        connection.executemany(insert_position, positions)
+        connection.execute("COMMIT")
+        print(f"\rloaded {min(rows, start + CHUNK):,} rows per table", end="", flush=True)
+    print()
+    return first
+
+def timed(query, repeat):
+    """
+    Run a query repeatedly.
+
+    Returns:
+        tuple: (p50 ms, p99 ms, rows of the last run)
+    """
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = query()
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return percentile(latencies, 50) * 1000, percentile(latencies, 99) * 1000, result
+
+def report(name, measured):
+    p50, p99, result = measured
+    rows = result[next(iter(result))] if isinstance(result, dict) else result
+    print(f"{name:38s} p50 {p50:8.3f} ms  p99 {p99:8.3f} ms  ({len(rows)} rows)")
+
+def main():
+    parser = argparse.ArgumentParser(description="History store benchmark")
+    parser.add_argument("--rows", type=int, default=10000000, help="Trades and positions loaded")
+    parser.add_argument("--repeat", type=int, default=200, help="Runs per query")
+    parser.add_argument("--records", type=int, default=200000, help="Signals recorded through the writer")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="history-bench-")
+    store = HistoryStore(path=os.path.join(directory, "history.db"), enabled=True)
+    try:
+        connection = store.connect()
+        connection.executescript(SCHEMA)
+        start = time.perf_counter()
+        first = load(connection, args.rows, args.seed)
+        elapsed = time.perf_counter() - start
+        print(f"load: {2 * args.rows / elapsed:,.0f} rows/s, "
+              f"{os.path.getsize(store.path) / 1e9:.2f} GB")
+        connection.execute("ANALYZE")
+        connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        connection.close()
+
+        # Pages served by the API
+        ticker = next(iter(TICKERS))
+        report("trades, newest page", timed(lambda: store.trades(limit=50), args.repeat))
+        report(f"trades, {ticker}", timed(lambda: store.trades(ticker=ticker, limit=50), args.repeat))
+        report("positions, open", timed(lambda: store.positions(status="open", limit=50), args.repeat))
+        report(f"positions, {ticker}, closed",
+               timed(lambda: store.positions(ticker=ticker, status="closed", limit=50), args.repeat))
+
+        # Following the cursor page after page
+        cursor = None
+        latencies = []
+        for _ in range(args.repeat):
+            begin = time.perf_counter()
+            page = store.trades(limit=50, cursor=cursor)
+            latencies.append(time.perf_counter() - begin)
+            cursor = page["next"]
+        latencies.sort()
+        print(f"{'trades, next ' + str(args.repeat) + ' pages':38s} p50 {percentile(latencies, 50) * 1000:8.3f} ms  "
+              f"p99 {percentile(latencies, 99) * 1000:8.3f} ms")
+
+        # Halfway into the table, by cursor and by OFFSET
+        middle = args.rows // 2
+        cursor = encode_cursor({"time": first + middle * 1000, "id": middle + 1})
+        report("trades, middle page by cursor", timed(lambda: store.trades(limit=50, cursor=cursor), args.repeat))
+        reader = store.connect()
+        offset_query = (f"SELECT {', '.join(COLUMNS['trades'])} FROM trades "
+                        "ORDER BY time DESC, id DESC LIMIT 50 OFFSET ?")
+        report("trades, middle page by OFFSET",
+               timed(lambda: reader.execute(offset_query, (args.rows - middle,)).fetchall(), max(1, args.repeat // 20)))
+
+        for table, where in (("trades", "ticker = ?"), ("positions", "status = ?")):
+            plan = reader.execute(
+                f"EXPLAIN QUERY PLAN SELECT * FROM {table} WHERE {where} AND (time, id) < (?, ?) "
+                "ORDER BY time DESC, id DESC LIMIT 50", ("x", 0, 0)
+            ).fetchall()
+            print(f"plan: {'; '.join(row[-1] for row in plan)}")
+        reader.close()
+
+        # Recording on the request thread, written in the background
+        signal = Signal(ticker, "buy", TICKERS[ticker], alert_id="bench")
+        result = {"success": True, "message": "Processed buy signal"}
+        store.max_queue = args.records
+        store.start()
+        start = time.perf_counter()
+        for _ in range(args.records):
+            store.record_signal(signal, result)
+        recorded = time.perf_counter() - start
+        while store.written + store.dropped < args.records:
+            time.sleep(0.001)
+        written = time.perf_counter() - start
+        stats = store.get_stats()
+        print(f"record_signal: {recorded / args.records * 1e6:.2f} us per call on the request thread; "
+              f"writer committed {stats['written']:,} rows in {stats['batches']} batches "
+              f"({stats['written'] / written:,.0f} rows/s), {stats['dropped']} dropped")
+    finally:
+        store.stop()
+        shutil.rmtree(directory, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+"""
+Benchmark: per-request logging cost on the webhook path.
+
+Compares the previous setup (synchronous console and rotating file handlers,
+eager f-string messages) with the queue-based writer and lazy %-style
+messages. Each "request" logs the two lines the webhook path emits for a
+valid signal. Console output goes to /dev/null; files go to a temp dir.
+
+Usage:
+    python benchmarks/bench_logging.py [--requests N]
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+# Add the project root to the system path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from trading_bot.api.signal import Signal
+from trading_bot.utils.logger import setup_logger, shutdown_logging
+
+def make_logger(name, log_file, async_mode):
+    """
+    Create a logger with the given output mode.
+    """
+    return setup_logger(name, level="INFO", log_file=log_file, async_mode=async_mode)
+
+def eager_request(logger, signal, payload):
+    logger.info(f"Received webhook: {payload}")
+    logger.info(f"Processing trade: {signal.action} {signal.ticker} at {signal.price}")
+
+def lazy_request(logger, signal, payload):
+    logger.info("Received signal: %s", signal)
+    logger.info("Processing trade: %s %s at %s", signal.action, signal.ticker, signal.price)
+
+def measure(logger, fn, requests):
+    signal = Signal("EURUSD", "buy", 1.1)
+    payload = {"passphrase": "x", "ticker": "EURUSD", "strategy": {"order_action": "buy", "order_price": 1.1}}
+    start = time.perf_counter()
+    for _ in range(requests):
+        fn(logger, signal, payload)
+    return (time.perf_counter() - start) / requests
+
+def main():
+    parser = argparse.ArgumentParser(description="Logging cost benchmark")
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    stderr = sys.stderr
+    sys.stderr = open(os.devnull, "w")
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            sync_logger = make_logger("bench.sync", os.path.join(tmp, "sync.log"), async_mode=False)
+            async_logger = make_logger("bench.async", os.path.join(tmp, "async.log"), async_mode=True)
+
+            results = [
+                ("sync handlers, f-string", measure(sync_logger, eager_request, args.requests)),
+                ("async writer, f-string", measure(async_logger, eager_request, args.requests)),
+                ("async writer, lazy %-style", measure(async_logger, lazy_request, args.requests)),
+            ]
+
+            # Drain the writer before the temp dir and /dev/null are closed
+            shutdown_logging()
+    finally:
+        sys.stderr.close()
+        sys.stderr = stderr
+
+    print(f"{args.requests} requests, 2 log lines each")
+    print(f"{'mode':<28} {'us/request':>12}")
+    for label, seconds in results:
+        print(f"{label:<28} {seconds * 1e6:>12.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+"""
+Benchmark: asynchronous Discord notifications against a local HTTP stub.
+
+Starts a stub webhook server that answers like Discord (rate-limit headers,
+429 responses once its bucket is empty, optional slow responses) and fires a
+burst of notifications at it. Measures how long notify() blocks the caller,
+compared with a blocking requests.post per notification, and reports how
+many messages and embeds reached the stub, including the summary of dropped
+notifications when the queue overflows.
+
+Usage:
+    python benchmarks/bench_notifications.py [--notifications N] [--queue-size N] [--delay S]
+"""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add the project root to the system path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+import requests
+
+from trading_bot.services.notifications.notification_service import NotificationService
+
+logging.getLogger("services.notifications").setLevel(logging.ERROR)
+
+class StubDiscord(BaseHTTPRequestHandler):
+    """
+    Discord-like webhook endpoint with a fixed-window rate limit.
+    """
+
+    limit = 5
+    period = 2.0
+    delay = 0.0
+    lock = threading.Lock()
+    window_start = 0.0
+    used = 0
+    messages = []
+    rate_limited = 0
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(self.delay)
+
+        cls = type(self)
+        with cls.lock:
+            now = time.monotonic()
+            if now - cls.window_start >= cls.period:
+                cls.window_start = now
+                cls.used = 0
+            reset_after = cls.period - (now - cls.window_start)
+            if cls.used >= cls.limit:
+                cls.rate_limited += 1
+                self._reply(429, {"retry_after": reset_after}, 0, reset_after)
+                return
+            cls.used += 1
+            cls.messages.append(json.loads(body))
+            remaining = cls.limit - cls.used
+        self._reply(204, None, remaining, reset_after)
+
+    def _reply(self, status, payload, remaining, reset_after):
+        data = json.dumps(payload).encode() if payload is not None else b""
+        self.send_response(status)
+        self.send_header("X-RateLimit-Limit", str(self.limit))
+        self.send_header("X-RateLimit-Remaining", str(remaining))
+        self.send_header("X-RateLimit-Reset-After", f"{reset_after:.3f}")
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+def main():
+    parser = argparse.ArgumentParser(description="Notification dispatcher benchmark")
+    parser.add_argument("--notifications", type=int, default=500)
+    parser.add_argument("--queue-size", type=int, default=100)
+    parser.add_argument("--delay", type=float, default=0.2, help="Stub response delay in seconds")
+    parser.add_argument("--blocking", type=int, default=10, help="Blocking posts to time for comparison")
+    args = parser.parse_args()
+
+    StubDiscord.delay = args.delay
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubDiscord)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/webhook"
+
+    # Baseline: one blocking post per notification on the caller's thread
+    start = time.perf_counter()
+    for i in range(args.blocking):
+        requests.post(url, json={"embeds": [{"title": f"blocking {i}"}]}, timeout=5)
+    blocking = (time.perf_counter() - start) / args.blocking
+    time.sleep(StubDiscord.period)
+    StubDiscord.messages.clear()
+
+    service = NotificationService(webhook_url=url, enabled=True, max_queue=args.queue_size, linger=0.05)
+    latencies = []
+    for i in range(args.notifications):
+        start = time.perf_counter()
+        service.notify(f"Trade {i}", "burst", level="success", fields={"Volume": 0.01})
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+
+    start = time.perf_counter()
+    service.stop(timeout=60)
+    drain = time.perf_counter() - start
+    server.shutdown()
+
+    stats = service.get_stats()
+    embeds = [embed for message in StubDiscord.messages for embed in message["embeds"]]
+    summaries = [embed for embed in embeds if embed["title"] == "Notifications dropped"]
+    dropped_reported = sum(int(embed["description"].split()[0]) for embed in summaries)
+
+    print(f"{args.notifications} notifications, queue {args.queue_size}, stub delay {args.delay * 1000:.0f} ms")
+    print(f"blocking post   {blocking * 1e3:9.2f} ms/notification")
+    print(f"notify()        p50 {latencies[len(latencies) // 2] * 1e6:7.1f} us  "
+          f"p99 {latencies[int(len(latencies) * 0.99)] * 1e6:7.1f} us  max {latencies[-1] * 1e6:7.1f} us")
+    print(f"messages {len(StubDiscord.messages)}, embeds delivered {stats['sent']} "
+          f"(summaries {len(summaries)}), dropped {stats['dropped']}, failed {stats['failed']}, "
+          f"429s {StubDiscord.rate_limited}, drain {drain:.1f} s")
+
+    if stats["sent"] - len(summaries) + stats["dropped"] + stats["failed"] != args.notifications:
+        sys.exit("Notifications unaccounted for")
+    if dropped_reported != stats["dropped"]:
+        sys.exit(f"Summaries report {dropped_reported} dropped, expected {stats['dropped']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+"""
+Benchmark: order micro-batching and netting.
+
+Fires bursts of alternating buy/sell alerts for a few tickers from many
+threads through WebhookHandler.process_signal, first sending every order
+directly and then through the OrderBatcher. Reports broker round trips,
+net volume and latency, and checks that the audit trail accounts for every
+alert and that netting preserves the net position per ticker.
+
+Usage:
+    python benchmarks/bench_order_batching.py [--signals N] [--threads N] [--window-ms MS]
+"""
+import os
+import sys
+import time
+import logging
+import argparse
+import threading
+from collections import defaultdict
+
+# Add the project root to the system path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+os.environ.setdefault("BROKER", "simulated")
+os.environ.setdefault("ALLOW_WEEKEND_TRADING", "true")
+os.environ.setdefault("ENABLE_DEDUP", "false")
+
+from trading_bot.api.signal import Signal
+from trading_bot.api.webhook_handler import webhook_handler
+from trading_bot.core.order_batcher import OrderBatcher
+from trading_bot.services.broker.session import BrokerSession
+from trading_bot.services.broker.simulated_broker import SimulatedBroker
+
+# Keep per-signal log lines out of the timings
+logging.getLogger("webhook_handler").setLevel(logging.CRITICAL)
+logging.getLogger("core.order_batcher").setLevel(logging.WARNING)
+
+def net_positions(orders):
+    """
+    Signed volume per symbol.
+    """
+    totals = defaultdict(float)
+    for order in orders:
+        totals[order.symbol] += order.volume if order.action == "buy" else -order.volume
+    return {symbol: round(volume, 8) for symbol, volume in totals.items()}
+
+def run(signals, threads):
+    """
+    Send the signals from several threads and return per-signal latencies.
+    """
+    latencies = []
+    lock = threading.Lock()
+
+    def worker(chunk):
+        local = []
+        for signal in chunk:
+            start = time.perf_counter()
+            if not webhook_handler.process_signal(signal)["success"]:
+                raise AssertionError(f"Signal failed: {signal}")
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    pool = [threading.Thread(target=worker, args=(signals[i::threads],)) for i in range(threads)]
+    start = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return sorted(latencies), time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Order batching benchmark")
+    parser.add_argument("--signals", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--tickers", type=int, default=4)
+    parser.add_argument("--window-ms", type=float, default=5.0)
+    parser.add_argument("--broker-latency", type=float, default=0.002)
+    args = parser.parse_args()
+
+    # Strategies flipping quickly: alternating actions per ticker
+    signals = [
+        Signal(f"SYM{i % args.tickers}", "buy" if (i // args.tickers) % 3 else "sell", 1.1, alert_id=str(i))
+        for i in range(args.signals)
+    ]
+
+    print(f"{args.signals} signals, {args.threads} threads, {args.tickers} tickers, "
+          f"broker latency {args.broker_latency * 1000:.0f} ms")
+
+    expected = None
+    for mode in ("direct", "batched"):
+        # Serial like a single MT5 terminal connection
+        broker = SimulatedBroker(latency=args.broker_latency, serial=True)
+        session = BrokerSession(broker)
+        session.start()
+        webhook_handler.broker = session
+        batcher = OrderBatcher(session, window=args.window_ms / 1000.0)
+        webhook_handler.batcher = batcher
+        if mode == "batched":
+            batcher.start()
+
+        latencies, elapsed = run(signals, args.threads)
+        batcher.stop()
+        session.stop()
+
+        net = net_positions(broker.orders)
+        round_trips = len(broker.orders) if mode == "direct" else broker.batches
+        print(
+            f"{mode:<8} {len(signals) / elapsed:8.0f} signals/s  orders {len(broker.orders):5d}  "
+            f"broker calls {round_trips:5d}  p50 {latencies[len(latencies) // 2] * 1000:6.2f} ms  "
+            f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:6.2f} ms"
+        )
+
+        if mode == "direct":
+            expected = net
+            continue
+
+        audited = sum(len(record["alerts"]) for record in batcher.audit_trail())
+        print(f"batches {batcher.batches}, audited alerts {audited}, netted out {batcher.netted_out}")
+        if audited != len(signals):
+            sys.exit("Audit trail does not account for every alert")
+        if {k: v for k, v in net.items() if v} != {k: v for k, v in expected.items() if v}:
+            sys.exit(f"Net position mismatch: {net} != {expected}")
+        print("net position per ticker matches direct execution")
+
+if __name__ == "__main__":
+    main()
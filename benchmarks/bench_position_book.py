@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+"""
+Benchmark: breakeven and trailing-stop evaluation with the position book.
+
+Opens 10k simulated positions spread over several symbols and replays
+random-walk price updates. Compares PositionBook.on_price with a naive loop
+that checks every open position on every update, and verifies that both
+produce the same stop modifications and closed positions.
+
+Usage:
+    python benchmarks/bench_position_book.py [--positions N] [--symbols N] [--updates N]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+# Add the project root to the system path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from trading_bot.core.position_book import PositionBook
+
+BREAKEVEN = 0.5
+TRAILING = 0.7
+STEP = 0.2
+
+def naive_update(positions, symbol, price):
+    """
+    Check every open position, as a per-tick scan would.
+    """
+    modifications = []
+    for ticket, p in list(positions.items()):
+        if p["symbol"] != symbol:
+            continue
+        d = p["direction"]
+        x = d * price
+        sl = d * p["sl"]
+        tp = d * p["tp"]
+        if x <= sl or x >= tp:
+            del positions[ticket]
+            continue
+
+        favorable = x - d * p["entry"]
+        target = p["target"]
+        new_sl = sl
+        if not p["breakeven_done"] and favorable >= BREAKEVEN * target:
+            new_sl = max(new_sl, d * p["entry"])
+            p["breakeven_done"] = True
+        step = STEP * target
+        if favorable >= TRAILING * target and x - step - new_sl >= step:
+            new_sl = x - step
+        if new_sl > sl:
+            p["sl"] = d * new_sl
+            modifications.append((ticket, d * new_sl))
+    return modifications
+
+def main():
+    parser = argparse.ArgumentParser(description="Position book benchmark")
+    parser.add_argument("--positions", type=int, default=10000)
+    parser.add_argument("--symbols", type=int, default=50)
+    parser.add_argument("--updates", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    symbols = [f"SYM{i:02d}" for i in range(args.symbols)]
+    prices = {symbol: 100.0 for symbol in symbols}
+
+    book = PositionBook(
+        enable_breakeven=True, breakeven_trigger=BREAKEVEN,
+        enable_trailing=True, trailing_trigger=TRAILING, trailing_step=STEP
+    )
+    naive = {}
+    for ticket in range(1, args.positions + 1):
+        symbol = rng.choice(symbols)
+        direction = rng.choice((1, -1))
+        entry = prices[symbol] + rng.uniform(-0.5, 0.5)
+        risk = rng.uniform(0.5, 2.0)
+        sl = entry - direction * risk
+        tp = entry + direction * risk * 2
+        book.open(ticket, symbol, "buy" if direction > 0 else "sell", 0.1, entry, sl=sl, tp=tp)
+        naive[ticket] = {
+            "symbol": symbol, "direction": direction, "entry": entry,
+            "sl": sl, "tp": tp, "target": abs(tp - entry), "breakeven_done": False
+        }
+
+    # Small steps so most updates stay inside the quiet band
+    updates = []
+    for _ in range(args.updates):
+        symbol = rng.choice(symbols)
+        prices[symbol] += rng.gauss(0, 0.02)
+        updates.append((symbol, prices[symbol]))
+
+    start = time.perf_counter()
+    book_mods = [book.on_price(symbol, price) for symbol, price in updates]
+    book_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    naive_mods = [naive_update(naive, symbol, price) for symbol, price in updates]
+    naive_time = time.perf_counter() - start
+
+    mismatches = sum(
+        1 for a, b in zip(book_mods, naive_mods)
+        if sorted((t, round(sl, 9)) for t, sl in a) != sorted((t, round(sl, 9)) for t, sl in b)
+    )
+    modifications = sum(len(m) for m in book_mods)
+
+    print(f"{args.positions} positions, {args.symbols} symbols, {args.updates} price updates")
+    print(f"naive scan     {naive_time / args.updates * 1e6:9.1f} us/update")
+    print(f"position book  {book_time / args.updates * 1e6:9.1f} us/update "
+          f"({naive_time / book_time:.0f}x faster)")
+    print(f"stop modifications: {modifications}, closed: {book.closed}, open: {len(book)} "
+          f"(naive open: {len(naive)})")
+    print(f"update mismatches: {mismatches}")
+
+    if mismatches or len(book) != len(naive):
+        sys.exit("Position book disagrees with the naive scan")
+
+if __name__ == "__main__":
+    main()
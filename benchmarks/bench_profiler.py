@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+"""
+Benchmark: webhook latency with profiling idle, sampling and tracing.
+
+Posts signals through the Flask test client with the profiler idle (its
+default state, which must cost nothing), while the stack sampler runs and
+while every request is traced with cProfile, and reports p50/p99 for each.
+
+Usage:
+    python benchmarks/bench_profiler.py [--requests N]
+"""
+import os
+import sys
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+
+# Add the project root to the system path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+output_dir = tempfile.mkdtemp(prefix="profiles-")
+os.environ.setdefault("BROKER", "simulated")
+os.environ.setdefault("WEBHOOK_PASSPHRASE", "bench")
+os.environ.setdefault("ALLOW_WEEKEND_TRADING", "true")
+os.environ.setdefault("ENABLE_SIGNAL_JOURNAL", "false")
+os.environ.setdefault("ENABLE_HISTORY", "false")
+os.environ["ENABLE_PROFILING"] = "true"
+os.environ["PROFILE_DIR"] = output_dir
+
+from trading_bot.api.app import create_app
+from trading_bot.api.benchmark import build_requests, percentile
+from trading_bot.core.risk_gate import risk_gate
+from trading_bot.utils.profiler import profiler
+
+# Keep per-signal log lines out of the timings
+for name in ("api.app", "webhook_handler", "core.position_book", "core.risk_gate",
+             "services.broker.session", "utils.profiler"):
+    logging.getLogger(name).setLevel(logging.ERROR)
+
+def run(client, requests):
+    """
+    Post the requests and return sorted latencies in seconds.
+    """
+    latencies = []
+    for _, _, body, content_type in requests:
+        start = time.perf_counter()
+        client.post("/webhook", data=body, content_type=content_type)
+        latencies.append(time.perf_counter() - start)
+    return sorted(latencies)
+
+def main():
+    parser = argparse.ArgumentParser(description="Profiler overhead benchmark")
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    risk_gate.max_daily_loss = float("inf")
+    client = create_app().test_client()
+    try:
+        results = {}
+        results["idle"] = run(client, build_requests(args.requests, "bench", prefix="idle"))
+
+        profiler.sample(3600)
+        results["sampling"] = run(client, build_requests(args.requests, "bench", prefix="sampling"))
+
+        profiler.trace("webhook", args.requests)
+        results["tracing"] = run(client, build_requests(args.requests, "bench", prefix="tracing"))
+
+        for mode, latencies in results.items():
+            print(f"{mode:9s} p50 {percentile(latencies, 50) * 1000:7.3f} ms  "
+                  f"p99 {percentile(latencies, 99) * 1000:7.3f} ms")
+        print(f"outputs: {os.listdir(output_dir)}")
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
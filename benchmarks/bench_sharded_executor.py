@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""
+Benchmark: signal throughput of the sharded executor by shard count.
+
+Signals for a set of tickers are pushed through a ShardedExecutor whose
+tasks call a stub broker with a fixed round-trip latency. Throughput should
+scale with the shard count until every ticker has its own shard, and the
+per-ticker order of executed signals must match the submission order.
+
+Usage:
+    python benchmarks/bench_sharded_executor.py [--signals N] [--tickers N] [--latency-ms MS]
+"""
+import os
+import sys
+import time
+import argparse
+import threading
+from collections import defaultdict
+
+# Add the project root to the system path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from trading_bot.core.executor import ShardedExecutor
+
+class StubBroker:
+    """
+    Broker stand-in that sleeps for a fixed latency per order.
+    """
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.executed = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def submit_order(self, ticker, sequence):
+        time.sleep(self.latency)
+        with self._lock:
+            self.executed[ticker].append(sequence)
+
+def run(shards, signals, tickers, latency):
+    """
+    Push all signals through an executor with the given shard count.
+
+    Returns:
+        tuple: (signals per second, True if per-ticker order was preserved)
+    """
+    broker = StubBroker(latency)
+    executor = ShardedExecutor(shards, name="bench")
+    executor.start()
+
+    symbols = [f"SYM{i:03d}" for i in range(tickers)]
+    expected = defaultdict(list)
+
+    start = time.perf_counter()
+    futures = []
+    for sequence in range(signals):
+        ticker = symbols[sequence % tickers]
+        expected[ticker].append(sequence)
+        futures.append(executor.submit(ticker, broker.submit_order, ticker, sequence))
+    for future in futures:
+        future.result()
+    elapsed = time.perf_counter() - start
+
+    executor.shutdown()
+    return signals / elapsed, broker.executed == expected
+
+def main():
+    parser = argparse.ArgumentParser(description="Sharded executor benchmark")
+    parser.add_argument("--signals", type=int, default=2000)
+    parser.add_argument("--tickers", type=int, default=32)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    args = parser.parse_args()
+
+    print(f"{args.signals} signals, {args.tickers} tickers, stub broker latency {args.latency_ms} ms")
+    print(f"{'shards':>8} {'signals/s':>12} {'speedup':>8} {'ordered':>8}")
+
+    baseline = None
+    for shards in args.shards:
+        throughput, ordered = run(shards, args.signals, args.tickers, args.latency_ms / 1000)
+        baseline = baseline or throughput
+        print(f"{shards:>8} {throughput:>12.1f} {throughput / baseline:>7.2f}x {str(ordered):>8}")
+
+if __name__ == "__main__":
+    main()
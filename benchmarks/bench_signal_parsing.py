@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+"""
+Benchmark: webhook payload parsing and validation.
+
+Compares the previous request path (generic JSON decode, f-string log line of
+the whole payload, then a chain of dict.get checks) with the single-pass
+parse_signal() on the same raw bodies. Reports requests per second and the
+memory allocated per request (tracemalloc peak).
+
+Usage:
+    python benchmarks/bench_signal_parsing.py [--iterations N]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+
+# Add the project root to the system path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from trading_bot.api.signal import parse_signal, SignalError, JSON_DECODER
+
+PASSPHRASE = "bench-passphrase"
+
+PAYLOADS = {
+    "valid": json.dumps({
+        "passphrase": PASSPHRASE,
+        "ticker": "EURUSD",
+        "strategy": {"order_action": "buy", "order_price": 1.1000}
+    }).encode("utf-8"),
+    "bad passphrase": json.dumps({
+        "passphrase": "wrong",
+        "ticker": "EURUSD",
+        "strategy": {"order_action": "buy", "order_price": 1.1000}
+    }).encode("utf-8"),
+    "form": b"passphrase=bench-passphrase&ticker=EURUSD&order_action=sell&order_price=1.1",
+}
+
+def legacy_path(body):
+    """
+    Previous parse/validate path without the Flask request object.
+    """
+    try:
+        data = json.loads(body)
+    except json.JSONDecodeError:
+        from urllib.parse import parse_qsl
+        form = dict(parse_qsl(body.decode("utf-8")))
+        data = {
+            "passphrase": form.get("passphrase", ""),
+            "ticker": form.get("ticker", ""),
+            "strategy": {
+                "order_action": form.get("order_action", ""),
+                "order_price": float(form.get("order_price", 0))
+            }
+        }
+
+    # The payload was formatted for the log before validation
+    message = f"Received webhook: {data}"
+
+    if data.get("passphrase", "") != PASSPHRASE:
+        return None
+    ticker = data.get("ticker", "")
+    if not ticker:
+        return None
+    strategy = data.get("strategy", {})
+    if not strategy:
+        return None
+    order_action = strategy.get("order_action", "").lower()
+    if order_action not in ["buy", "sell"]:
+        return None
+    order_price = strategy.get("order_price", 0)
+    if not order_price:
+        return None
+    return {"ticker": ticker, "action": order_action, "price": order_price}
+
+def fast_path(body):
+    """
+    Single-pass parser.
+    """
+    try:
+        return parse_signal(body, PASSPHRASE)
+    except SignalError:
+        return None
+
+def measure(fn, body, iterations):
+    """
+    Measure throughput and per-request allocation of a parse function.
+
+    Returns:
+        tuple: (requests per second, bytes allocated per request)
+    """
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(body)
+    elapsed = time.perf_counter() - start
+
+    samples = min(iterations, 1000)
+    tracemalloc.start()
+    total = 0
+    for _ in range(samples):
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        fn(body)
+        total += tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+
+    return iterations / elapsed, total / samples
+
+def main():
+    parser = argparse.ArgumentParser(description="Webhook parsing benchmark")
+    parser.add_argument("--iterations", type=int, default=100000)
+    args = parser.parse_args()
+
+    print(f"JSON decoder: {JSON_DECODER}")
+    print(f"{'payload':<16} {'path':<8} {'req/s':>12} {'bytes/req':>10}")
+    for name, body in PAYLOADS.items():
+        for label, fn in (("legacy", legacy_path), ("fast", fast_path)):
+            throughput, allocated = measure(fn, body, args.iterations)
+            print(f"{name:<16} {label:<8} {throughput:>12.0f} {allocated:>10.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+"""
+Benchmark: event-driven tick evaluation against fixed-interval polling.
+
+Streams synthetic ticks for the benchmark tickers into a tick stream that
+moves breakeven and trailing stops on a position book, for a few thresholds.
+Reports ticks, evaluations, coalesced and filtered ticks, the delay from a
+tick to the end of its evaluation and the stops moved. Polling every
+SCHEDULER_INTERVAL_SECONDS reacts after half an interval on average, up to
+a full interval.
+
+Usage:
+    python benchmarks/bench_tick_stream.py [--seconds S] [--rate TICKS_PER_SECOND] [--positions N]
+"""
+import os
+import sys
+import time
+import logging
+import argparse
+
+# Add the project root to the system path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+os.environ.setdefault("BROKER", "simulated")
+os.environ.setdefault("ENABLE_SIGNAL_JOURNAL", "false")
+
+from trading_bot.api.benchmark import TICKERS
+from trading_bot.core.position_book import PositionBook
+from trading_bot.core.tick_stream import TickStream, TICK_LATENCY_SECONDS
+from trading_bot.services.market_data.tick_feed import SyntheticTickFeed
+from trading_bot.utils.metrics import bucket_bounds
+from trading_bot.config import settings
+
+for name in ("core.tick_stream", "services.tick_feed", "core.position_book"):
+    logging.getLogger(name).setLevel(logging.ERROR)
+
+def open_positions(book, count):
+    """
+    Open long and short positions around each ticker's start price, with
+    stops and targets close enough for ticks to move them.
+    """
+    ticket = 0
+    for symbol, price in TICKERS.items():
+        for i in range(count):
+            ticket += 1
+            distance = price * 0.001 * (1 + i % 5)
+            if i % 2:
+                book.open(ticket, symbol, "sell", 0.1, price, sl=price + distance, tp=price - 2 * distance)
+            else:
+                book.open(ticket, symbol, "buy", 0.1, price, sl=price - distance, tp=price + 2 * distance)
+
+def delay_percentile(before, after, q):
+    """
+    Percentile in milliseconds of the tick delays recorded between two
+    histogram snapshots.
+    """
+    counts = [b - a for a, b in zip(before, after)]
+    rank = max(1, int(q / 100.0 * sum(counts) + 0.5))
+    seen = 0
+    for index, count in enumerate(counts):
+        seen += count
+        if seen >= rank:
+            return bucket_bounds(index)[1] / 1e6
+    return float("nan")
+
+def run(threshold, seconds, rate, positions):
+    """
+    Stream ticks for a number of seconds.
+
+    Returns:
+        dict: Tick stream statistics and the number of stops moved
+    """
+    book = PositionBook(enable_trailing=True)
+    open_positions(book, positions)
+    moved = [0]
+
+    def evaluate(symbol, price):
+        moved[0] += len(book.on_price(symbol, price))
+
+    before = TICK_LATENCY_SECONDS.snapshot()[0]
+    feed = SyntheticTickFeed(TICKERS, rate=rate, volatility=0.0002, start_prices=TICKERS)
+    stream = TickStream(feed, evaluate, threshold=threshold)
+    stream.start()
+    time.sleep(seconds)
+    stream.stop()
+
+    stats = stream.get_stats()
+    after = TICK_LATENCY_SECONDS.snapshot()[0]
+    stats["p50_ms"] = delay_percentile(before, after, 50)
+    stats["p99_ms"] = delay_percentile(before, after, 99)
+    stats["moved"] = moved[0]
+    stats["open"] = len(book)
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description="Tick stream benchmark")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--rate", type=float, default=100.0, help="Ticks per second per symbol")
+    parser.add_argument("--positions", type=int, default=20, help="Positions per symbol")
+    args = parser.parse_args()
+
+    print(f"{len(TICKERS)} symbols, {args.rate:.0f} ticks/s each, {args.positions} positions per symbol")
+    for threshold in (0.0, 0.01, 0.05):
+        stats = run(threshold, args.seconds, args.rate, args.positions)
+        print(f"threshold {threshold:5.2f}%: {stats['ticks']:6d} ticks, {stats['evaluations']:6d} evaluations "
+              f"({stats['filtered']} filtered, {stats['coalesced']} coalesced), "
+              f"tick to evaluation p50 {stats['p50_ms']:.3f} ms p99 {stats['p99_ms']:.3f} ms; "
+              f"{stats['moved']} stops moved, {stats['open']} positions open")
+
+    interval = settings.SCHEDULER_INTERVAL_SECONDS
+    print(f"polling every {interval}s: {len(TICKERS) * args.seconds / interval:.0f} evaluations, "
+          f"reaction {interval * 500:.0f} ms on average, up to {interval * 1000:.0f} ms")
+
+if __name__ == "__main__":
+    main()
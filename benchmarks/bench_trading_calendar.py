@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+"""
+Benchmark: trading-hours check, previous implementation vs compiled calendar.
+
+The previous TradingScheduler._is_trading_allowed re-parsed the trading hours
+and built two datetimes on every call. The compiled calendar does a single
+binary search in a per-weekday table. Both are checked for agreement over a
+week of minutes before timing.
+
+Usage:
+    python benchmarks/bench_trading_calendar.py [--calls N]
+"""
+import os
+import sys
+import time
+import argparse
+import datetime
+
+# Add the project root to the system path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from trading_bot.core.trading_calendar import TradingCalendar, parse_sessions, parse_symbol_sessions
+
+HOURS_START = "22:00"
+HOURS_END = "20:00"
+
+def legacy_is_trading_allowed(current_time, allow_weekends=False):
+    """
+    Previous implementation without logging.
+    """
+    if current_time.weekday() >= 5 and not allow_weekends:
+        return False
+
+    start_hour, start_minute = map(int, HOURS_START.split(":"))
+    end_hour, end_minute = map(int, HOURS_END.split(":"))
+    trading_start = current_time.replace(hour=start_hour, minute=start_minute, second=0, microsecond=0)
+    trading_end = current_time.replace(hour=end_hour, minute=end_minute, second=0, microsecond=0)
+
+    if trading_end < trading_start:
+        if current_time < trading_start and current_time > trading_end:
+            return False
+    else:
+        if current_time < trading_start or current_time > trading_end:
+            return False
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description="Trading calendar benchmark")
+    parser.add_argument("--calls", type=int, default=200000)
+    args = parser.parse_args()
+
+    calendar = TradingCalendar(parse_sessions(f"{HOURS_START}-{HOURS_END}"))
+
+    # Agreement over every minute of a week
+    monday = datetime.datetime(2024, 1, 1)
+    times = [monday + datetime.timedelta(minutes=m) for m in range(7 * 24 * 60)]
+    mismatches = sum(
+        legacy_is_trading_allowed(t) != calendar.is_trading_allowed(t)
+        for t in times
+    )
+    print(f"mismatches over one week of minutes: {mismatches}")
+
+    # A busier calendar: 24 sessions per day and per-symbol overrides
+    busy = TradingCalendar(
+        parse_sessions(",".join(f"{h:02d}:00-{h:02d}:45" for h in range(24))),
+        symbol_sessions=parse_symbol_sessions(
+            ";".join(f"SYM{i}=08:00-12:00,13:00-17:00" for i in range(500))
+        ),
+        holidays=[datetime.date(2024, 12, 25)]
+    )
+
+    samples = [times[i % len(times)] for i in range(0, args.calls * 7, 7)][:args.calls]
+    cases = [
+        ("legacy", lambda t: legacy_is_trading_allowed(t)),
+        ("calendar", lambda t: calendar.is_trading_allowed(t)),
+        ("calendar, 24 sessions", lambda t: busy.is_trading_allowed(t)),
+        ("calendar, per symbol", lambda t: busy.is_trading_allowed(t, "SYM42")),
+    ]
+
+    print(f"{'implementation':<24} {'ns/call':>10}")
+    for label, fn in cases:
+        start = time.perf_counter()
+        for t in samples:
+            fn(t)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<24} {elapsed / len(samples) * 1e9:>10.0f}")
+
+    if mismatches:
+        sys.exit("Compiled calendar disagrees with the previous implementation")
+
+if __name__ == "__main__":
+    main()
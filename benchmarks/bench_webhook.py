@@ -0,0 +1,29 @@
+#!/usr/bin/env python
+"""
+Benchmark: the webhook pipeline under a realistic payload mix.
+
+Runs the same load generator as `python -m trading_bot bench`: valid,
+bad-passphrase, form-encoded and duplicate TradingView alerts sent to
+WebhookHandler.process_request, through the Flask test client and over
+local HTTP. Reports throughput, p50/p99/p999 latency and memory per request
+and writes the results as JSON (benchmarks/results/ by default) for
+comparison across commits with --compare.
+
+Usage:
+    python benchmarks/bench_webhook.py [--requests N] [--clients N] [--modes handler,client,http]
+                                       [--output PATH] [--compare PATH]
+"""
+import os
+import sys
+
+# Add the project root to the system path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+os.environ.setdefault("BROKER", "simulated")
+os.environ.setdefault("WEBHOOK_PASSPHRASE", "bench")
+
+from trading_bot.api.benchmark import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+"""
+Load test: latency of the /webhook endpoint over real HTTP.
+
+Opens one keep-alive connection per client thread, posts valid signals for
+a rotating set of tickers and reports throughput and p50/p99 latency.
+Start the server first, e.g.:
+
+    python -m trading_bot --server --no-scheduler
+    python benchmarks/load_test.py --clients 16 --requests 5000
+
+Usage:
+    python benchmarks/load_test.py [--url URL] [--clients N] [--requests N] [--passphrase P]
+"""
+import os
+import json
+import time
+import argparse
+import threading
+import http.client
+from collections import Counter
+from urllib.parse import urlparse
+
+def percentile(values, pct):
+    """
+    Nearest-rank percentile of a sorted list.
+    """
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, int(round(pct / 100 * len(values))) - 1))
+    return values[index]
+
+def client(url, passphrase, count, offset, latencies, statuses, lock):
+    """
+    Post count signals over a single keep-alive connection.
+    """
+    conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=30)
+    headers = {"Content-Type": "application/json", "Connection": "keep-alive"}
+    local_latencies = []
+    local_statuses = Counter()
+
+    for i in range(count):
+        body = json.dumps({
+            "passphrase": passphrase,
+            "ticker": f"SYM{(offset + i) % 50:02d}",
+            "strategy": {"order_action": "buy" if i % 2 else "sell", "order_price": 1.1 + i * 1e-5}
+        })
+        start = time.perf_counter()
+        try:
+            conn.request("POST", url.path or "/webhook", body=body, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            local_statuses[response.status] += 1
+        except (OSError, http.client.HTTPException):
+            local_statuses["error"] += 1
+            conn.close()
+            conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=30)
+            continue
+        local_latencies.append(time.perf_counter() - start)
+
+    conn.close()
+    with lock:
+        latencies.extend(local_latencies)
+        statuses.update(local_statuses)
+
+def main():
+    parser = argparse.ArgumentParser(description="Webhook load test")
+    parser.add_argument("--url", default="http://127.0.0.1:5000/webhook")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--passphrase", default=os.getenv("WEBHOOK_PASSPHRASE", ""))
+    args = parser.parse_args()
+
+    url = urlparse(args.url)
+    latencies = []
+    statuses = Counter()
+    lock = threading.Lock()
+    per_client = max(1, args.requests // args.clients)
+
+    threads = [
+        threading.Thread(
+            target=client,
+            args=(url, args.passphrase, per_client, i * per_client, latencies, statuses, lock)
+        )
+        for i in range(args.clients)
+    ]
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"requests:   {sum(statuses.values())} in {elapsed:.2f}s ({args.clients} clients)")
+    print(f"throughput: {len(latencies) / elapsed:.1f} req/s")
+    print(f"statuses:   {dict(statuses)}")
+    print(f"p50:        {percentile(latencies, 50) * 1000:.2f} ms")
+    print(f"p99:        {percentile(latencies, 99) * 1000:.2f} ms")
+    print(f"max:        {(latencies[-1] if latencies else 0) * 1000:.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+"""
+Shared test setup.
+
+Settings are read at import, so the environment is set up here before any
+test imports the bot: simulated broker, no weekend restriction, console-only
+logging and none of the optional subsystems writing to disk.
+"""
+import os
+import sys
+
+# Add the project root to the system path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+os.environ.setdefault("BROKER", "simulated")
+os.environ.setdefault("ALLOW_WEEKEND_TRADING", "true")
+os.environ.setdefault("LOG_FILE", "")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ.setdefault("ENABLE_SIGNAL_JOURNAL", "false")
+os.environ.setdefault("ENABLE_HISTORY", "false")
+os.environ.setdefault("ENABLE_EVENTS", "false")
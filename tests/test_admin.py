@@ -0,0 +1,26 @@
+"""
+Tests for the admin token check on the admin endpoints.
+"""
+import pytest
+from flask import Flask
+
+from trading_bot.api import app as app_module
+from trading_bot.config import settings
+
+@pytest.fixture
+def request_with_token(monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "s3cret")
+    app = Flask(__name__)
+
+    def check(token):
+        headers = {} if token is None else {"X-Admin-Token": token}
+        with app.test_request_context("/admin/reload", headers=headers):
+            return app_module._admin_authorized()
+    return check
+
+def test_matching_token_is_accepted(request_with_token):
+    assert request_with_token("s3cret")
+
+@pytest.mark.parametrize("token", [None, "", "s3cre", "s3cret2", "S3CRET", "sécret"])
+def test_other_tokens_are_rejected(request_with_token, token):
+    assert not request_with_token(token)
@@ -0,0 +1,30 @@
+"""
+Tests that the webhook app imports without the heavy dependencies.
+"""
+import os
+import sys
+import subprocess
+
+import pytest
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ("numpy", "pandas", "apscheduler", "MetaTrader5")
+
+CHECK = (
+    "import sys\n"
+    "import trading_bot.api.app\n"
+    "print(','.join(name for name in {modules!r} if name in sys.modules))\n"
+)
+
+@pytest.mark.parametrize("broker", ["simulated", "mt5"])
+def test_app_import_defers_heavy_modules(broker):
+    # A fresh interpreter: this process has already imported them
+    env = dict(os.environ, BROKER=broker, LOG_FILE="", LOG_LEVEL="WARNING")
+    result = subprocess.run(
+        [sys.executable, "-c", CHECK.format(modules=HEAVY_MODULES)],
+        cwd=project_root, env=env, capture_output=True, text=True, timeout=60
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ""
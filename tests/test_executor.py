@@ -0,0 +1,61 @@
+"""
+Tests for the sharded executor lifecycle.
+"""
+import threading
+
+from trading_bot.core.executor import ShardedExecutor
+
+def test_tasks_for_a_key_run_in_order():
+    executor = ShardedExecutor(4)
+    executor.start()
+    seen = []
+    futures = [executor.submit("EURUSD", seen.append, i) for i in range(100)]
+    executor.shutdown()
+
+    assert all(future.done() for future in futures)
+    assert seen == list(range(100))
+
+def test_shutdown_does_not_block_on_a_full_queue():
+    executor = ShardedExecutor(1, max_queue_size=1)
+    executor.start()
+    release = threading.Event()
+    executor.submit("EURUSD", release.wait)
+    executor.submit("EURUSD", lambda: None)
+
+    done = threading.Event()
+    stopper = threading.Thread(target=lambda: (executor.shutdown(wait=False), done.set()))
+    stopper.start()
+    assert done.wait(2)
+
+    release.set()
+    executor._threads[0].join(2)
+    assert not executor._threads[0].is_alive()
+
+def test_restart_keeps_a_worker_that_is_still_draining():
+    executor = ShardedExecutor(1)
+    executor.start()
+    release = threading.Event()
+    seen = []
+    executor.submit("EURUSD", release.wait)
+    executor.submit("EURUSD", seen.append, 1)
+    executor.shutdown(wait=False)
+    worker = executor._threads[0]
+
+    executor.start()
+    future = executor.submit("EURUSD", seen.append, 2)
+    release.set()
+    future.result(2)
+
+    assert executor._threads == [worker]
+    assert seen == [1, 2]
+    assert len([t for t in threading.enumerate() if t.name == "shard-0"]) == 1
+    executor.shutdown()
+
+def test_restart_after_full_shutdown():
+    executor = ShardedExecutor(2)
+    executor.start()
+    executor.shutdown()
+
+    executor.start()
+    assert executor.submit("EURUSD", lambda: 42).result(2) == 42
+    executor.shutdown()
@@ -0,0 +1,109 @@
+"""
+Tests comparing the incremental indicator engine with the `ta` library.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from ta.volatility import AverageTrueRange
+from ta.trend import SMAIndicator, EMAIndicator
+
+from trading_bot.services.market_data.indicators import RingBuffer, SymbolIndicators
+
+ATR_PERIOD = 14
+MA_PERIOD = 20
+BARS = 300
+
+@pytest.fixture(scope="module")
+def bars():
+    rng = np.random.default_rng(7)
+    close = 1.1 + np.cumsum(rng.normal(0, 0.0005, BARS))
+    spread = np.abs(rng.normal(0, 0.0004, BARS))
+    high = close + spread * rng.random(BARS)
+    low = close - spread * rng.random(BARS)
+    return high, low, close
+
+@pytest.fixture(scope="module")
+def expected(bars):
+    high, low, close = (pd.Series(values) for values in bars)
+    return {
+        "atr": AverageTrueRange(high, low, close, window=ATR_PERIOD).average_true_range().to_numpy(),
+        "sma": SMAIndicator(close, window=MA_PERIOD).sma_indicator().to_numpy(),
+        "ema": EMAIndicator(close, window=MA_PERIOD).ema_indicator().to_numpy(),
+    }
+
+def assert_matches(state, expected, count):
+    """
+    Check the last count values of each indicator against ta.
+    """
+    for name in ("atr", "sma", "ema"):
+        actual = getattr(state, name).to_array()
+        assert len(actual) == count
+        np.testing.assert_allclose(actual, expected[name][-count:], rtol=1e-9, atol=1e-12, err_msg=name)
+
+def test_updates_match_ta(bars, expected):
+    state = SymbolIndicators(ATR_PERIOD, MA_PERIOD, capacity=BARS)
+    for h, l, c in zip(*bars):
+        state.update(h, l, c)
+
+    assert_matches(state, expected, BARS)
+    assert state.last_atr == pytest.approx(expected["atr"][-1], rel=1e-9)
+
+def test_warm_up_period_matches_ta(bars, expected):
+    high, low, close = bars
+    state = SymbolIndicators(ATR_PERIOD, MA_PERIOD, capacity=BARS)
+
+    for i in range(MA_PERIOD):
+        values = state.update(high[i], low[i], close[i])
+        if i < ATR_PERIOD - 1:
+            assert values["atr"] == 0.0
+        if i < MA_PERIOD - 1:
+            assert np.isnan(values["sma"]) and np.isnan(values["ema"])
+
+    # ta reports the same zeros and NaNs before its first full window
+    assert_matches(state, {name: values[:MA_PERIOD] for name, values in expected.items()}, MA_PERIOD)
+    assert not np.isnan(state.values()["sma"])
+
+@pytest.mark.parametrize("split", [5, ATR_PERIOD, MA_PERIOD, BARS // 2, BARS])
+def test_vectorized_warm_up_then_updates_match_ta(bars, expected, split):
+    high, low, close = bars
+    state = SymbolIndicators(ATR_PERIOD, MA_PERIOD, capacity=BARS)
+    state.warm_up(high[:split], low[:split], close[:split])
+    for h, l, c in zip(high[split:], low[split:], close[split:]):
+        state.update(h, l, c)
+
+    assert_matches(state, expected, BARS)
+
+def test_ring_buffer_wraparound_keeps_latest_values(bars, expected):
+    capacity = 64
+    state = SymbolIndicators(ATR_PERIOD, MA_PERIOD, capacity=capacity)
+    for h, l, c in zip(*bars):
+        state.update(h, l, c)
+
+    assert state.bars == BARS
+    assert_matches(state, expected, capacity)
+
+def test_warm_up_longer_than_capacity_then_wraparound(bars, expected):
+    high, low, close = bars
+    capacity = 50
+    split = 200
+    state = SymbolIndicators(ATR_PERIOD, MA_PERIOD, capacity=capacity)
+    state.warm_up(high[:split], low[:split], close[:split])
+    assert_matches(state, {name: values[:split] for name, values in expected.items()}, capacity)
+
+    for h, l, c in zip(high[split:], low[split:], close[split:]):
+        state.update(h, l, c)
+    assert_matches(state, expected, capacity)
+
+def test_ring_buffer_order_after_wraparound():
+    buffer = RingBuffer(3)
+    for value in range(5):
+        buffer.append(value)
+
+    assert list(buffer.to_array()) == [2, 3, 4]
+    assert list(buffer.last(2)) == [3, 4]
+    assert buffer[-1] == 4 and buffer[-3] == 2
+    with pytest.raises(IndexError):
+        buffer[-4]
+
+    buffer.extend([5, 6, 7, 8])
+    assert list(buffer.to_array()) == [6, 7, 8]
@@ -0,0 +1,29 @@
+"""
+Tests for the batched background log writer.
+"""
+import io
+import logging
+
+from trading_bot.utils.logger import BatchWriter
+
+def record(name, level, message):
+    return logging.LogRecord(name, level, __file__, 0, message, None, None)
+
+def test_batches_apply_handler_level_and_filters():
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter("%(name)s %(levelname)s %(message)s"))
+    handler.setLevel(logging.INFO)
+    handler.addFilter(logging.Filter("kept"))
+
+    writer = BatchWriter([handler])
+    writer.queue.put(record("kept", logging.INFO, "written"))
+    writer.queue.put(record("kept", logging.DEBUG, "below level"))
+    writer.queue.put(record("dropped", logging.ERROR, "filtered out"))
+    writer.queue.put(record("kept.child", logging.WARNING, "child logger"))
+    writer.stop()
+
+    assert stream.getvalue().splitlines() == [
+        "kept INFO written",
+        "kept.child WARNING child logger",
+    ]
@@ -0,0 +1,46 @@
+"""
+Tests for the market data service bar cache.
+"""
+from trading_bot.services.market_data.mt5_data_service import MarketDataService, SyntheticBarSource
+
+# Broker server clock ahead of UTC, like most MetaTrader 5 servers
+SERVER_OFFSET = 3 * 3600
+
+# 2026-10-14 12:07:30 UTC, inside an M15 bar
+NOW = 1791979650.0
+
+class ServerTimeBarSource(SyntheticBarSource):
+    """
+    Synthetic bars stamped in a server time zone ahead of UTC.
+    """
+
+    def __init__(self, clock):
+        super().__init__(clock=lambda: clock() + SERVER_OFFSET)
+
+    def server_time(self, symbol, now):
+        return now + SERVER_OFFSET
+
+def test_only_closed_bars_are_cached(tmp_path):
+    clock = lambda: NOW
+    service = MarketDataService(SyntheticBarSource(clock=clock), cache_dir=str(tmp_path), history_bars=10, clock=clock)
+
+    bars = service.get_bars("EURUSD", "M15")
+
+    assert len(bars) == 9
+    assert bars["time"][-1] + 900 <= NOW < bars["time"][-1] + 1800
+
+def test_bar_times_are_compared_in_server_time(tmp_path):
+    now = [NOW]
+    clock = lambda: now[0]
+    service = MarketDataService(ServerTimeBarSource(clock), cache_dir=str(tmp_path), history_bars=10, clock=clock)
+
+    bars = service.get_bars("EURUSD", "M15")
+
+    # The latest closed bar is there, not one from SERVER_OFFSET ago
+    server_now = NOW + SERVER_OFFSET
+    assert len(bars) == 9
+    assert bars["time"][-1] + 900 <= server_now < bars["time"][-1] + 1800
+
+    # The forming bar is cached once it has closed
+    now[0] += 900
+    assert service.get_bars("EURUSD", "M15")["time"][-1] == bars["time"][-1] + 900
@@ -0,0 +1,71 @@
+"""
+Tests for the Discord notification dispatcher.
+"""
+from trading_bot.services.notifications import notification_service as module
+from trading_bot.services.notifications.notification_service import (
+    NotificationService, MAX_EMBEDS, MAX_MESSAGE_CHARS, _embed_size
+)
+
+class Response:
+    status_code = 204
+    headers = {}
+
+class RecordingSession:
+    """
+    Stand-in for requests.Session that records the posted messages.
+    """
+
+    def __init__(self):
+        self.messages = []
+
+    def post(self, url, json=None, timeout=None):
+        self.messages.append(json["embeds"])
+        return Response()
+
+def service():
+    notifier = NotificationService(webhook_url="https://discord.invalid/webhook", enabled=True,
+                                   linger=0.05, rate_limit=1000)
+    notifier._session = RecordingSession()
+    return notifier
+
+def test_messages_stay_within_the_size_limit():
+    notifier = service()
+    for i in range(MAX_EMBEDS):
+        notifier.notify(f"Alert {i}", "x" * 2500)
+    notifier.stop()
+
+    messages = notifier._session.messages
+    assert sum(len(embeds) for embeds in messages) == MAX_EMBEDS
+    assert len(messages) > 1
+    for embeds in messages:
+        assert len(embeds) <= MAX_EMBEDS
+        assert sum(_embed_size(embed) for embed in embeds) <= MAX_MESSAGE_CHARS
+
+def test_small_embeds_share_a_message():
+    notifier = service()
+    for i in range(MAX_EMBEDS):
+        notifier.notify(f"Alert {i}", "filled")
+    notifier.stop()
+
+    assert [len(embeds) for embeds in notifier._session.messages] == [MAX_EMBEDS]
+
+def test_oversized_embed_is_trimmed():
+    notifier = service()
+    fields = {f"field {i}": "v" * 1024 for i in range(25)}
+    notifier.notify("Large", "d" * 4096, fields=fields)
+    notifier.stop()
+
+    embed, = notifier._session.messages[0]
+    assert _embed_size(embed) <= MAX_MESSAGE_CHARS
+    assert embed["title"] == "Large"
+    assert embed["description"]
+
+def test_stop_is_registered_once_across_restarts(monkeypatch):
+    registered = []
+    monkeypatch.setattr(module.atexit, "register", registered.append)
+    notifier = service()
+    for _ in range(3):
+        notifier.notify("Alert")
+        notifier.stop()
+
+    assert registered == [notifier.stop]
@@ -0,0 +1,84 @@
+"""
+Tests for the signal journal replay.
+"""
+import os
+import json
+
+from trading_bot.api.signal import Signal
+from trading_bot.api.signal_journal import SignalJournal, MAX_REPLAY_ATTEMPTS, DEAD_LETTER_FILE
+
+class RecordingHandler:
+    """
+    Handler stand-in that records replayed signals and can fail them.
+    """
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.signals = []
+
+    def process_signal(self, signal):
+        self.signals.append(signal)
+        if self.fail:
+            raise RuntimeError("replay failed")
+        return {"success": True, "message": "ok"}
+
+def crashed_journal(directory, signals):
+    """
+    Journal signals and stop without completing them, like a crash.
+    """
+    journal = SignalJournal(directory, enabled=True)
+    journal.start()
+    ids = [journal.append(signal) for signal in signals]
+    journal.stop()
+    return ids
+
+def segments(directory):
+    return [name for name in os.listdir(directory) if name.startswith("signals-")]
+
+def test_unfinished_signals_are_replayed_once(tmp_path):
+    signal = Signal("EURUSD", "buy", 1.1, alert_id="1")
+    crashed_journal(str(tmp_path), [signal])
+
+    handler = RecordingHandler()
+    assert SignalJournal(str(tmp_path), enabled=True).replay(handler) == 1
+    assert SignalJournal(str(tmp_path), enabled=True).replay(handler) == 0
+
+    assert [s.dedup_key() for s in handler.signals] == [signal.dedup_key()]
+    assert segments(str(tmp_path)) == []
+
+def test_completed_signals_are_not_replayed(tmp_path):
+    journal = SignalJournal(str(tmp_path), enabled=True)
+    journal.start()
+    entry_id = journal.append(Signal("EURUSD", "buy", 1.1))
+    journal.complete(entry_id, {"success": True, "message": "ok"})
+    journal.stop()
+
+    handler = RecordingHandler()
+    assert SignalJournal(str(tmp_path), enabled=True).replay(handler) == 0
+    assert handler.signals == []
+
+def test_failing_entry_is_moved_to_dead_letter(tmp_path):
+    directory = str(tmp_path)
+    entry_id, = crashed_journal(directory, [Signal("EURUSD", "buy", 1.1, alert_id="1")])
+
+    handler = RecordingHandler(fail=True)
+    for _ in range(MAX_REPLAY_ATTEMPTS - 1):
+        assert SignalJournal(directory, enabled=True).replay(handler) == 0
+        assert segments(directory)
+        assert not os.path.exists(os.path.join(directory, DEAD_LETTER_FILE))
+
+    journal = SignalJournal(directory, enabled=True)
+    journal.replay(handler)
+    assert journal.get_stats()["dead_lettered"] == 1
+    assert len(handler.signals) == MAX_REPLAY_ATTEMPTS
+    assert segments(directory) == []
+
+    with open(os.path.join(directory, DEAD_LETTER_FILE)) as dead_letter:
+        record, = [json.loads(line) for line in dead_letter]
+    assert record["id"] == entry_id
+    assert record["attempts"] == MAX_REPLAY_ATTEMPTS
+    assert record["signal"]["ticker"] == "EURUSD"
+
+    # Given up on: later starts leave it alone
+    SignalJournal(directory, enabled=True).replay(handler)
+    assert len(handler.signals) == MAX_REPLAY_ATTEMPTS
@@ -0,0 +1,93 @@
+"""
+Tests for the TTL cache behind duplicate signal suppression.
+"""
+from trading_bot.utils.ttl_cache import TTLCache
+
+class FakeClock:
+    """
+    Manually advanced time source.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_get_or_set_claims_a_missing_key():
+    cache = TTLCache(10, 60)
+
+    assert cache.get_or_set("key", "first") is None
+    assert cache.get_or_set("key", "second") == "first"
+    assert cache.get("key") == "first"
+
+def test_delete_releases_a_claim():
+    cache = TTLCache(10, 60)
+    cache.get_or_set("key", "first")
+
+    cache.delete("key")
+
+    assert cache.get("key") is None
+    assert cache.get_or_set("key", "second") is None
+    assert cache.get("key") == "second"
+
+def test_delete_of_missing_key_is_ignored():
+    cache = TTLCache(10, 60)
+    cache.delete("missing")
+    assert len(cache) == 0
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = TTLCache(10, 5, clock=clock)
+    cache.set("key", "value")
+
+    clock.now = 4.9
+    assert cache.get("key") == "value"
+
+    clock.now = 5.0
+    assert cache.get("key") is None
+    assert cache.get_stats()["expirations"] == 1
+
+def test_expired_claim_can_be_taken_again():
+    clock = FakeClock()
+    cache = TTLCache(10, 5, clock=clock)
+    assert cache.get_or_set("key", "first") is None
+
+    clock.now = 5.0
+    assert cache.get_or_set("key", "second") is None
+    assert cache.get("key") == "second"
+
+def test_set_restarts_the_time_window():
+    clock = FakeClock()
+    cache = TTLCache(10, 5, clock=clock)
+    cache.set("key", "first")
+
+    clock.now = 4.0
+    cache.set("key", "second")
+
+    clock.now = 8.0
+    assert cache.get("key") == "second"
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(2, 60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.get_stats()["evictions"] == 1
+
+def test_resize_keeps_the_most_recent_entries():
+    cache = TTLCache(3, 60)
+    for key in ("a", "b", "c"):
+        cache.set(key, key)
+
+    cache.resize(1, 30)
+
+    assert len(cache) == 1
+    assert cache.get("c") == "c"
+    assert cache.ttl == 30
@@ -0,0 +1,102 @@
+"""
+Tests for duplicate signal suppression in WebhookHandler.process_signal.
+"""
+import pytest
+
+from trading_bot.api.signal import Signal
+from trading_bot.api.webhook_handler import WebhookHandler
+from trading_bot.services.broker.base import OrderResult
+from trading_bot.services.broker.simulated_broker import SimulatedBroker
+from trading_bot.utils.ttl_cache import TTLCache
+
+class CountingBroker(SimulatedBroker):
+    """
+    Simulated broker that counts orders and can be told to reject them.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.submitted = 0
+        self.reject = False
+
+    def submit_order(self, order):
+        self.submitted += 1
+        if self.reject:
+            return OrderResult(False, message="rejected")
+        return super().submit_order(order)
+
+class OpenCalendar:
+    def is_trading_allowed(self, now=None, symbol=None):
+        return True
+
+class NoLimitRiskGate:
+    def approve(self, symbol):
+        return True
+
+    def position_size(self, symbol):
+        return None
+
+class StoppedBatcher:
+    running = False
+
+@pytest.fixture
+def handler():
+    handler = WebhookHandler()
+    handler.broker = CountingBroker()
+    handler.broker.connect()
+    handler.batcher = StoppedBatcher()
+    handler.calendar = OpenCalendar()
+    handler.risk_gate = NoLimitRiskGate()
+    handler.dedup_cache = TTLCache(100, 60)
+    return handler
+
+def signal(alert_id="1"):
+    return Signal("EURUSD", "buy", 1.1, alert_id=alert_id)
+
+def test_repeat_is_answered_from_cache(handler):
+    first = handler.process_signal(signal())
+    second = handler.process_signal(signal())
+
+    assert first["success"]
+    assert second == first
+    assert handler.broker.submitted == 1
+
+def test_different_alerts_are_not_suppressed(handler):
+    handler.process_signal(signal("1"))
+    handler.process_signal(signal("2"))
+
+    assert handler.broker.submitted == 2
+
+def test_failed_signal_can_be_retried(handler):
+    handler.broker.reject = True
+    assert not handler.process_signal(signal())["success"]
+
+    handler.broker.reject = False
+    assert handler.process_signal(signal())["success"]
+    assert handler.broker.submitted == 2
+
+def test_no_suppression_without_cache(handler):
+    handler.dedup_cache = None
+
+    handler.process_signal(signal())
+    handler.process_signal(signal())
+
+    assert handler.broker.submitted == 2
+
+def test_claim_suppresses_the_signal_until_processed(handler):
+    assert handler.claim(signal()) is None
+
+    # A repeat arriving while the claimed signal is queued is suppressed
+    assert handler.claim(signal()) is not None
+
+    result = handler.process_signal(signal(), claimed=True)
+    assert result["success"]
+    assert handler.claim(signal()) == result
+    assert handler.broker.submitted == 1
+
+def test_release_frees_the_claim(handler):
+    assert handler.claim(signal()) is None
+
+    handler.release(signal())
+
+    assert handler.claim(signal()) is None
@@ -1,6 +1,10 @@
 """
 TradingView Webhook Bot - A trading automation system.
 """
+import time
+
+# Origin of the startup stage timings (see utils/startup.py)
+STARTED = time.perf_counter()
 
 __version__ = "1.0.0"
 __author__ = "Loryo80"
\ No newline at end of file
@@ -4,17 +4,25 @@ Main entry point for the trading bot package.
 """
 import os
 import sys
+import time
 import argparse
 import logging
-from dotenv import load_dotenv
+import threading
 
-# Load environment variables
-load_dotenv()
-
-# Add application modules
+# Add application modules (settings loads the .env file)
 from trading_bot.utils.logger import setup_logger
 from trading_bot.api.app import create_app
 from trading_bot.core.scheduler import TradingScheduler
+from trading_bot.api.server import run_server, check_workers
+from trading_bot.api.webhook_handler import webhook_handler
+from trading_bot.api.signal_journal import signal_journal
+from trading_bot.services.broker.session import broker_session
+from trading_bot.services.history.history_store import history_store
+from trading_bot.services.notifications.notification_service import notification_service
+from trading_bot.utils.profiler import profiler
+from trading_bot.utils.startup import startup
+from trading_bot.config import settings
+from trading_bot.config.reloader import settings_reloader
 
 # Setup logging
 logger = setup_logger("trading_bot")
@@ -37,22 +45,67 @@ def parse_args():
     parser.add_argument(
         "--port", 
         type=int, 
-        default=int(os.getenv("WEBHOOK_PORT", 5000)),
+        default=settings.WEBHOOK_PORT,
         help="Port for the webhook server"
     )
     parser.add_argument(
         "--host", 
         type=str, 
-        default=os.getenv("WEBHOOK_HOST", "0.0.0.0"),
+        default=settings.WEBHOOK_HOST,
         help="Host for the webhook server"
     )
+    parser.add_argument(
+        "--server", 
+        action="store_true", 
+        help="Run under a production server instead of the Flask development server"
+    )
+    parser.add_argument(
+        "--workers", 
+        type=int, 
+        default=None,
+        help="Worker processes in server mode (only 1 is supported)"
+    )
+    parser.add_argument(
+        "--threads", 
+        type=int, 
+        default=None,
+        help="Threads per worker in server mode"
+    )
     
     return parser.parse_args()
 
+def start_scheduler(disable_notifications):
+    """
+    Create and start the trading scheduler.
+    
+    Args:
+        disable_notifications (bool): Disable scheduler notifications
+    """
+    start = time.perf_counter()
+    try:
+        scheduler = TradingScheduler(disable_notifications=disable_notifications)
+        scheduler.start()
+    except Exception as e:
+        logger.exception("Error starting scheduler: %s", e)
+        return
+    startup.record("scheduler", time.perf_counter() - start)
+
 def main():
     """
     Main entry point for the trading bot.
     """
+    # Offline replay has its own options and starts none of the services
+    if len(sys.argv) > 1 and sys.argv[1] == "replay":
+        from trading_bot.core.replay import main as replay_main
+        replay_main(sys.argv[2:])
+        return
+    
+    # Load benchmark against a simulated broker
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        from trading_bot.api.benchmark import main as bench_main
+        bench_main(sys.argv[2:])
+        return
+    
     # Parse command line arguments
     args = parse_args()
     
@@ -64,19 +117,62 @@ def main():
     print(f"Author: {trading_bot.__author__}")
     print("=" * 50)
     
+    enable_scheduler = not args.no_scheduler and settings.ENABLE_SCHEDULER
+    
+    # Turn off all notifications (workers inherit this when forked)
+    if args.no_notifications:
+        notification_service.disable()
+    
+    # Run under the production server (it starts the scheduler in one worker)
+    if args.server:
+        check_workers(args.workers)
+        
+        # Replay in this process, before the workers open their journal segments
+        broker_session.start()
+        history_store.start()
+        signal_journal.replay(webhook_handler)
+        history_store.stop()
+        broker_session.stop()
+        
+        run_server(
+            args.host,
+            args.port,
+            workers=args.workers,
+            threads=args.threads,
+            enable_scheduler=enable_scheduler,
+            disable_notifications=args.no_notifications
+        )
+        return
+    
     # Create Flask application
     app = create_app()
     
-    # Start the scheduler if enabled
-    if not args.no_scheduler and os.getenv("ENABLE_SCHEDULER", "True").lower() in ("true", "1", "yes"):
+    # Execute signals that were accepted but not finished before the last shutdown
+    signal_journal.replay(webhook_handler)
+    startup.mark("journal replay")
+    
+    # SIGUSR1 samples stacks, SIGUSR2 traces webhooks (when ENABLE_PROFILING is set)
+    profiler.install_signal_handlers()
+    
+    # SIGHUP reloads the settings from the .env file
+    settings_reloader.install_signal_handler()
+    
+    # Start the scheduler in the background; it loads APScheduler and the
+    # market data stack, which the webhook path does not need
+    if enable_scheduler:
         logger.info("Starting scheduler")
-        scheduler = TradingScheduler(disable_notifications=args.no_notifications)
-        scheduler.start()
+        threading.Thread(
+            target=start_scheduler,
+            args=(args.no_notifications,),
+            name="scheduler-start",
+            daemon=True
+        ).start()
     else:
         logger.info("Scheduler disabled")
     
     # Start the Flask application
-    logger.info(f"Starting webhook server at {args.host}:{args.port}")
+    logger.info("Starting webhook server at %s:%s", args.host, args.port)
+    startup.ready()
     app.run(host=args.host, port=args.port, debug=False)
 
 if __name__ == "__main__":
@@ -2,17 +2,62 @@
 Flask application for the trading bot API.
 """
 import os
-import json
+import hmac
+import time
 import logging
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, Response, request, jsonify, render_template
 
+import trading_bot
 from trading_bot.utils.logger import setup_logger
+from trading_bot.utils.metrics import metrics
+from trading_bot.utils.profiler import profiler, ProfilerBusyError
+from trading_bot.utils.startup import startup
 from trading_bot.api.webhook_handler import webhook_handler
+from trading_bot.api.signal import parse_signal, SignalError
+from trading_bot.api.ingest_queue import ingest_queue, QueueFullError
+from trading_bot.api.signal_journal import signal_journal
+from trading_bot.api.events import event_broadcaster, TooManyClientsError
+from trading_bot.services.broker.session import broker_session
+from trading_bot.services.history.history_store import history_store
+from trading_bot.core.order_batcher import order_batcher
+from trading_bot.core.position_book import position_book
+from trading_bot.core.risk_gate import risk_gate
+from trading_bot.core.scheduler import scheduler_metrics
+from trading_bot.services.notifications.notification_service import notification_service
 from trading_bot.config import settings
+from trading_bot.config.reloader import settings_reloader
 
 # Configure logging
 logger = setup_logger("api.app")
 
+REQUEST_SECONDS = metrics.histogram("stage_seconds", "Latency of webhook processing stages", stage="request")
+WEBHOOK_RESULTS = {
+    result: metrics.counter("webhook_requests_total", "Webhook requests by outcome", result=result)
+    for result in ("processed", "queued", "invalid", "duplicate", "queue_full", "error")
+}
+
+metrics.gauge("ingest_queue_depth", "Signals waiting in the ingest queue",
+              lambda: ingest_queue.get_stats()["depth"])
+metrics.gauge("open_positions", "Positions tracked by the position book",
+              lambda: position_book.get_stats()["positions"])
+metrics.gauge("broker_connected", "1 if the broker session is connected",
+              lambda: broker_session.get_stats()["connected"])
+metrics.gauge("notifications_queued", "Notifications waiting to be sent",
+              lambda: notification_service.get_stats()["queued"])
+metrics.gauge("notifications_dropped", "Notifications dropped because the queue was full",
+              lambda: notification_service.get_stats()["dropped"])
+metrics.gauge("journal_pending", "Journaled signals without a recorded result",
+              lambda: signal_journal.get_stats()["pending"])
+metrics.gauge("event_clients", "Connected /events streams",
+              lambda: event_broadcaster.clients)
+
+def _admin_authorized():
+    """
+    Check the request's X-Admin-Token header against ADMIN_TOKEN in constant time.
+    """
+    token = request.headers.get("X-Admin-Token", "")
+    return hmac.compare_digest(token.encode(), settings.ADMIN_TOKEN.encode())
+
 def create_app():
     """
     Create and configure the Flask application.
@@ -20,8 +65,31 @@ def create_app():
     Returns:
         Flask: Configured Flask application
     """
+    startup.mark("imports")
     app = Flask(__name__, template_folder="templates")
     
+    # Open the persistent broker session before the first signal arrives
+    broker_session.start()
+    startup.mark("broker")
+    
+    # Net bursts of same-ticker orders before they reach the broker
+    if settings.ENABLE_ORDER_BATCHING:
+        order_batcher.start()
+    
+    # Journal accepted signals before they are acknowledged
+    signal_journal.start()
+    
+    # Record signals, trades and positions for the dashboard
+    history_store.start()
+    
+    # Start the ingest workers in acknowledge-then-process mode
+    if settings.ENABLE_ASYNC_INGEST:
+        ingest_queue.start()
+    
+    # Reload the settings when the .env file changes (SETTINGS_RELOAD_SECONDS)
+    settings_reloader.watch()
+    startup.mark("services")
+    
     @app.route("/", methods=["GET"])
     def index():
         """
@@ -34,27 +102,53 @@ def create_app():
         """
         Handle webhook requests from signal sources.
         """
+        start = time.perf_counter_ns()
+        outcome = "error"
         try:
-            # Parse the webhook payload
-            if request.is_json:
-                webhook_data = request.get_json()
-            else:
+            # Parse and validate the webhook payload in a single pass
+            try:
+                signal = parse_signal(request.get_data(cache=False), webhook_handler.passphrase)
+            except SignalError as e:
+                logger.warning("Rejected webhook: %s", e)
+                outcome = "invalid"
+                return jsonify({
+                    "success": False,
+                    "message": str(e)
+                })
+            
+            # Acknowledge-then-process: queue and return immediately
+            if ingest_queue.running:
+                # Answers repeats and reserves the alert for the worker in one lookup
+                duplicate = webhook_handler.claim(signal)
+                if duplicate is not None:
+                    outcome = "duplicate"
+                    return jsonify(duplicate)
+                
                 try:
-                    webhook_data = json.loads(request.data)
-                except json.JSONDecodeError:
-                    # Try to parse as form data for backward compatibility
-                    webhook_data = {
-                        "passphrase": request.form.get("passphrase", ""),
-                        "ticker": request.form.get("ticker", ""),
-                        "strategy": {
-                            "order_action": request.form.get("order_action", ""),
-                            "order_price": float(request.form.get("order_price", 0))
-                        }
-                    }
+                    ingest_queue.submit(signal, claimed=True)
+                except QueueFullError as e:
+                    webhook_handler.release(signal)
+                    outcome = "queue_full"
+                    return jsonify({
+                        "success": False,
+                        "message": str(e)
+                    }), 503, {"Retry-After": "1"}
+                except Exception:
+                    webhook_handler.release(signal)
+                    raise
                 
-            # Process the webhook request
-            logger.info(f"Received webhook: {webhook_data}")
-            result = webhook_handler.process_request(webhook_data)
+                outcome = "queued"
+                return jsonify({
+                    "success": True,
+                    "message": "Signal queued"
+                }), 202
+            
+            # Process the signal, journaled so it is replayed if we crash midway
+            logger.info("Received signal: %s", signal)
+            entry_id = signal_journal.append(signal)
+            result = webhook_handler.process_signal(signal)
+            signal_journal.complete(entry_id, result)
+            outcome = "processed"
             
             # Return the result
             return jsonify(result)
@@ -67,6 +161,146 @@ def create_app():
                 "success": False,
                 "message": error_message
             })
+        finally:
+            WEBHOOK_RESULTS[outcome].inc()
+            REQUEST_SECONDS.since(start)
+            if startup.first_webhook_after is None and outcome in ("processed", "queued"):
+                startup.webhook_accepted()
+    
+    @app.route("/metrics", methods=["GET"])
+    def prometheus_metrics():
+        """
+        Expose metrics in the Prometheus text format.
+        """
+        if not metrics.enabled:
+            return jsonify({"success": False, "message": "Endpoint not found"}), 404
+        return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+    
+    @app.route("/admin/profile", methods=["GET", "POST"])
+    def admin_profile():
+        """
+        Start a stack sample or a trace of the next calls of a target.
+        
+        POST {"mode": "sample", "seconds": 10} or
+        {"mode": "trace", "target": "webhook", "count": 50}; GET returns the
+        profiler state.
+        """
+        if not profiler.enabled or not settings.ADMIN_TOKEN:
+            return jsonify({"success": False, "message": "Endpoint not found"}), 404
+        if not _admin_authorized():
+            return jsonify({"success": False, "message": "Invalid admin token"}), 403
+        
+        if request.method == "GET":
+            return jsonify(profiler.get_stats())
+        
+        options = request.get_json(silent=True) or {}
+        try:
+            if options.get("mode", "sample") == "sample":
+                output = profiler.sample(float(options.get("seconds") or 0) or None)
+            elif options["mode"] == "trace":
+                output = profiler.trace(options.get("target", "webhook"), int(options.get("count") or 0) or None)
+            else:
+                return jsonify({"success": False, "message": f"Unknown profiling mode: {options['mode']}"}), 400
+        except KeyError as e:
+            return jsonify({"success": False, "message": e.args[0]}), 400
+        except ValueError as e:
+            return jsonify({"success": False, "message": str(e)}), 400
+        except ProfilerBusyError as e:
+            return jsonify({"success": False, "message": str(e)}), 409
+        
+        return jsonify({"success": True, "message": "Profiling started", "output": output}), 202
+    
+    @app.route("/admin/reload", methods=["GET", "POST"])
+    def admin_reload():
+        """
+        Reload the settings from the .env file.
+        
+        POST applies the reloadable settings that changed and returns the new
+        version; GET returns the reload state.
+        """
+        if not settings.ADMIN_TOKEN:
+            return jsonify({"success": False, "message": "Endpoint not found"}), 404
+        if not _admin_authorized():
+            return jsonify({"success": False, "message": "Invalid admin token"}), 403
+        
+        if request.method == "GET":
+            return jsonify(settings_reloader.get_stats())
+        
+        try:
+            result = settings_reloader.reload()
+        except ValueError as e:
+            return jsonify({"success": False, "message": str(e)}), 400
+        
+        result["success"] = True
+        result["message"] = "Settings reloaded"
+        return jsonify(result)
+    
+    @app.route("/events", methods=["GET"])
+    def events():
+        """
+        Stream signals, fills, position changes and scheduler cycles as
+        server-sent events, starting with a snapshot of the current state.
+        """
+        if not event_broadcaster.enabled:
+            return jsonify({"success": False, "message": "Endpoint not found"}), 404
+        try:
+            client = event_broadcaster.subscribe()
+        except TooManyClientsError as e:
+            return jsonify({"success": False, "message": str(e)}), 503, {"Retry-After": "5"}
+        
+        snapshot = {
+            "positions": position_book.get_stats(),
+            "risk": risk_gate.get_stats(),
+            "scheduler": scheduler_metrics.get_stats()
+        }
+        response = Response(
+            event_broadcaster.stream(client, snapshot),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+        # Also covers clients that disconnect before the stream starts
+        response.call_on_close(lambda: event_broadcaster.unsubscribe(client))
+        return response
+    
+    def history_page(table):
+        """
+        Serve a page of a history table from the query string (ticker,
+        status, cursor, limit).
+        """
+        if not history_store.running:
+            return jsonify({"success": False, "message": "History is disabled"}), 404
+        try:
+            page = history_store.page(
+                table,
+                ticker=request.args.get("ticker"),
+                status=request.args.get("status"),
+                cursor=request.args.get("cursor"),
+                limit=request.args.get("limit", 50)
+            )
+        except ValueError as e:
+            return jsonify({"success": False, "message": str(e)}), 400
+        return jsonify(page)
+    
+    @app.route("/api/signals", methods=["GET"])
+    def signals():
+        """
+        Get received signals and their outcome, newest first.
+        """
+        return history_page("signals")
+    
+    @app.route("/api/trades", methods=["GET"])
+    def trades():
+        """
+        Get filled orders, newest first.
+        """
+        return history_page("trades")
+    
+    @app.route("/api/positions", methods=["GET"])
+    def positions():
+        """
+        Get open and closed positions, newest first.
+        """
+        return history_page("positions")
     
     @app.route("/status", methods=["GET"])
     def status():
@@ -75,9 +309,26 @@ def create_app():
         """
         return jsonify({
             "status": "active",
-            "version": "1.0.0",
+            "version": trading_bot.__version__,
             "scheduler_enabled": settings.ENABLE_SCHEDULER,
-            "scheduler_interval": settings.SCHEDULER_INTERVAL_SECONDS
+            "scheduler_interval": settings.SCHEDULER_INTERVAL_SECONDS,
+            "ingest_queue": ingest_queue.get_stats(),
+            "dedup": webhook_handler.dedup_cache.get_stats() if webhook_handler.dedup_cache else None,
+            "scheduler": scheduler_metrics.get_stats(),
+            "broker": broker_session.get_stats(),
+            "order_batching": order_batcher.get_stats(),
+            "positions": position_book.get_stats(),
+            "risk": risk_gate.get_stats(),
+            "notifications": notification_service.get_stats(),
+            "journal": signal_journal.get_stats(),
+            "history": history_store.get_stats(),
+            "events": event_broadcaster.get_stats(),
+            "startup": startup.get_stats(),
+            "settings": settings_reloader.get_stats(),
+            "latency": {
+                metric.labels.get("stage") or metric.name[len(metrics.prefix):]: metric.get_stats()
+                for metric in metrics.histograms()
+            }
         })
     
     @app.errorhandler(404)
@@ -101,4 +352,8 @@ def create_app():
             "message": "Internal server error"
         }), 500
     
+    # The webhook view can be wrapped in cProfile from /admin/profile
+    profiler.register("webhook", app.view_functions, "webhook")
+    startup.mark("app")
+    
     return app
\ No newline at end of file
@@ -0,0 +1,451 @@
+"""
+Load generator and benchmark for the webhook pipeline.
+
+Builds a realistic mix of TradingView alerts (valid JSON, bad passphrase,
+form-encoded and repeated alerts) and sends it through three layers:
+WebhookHandler.process_request directly, the create_app() routes through
+the Flask test client, and the same app served over local HTTP with
+keep-alive connections. Each layer reports throughput, p50/p99/p999
+latency per payload kind and memory allocated per request. Results are
+written as JSON tagged with the git commit so runs can be compared.
+
+Orders always go to a SimulatedBroker and the signal journal writes to a
+temporary directory, so a benchmark never touches a live account or the
+production journal. The trading calendar and the daily loss limit are
+lifted, so every valid alert runs the full pipeline whatever the time of
+day and however the random fills move the simulated P&L.
+
+Usage:
+    python -m trading_bot bench --requests 5000 --clients 8
+    python -m trading_bot bench --modes client --compare benchmarks/results/<previous>.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import logging
+import argparse
+import platform
+import tempfile
+import threading
+import subprocess
+import tracemalloc
+import http.client
+from collections import Counter
+from urllib.parse import urlencode
+
+from trading_bot.config import settings
+
+# Share of each payload kind in the default mix
+DEFAULT_MIX = {"valid": 0.7, "bad_passphrase": 0.1, "form": 0.1, "duplicate": 0.1}
+
+MODES = ("handler", "client", "http")
+
+# Tickers and the price alerts are placed around
+TICKERS = {
+    "EURUSD": 1.08, "GBPUSD": 1.27, "USDJPY": 149.5, "AUDUSD": 0.66, "USDCAD": 1.36,
+    "XAUUSD": 2350.0, "US30": 39000.0, "NAS100": 18000.0, "BTCUSD": 65000.0, "ETHUSD": 3400.0
+}
+
+# Pipeline loggers that would otherwise write a line per request
+QUIET_LOGGERS = (
+    "api.app", "webhook_handler", "api.ingest_queue", "api.signal_journal", "core.order_batcher",
+    "core.position_book", "core.risk_gate", "services.broker.session", "services.notifications", "services.history",
+    "werkzeug"
+)
+
+class _OpenCalendar:
+    """
+    Trading calendar that is always open, so results do not depend on the clock.
+    """
+
+    def is_trading_allowed(self, when=None, symbol=None):
+        return True
+
+def build_requests(count, passphrase, mix=None, seed=0, prefix="bench"):
+    """
+    Build a mix of webhook requests.
+
+    Args:
+        count (int): Number of requests
+        passphrase (str): Passphrase of valid requests
+        mix (dict, optional): Payload kind to share. Defaults to DEFAULT_MIX.
+        seed (int, optional): Random seed. Defaults to 0.
+        prefix (str, optional): Alert id prefix, unique per run so earlier
+            runs do not turn alerts into duplicates. Defaults to "bench".
+
+    Returns:
+        list: (kind, payload dict, body bytes, content type) tuples
+    """
+    mix = mix or DEFAULT_MIX
+    rng = random.Random(seed)
+    kinds = list(mix)
+    weights = [mix[kind] for kind in kinds]
+
+    requests = []
+    sent = []
+    for i in range(count):
+        kind = rng.choices(kinds, weights)[0]
+        if kind == "duplicate" and sent:
+            # TradingView retries resend the exact same alert
+            _, payload, body, content_type = rng.choice(sent[-100:])
+            requests.append((kind, payload, body, content_type))
+            continue
+
+        ticker = rng.choice(list(TICKERS))
+        action = rng.choice(("buy", "sell"))
+        price = round(TICKERS[ticker] * rng.uniform(0.9995, 1.0005), 5)
+        alert_id = f"{prefix}-{i}"
+        if kind == "form":
+            payload = {"passphrase": passphrase, "ticker": ticker, "order_action": action,
+                       "order_price": price, "alert_id": alert_id}
+            body = urlencode(payload).encode()
+            content_type = "application/x-www-form-urlencoded"
+            payload = {"passphrase": passphrase, "ticker": ticker, "alert_id": alert_id,
+                       "strategy": {"order_action": action, "order_price": price}}
+        else:
+            payload = {
+                "passphrase": passphrase if kind != "bad_passphrase" else passphrase + "-wrong",
+                "ticker": ticker,
+                "alert_id": alert_id,
+                "strategy": {"order_action": action, "order_price": price}
+            }
+            body = json.dumps(payload).encode()
+            content_type = "application/json"
+        requests.append((kind if kind != "duplicate" else "valid", payload, body, content_type))
+        if kind in ("valid", "form"):
+            sent.append(requests[-1])
+    return requests
+
+def percentile(values, pct):
+    """
+    Nearest-rank percentile of a sorted list.
+    """
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, int(round(pct / 100 * len(values))) - 1))
+    return values[index]
+
+def summarize(kinds, latencies, statuses, elapsed):
+    """
+    Summarize one run.
+
+    Args:
+        kinds (list): Payload kind of each timed request
+        latencies (list): Latency of each timed request in seconds
+        statuses (Counter): Response status counts
+        elapsed (float): Wall time of the run in seconds
+
+    Returns:
+        dict: Throughput and latency percentiles, overall and per kind
+    """
+    def stats(values):
+        values = sorted(values)
+        return {
+            "requests": len(values),
+            "p50_ms": round(percentile(values, 50) * 1000, 4),
+            "p99_ms": round(percentile(values, 99) * 1000, 4),
+            "p999_ms": round(percentile(values, 99.9) * 1000, 4),
+            "max_ms": round((values[-1] if values else 0) * 1000, 4)
+        }
+
+    by_kind = {}
+    for kind, latency in zip(kinds, latencies):
+        by_kind.setdefault(kind, []).append(latency)
+
+    summary = stats(latencies)
+    summary.update({
+        "elapsed": round(elapsed, 4),
+        "throughput": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "statuses": {str(status): count for status, count in statuses.items()},
+        "kinds": {kind: stats(values) for kind, values in sorted(by_kind.items())}
+    })
+    return summary
+
+def run_handler(handler, requests):
+    """
+    Call WebhookHandler.process_request for each payload.
+    """
+    latencies = []
+    statuses = Counter()
+    start = time.perf_counter()
+    for _, payload, _, _ in requests:
+        request_start = time.perf_counter()
+        result = handler.process_request(payload)
+        latencies.append(time.perf_counter() - request_start)
+        statuses["success" if result.get("success") else "failure"] += 1
+    return summarize([kind for kind, _, _, _ in requests], latencies, statuses, time.perf_counter() - start)
+
+def run_client(app, requests):
+    """
+    Post each request through the Flask test client.
+    """
+    client = app.test_client()
+    latencies = []
+    statuses = Counter()
+    start = time.perf_counter()
+    for _, _, body, content_type in requests:
+        request_start = time.perf_counter()
+        response = client.post(settings.WEBHOOK_ENDPOINT, data=body, content_type=content_type)
+        latencies.append(time.perf_counter() - request_start)
+        statuses[response.status_code] += 1
+    return summarize([kind for kind, _, _, _ in requests], latencies, statuses, time.perf_counter() - start)
+
+def run_http(app, requests, clients):
+    """
+    Serve the app on a local port and post the requests over keep-alive
+    connections from several client threads.
+    """
+    from werkzeug.serving import make_server
+
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    server_thread = threading.Thread(target=server.serve_forever, name="bench-server", daemon=True)
+    server_thread.start()
+    port = server.server_port
+
+    lock = threading.Lock()
+    kinds = []
+    latencies = []
+    statuses = Counter()
+
+    def client(chunk):
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        local_kinds = []
+        local_latencies = []
+        local_statuses = Counter()
+        for kind, _, body, content_type in chunk:
+            request_start = time.perf_counter()
+            try:
+                conn.request("POST", settings.WEBHOOK_ENDPOINT, body=body,
+                             headers={"Content-Type": content_type, "Connection": "keep-alive"})
+                response = conn.getresponse()
+                response.read()
+            except (OSError, http.client.HTTPException):
+                local_statuses["error"] += 1
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+                continue
+            local_latencies.append(time.perf_counter() - request_start)
+            local_kinds.append(kind)
+            local_statuses[response.status] += 1
+        conn.close()
+        with lock:
+            kinds.extend(local_kinds)
+            latencies.extend(local_latencies)
+            statuses.update(local_statuses)
+
+    threads = [threading.Thread(target=client, args=(requests[i::clients],)) for i in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    server.shutdown()
+    server_thread.join()
+    summary = summarize(kinds, latencies, statuses, elapsed)
+    summary["clients"] = clients
+    return summary
+
+def measure_memory(app, requests):
+    """
+    Measure Python allocations per request through the Flask test client.
+
+    Returns:
+        dict: Mean and max peak allocation above the baseline during a
+            request, and bytes still allocated afterwards per request
+    """
+    client = app.test_client()
+    peaks = []
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        for _, _, body, content_type in requests:
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            client.post(settings.WEBHOOK_ENDPOINT, data=body, content_type=content_type)
+            peaks.append(tracemalloc.get_traced_memory()[1] - before)
+        retained = tracemalloc.get_traced_memory()[0] - baseline
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "requests": len(requests),
+        "peak_bytes_mean": int(sum(peaks) / len(peaks)) if peaks else 0,
+        "peak_bytes_max": max(peaks, default=0),
+        "retained_bytes_per_request": int(retained / len(requests)) if requests else 0
+    }
+
+def max_rss_kb():
+    """
+    Peak resident set size of this process in KiB, or None where unavailable.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, KiB elsewhere
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+def git_commit():
+    """
+    Short hash of the checked out commit, with "-dirty" for local changes.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=root,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=root,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit + ("-dirty" if dirty else "")
+
+def compare(results, baseline):
+    """
+    Print the change from a previous result file.
+
+    Args:
+        results (dict): Results of this run
+        baseline (dict): Results of the run to compare against
+    """
+    print(f"\nCompared with {baseline.get('commit')} ({baseline.get('time')}):")
+    for mode, current in results["modes"].items():
+        previous = baseline.get("modes", {}).get(mode)
+        if not previous:
+            continue
+        changes = []
+        for key in ("throughput", "p50_ms", "p99_ms", "p999_ms"):
+            if previous.get(key):
+                change = (current[key] - previous[key]) / previous[key] * 100
+                changes.append(f"{key} {previous[key]} -> {current[key]} ({change:+.1f}%)")
+        print(f"  {mode:8s} " + ", ".join(changes))
+
+def parse_args(argv=None):
+    """
+    Parse benchmark command line arguments.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m trading_bot bench",
+        description="Benchmark the webhook pipeline with a mix of TradingView payloads"
+    )
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per mode")
+    parser.add_argument("--clients", type=int, default=8, help="Client threads in http mode")
+    parser.add_argument("--modes", default=",".join(MODES), help="Comma-separated modes: handler, client, http")
+    parser.add_argument("--mix", default=None,
+                        help="Payload mix as kind=share pairs, e.g. valid=0.7,bad_passphrase=0.1,form=0.1,duplicate=0.1")
+    parser.add_argument("--memory-requests", type=int, default=500, help="Requests traced for memory (0 to skip)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None,
+                        help="Result file (defaults to benchmarks/results/<time>-<commit>.json)")
+    parser.add_argument("--compare", default=None, help="Earlier result file to compare against")
+    parser.add_argument("--verbose", action="store_true", help="Keep per-request log lines")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """
+    Entry point of `python -m trading_bot bench`.
+    """
+    args = parse_args(argv)
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    unknown = set(modes) - set(MODES)
+    if unknown:
+        sys.exit(f"Unknown modes: {', '.join(sorted(unknown))}")
+    mix = None
+    if args.mix:
+        mix = {kind: float(share) for kind, share in (pair.split("=") for pair in args.mix.split(","))}
+        if set(mix) - set(DEFAULT_MIX):
+            sys.exit(f"Unknown payload kinds: {', '.join(sorted(set(mix) - set(DEFAULT_MIX)))}")
+
+    from trading_bot.api.app import create_app
+    from trading_bot.api.webhook_handler import webhook_handler
+    from trading_bot.api.signal_journal import signal_journal
+    from trading_bot.api.ingest_queue import ingest_queue
+    from trading_bot.core.order_batcher import order_batcher
+    from trading_bot.core.risk_gate import risk_gate
+    from trading_bot.services.broker.session import broker_session
+    from trading_bot.services.broker.simulated_broker import SimulatedBroker
+    from trading_bot.services.history.history_store import history_store
+    from trading_bot.services.notifications.notification_service import notification_service
+
+    if not args.verbose:
+        for name in QUIET_LOGGERS:
+            logging.getLogger(name).setLevel(logging.ERROR)
+
+    # Never trade on the configured account or write the real journal and history
+    broker_session.broker = SimulatedBroker(latency=settings.SIMULATED_BROKER_LATENCY)
+    journal_dir = tempfile.mkdtemp(prefix="bench-journal-")
+    signal_journal.directory = journal_dir
+    history_dir = tempfile.mkdtemp(prefix="bench-history-")
+    history_store.path = os.path.join(history_dir, "history.db")
+    notification_service.disable()
+    webhook_handler.calendar = _OpenCalendar()
+    risk_gate.max_daily_loss = float("inf")
+    passphrase = webhook_handler.passphrase or "bench"
+    webhook_handler.passphrase = passphrase
+
+    app = create_app()
+    results = {
+        "commit": git_commit(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "requests": args.requests,
+        "mix": mix or DEFAULT_MIX,
+        "settings": {
+            name: getattr(settings, name)
+            for name in ("ENABLE_ASYNC_INGEST", "ENABLE_DEDUP", "ENABLE_ORDER_BATCHING",
+                         "ENABLE_SIGNAL_JOURNAL", "ENABLE_HISTORY", "ENABLE_METRICS", "SIMULATED_BROKER_LATENCY")
+        },
+        "modes": {}
+    }
+
+    try:
+        for index, mode in enumerate(modes):
+            # Fresh alert ids per mode, or the dedup cache answers every request
+            requests = build_requests(args.requests, passphrase, mix, args.seed + index, prefix=f"{mode}-{time.time_ns()}")
+            if mode == "handler":
+                summary = run_handler(webhook_handler, requests)
+            elif mode == "client":
+                summary = run_client(app, requests)
+            else:
+                summary = run_http(app, requests, args.clients)
+            results["modes"][mode] = summary
+            print(f"{mode:8s} {summary['requests']:6d} requests  {summary['throughput']:9.1f} req/s  "
+                  f"p50 {summary['p50_ms']:7.3f} ms  p99 {summary['p99_ms']:7.3f} ms  "
+                  f"p999 {summary['p999_ms']:7.3f} ms  {summary['statuses']}")
+            for kind, stats in summary["kinds"].items():
+                print(f"         {kind:15s} {stats['requests']:6d}  p50 {stats['p50_ms']:7.3f} ms  "
+                      f"p99 {stats['p99_ms']:7.3f} ms")
+
+        if args.memory_requests > 0:
+            requests = build_requests(args.memory_requests, passphrase, mix, args.seed, prefix=f"memory-{time.time_ns()}")
+            results["memory"] = measure_memory(app, requests)
+            print(f"memory   {results['memory']['peak_bytes_mean']} bytes peak per request "
+                  f"(max {results['memory']['peak_bytes_max']}), "
+                  f"{results['memory']['retained_bytes_per_request']} bytes retained per request")
+        results["max_rss_kb"] = max_rss_kb()
+    finally:
+        ingest_queue.stop()
+        order_batcher.stop()
+        signal_journal.stop()
+        broker_session.stop()
+        history_store.stop()
+        shutil.rmtree(journal_dir, ignore_errors=True)
+        shutil.rmtree(history_dir, ignore_errors=True)
+
+    output = args.output
+    if output is None:
+        directory = os.path.join("benchmarks", "results")
+        os.makedirs(directory, exist_ok=True)
+        output = os.path.join(directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{results['commit'] or 'unknown'}.json")
+    with open(output, "w") as result_file:
+        json.dump(results, result_file, indent=2)
+    print(f"Results written to {output}")
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            compare(results, json.load(baseline_file))
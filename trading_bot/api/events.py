@@ -0,0 +1,292 @@
+"""
+Server-sent event stream of live trading activity.
+
+One broadcaster per process fans out accepted and rejected signals, fills,
+position changes and scheduler cycles to every client of /events, so a
+dashboard follows the bot without polling /status. An event is serialized
+once and appended to a bounded buffer per client; nothing is built while no
+client is connected. A client whose buffer is full is dropped instead of
+being waited for: the thread publishing an event never blocks on a viewer,
+and the browser reconnects to a fresh stream.
+
+Each stream holds a server thread for as long as it is open, so the number
+of clients is capped by EVENTS_MAX_CLIENTS.
+"""
+import json
+import time
+import itertools
+import threading
+from collections import deque
+
+from trading_bot.utils.logger import setup_logger
+from trading_bot.services.broker.session import broker_session
+from trading_bot.core.position_book import position_book
+from trading_bot.core.scheduler import scheduler_metrics
+from trading_bot.config import settings
+
+# Configure logging
+logger = setup_logger("api.events")
+
+# Reconnection delay sent to EventSource clients
+RETRY_MS = 3000
+
+class TooManyClientsError(Exception):
+    """
+    Raised when a stream is opened while EVENTS_MAX_CLIENTS are connected.
+    """
+
+class _Client:
+    """
+    Buffered events of one connected stream.
+    """
+
+    __slots__ = ("id", "buffer", "wakeup", "dropped", "connected", "sent")
+
+    def __init__(self, client_id):
+        self.id = client_id
+        self.buffer = deque()
+        self.wakeup = threading.Event()
+        self.dropped = False
+        self.connected = time.time()
+        self.sent = 0
+
+class EventBroadcaster:
+    """
+    Fans out events to the bounded buffers of the connected streams.
+    """
+
+    def __init__(self, enabled=None, max_clients=None, buffer_size=None, keepalive=None):
+        """
+        Initialize the broadcaster.
+
+        Args:
+            enabled (bool, optional): Defaults to ENABLE_EVENTS.
+            max_clients (int, optional): Concurrent streams. Defaults to EVENTS_MAX_CLIENTS.
+            buffer_size (int, optional): Events buffered per client before it is
+                dropped. Defaults to EVENTS_BUFFER_SIZE.
+            keepalive (float, optional): Seconds between keepalive comments on an
+                idle stream. Defaults to EVENTS_KEEPALIVE_SECONDS.
+        """
+        self.enabled = settings.ENABLE_EVENTS if enabled is None else enabled
+        self.max_clients = max(1, max_clients or settings.EVENTS_MAX_CLIENTS)
+        self.buffer_size = max(1, buffer_size or settings.EVENTS_BUFFER_SIZE)
+        self.keepalive = keepalive or settings.EVENTS_KEEPALIVE_SECONDS
+
+        # Replaced, never mutated, so publishing iterates without a lock
+        self._clients = ()
+        self._lock = threading.Lock()
+        self._client_ids = itertools.count(1)
+        self._event_ids = itertools.count(1)
+
+        self.published = 0
+        self.dropped_clients = 0
+        self.rejected_clients = 0
+
+    @property
+    def clients(self):
+        """
+        int: Connected streams.
+        """
+        return len(self._clients)
+
+    def subscribe(self):
+        """
+        Register a new stream.
+
+        Returns:
+            _Client: Client to pass to stream()
+
+        Raises:
+            TooManyClientsError: If max_clients streams are already open
+        """
+        with self._lock:
+            if len(self._clients) >= self.max_clients:
+                self.rejected_clients += 1
+                raise TooManyClientsError(f"Too many event streams ({self.max_clients} connected)")
+            client = _Client(next(self._client_ids))
+            self._clients = self._clients + (client,)
+        logger.info("Event stream %d opened (%d connected)", client.id, len(self._clients))
+        return client
+
+    def unsubscribe(self, client):
+        """
+        Remove a stream.
+
+        Args:
+            client (_Client): Client returned by subscribe()
+        """
+        with self._lock:
+            if client not in self._clients:
+                return
+            self._clients = tuple(other for other in self._clients if other is not client)
+        logger.info("Event stream %d closed after %d events", client.id, client.sent)
+
+    def stream(self, client, snapshot=None):
+        """
+        Generate the server-sent event stream of a client.
+
+        Args:
+            client (_Client): Client returned by subscribe()
+            snapshot (dict, optional): State sent first as a "snapshot" event
+
+        Yields:
+            bytes: Chunks of the text/event-stream body
+        """
+        try:
+            yield f"retry: {RETRY_MS}\n\n".encode()
+            if snapshot is not None:
+                yield self._format("snapshot", snapshot)
+
+            buffer = client.buffer
+            wakeup = client.wakeup
+            while not client.dropped:
+                if not buffer:
+                    # Clear, then check again: an event published in between
+                    # is either seen here or sets the flag for the wait
+                    wakeup.clear()
+                    if not buffer and not wakeup.wait(self.keepalive):
+                        yield b": keepalive\n\n"
+                        continue
+                chunk = []
+                while buffer:
+                    chunk.append(buffer.popleft())
+                if chunk:
+                    client.sent += len(chunk)
+                    yield b"".join(chunk)
+
+            if client.dropped:
+                yield self._format("dropped", {"reason": "Client too slow, reconnect for a new snapshot"})
+        finally:
+            self.unsubscribe(client)
+
+    def publish(self, event, data):
+        """
+        Send an event to every connected stream.
+
+        Args:
+            event (str): Event name
+            data (dict): JSON-serializable payload
+        """
+        clients = self._clients
+        if not clients:
+            return
+        message = self._format(event, data)
+        self.published += 1
+        for client in clients:
+            buffer = client.buffer
+            if len(buffer) >= self.buffer_size:
+                self._drop(client)
+                continue
+            buffer.append(message)
+            if not client.wakeup.is_set():
+                client.wakeup.set()
+
+    def close(self):
+        """
+        End every open stream.
+        """
+        for client in self._clients:
+            client.dropped = True
+            client.wakeup.set()
+
+    def on_signal(self, signal, result):
+        """
+        Publish the outcome of a processed signal.
+        """
+        if not self._clients:
+            return
+        self.publish("signal", {
+            "time": int(time.time() * 1000),
+            "ticker": signal.ticker,
+            "action": signal.action,
+            "price": signal.price,
+            "alert_id": signal.alert_id,
+            "status": "executed" if result.get("success") else "rejected",
+            "message": result.get("message")
+        })
+
+    def on_fill(self, order, result):
+        """
+        Fill listener: publish the trade and the position it opened.
+        """
+        if not self._clients:
+            return
+        now = int(time.time() * 1000)
+        volume = result.volume or order.volume
+        price = result.price or order.price
+        self.publish("fill", {
+            "time": now, "ticker": order.symbol, "action": order.action, "volume": volume, "price": price,
+            "sl": order.sl, "tp": order.tp, "order_id": result.order_id, "status": "filled"
+        })
+        self.publish("position", {
+            "time": now, "ticket": result.order_id, "ticker": order.symbol, "action": order.action,
+            "volume": volume, "entry": price, "sl": order.sl, "tp": order.tp, "status": "open"
+        })
+
+    def on_modify(self, symbol, ticket, sl):
+        """
+        Modify listener: publish a moved stop.
+        """
+        if not self._clients:
+            return
+        self.publish("position", {
+            "time": int(time.time() * 1000), "ticket": ticket, "ticker": symbol, "sl": sl, "status": "modified"
+        })
+
+    def on_close(self, symbol, ticket, pnl):
+        """
+        Close listener: publish a closed position.
+        """
+        if not self._clients:
+            return
+        self.publish("position", {
+            "time": int(time.time() * 1000), "ticket": ticket, "ticker": symbol, "pnl": pnl, "status": "closed"
+        })
+
+    def on_cycle(self, duration, timed_out, skipped):
+        """
+        Cycle listener: publish the scheduler metrics after each cycle.
+        """
+        if not self._clients:
+            return
+        self.publish("scheduler", scheduler_metrics.get_stats())
+
+    def get_stats(self):
+        """
+        Get stream counters.
+
+        Returns:
+            dict: Event stream statistics
+        """
+        clients = self._clients
+        return {
+            "enabled": self.enabled,
+            "clients": len(clients),
+            "max_clients": self.max_clients,
+            "published": self.published,
+            "dropped_clients": self.dropped_clients,
+            "rejected_clients": self.rejected_clients,
+            "buffered": sum(len(client.buffer) for client in clients)
+        }
+
+    def _format(self, event, data):
+        return f"id: {next(self._event_ids)}\nevent: {event}\ndata: {json.dumps(data, default=str)}\n\n".encode()
+
+    def _drop(self, client):
+        with self._lock:
+            if client.dropped:
+                return
+            client.dropped = True
+            self.dropped_clients += 1
+        logger.warning("Event stream %d dropped: %d events not read", client.id, len(client.buffer))
+        # Later events skip it, and its stream ends at the next wakeup
+        self.unsubscribe(client)
+        client.wakeup.set()
+
+# Create a singleton instance following fills, stop moves and closes of the
+# shared broker session and position book, and the scheduler's cycles
+event_broadcaster = EventBroadcaster()
+broker_session.add_fill_listener(event_broadcaster.on_fill)
+position_book.add_modify_listener(event_broadcaster.on_modify)
+position_book.add_close_listener(event_broadcaster.on_close)
+scheduler_metrics.add_cycle_listener(event_broadcaster.on_cycle)
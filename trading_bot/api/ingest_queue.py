@@ -0,0 +1,232 @@
+"""
+Asynchronous ingest queue for webhook signals.
+
+In acknowledge-then-process mode the webhook endpoint only validates the
+payload and puts it on a bounded in-process queue. A pool of worker threads
+drains the queue and hands each signal to the webhook handler, so a slow
+trade execution never stalls the alerts that arrive after it.
+"""
+import time
+import queue
+import atexit
+import threading
+
+from trading_bot.utils.logger import setup_logger
+from trading_bot.api.webhook_handler import webhook_handler
+from trading_bot.api.signal_journal import signal_journal
+from trading_bot.core.executor import ShardedExecutor
+from trading_bot.config import settings
+
+# Configure logging
+logger = setup_logger("api.ingest_queue")
+
+class QueueFullError(Exception):
+    """
+    Raised when a signal cannot be queued because the ingest queue is full.
+    """
+
+class IngestQueue:
+    """
+    Bounded queue with a pool of workers in front of the webhook handler.
+
+    Workers are the shards of a ShardedExecutor keyed by ticker, so signals
+    for the same symbol are processed strictly in arrival order while
+    different symbols are handled in parallel.
+    """
+
+    def __init__(self, handler, workers=None, max_size=None, backpressure=None, block_timeout=None,
+                 journal=None):
+        """
+        Initialize the ingest queue.
+
+        Args:
+            handler (WebhookHandler): Handler that processes queued signals
+            workers (int, optional): Number of worker threads. Defaults to INGEST_WORKERS.
+            max_size (int, optional): Maximum number of queued signals. Defaults to INGEST_QUEUE_SIZE.
+            backpressure (str, optional): "reject" to fail immediately when full,
+                "block" to wait up to block_timeout. Defaults to INGEST_BACKPRESSURE.
+            block_timeout (float, optional): Seconds to wait for a free slot in
+                "block" mode. Defaults to INGEST_BLOCK_TIMEOUT.
+            journal (SignalJournal, optional): Journal recording queued signals.
+                Defaults to the shared signal journal.
+        """
+        self.handler = handler
+        self.journal = journal or signal_journal
+        self.workers = max(1, workers or settings.INGEST_WORKERS)
+        self.max_size = max(1, max_size or settings.INGEST_QUEUE_SIZE)
+        self.backpressure = (backpressure or settings.INGEST_BACKPRESSURE).lower()
+        self.block_timeout = settings.INGEST_BLOCK_TIMEOUT if block_timeout is None else block_timeout
+
+        if self.backpressure not in ("reject", "block"):
+            raise ValueError(f"Invalid backpressure mode: {self.backpressure}")
+
+        # Each worker owns a slice of the total capacity
+        per_worker = max(1, -(-self.max_size // self.workers))
+        self.executor = ShardedExecutor(self.workers, max_queue_size=per_worker, name="ingest-worker")
+        self._lock = threading.Lock()
+        self._exit_registered = False
+
+        # Counters exposed on /status
+        self._enqueued = 0
+        self._processed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._last_lag = 0.0
+        self._max_lag = 0.0
+
+    @property
+    def running(self):
+        """
+        bool: True if the worker pool is running.
+        """
+        return self.executor.running
+
+    def start(self):
+        """
+        Start the worker pool.
+        """
+        if self.executor.running:
+            return
+        self.executor.start()
+
+        # Drain whatever is still queued when the interpreter exits (registered
+        # once, however often it is restarted)
+        if not self._exit_registered:
+            atexit.register(self.stop)
+            self._exit_registered = True
+        logger.info(
+            "Ingest queue started (workers: %s, size: %s, backpressure: %s)",
+            self.workers, self.max_size, self.backpressure
+        )
+
+    def stop(self, timeout=None):
+        """
+        Stop the worker pool after draining all queued signals.
+
+        Args:
+            timeout (float, optional): Seconds to wait for each worker to finish
+        """
+        if not self.executor.running:
+            return
+        self.executor.shutdown(wait=True, timeout=timeout)
+
+        logger.info("Ingest queue stopped")
+
+    def submit(self, signal, claimed=False):
+        """
+        Queue a validated signal for processing.
+
+        The signal is journaled first, so it survives a crash between the
+        acknowledgement and its execution.
+
+        Args:
+            signal (Signal): Validated trading signal
+            claimed (bool, optional): Its dedup key was reserved with the
+                handler's claim(). Defaults to False.
+
+        Raises:
+            QueueFullError: If the queue is full or not running
+        """
+        entry_id = self.journal.append(signal)
+        try:
+            self.executor.submit(
+                signal.ticker,
+                self._process,
+                signal,
+                time.monotonic(),
+                entry_id,
+                claimed,
+                block=self.backpressure == "block",
+                timeout=self.block_timeout
+            )
+        except RuntimeError:
+            self.journal.complete(entry_id, {"success": False, "message": "Ingest queue is not running"})
+            raise QueueFullError("Ingest queue is not running")
+        except queue.Full:
+            self.journal.complete(entry_id, {"success": False, "message": "Ingest queue is full"})
+            with self._lock:
+                self._rejected += 1
+            raise QueueFullError("Ingest queue is full")
+
+        with self._lock:
+            self._enqueued += 1
+
+    def get_stats(self):
+        """
+        Get queue depth and processing counters.
+
+        Returns:
+            dict: Queue statistics
+        """
+        now = time.monotonic()
+        depth = self.executor.depth()
+        oldest = self.executor.oldest(lambda args: args[1])
+
+        with self._lock:
+            return {
+                "running": self.executor.running,
+                "workers": self.workers,
+                "capacity": self.max_size,
+                "backpressure": self.backpressure,
+                "depth": depth,
+                "enqueued": self._enqueued,
+                "processed": self._processed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "lag_ms": round(self._last_lag * 1000, 3),
+                "max_lag_ms": round(self._max_lag * 1000, 3),
+                "oldest_pending_ms": round((now - oldest) * 1000, 3) if oldest is not None else 0.0,
+                "shards": self.executor.get_stats()
+            }
+
+    def _process(self, signal, enqueued_at, entry_id=None, claimed=False):
+        """
+        Process a queued signal on its ticker's worker.
+
+        The worker does not wait for order batching, so later signals for the
+        same ticker can join the same batch.
+
+        Args:
+            signal (Signal): Validated trading signal
+            enqueued_at (float): Monotonic time the signal was queued
+            entry_id (str, optional): Journal entry of the signal
+            claimed (bool, optional): Its dedup key is already reserved
+        """
+        lag = time.monotonic() - enqueued_at
+        with self._lock:
+            self._last_lag = lag
+            self._max_lag = max(self._max_lag, lag)
+
+        try:
+            future = self.handler.process_signal(signal, wait=False, claimed=claimed)
+        except Exception as e:
+            logger.exception("Error processing queued signal: %s", e)
+            self.journal.complete(entry_id, {"success": False, "message": str(e)})
+            self._finished(entry_id, None)
+            return
+        future.add_done_callback(lambda done: self._finished(entry_id, done))
+
+    def _finished(self, entry_id, future):
+        """
+        Count a processed signal and journal its result once it is known.
+
+        Args:
+            entry_id (str): Journal entry of the signal, or None
+            future (Future): Completed result, or None if processing raised
+        """
+        success = False
+        if future is not None:
+            result = future.result()
+            success = result.get("success", False)
+            if not success:
+                logger.warning("Queued signal failed: %s", result.get("message"))
+            self.journal.complete(entry_id, result)
+
+        with self._lock:
+            if success:
+                self._processed += 1
+            else:
+                self._failed += 1
+
+# Create a singleton instance (workers are started by the application)
+ingest_queue = IngestQueue(webhook_handler)
@@ -0,0 +1,218 @@
+"""
+Production server for the trading bot API.
+
+Runs create_app() under gunicorn with a gthread worker, or on platforms
+without gunicorn (MetaTrader 5 only runs on Windows) under waitress; both
+serve requests from a thread pool in a single process.
+
+The trading core (open positions, the daily loss halt, the dedup cache, the
+order batcher and the per-ticker shards) lives in the memory of the serving
+process, so a second worker process would keep its own copy of all of it:
+positions it fills would never be managed by the scheduler, the loss limit
+would apply per process and retries landing on another worker would not be
+deduplicated. Until that state is shared the server refuses to start more
+than one worker; throughput scales with threads.
+"""
+import os
+
+from trading_bot.utils.logger import setup_logger
+from trading_bot.utils.startup import startup
+from trading_bot.api.app import create_app
+from trading_bot.api.ingest_queue import ingest_queue
+from trading_bot.api.signal_journal import signal_journal
+from trading_bot.api.events import event_broadcaster
+from trading_bot.services.broker.session import broker_session
+from trading_bot.services.history.history_store import history_store
+from trading_bot.core.order_batcher import order_batcher
+from trading_bot.services.notifications.notification_service import notification_service
+from trading_bot.config import settings
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Configure logging
+logger = setup_logger("api.server")
+
+def run_server(host, port, workers=None, threads=None, keepalive=None, graceful_timeout=None,
+               enable_scheduler=True, disable_notifications=False):
+    """
+    Run the API under a production server.
+
+    Args:
+        host (str): Host to bind to
+        port (int): Port to bind to
+        workers (int, optional): Worker processes, only 1 is supported. Defaults to SERVER_WORKERS.
+        threads (int, optional): Threads per worker. Defaults to SERVER_THREADS.
+        keepalive (int, optional): Keep-alive timeout in seconds. Defaults to SERVER_KEEPALIVE.
+        graceful_timeout (int, optional): Seconds to drain in-flight requests and
+            queued signals on shutdown. Defaults to SERVER_GRACEFUL_TIMEOUT.
+        enable_scheduler (bool, optional): Start the trading scheduler in one worker. Defaults to True.
+        disable_notifications (bool, optional): Disable scheduler notifications. Defaults to False.
+
+    Raises:
+        ValueError: If more than one worker process is requested
+    """
+    options = {
+        "bind": f"{host}:{port}",
+        "workers": workers or settings.SERVER_WORKERS,
+        "threads": threads or settings.SERVER_THREADS,
+        "keepalive": keepalive or settings.SERVER_KEEPALIVE,
+        "graceful_timeout": graceful_timeout or settings.SERVER_GRACEFUL_TIMEOUT
+    }
+
+    check_workers(options["workers"])
+
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        BaseApplication = None
+
+    if BaseApplication is None or fcntl is None:
+        _run_waitress(options, host, port, enable_scheduler, disable_notifications)
+        return
+
+    class GunicornApplication(BaseApplication):
+        """
+        Gunicorn application loading create_app() in its worker.
+        """
+
+        def load_config(self):
+            for key, value in options.items():
+                self.cfg.set(key, value)
+            self.cfg.set("worker_class", "gthread")
+            self.cfg.set("post_worker_init", _post_worker_init)
+            self.cfg.set("worker_exit", _worker_exit)
+
+        def load(self):
+            return create_app()
+
+    _SchedulerLock.enabled = enable_scheduler
+    _SchedulerLock.disable_notifications = disable_notifications
+
+    logger.info(
+        "Starting gunicorn at %s (workers: %d, threads: %d, keepalive: %ds)",
+        options["bind"], options["workers"], options["threads"], options["keepalive"]
+    )
+    GunicornApplication().run()
+
+def check_workers(workers):
+    """
+    Refuse a worker count the trading core cannot run with.
+
+    Args:
+        workers (int, optional): Worker processes. Defaults to SERVER_WORKERS.
+
+    Raises:
+        ValueError: If more than one worker process is requested
+    """
+    workers = workers or settings.SERVER_WORKERS
+    if workers != 1:
+        raise ValueError(
+            f"Cannot run {workers} worker processes: positions, the daily loss limit "
+            "and the dedup cache are kept per process. Run one worker and raise --threads instead"
+        )
+
+class _SchedulerLock:
+    """
+    Process-wide state for the scheduler-owning worker.
+
+    The worker takes an exclusive lock on SCHEDULER_LOCK_FILE before it runs
+    the scheduler, so the old and the new worker never both run it while
+    gunicorn replaces one. The lock is released when the worker exits, and
+    the worker spawned to replace it takes over.
+    """
+    enabled = True
+    disable_notifications = False
+    handle = None
+    scheduler = None
+
+def _post_worker_init(worker):
+    """
+    Gunicorn hook: start the scheduler if this worker wins the lock.
+    """
+    startup.ready()
+    if not _SchedulerLock.enabled:
+        return
+
+    lock_file = settings.SCHEDULER_LOCK_FILE
+    lock_dir = os.path.dirname(lock_file)
+    if lock_dir and not os.path.exists(lock_dir):
+        os.makedirs(lock_dir, exist_ok=True)
+
+    handle = open(lock_file, "a")
+    try:
+        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        handle.close()
+        return
+
+    # Imported here so workers that never run the scheduler don't load it
+    from trading_bot.core.scheduler import TradingScheduler
+
+    _SchedulerLock.handle = handle
+    _SchedulerLock.scheduler = TradingScheduler(
+        disable_notifications=_SchedulerLock.disable_notifications
+    )
+    _SchedulerLock.scheduler.start()
+    logger.info("Scheduler started in worker %d", worker.pid)
+
+def _worker_exit(server, worker):
+    """
+    Gunicorn hook: shut down the worker's services and release the scheduler lock.
+    """
+    _shutdown(server.cfg.graceful_timeout, _SchedulerLock.scheduler)
+    _SchedulerLock.scheduler = None
+    if _SchedulerLock.handle is not None:
+        _SchedulerLock.handle.close()
+        _SchedulerLock.handle = None
+
+def _shutdown(graceful_timeout, scheduler=None):
+    """
+    Stop the services of a serving process, shared by gunicorn workers and waitress.
+
+    Drains queued signals, stops the scheduler, sends the orders still in a
+    batch, closes the journal and the broker session, writes the queued
+    history, ends the event streams and sends the remaining notifications.
+
+    Args:
+        graceful_timeout (float): Seconds to drain queued signals and batches
+        scheduler (TradingScheduler, optional): Scheduler running in this process
+    """
+    ingest_queue.stop(timeout=graceful_timeout)
+    if scheduler is not None:
+        scheduler.stop()
+    order_batcher.stop(timeout=graceful_timeout)
+    signal_journal.stop()
+    broker_session.stop()
+    history_store.stop()
+    event_broadcaster.close()
+    notification_service.stop()
+
+def _run_waitress(options, host, port, enable_scheduler, disable_notifications):
+    """
+    Run the API under waitress in a single process.
+    """
+    from waitress import serve
+
+    app = create_app()
+
+    scheduler = None
+    if enable_scheduler:
+        from trading_bot.core.scheduler import TradingScheduler
+        scheduler = TradingScheduler(disable_notifications=disable_notifications)
+        scheduler.start()
+
+    logger.info("Starting waitress at %s:%s (threads: %d)", host, port, options["threads"])
+    startup.ready()
+    try:
+        serve(
+            app,
+            host=host,
+            port=port,
+            threads=options["threads"],
+            channel_timeout=options["keepalive"]
+        )
+    finally:
+        _shutdown(options["graceful_timeout"], scheduler)
@@ -0,0 +1,188 @@
+"""
+Webhook payload parsing and validation.
+
+Raw request bodies are decoded once and validated in a single pass into a
+compact Signal record. Invalid payloads raise SignalError before anything is
+logged or allocated beyond the decoded body.
+"""
+import math
+import time
+from urllib.parse import parse_qsl
+
+from trading_bot.utils.metrics import metrics
+
+# Use the fastest JSON decoder available
+try:
+    import orjson as _json
+except ImportError:
+    try:
+        import ujson as _json
+    except ImportError:
+        import json as _json
+
+_loads = _json.loads
+JSON_DECODER = _json.__name__
+
+# Valid order actions
+ORDER_ACTIONS = ("buy", "sell")
+
+# Stage latencies
+PARSE_SECONDS = metrics.histogram("stage_seconds", "Latency of webhook processing stages", stage="parse")
+VALIDATION_SECONDS = metrics.histogram("stage_seconds", "Latency of webhook processing stages", stage="validation")
+
+class SignalError(ValueError):
+    """
+    Raised when a webhook payload is not a valid trading signal.
+    """
+
+class Signal:
+    """
+    Validated trading signal.
+    """
+
+    __slots__ = ("ticker", "action", "price", "alert_id")
+
+    def __init__(self, ticker, action, price, alert_id=None):
+        """
+        Initialize the signal.
+
+        Args:
+            ticker (str): Ticker symbol
+            action (str): Order action ("buy" or "sell")
+            price (float): Order price
+            alert_id (str, optional): Alert identifier sent by the signal source
+        """
+        self.ticker = ticker
+        self.action = action
+        self.price = price
+        self.alert_id = alert_id
+
+    def __repr__(self):
+        return f"Signal({self.action} {self.ticker} at {self.price})"
+
+    def __eq__(self, other):
+        if not isinstance(other, Signal):
+            return NotImplemented
+        return (
+            (self.ticker, self.action, self.price, self.alert_id)
+            == (other.ticker, other.action, other.price, other.alert_id)
+        )
+
+    def dedup_key(self):
+        """
+        Get the key identifying repeats of this alert.
+
+        Returns:
+            tuple: (ticker, action, price, alert_id), equal across processes
+                unlike its hash
+        """
+        return (self.ticker, self.action, self.price, self.alert_id)
+
+    def to_dict(self):
+        """
+        Convert the signal to the response data format.
+
+        Returns:
+            dict: Signal data
+        """
+        return {
+            "ticker": self.ticker,
+            "action": self.action,
+            "price": self.price
+        }
+
+    @classmethod
+    def from_payload(cls, data, passphrase=""):
+        """
+        Validate a decoded webhook payload and build a signal from it.
+
+        Args:
+            data (dict): Decoded webhook payload
+            passphrase (str, optional): Expected passphrase. Empty accepts all requests.
+
+        Returns:
+            Signal: Validated signal
+
+        Raises:
+            SignalError: If the payload is invalid
+        """
+        if not isinstance(data, dict):
+            raise SignalError("Invalid payload")
+
+        # Validate the webhook passphrase
+        if passphrase and data.get("passphrase", "") != passphrase:
+            raise SignalError("Invalid passphrase")
+
+        ticker = data.get("ticker")
+        if not ticker or not isinstance(ticker, str):
+            raise SignalError("Missing ticker")
+
+        strategy = data.get("strategy")
+        if not strategy or not isinstance(strategy, dict):
+            raise SignalError("Missing strategy information")
+
+        order_action = strategy.get("order_action")
+        order_action = order_action.lower() if isinstance(order_action, str) else ""
+        if order_action not in ORDER_ACTIONS:
+            raise SignalError(f"Invalid order action: {order_action}")
+
+        order_price = strategy.get("order_price")
+        if not order_price:
+            raise SignalError("Missing order price")
+        try:
+            order_price = float(order_price)
+        except (TypeError, ValueError):
+            raise SignalError(f"Invalid order price: {order_price}") from None
+        # Rejects NaN, infinities, zero and negative prices
+        if not (math.isfinite(order_price) and order_price > 0):
+            raise SignalError(f"Invalid order price: {order_price}")
+
+        alert_id = data.get("alert_id")
+        return cls(ticker, order_action, order_price, str(alert_id) if alert_id is not None else None)
+
+def parse_signal(body, passphrase=""):
+    """
+    Parse a raw webhook body into a validated signal.
+
+    JSON bodies are decoded with the fastest available decoder. Anything else
+    is treated as form data (passphrase, ticker, order_action, order_price)
+    for backward compatibility.
+
+    Args:
+        body (bytes): Raw request body
+        passphrase (str, optional): Expected passphrase. Empty accepts all requests.
+
+    Returns:
+        Signal: Validated signal
+
+    Raises:
+        SignalError: If the body cannot be decoded or is not a valid signal
+    """
+    start = time.perf_counter_ns()
+    if body[:1] in (b"{", b"[") or body.lstrip()[:1] in (b"{", b"["):
+        try:
+            data = _loads(body)
+        except ValueError:
+            raise SignalError("Invalid JSON payload") from None
+    else:
+        try:
+            form = dict(parse_qsl(body.decode("utf-8")))
+        except UnicodeDecodeError:
+            raise SignalError("Invalid payload encoding") from None
+        data = {
+            "passphrase": form.get("passphrase", ""),
+            "ticker": form.get("ticker", ""),
+            "strategy": {
+                "order_action": form.get("order_action", ""),
+                "order_price": form.get("order_price", 0)
+            },
+            "alert_id": form.get("alert_id")
+        }
+
+    parsed = time.perf_counter_ns()
+    PARSE_SECONDS.observe(parsed - start)
+
+    try:
+        return Signal.from_payload(data, passphrase)
+    finally:
+        VALIDATION_SECONDS.since(parsed)
@@ -0,0 +1,401 @@
+"""
+Write-ahead journal of received webhook signals.
+
+Every accepted signal is appended to a journal segment and synced to disk
+before it is acknowledged; its result is appended once execution finishes.
+Appends use group commit: a single writer thread writes and fsyncs
+everything that arrived while the previous sync was running, so concurrent
+requests share one fsync instead of paying for one each.
+
+Each process writes its own segments (logs/journal/signals-<pid>-<ns>.log).
+On startup the entries of earlier segments that never got a result are
+replayed and the segments are compacted away. A running process rolls over
+to a new segment once the current one exceeds SIGNAL_JOURNAL_SEGMENT_BYTES,
+carrying its unfinished entries forward.
+
+Replay is at-least-once: a signal executed just before a crash, whose
+result was not yet on disk, is executed again. An entry whose replay raises
+is retried on the following starts, up to MAX_REPLAY_ATTEMPTS times, and then
+moved to the dead-letter file (logs/journal/dead-letter.log) for inspection.
+"""
+import os
+import glob
+import json
+import time
+import atexit
+import threading
+
+from trading_bot.utils.logger import setup_logger
+from trading_bot.api.signal import Signal
+from trading_bot.config import settings
+
+# Configure logging
+logger = setup_logger("api.signal_journal")
+
+# Replays of an entry that raise before it is moved to the dead-letter file
+MAX_REPLAY_ATTEMPTS = 3
+
+# File of the entries given up on, next to the segments
+DEAD_LETTER_FILE = "dead-letter.log"
+
+class _Commit:
+    """
+    Lines waiting for the same fsync.
+    """
+
+    __slots__ = ("lines", "done", "ok")
+
+    def __init__(self):
+        self.lines = []
+        self.done = threading.Event()
+        self.ok = False
+
+class SignalJournal:
+    """
+    Append-only, group-committed journal of signals and their results.
+    """
+
+    def __init__(self, directory=None, enabled=None, segment_bytes=None):
+        """
+        Initialize the signal journal.
+
+        Args:
+            directory (str, optional): Journal directory. Defaults to SIGNAL_JOURNAL_DIR.
+            enabled (bool, optional): Defaults to ENABLE_SIGNAL_JOURNAL.
+            segment_bytes (int, optional): Segment size that triggers a rollover.
+                Defaults to SIGNAL_JOURNAL_SEGMENT_BYTES.
+        """
+        self.directory = directory or settings.SIGNAL_JOURNAL_DIR
+        self.enabled = settings.ENABLE_SIGNAL_JOURNAL if enabled is None else enabled
+        self.segment_bytes = segment_bytes or settings.SIGNAL_JOURNAL_SEGMENT_BYTES
+
+        self._cond = threading.Condition()
+        self._commit = _Commit()
+        self._thread = None
+        self._stopping = False
+        self._exit_registered = False
+        self._file = None
+        self._path = None
+        self._prefix = None
+        self._next_id = 0
+        # Unfinished entries of this process: id -> journal line
+        self._pending = {}
+
+        self.appended = 0
+        self.completed = 0
+        self.syncs = 0
+        self.errors = 0
+        self.replayed = 0
+        self.dead_lettered = 0
+
+    @property
+    def running(self):
+        """
+        bool: True if the writer thread is running.
+        """
+        return self._thread is not None
+
+    def start(self):
+        """
+        Open a new segment for this process and start the writer thread.
+        """
+        if not self.enabled or self._thread is not None:
+            return
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._prefix = f"{os.getpid()}-{time.time_ns()}"
+        self._open_segment()
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="signal-journal", daemon=True)
+        self._thread.start()
+
+        if not self._exit_registered:
+            # Once, however often it is restarted
+            atexit.register(self.stop)
+            self._exit_registered = True
+        logger.info("Signal journal started: %s", self._path)
+
+    def stop(self):
+        """
+        Write the remaining records and close the segment.
+
+        The segment stays on disk so unfinished entries are replayed on the
+        next start.
+        """
+        with self._cond:
+            thread = self._thread
+            if thread is None:
+                return
+            self._stopping = True
+            self._cond.notify()
+        thread.join()
+
+        self._thread = None
+        self._file.close()
+        self._file = None
+
+    def append(self, signal):
+        """
+        Record a received signal and wait until it is on disk.
+
+        Args:
+            signal (Signal): Validated trading signal
+
+        Returns:
+            str: Entry id to pass to complete(), or None if the journal is
+                not running or the write failed
+        """
+        if self._thread is None:
+            return None
+
+        with self._cond:
+            self._next_id += 1
+            entry_id = f"{self._prefix}-{self._next_id}"
+            line = json.dumps({
+                "id": entry_id,
+                "time": time.time(),
+                "signal": {
+                    "ticker": signal.ticker,
+                    "action": signal.action,
+                    "price": signal.price,
+                    "alert_id": signal.alert_id
+                }
+            }, separators=(",", ":")) + "\n"
+            self._pending[entry_id] = line
+            commit = self._commit
+            commit.lines.append(line)
+            self.appended += 1
+            self._cond.notify()
+
+        commit.done.wait()
+        return entry_id if commit.ok else None
+
+    def complete(self, entry_id, result):
+        """
+        Record the result of a journaled signal without waiting for the disk.
+
+        Args:
+            entry_id (str): Id returned by append(); None is ignored
+            result (dict): Response of the webhook handler
+        """
+        if entry_id is None:
+            return
+
+        line = json.dumps({
+            "id": entry_id,
+            "success": bool(result.get("success")),
+            "message": result.get("message", "")
+        }, separators=(",", ":")) + "\n"
+
+        with self._cond:
+            if self._pending.pop(entry_id, None) is None or self._thread is None:
+                return
+            self._commit.lines.append(line)
+            self.completed += 1
+            self._cond.notify()
+
+    def replay(self, handler):
+        """
+        Execute the unfinished entries of earlier runs, then compact their segments.
+
+        Args:
+            handler (WebhookHandler): Handler that processes the signals
+
+        Returns:
+            int: Number of replayed signals
+        """
+        if not self.enabled:
+            return 0
+
+        segments = self._closed_segments()
+        replayed = 0
+        dead_lettered = 0
+        for path in segments:
+            with open(path, "a+") as journal:
+                # Terminate a line torn by the crash before appending results
+                if journal.tell():
+                    journal.seek(journal.tell() - 1)
+                    if journal.read(1) != "\n":
+                        journal.write("\n")
+                for entry_id, (line, signal, attempts, _) in self._read_pending(path).items():
+                    logger.warning("Replaying unfinished signal %s: %s", entry_id, signal)
+                    try:
+                        result = handler.process_signal(signal)
+                    except Exception as e:
+                        logger.exception("Error replaying signal %s: %s", entry_id, e)
+                        attempts += 1
+                        if attempts < MAX_REPLAY_ATTEMPTS:
+                            # Counted in the segment, so the next start knows
+                            record = {"id": entry_id, "attempts": attempts, "message": str(e)}
+                        else:
+                            logger.error("Giving up on signal %s after %d attempts, moved to %s",
+                                         entry_id, attempts, DEAD_LETTER_FILE)
+                            self._dead_letter(line, attempts, str(e))
+                            record = {"id": entry_id, "success": False, "message": str(e), "dead_letter": True}
+                            dead_lettered += 1
+                    else:
+                        record = {
+                            "id": entry_id,
+                            "success": bool(result.get("success")),
+                            "message": result.get("message", ""),
+                            "replayed": True
+                        }
+                        replayed += 1
+
+                    journal.write(json.dumps(record, separators=(",", ":")) + "\n")
+                    journal.flush()
+                    os.fsync(journal.fileno())
+
+        self.replayed += replayed
+        self.dead_lettered += dead_lettered
+        self.compact(segments)
+        if replayed:
+            logger.info("Replayed %d unfinished signals", replayed)
+        return replayed
+
+    def compact(self, segments=None):
+        """
+        Remove finished entries from closed segments.
+
+        Segments without unfinished entries are deleted; the others are
+        rewritten with only their unfinished entries and replay attempts.
+
+        Args:
+            segments (list, optional): Segment paths. Defaults to all segments
+                not written by this process.
+
+        Returns:
+            int: Number of entries kept
+        """
+        kept = 0
+        for path in segments if segments is not None else self._closed_segments():
+            pending = self._read_pending(path)
+            if not pending:
+                os.remove(path)
+                continue
+
+            temp = path + ".tmp"
+            with open(temp, "w") as journal:
+                for line, _, _, attempt_line in pending.values():
+                    journal.write(line)
+                    if attempt_line is not None:
+                        journal.write(attempt_line)
+                journal.flush()
+                os.fsync(journal.fileno())
+            os.replace(temp, path)
+            kept += len(pending)
+        return kept
+
+    def get_stats(self):
+        """
+        Get journal counters.
+
+        Returns:
+            dict: Journal statistics
+        """
+        with self._cond:
+            return {
+                "enabled": self.enabled,
+                "segment": self._path,
+                "pending": len(self._pending),
+                "appended": self.appended,
+                "completed": self.completed,
+                "syncs": self.syncs,
+                "errors": self.errors,
+                "replayed": self.replayed,
+                "dead_lettered": self.dead_lettered
+            }
+
+    def _dead_letter(self, line, attempts, message):
+        """
+        Append an entry that could not be replayed to the dead-letter file.
+        """
+        record = json.loads(line)
+        record["attempts"] = attempts
+        record["message"] = message
+        with open(os.path.join(self.directory, DEAD_LETTER_FILE), "a") as dead_letter:
+            dead_letter.write(json.dumps(record, separators=(",", ":")) + "\n")
+            dead_letter.flush()
+            os.fsync(dead_letter.fileno())
+
+    def _closed_segments(self):
+        paths = sorted(glob.glob(os.path.join(self.directory, "signals-*.log")))
+        own = f"signals-{self._prefix}-" if self._prefix else None
+        return [path for path in paths if not (own and os.path.basename(path).startswith(own))]
+
+    def _read_pending(self, path):
+        """
+        Unfinished entries of a segment, as
+        id -> (line, signal, failed replay attempts, last attempt line).
+        """
+        pending = {}
+        with open(path) as journal:
+            for line in journal:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Torn write at the end of a crashed segment
+                    continue
+                line = line if line.endswith("\n") else line + "\n"
+                if "signal" in record:
+                    data = record["signal"]
+                    signal = Signal(data["ticker"], data["action"], data["price"], data.get("alert_id"))
+                    pending[record["id"]] = (line, signal, 0, None)
+                elif "attempts" in record:
+                    entry = pending.get(record["id"])
+                    if entry is not None:
+                        pending[record["id"]] = (entry[0], entry[1], record["attempts"], line)
+                else:
+                    pending.pop(record.get("id"), None)
+        return pending
+
+    def _open_segment(self):
+        old = self._path
+        self._path = os.path.join(self.directory, f"signals-{self._prefix}-{time.time_ns()}.log")
+        self._file = open(self._path, "ab")
+        return old
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._commit.lines and not self._stopping:
+                    self._cond.wait()
+                commit = self._commit
+                if not commit.lines:
+                    return
+                self._commit = _Commit()
+                if self._file.tell() >= self.segment_bytes:
+                    # Entries received in this commit are written with it
+                    in_commit = set(commit.lines)
+                    carried = [line for line in self._pending.values() if line not in in_commit]
+                else:
+                    carried = None
+
+            try:
+                if carried is not None:
+                    self._roll_over(carried)
+                self._file.write("".join(commit.lines).encode())
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                commit.ok = True
+                self.syncs += 1
+            except OSError as e:
+                self.errors += 1
+                logger.error("Error writing signal journal: %s", e)
+            commit.done.set()
+
+    def _roll_over(self, carried):
+        """
+        Start a new segment holding the unfinished entries, then delete the old one.
+        """
+        old_file = self._file
+        old = self._open_segment()
+        self._file.write("".join(carried).encode())
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        old_file.close()
+        os.remove(old)
+        logger.info("Signal journal rolled over to %s (%d unfinished entries)", self._path, len(carried))
+
+# Create a singleton instance (started by the application)
+signal_journal = SignalJournal()
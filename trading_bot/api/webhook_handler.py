@@ -5,13 +5,48 @@ This module processes incoming webhook requests from TradingView
 and executes trades accordingly.
 """
 import os
+import time
 import logging
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 from trading_bot.utils.logger import setup_logger
+from trading_bot.utils.metrics import metrics
+from trading_bot.utils.ttl_cache import TTLCache
+from trading_bot.api.signal import Signal, SignalError
+from trading_bot.core.trading_calendar import trading_calendar
+from trading_bot.services.broker.base import BrokerError, Order
+from trading_bot.services.broker.session import broker_session
+from trading_bot.core.order_batcher import order_batcher
+from trading_bot.core.risk_gate import risk_gate
+from trading_bot.services.history.history_store import history_store
+from trading_bot.api.events import event_broadcaster
+from trading_bot.services.notifications.notification_service import notification_service
 from trading_bot.config import settings
+from trading_bot.config.reloader import settings_reloader
 
 # Configure logging
 logger = setup_logger("webhook_handler")
 
+# Placeholder cached while the first copy of an alert is being executed
+_IN_PROGRESS = {
+    "success": True,
+    "message": "Duplicate signal ignored (original still processing)"
+}
+
+# Stage latencies and outcomes
+RISK_SECONDS = metrics.histogram("stage_seconds", "Latency of webhook processing stages", stage="risk")
+DEDUP_SECONDS = metrics.histogram("stage_seconds", "Latency of webhook processing stages", stage="dedup")
+SESSION_REJECTS = metrics.counter("rejected_signals_total", "Signals rejected before execution", reason="session")
+LOSS_LIMIT_REJECTS = metrics.counter("rejected_signals_total", "Signals rejected before execution", reason="loss_limit")
+DUPLICATES = metrics.counter("duplicate_signals_total", "Repeated alerts answered from the dedup cache")
+
+def _completed(result):
+    """
+    Wrap a result in an already completed Future.
+    """
+    future = Future()
+    future.set_result(result)
+    return future
+
 class WebhookHandler:
     """
     Handler for processing webhook requests from signal sources.
@@ -22,8 +57,40 @@ class WebhookHandler:
         Initialize the webhook handler.
         """
         self.passphrase = settings.WEBHOOK_PASSPHRASE
+        self.broker = broker_session
+        self.batcher = order_batcher
+        self.risk_gate = risk_gate
+        self.notifier = notification_service
+        self.calendar = trading_calendar
+        self.history = history_store
+        self.events = event_broadcaster
+        
+        # Cache of recent alerts used to suppress duplicates
+        self.dedup_cache = None
+        if settings.ENABLE_DEDUP:
+            self.dedup_cache = TTLCache(settings.DEDUP_MAX_ENTRIES, settings.DEDUP_WINDOW_SECONDS)
+        
         logger.info("Webhook handler initialized")
     
+    def on_settings(self, old, new):
+        """
+        Settings listener: apply a new passphrase and dedup window.
+        
+        A resized dedup cache keeps its entries, so alerts in flight are
+        still suppressed; disabling dedup drops the cache.
+        """
+        if new.WEBHOOK_PASSPHRASE != old.WEBHOOK_PASSPHRASE:
+            self.passphrase = new.WEBHOOK_PASSPHRASE
+            logger.info("Webhook passphrase updated")
+        
+        dedup_cache = self.dedup_cache
+        if not new.ENABLE_DEDUP:
+            self.dedup_cache = None
+        elif dedup_cache is None:
+            self.dedup_cache = TTLCache(new.DEDUP_MAX_ENTRIES, new.DEDUP_WINDOW_SECONDS)
+        else:
+            dedup_cache.resize(new.DEDUP_MAX_ENTRIES, new.DEDUP_WINDOW_SECONDS)
+    
     def process_request(self, data):
         """
         Process a webhook request.
@@ -35,88 +102,270 @@ class WebhookHandler:
             dict: Response with status and message
         """
         try:
-            # Validate the webhook passphrase
-            if not self._validate_passphrase(data):
-                logger.warning("Invalid passphrase in webhook request")
-                return {
-                    "success": False,
-                    "message": "Invalid passphrase"
-                }
+            signal = Signal.from_payload(data, self.passphrase)
+        except SignalError as e:
+            logger.warning("Invalid webhook request: %s", e)
+            return {
+                "success": False,
+                "message": str(e)
+            }
+        
+        return self.process_signal(signal)
+    
+    def process_signal(self, signal, wait=True, claimed=False):
+        """
+        Process a validated trading signal.
+        
+        Args:
+            signal (Signal): Validated trading signal
+            wait (bool, optional): Wait for the result. When False a Future is
+                returned instead, so callers are not held up by order batching.
+                Defaults to True.
+            claimed (bool, optional): The signal's dedup key was already reserved
+                with claim(), so the cache is not consulted again. Defaults to False.
             
-            # Extract the ticker symbol
-            ticker = data.get("ticker", "")
-            if not ticker:
-                logger.warning("Missing ticker in webhook request")
+        Returns:
+            dict: Response with status and message, or a Future resolving to it
+                if wait is False
+        """
+        # Return the cached response for repeats within the dedup window,
+        # before any other check (read once: a settings reload may swap the cache)
+        key = signal.dedup_key()
+        dedup_cache = self.dedup_cache
+        if dedup_cache is not None and not claimed:
+            start = time.perf_counter_ns()
+            cached = dedup_cache.get_or_set(key, _IN_PROGRESS)
+            DEDUP_SECONDS.since(start)
+            if cached is not None:
+                DUPLICATES.inc()
+                logger.info("Duplicate signal suppressed: %s", signal)
+                return cached if wait else _completed(cached)
+        
+        # Reject signals outside the trading sessions for this symbol
+        start = time.perf_counter_ns()
+        if not self.calendar.is_trading_allowed(symbol=signal.ticker):
+            RISK_SECONDS.since(start)
+            SESSION_REJECTS.inc()
+            logger.warning("Trading not allowed for %s at this time", signal.ticker)
+            result = {
+                "success": False,
+                "message": f"Trading not allowed for {signal.ticker} at this time"
+            }
+            self._finish(signal, dedup_cache, key, result)
+            return result if wait else _completed(result)
+        
+        # Reject new orders once the daily loss limit has been reached
+        if not self.risk_gate.approve(signal.ticker):
+            RISK_SECONDS.since(start)
+            LOSS_LIMIT_REJECTS.inc()
+            logger.warning("Daily loss limit reached, rejecting %s", signal)
+            result = {
+                "success": False,
+                "message": "Daily loss limit reached"
+            }
+            self._finish(signal, dedup_cache, key, result)
+            return result if wait else _completed(result)
+        
+        RISK_SECONDS.since(start)
+        
+        if self.batcher.running:
+            try:
+                future = self._batch_signal(signal)
+            except Exception:
+                # Release the placeholder, or retries are suppressed until it expires
+                if dedup_cache is not None:
+                    dedup_cache.delete(key)
+                raise
+            future.add_done_callback(lambda done: self._finish(signal, dedup_cache, key, done.result()))
+            if not wait:
+                return future
+            try:
+                return future.result(timeout=self.batcher.timeout)
+            except FutureTimeoutError:
+                # The batch still completes and records the outcome when it does
+                logger.error("No result for %s after %ss of order batching", signal, self.batcher.timeout)
                 return {
                     "success": False,
-                    "message": "Missing ticker"
+                    "message": "Timed out waiting for the order batch"
                 }
+        
+        result = self._execute_signal(signal)
+        self._finish(signal, dedup_cache, key, result)
+        return result if wait else _completed(result)
+    
+    def _finish(self, signal, dedup_cache, key, result):
+        """
+        Record the outcome of a signal and cache it for duplicate suppression.
+        
+        Only successful executions suppress later repeats.
+        """
+        self._record(signal, result)
+        if dedup_cache is None:
+            return
+        if result["success"]:
+            dedup_cache.set(key, result)
+        else:
+            dedup_cache.delete(key)
+    
+    def _record(self, signal, result):
+        """
+        Store the outcome of a signal and publish it to the event streams.
+        """
+        self.history.record_signal(signal, result)
+        self.events.on_signal(signal, result)
+    
+    def claim(self, signal):
+        """
+        Check a signal against the dedup cache and reserve its key.
+        
+        Used by acknowledge-then-process mode, which answers duplicates before
+        queueing. A signal that is not a duplicate must then be processed with
+        claimed=True, or released if it cannot be queued.
+        
+        Args:
+            signal (Signal): Validated trading signal
             
-            # Extract the strategy information
-            strategy = data.get("strategy", {})
-            if not strategy:
-                logger.warning("Missing strategy in webhook request")
-                return {
-                    "success": False,
-                    "message": "Missing strategy information"
-                }
+        Returns:
+            dict: Cached response, or None if the signal is not a duplicate
+        """
+        dedup_cache = self.dedup_cache
+        if dedup_cache is None:
+            return None
+        start = time.perf_counter_ns()
+        cached = dedup_cache.get_or_set(signal.dedup_key(), _IN_PROGRESS)
+        DEDUP_SECONDS.since(start)
+        if cached is not None:
+            DUPLICATES.inc()
+        return cached
+    
+    def release(self, signal):
+        """
+        Drop the dedup key reserved by claim() for a signal that was not processed.
+        
+        Args:
+            signal (Signal): Validated trading signal
+        """
+        dedup_cache = self.dedup_cache
+        if dedup_cache is not None:
+            dedup_cache.delete(signal.dedup_key())
+    
+    def _build_order(self, signal):
+        """
+        Build the order for a signal.
+        
+        Args:
+            signal (Signal): Validated trading signal
             
-            # Extract the order action
-            order_action = strategy.get("order_action", "").lower()
-            if order_action not in ["buy", "sell"]:
-                logger.warning(f"Invalid order action: {order_action}")
-                return {
-                    "success": False,
-                    "message": f"Invalid order action: {order_action}"
-                }
+        Returns:
+            Order: Order sized for the symbol
+        """
+        symbol_info = self.broker.get_symbol_info(signal.ticker)
+        size = self.risk_gate.position_size(signal.ticker)
+        if size is None:
+            # No ATR yet: fixed volume without protective stops
+            return Order(
+                signal.ticker,
+                signal.action,
+                symbol_info.normalize_volume(settings.snapshot.ORDER_VOLUME),
+                price=signal.price,
+                comment="webhook"
+            )
+        
+        direction = 1 if signal.action == "buy" else -1
+        return Order(
+            signal.ticker,
+            signal.action,
+            size.volume,
+            price=signal.price,
+            sl=symbol_info.normalize_price(signal.price - direction * size.stop_distance),
+            tp=symbol_info.normalize_price(signal.price + direction * size.target_distance),
+            comment="webhook"
+        )
+    
+    def _batch_signal(self, signal):
+        """
+        Add a signal's order to the current micro-batch.
+        
+        Args:
+            signal (Signal): Validated trading signal
             
-            # Extract the order price
-            order_price = strategy.get("order_price", 0)
-            if not order_price:
-                logger.warning("Missing order price in webhook request")
-                return {
-                    "success": False,
-                    "message": "Missing order price"
-                }
+        Returns:
+            Future: Resolves to the response once the batch has been sent
+        """
+        logger.info("Batching trade: %s %s at %s", signal.action, signal.ticker, signal.price)
+        try:
+            return self.batcher.submit(signal, self._build_order(signal))
+        except BrokerError as e:
+            logger.error("Broker error executing %s: %s", signal, e)
+            self.notifier.notify("Broker error", f"{signal}: {e}", level="error")
+            return _completed({
+                "success": False,
+                "message": f"Broker error: {str(e)}"
+            })
+        except RuntimeError:
+            # The batcher was stopped after the check; send the order directly
+            return _completed(self._execute_signal(signal))
+    
+    def _execute_signal(self, signal):
+        """
+        Execute a trading signal.
+        
+        Args:
+            signal (Signal): Validated trading signal
             
+        Returns:
+            dict: Response with status and message
+        """
+        try:
             # Execute the trade
-            logger.info(f"Processing trade: {order_action} {ticker} at {order_price}")
+            logger.info("Processing trade: %s %s at %s", signal.action, signal.ticker, signal.price)
+            
+            result = self.broker.submit_order(self._build_order(signal))
             
-            # TODO: Implement trade execution
-            # This is a placeholder for actual trade execution logic
+            if not result.success:
+                logger.warning("Order rejected for %s: %s", signal.ticker, result.message)
+                self.notifier.notify("Order rejected", f"{signal}: {result.message}", level="warning")
+                return {
+                    "success": False,
+                    "message": f"Order rejected: {result.message}"
+                }
             
+            data = signal.to_dict()
+            data["order"] = result.to_dict()
             return {
                 "success": True,
-                "message": f"Processed {order_action} signal for {ticker}",
-                "data": {
-                    "ticker": ticker,
-                    "action": order_action,
-                    "price": order_price
-                }
+                "message": f"Processed {signal.action} signal for {signal.ticker}",
+                "data": data
             }
             
+        except BrokerError as e:
+            logger.error("Broker error executing %s: %s", signal, e)
+            self.notifier.notify("Broker error", f"{signal}: {e}", level="error")
+            return {
+                "success": False,
+                "message": f"Broker error: {str(e)}"
+            }
         except Exception as e:
-            logger.exception(f"Error processing webhook request: {str(e)}")
+            logger.exception("Error processing webhook request: %s", e)
             return {
                 "success": False,
                 "message": f"Error processing webhook request: {str(e)}"
             }
     
-    def _validate_passphrase(self, data):
+    def on_fill(self, order, result):
         """
-        Validate the webhook passphrase.
-        
-        Args:
-            data (dict): Webhook payload data
-            
-        Returns:
-            bool: True if passphrase is valid, False otherwise
+        Fill listener: announce executed orders.
         """
-        if not self.passphrase:
-            # If no passphrase is configured, accept all requests
-            return True
-            
-        return data.get("passphrase", "") == self.passphrase
-
-# Create a singleton instance
-webhook_handler = WebhookHandler()
\ No newline at end of file
+        self.notifier.notify(
+            f"{order.action.upper()} {order.symbol}",
+            order.comment,
+            level="success",
+            fields={"Volume": result.volume or order.volume, "Price": result.price or order.price,
+                    "SL": order.sl, "TP": order.tp, "Order": result.order_id}
+        )
+    
+# Create a singleton instance, announce fills from the shared broker session
+# and follow settings reloads
+webhook_handler = WebhookHandler()
+broker_session.add_fill_listener(webhook_handler.on_fill)
+settings_reloader.add_listener(webhook_handler.on_settings)
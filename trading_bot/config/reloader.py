@@ -0,0 +1,219 @@
+"""
+Hot reload of the settings.
+
+A reload re-reads the .env file and parses a new snapshot. If a setting in
+settings.RELOADABLE changed, the snapshot is published under the next
+version and the listeners registered by the services that derive state from
+the settings (trading calendar, risk gate, position book, webhook handler
+and scheduler) are called with the old and new snapshots. Changes to the
+other settings are logged and left for the next restart.
+
+Reloads are started from POST /admin/reload, SIGHUP in development mode, or
+by the watcher that checks the .env file every SETTINGS_RELOAD_SECONDS.
+"""
+import os
+import signal
+import threading
+
+from trading_bot.utils.logger import setup_logger
+from trading_bot.config import settings
+
+# Configure logging
+logger = setup_logger("config.reloader")
+
+class SettingsReloader:
+    """
+    Reloads the settings and notifies listeners of the new version.
+    """
+
+    def __init__(self):
+        """
+        Initialize the reloader.
+        """
+        self._lock = threading.Lock()
+        self._listeners = []
+        self._watcher = None
+        self._stop = threading.Event()
+        self._mtime = self._dotenv_mtime()
+
+        self.reloads = 0
+        self.failures = 0
+        self.last_error = None
+        self.restart_required = []
+
+    def add_listener(self, callback):
+        """
+        Register a callback for settings changes.
+
+        Args:
+            callback (callable): Called as callback(old, new) with the previous
+                and the published Settings after a reload changed a setting
+        """
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        """
+        Unregister a callback added with add_listener.
+
+        Args:
+            callback (callable): Registered callback
+        """
+        try:
+            self._listeners.remove(callback)
+        except ValueError:
+            pass
+
+    def reload(self):
+        """
+        Reload the settings from the .env file and the process environment.
+
+        Returns:
+            dict: New version, the settings applied and the settings that
+                changed but need a restart
+
+        Raises:
+            ValueError: If a value cannot be parsed; the current settings are kept
+        """
+        # Serialized so listeners see the versions in order
+        with self._lock:
+            self._mtime = self._dotenv_mtime()
+            old = settings.snapshot
+            try:
+                parsed = settings.load(settings.read_environ(), old.version + 1)
+            except ValueError as e:
+                self.failures += 1
+                self.last_error = str(e)
+                logger.error("Settings not reloaded: %s", e)
+                raise
+
+            values = old.as_dict()
+            changed = []
+            restart_required = []
+            for name in settings.NAMES:
+                value = getattr(parsed, name)
+                if value == values[name]:
+                    continue
+                if name in settings.RELOADABLE:
+                    values[name] = value
+                    changed.append(name)
+                else:
+                    restart_required.append(name)
+
+            self.last_error = None
+            self.restart_required = restart_required
+            if restart_required:
+                logger.warning("Settings changed that apply after a restart: %s", ", ".join(restart_required))
+
+            if not changed:
+                logger.info("Settings reloaded, nothing to apply (version %d)", old.version)
+                return self._result(old.version, changed)
+
+            new = settings.Settings(old.version + 1, **values)
+            settings.publish(new)
+            self.reloads += 1
+            logger.info("Settings reloaded (version %d): %s", new.version, ", ".join(changed))
+
+            for callback in list(self._listeners):
+                try:
+                    callback(old, new)
+                except Exception as e:
+                    logger.exception("Error in settings listener: %s", e)
+
+            return self._result(new.version, changed)
+
+    def watch(self):
+        """
+        Start reloading whenever the .env file changes.
+
+        Does nothing if SETTINGS_RELOAD_SECONDS is 0 or there is no .env file.
+        """
+        if self._watcher is not None or settings.SETTINGS_RELOAD_SECONDS <= 0:
+            return
+        if not settings.DOTENV_PATH:
+            logger.warning("No .env file to watch for settings changes")
+            return
+
+        self._stop.clear()
+        self._watcher = threading.Thread(target=self._watch, name="settings-watcher", daemon=True)
+        self._watcher.start()
+        logger.info("Watching %s for settings changes every %ss",
+                    settings.DOTENV_PATH, settings.SETTINGS_RELOAD_SECONDS)
+
+    def stop(self):
+        """
+        Stop watching the .env file.
+        """
+        watcher = self._watcher
+        if watcher is not None:
+            self._stop.set()
+            watcher.join(timeout=5)
+            self._watcher = None
+
+    def install_signal_handler(self):
+        """
+        Reload on SIGHUP.
+
+        Only possible from the main thread on platforms with SIGHUP.
+        """
+        if not hasattr(signal, "SIGHUP"):
+            return
+        try:
+            signal.signal(signal.SIGHUP, lambda signum, frame: self._reload_from_signal())
+        except ValueError:
+            logger.warning("The reload signal can only be installed from the main thread")
+            return
+        logger.info("Settings reload signal installed (SIGHUP)")
+
+    def get_stats(self):
+        """
+        Get the reload state.
+
+        Returns:
+            dict: Version and reload counters
+        """
+        return {
+            "version": settings.snapshot.version,
+            "reloads": self.reloads,
+            "failures": self.failures,
+            "last_error": self.last_error,
+            "restart_required": self.restart_required,
+            "watching": self._watcher is not None
+        }
+
+    def _result(self, version, changed):
+        return {
+            "version": version,
+            "changed": changed,
+            "restart_required": self.restart_required
+        }
+
+    def _reload_from_signal(self):
+        # Leave the interrupted frame quickly; the lock may be held by it
+        def run():
+            try:
+                self.reload()
+            except ValueError:
+                pass
+        threading.Thread(target=run, name="settings-reload", daemon=True).start()
+
+    def _watch(self):
+        # The interval is read on every pass so it can be reloaded too; 0 stops the watcher
+        while settings.SETTINGS_RELOAD_SECONDS > 0 and not self._stop.wait(settings.SETTINGS_RELOAD_SECONDS):
+            if self._dotenv_mtime() == self._mtime:
+                continue
+            try:
+                self.reload()
+            except ValueError:
+                pass
+            except Exception as e:
+                logger.exception("Error reloading settings: %s", e)
+        self._watcher = None
+
+    def _dotenv_mtime(self):
+        try:
+            return os.stat(settings.DOTENV_PATH).st_mtime_ns
+        except OSError:
+            return None
+
+# Create a singleton instance
+settings_reloader = SettingsReloader()
@@ -1,50 +1,296 @@
 """
 Settings configuration for the trading bot.
+
+Settings are read from the environment and the .env file at import and
+parsed into an immutable, versioned Settings snapshot. Every setting is also
+a module attribute (settings.WEBHOOK_PORT), which is how the rest of the
+package reads them.
+
+The settings in RELOADABLE can be changed without a restart (see
+config/reloader.py): a reload parses a new snapshot and publishes it with a
+single reference swap, so code that needs several settings to agree reads
+settings.snapshot once and takes them all from it.
 """
 import os
-from dotenv import load_dotenv
+import threading
+from dotenv import load_dotenv, find_dotenv, dotenv_values
+
+def _bool(value):
+    return value.lower() in ("true", "1", "yes")
+
+# Name, type and default of every setting. Subsystems added on top of the
+# original bot are off by default and enabled in .env (see env.example)
+FIELDS = (
+    # MetaTrader5 settings
+    ("MT5_USERNAME", str, ""),
+    ("MT5_PASSWORD", str, ""),
+    ("MT5_SERVER", str, ""),
+
+    # Broker settings (simulated fills orders locally; mt5 sends them to MetaTrader 5)
+    ("BROKER", str, "simulated"),
+    ("ORDER_VOLUME", float, 0.01),
+    ("BROKER_HEALTH_INTERVAL", float, 10.0),
+    ("BROKER_BACKOFF_INITIAL", float, 1.0),
+    ("BROKER_BACKOFF_MAX", float, 60.0),
+    ("BROKER_SYMBOL_CACHE_TTL", float, 3600.0),
+    # Seconds per order round trip when BROKER=simulated
+    ("SIMULATED_BROKER_LATENCY", float, 0.0),
+
+    # Order micro-batching (nets same-ticker orders arriving within the window)
+    ("ENABLE_ORDER_BATCHING", _bool, False),
+    ("ORDER_BATCH_WINDOW_MS", float, 5.0),
+    ("ORDER_BATCH_MAX_SIZE", int, 100),
+    # Seconds a webhook waits for the result of its batch
+    ("ORDER_BATCH_TIMEOUT", float, 30.0),
+
+    # Webhook settings
+    ("WEBHOOK_PASSPHRASE", str, ""),
+    ("WEBHOOK_ENDPOINT", str, "/webhook"),
+    ("WEBHOOK_PORT", int, 5000),
+    ("WEBHOOK_HOST", str, "0.0.0.0"),
+
+    # Ingest queue settings
+    ("ENABLE_ASYNC_INGEST", _bool, False),
+    ("INGEST_QUEUE_SIZE", int, 1000),
+    ("INGEST_WORKERS", int, 4),
+    ("INGEST_BACKPRESSURE", str, "reject"),
+    ("INGEST_BLOCK_TIMEOUT", float, 0.05),
+
+    # Write-ahead signal journal (replayed on startup)
+    ("ENABLE_SIGNAL_JOURNAL", _bool, False),
+    ("SIGNAL_JOURNAL_DIR", str, "logs/journal"),
+    ("SIGNAL_JOURNAL_SEGMENT_BYTES", int, 16 * 1024 * 1024),
+
+    # Signal, trade and position history (SQLite)
+    ("ENABLE_HISTORY", _bool, False),
+    ("HISTORY_DB", str, "data/history.db"),
+    ("HISTORY_BATCH_SIZE", int, 500),
+    ("HISTORY_FLUSH_MS", float, 50.0),
+    ("HISTORY_QUEUE_SIZE", int, 100000),
+
+    # Server-sent event stream (/events)
+    ("ENABLE_EVENTS", _bool, False),
+    ("EVENTS_MAX_CLIENTS", int, 4),
+    ("EVENTS_BUFFER_SIZE", int, 256),
+    ("EVENTS_KEEPALIVE_SECONDS", float, 15.0),
+
+    # Duplicate alert suppression
+    ("ENABLE_DEDUP", _bool, False),
+    ("DEDUP_WINDOW_SECONDS", float, 60.0),
+    ("DEDUP_MAX_ENTRIES", int, 10000),
+
+    # Production server settings
+    # Worker processes; only 1 is supported while positions and risk state are per process
+    ("SERVER_WORKERS", int, 1),
+    ("SERVER_THREADS", int, 8),
+    ("SERVER_KEEPALIVE", int, 5),
+    ("SERVER_GRACEFUL_TIMEOUT", int, 30),
+    ("SCHEDULER_LOCK_FILE", str, "logs/scheduler.lock"),
+
+    # Metrics exposed on /metrics
+    ("ENABLE_METRICS", _bool, False),
+
+    # Admin endpoints require this token in the X-Admin-Token header (empty disables them)
+    ("ADMIN_TOKEN", str, ""),
+
+    # On-demand profiling (/admin/profile, SIGUSR1 and SIGUSR2)
+    ("ENABLE_PROFILING", _bool, False),
+    ("PROFILE_DIR", str, "logs/profiles"),
+    ("PROFILE_SAMPLE_INTERVAL_MS", float, 5.0),
+    ("PROFILE_SAMPLE_SECONDS", float, 10.0),
+    ("PROFILE_TRACE_COUNT", int, 50),
+
+    # Notification settings
+    ("DISCORD_WEBHOOK_URL", str, ""),
+    ("ENABLE_NOTIFICATIONS", _bool, True),
+    ("NOTIFICATION_QUEUE_SIZE", int, 1000),
+    ("NOTIFICATION_BATCH_SECONDS", float, 1.0),
+    ("NOTIFICATION_TIMEOUT", float, 5.0),
+
+    # Scheduler settings
+    ("SCHEDULER_INTERVAL_SECONDS", int, 15),
+    ("ENABLE_SCHEDULER", _bool, True),
+    # Comma-separated symbols evaluated by the scheduler
+    ("WATCHLIST", str, ""),
+    ("SCHEDULER_WORKERS", int, 8),
+    # Seconds an evaluation cycle may take (0 means 80% of the interval)
+    ("SCHEDULER_CYCLE_DEADLINE", float, 0.0),
+
+    # Event-driven evaluation from a live tick feed; the interval job becomes a sweep
+    ("ENABLE_TICK_STREAM", _bool, False),
+    # Tick feed: mt5 or synthetic
+    ("TICK_FEED", str, "mt5"),
+    # Price move in percent since the last evaluation that triggers a new one
+    ("TICK_THRESHOLD_PERCENTAGE", float, 0.01),
+    # Interval of the safety sweep while the tick stream runs
+    ("TICK_SWEEP_SECONDS", int, 300),
+    ("TICK_WORKERS", int, 4),
+    ("TICK_POLL_MS", float, 100.0),
+    # Ticks per second per symbol from the synthetic feed
+    ("SYNTHETIC_TICK_RATE", float, 10.0),
+
+    # Trading settings
+    ("RISK_PERCENTAGE", float, 1.0),
+    ("REWARD_PERCENTAGE", float, 2.0),
+    ("ATR_PERIOD", int, 14),
+    ("ATR_MULTIPLIER", float, 2.0),
+
+    # Market data settings
+    ("MARKET_DATA_SOURCE", str, "mt5"),
+    ("MARKET_DATA_CACHE_DIR", str, "data/bars"),
+    ("MARKET_DATA_CSV_DIR", str, "data/csv"),
+    ("MARKET_DATA_HISTORY_BARS", int, 1000),
+    ("MARKET_DATA_TIMEFRAME", str, "M15"),
+
+    # Risk management settings
+    ("MAX_DAILY_LOSS_PERCENTAGE", float, 5.0),
+    ("ALLOW_WEEKEND_TRADING", _bool, False),
+    ("TRADING_HOURS_START", str, "00:00"),
+    ("TRADING_HOURS_END", str, "23:59"),
+    # Comma-separated HH:MM-HH:MM sessions; overrides TRADING_HOURS_START/END when set
+    ("TRADING_SESSIONS", str, ""),
+    # Per-symbol sessions, e.g. "US30=14:30-21:00;XAUUSD=01:00-12:00,13:00-23:00"
+    ("SYMBOL_SESSIONS", str, ""),
+    # Comma-separated YYYY-MM-DD dates with no trading
+    ("TRADING_HOLIDAYS", str, ""),
+    # IANA timezone the sessions are expressed in (empty for local time)
+    ("TRADING_TIMEZONE", str, ""),
+
+    # Logging settings
+    ("LOG_LEVEL", str, "INFO"),
+    ("LOG_FILE", str, "logs/trading_bot.log"),
+    ("LOG_ASYNC", _bool, False),
+    ("LOG_FORMAT", str, "text"),
+
+    # Advanced position management
+    ("ENABLE_BREAKEVEN", _bool, True),
+    ("BREAKEVEN_TRIGGER_PERCENTAGE", float, 0.5),
+    ("ENABLE_TRAILING_STOP", _bool, False),
+    ("TRAILING_STOP_TRIGGER_PERCENTAGE", float, 0.7),
+    ("TRAILING_STOP_STEP_PERCENTAGE", float, 0.2),
+
+    # Seconds between checks of the .env file for changes (0 disables; see RELOADABLE)
+    ("SETTINGS_RELOAD_SECONDS", float, 0.0),
+)
+
+NAMES = tuple(name for name, _, _ in FIELDS)
+
+# Settings applied to the running services on reload; the others are only
+# read at startup and keep their value until the next restart
+RELOADABLE = frozenset((
+    "WEBHOOK_PASSPHRASE", "ORDER_VOLUME", "ADMIN_TOKEN",
+    "ENABLE_DEDUP", "DEDUP_WINDOW_SECONDS", "DEDUP_MAX_ENTRIES",
+    "SCHEDULER_INTERVAL_SECONDS", "WATCHLIST", "SCHEDULER_CYCLE_DEADLINE", "MARKET_DATA_TIMEFRAME",
+    "TICK_THRESHOLD_PERCENTAGE", "TICK_SWEEP_SECONDS",
+    "RISK_PERCENTAGE", "REWARD_PERCENTAGE", "ATR_MULTIPLIER", "MAX_DAILY_LOSS_PERCENTAGE",
+    "ALLOW_WEEKEND_TRADING", "TRADING_HOURS_START", "TRADING_HOURS_END", "TRADING_SESSIONS",
+    "SYMBOL_SESSIONS", "TRADING_HOLIDAYS", "TRADING_TIMEZONE",
+    "ENABLE_BREAKEVEN", "BREAKEVEN_TRIGGER_PERCENTAGE", "ENABLE_TRAILING_STOP",
+    "TRAILING_STOP_TRIGGER_PERCENTAGE", "TRAILING_STOP_STEP_PERCENTAGE",
+    "SETTINGS_RELOAD_SECONDS",
+))
+
+class Settings:
+    """
+    Immutable, typed snapshot of all settings.
+    """
+
+    __slots__ = NAMES + ("version",)
+
+    def __init__(self, version=1, **values):
+        """
+        Initialize the snapshot.
+
+        Args:
+            version (int, optional): Snapshot version, incremented by every
+                reload that changes a setting. Defaults to 1.
+            **values: Parsed value of every setting in FIELDS
+        """
+        object.__setattr__(self, "version", version)
+        for name in NAMES:
+            object.__setattr__(self, name, values[name])
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Settings are read-only: {name}")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"Settings are read-only: {name}")
+
+    def as_dict(self):
+        """
+        Get all settings.
+
+        Returns:
+            dict: Setting name to value
+        """
+        return {name: getattr(self, name) for name in NAMES}
+
+def load(environ=None, version=1):
+    """
+    Parse the settings from the environment.
+
+    Args:
+        environ (Mapping, optional): Variables to read. Defaults to os.environ.
+        version (int, optional): Version of the new snapshot. Defaults to 1.
+
+    Returns:
+        Settings: Parsed settings
+
+    Raises:
+        ValueError: If a value cannot be parsed as its setting's type
+    """
+    environ = os.environ if environ is None else environ
+    values = {}
+    for name, kind, default in FIELDS:
+        raw = environ.get(name)
+        if raw is None:
+            values[name] = default
+            continue
+        try:
+            values[name] = kind(raw)
+        except ValueError:
+            raise ValueError(f"Invalid value for {name}: {raw!r}") from None
+    return Settings(version, **values)
+
+def read_environ():
+    """
+    Read the variables a reload parses: the .env file as it is now, with the
+    variables set in the process environment at startup taking precedence,
+    as they did when the settings were first loaded.
+
+    Returns:
+        dict: Variable name to value
+    """
+    environ = {}
+    if DOTENV_PATH:
+        environ.update((name, value) for name, value in dotenv_values(DOTENV_PATH).items() if value is not None)
+    environ.update(_PROCESS_ENVIRON)
+    return environ
+
+def publish(new):
+    """
+    Make a snapshot the current settings.
+
+    The module attributes are updated first and the snapshot reference is
+    swapped last, so a reader of settings.snapshot sees either the old or the
+    new settings in full.
+
+    Args:
+        new (Settings): Snapshot to publish
+    """
+    global snapshot
+    with _publish_lock:
+        globals().update(new.as_dict())
+        snapshot = new
+
+# Variables set before the .env file is loaded win over it, now and on reload
+_PROCESS_ENVIRON = dict(os.environ)
+_publish_lock = threading.Lock()
 
 # Load environment variables from .env file
-load_dotenv()
-
-# MetaTrader5 settings
-MT5_USERNAME = os.getenv("MT5_USERNAME", "")
-MT5_PASSWORD = os.getenv("MT5_PASSWORD", "")
-MT5_SERVER = os.getenv("MT5_SERVER", "")
-
-# Webhook settings
-WEBHOOK_PASSPHRASE = os.getenv("WEBHOOK_PASSPHRASE", "")
-WEBHOOK_ENDPOINT = os.getenv("WEBHOOK_ENDPOINT", "/webhook")
-WEBHOOK_PORT = int(os.getenv("WEBHOOK_PORT", 5000))
-WEBHOOK_HOST = os.getenv("WEBHOOK_HOST", "0.0.0.0")
-
-# Notification settings
-DISCORD_WEBHOOK_URL = os.getenv("DISCORD_WEBHOOK_URL", "")
-ENABLE_NOTIFICATIONS = os.getenv("ENABLE_NOTIFICATIONS", "True").lower() in ("true", "1", "yes")
-
-# Scheduler settings
-SCHEDULER_INTERVAL_SECONDS = int(os.getenv("SCHEDULER_INTERVAL_SECONDS", 15))
-ENABLE_SCHEDULER = os.getenv("ENABLE_SCHEDULER", "True").lower() in ("true", "1", "yes")
-
-# Trading settings
-RISK_PERCENTAGE = float(os.getenv("RISK_PERCENTAGE", 1.0))
-REWARD_PERCENTAGE = float(os.getenv("REWARD_PERCENTAGE", 2.0))
-ATR_PERIOD = int(os.getenv("ATR_PERIOD", 14))
-ATR_MULTIPLIER = float(os.getenv("ATR_MULTIPLIER", 2.0))
-
-# Risk management settings
-MAX_DAILY_LOSS_PERCENTAGE = float(os.getenv("MAX_DAILY_LOSS_PERCENTAGE", 5.0))
-ALLOW_WEEKEND_TRADING = os.getenv("ALLOW_WEEKEND_TRADING", "False").lower() in ("true", "1", "yes")
-TRADING_HOURS_START = os.getenv("TRADING_HOURS_START", "00:00")
-TRADING_HOURS_END = os.getenv("TRADING_HOURS_END", "23:59")
-
-# Logging settings
-LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
-LOG_FILE = os.getenv("LOG_FILE", "logs/trading_bot.log")
-
-# Advanced position management
-ENABLE_BREAKEVEN = os.getenv("ENABLE_BREAKEVEN", "True").lower() in ("true", "1", "yes")
-BREAKEVEN_TRIGGER_PERCENTAGE = float(os.getenv("BREAKEVEN_TRIGGER_PERCENTAGE", 0.5))
-ENABLE_TRAILING_STOP = os.getenv("ENABLE_TRAILING_STOP", "False").lower() in ("true", "1", "yes")
-TRAILING_STOP_TRIGGER_PERCENTAGE = float(os.getenv("TRAILING_STOP_TRIGGER_PERCENTAGE", 0.7))
-TRAILING_STOP_STEP_PERCENTAGE = float(os.getenv("TRAILING_STOP_STEP_PERCENTAGE", 0.2))
\ No newline at end of file
+DOTENV_PATH = find_dotenv()
+load_dotenv(DOTENV_PATH)
+
+# Parse once; module attributes mirror the snapshot
+snapshot = load()
+globals().update(snapshot.as_dict())
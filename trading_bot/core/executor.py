@@ -0,0 +1,223 @@
+"""
+Sharded executor for per-ticker signal execution.
+
+Work is partitioned by key (the ticker symbol) onto a fixed number of shards.
+Each shard owns one worker thread and one FIFO queue, so tasks for the same
+key run strictly in submission order while tasks for unrelated keys run in
+parallel on other shards.
+"""
+import zlib
+import queue
+import threading
+from concurrent.futures import Future
+
+# Sentinel telling a shard worker to exit once its queue has been drained
+_STOP = object()
+
+class ShardedExecutor:
+    """
+    Executor running tasks on a fixed set of single-threaded shards.
+    """
+
+    def __init__(self, shards, max_queue_size=0, name="shard"):
+        """
+        Initialize the sharded executor.
+
+        Args:
+            shards (int): Number of shards (worker threads)
+            max_queue_size (int, optional): Maximum number of pending tasks per
+                shard. Defaults to 0 (unbounded).
+            name (str, optional): Prefix for worker thread names. Defaults to "shard".
+        """
+        self.shards = max(1, int(shards))
+        self.max_queue_size = max(0, int(max_queue_size))
+        self.name = name
+
+        self._queues = [queue.Queue(maxsize=self.max_queue_size) for _ in range(self.shards)]
+        self._completed = [0] * self.shards
+        self._threads = []
+        self._lock = threading.Lock()
+        self._running = False
+
+    @property
+    def running(self):
+        """
+        bool: True if the shard workers are running.
+        """
+        return self._running
+
+    def start(self):
+        """
+        Start one worker thread per shard.
+
+        After a shutdown, a worker still draining its queue is kept instead of
+        starting a second one on the same queue, which would break the order
+        of its tasks.
+        """
+        with self._lock:
+            if self._running:
+                return
+
+            threads = []
+            for index, q in enumerate(self._queues):
+                thread = self._threads[index] if self._threads else None
+                if thread is not None and thread.is_alive():
+                    with q.mutex:
+                        if _STOP in q.queue:
+                            # Not stopped yet: take back its stop and keep it
+                            q.queue.remove(_STOP)
+                            q.unfinished_tasks -= 1
+                            threads.append(thread)
+                            continue
+                    # It took the stop and is exiting
+                    thread.join()
+
+                thread = threading.Thread(
+                    target=self._worker,
+                    args=(index,),
+                    name=f"{self.name}-{index}",
+                    daemon=True
+                )
+                thread.start()
+                threads.append(thread)
+
+            self._threads = threads
+            self._running = True
+
+    def shutdown(self, wait=True, timeout=None):
+        """
+        Stop the shard workers after all queued tasks have run.
+
+        Args:
+            wait (bool, optional): Wait for the workers to finish. Defaults to True.
+            timeout (float, optional): Seconds to wait for each worker
+        """
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+
+            # Queued past the size bound: a full queue behind a stuck task
+            # must not block shutdown
+            for q in self._queues:
+                with q.mutex:
+                    q.queue.append(_STOP)
+                    q.unfinished_tasks += 1
+                    q.not_empty.notify()
+
+        if wait:
+            for thread in self._threads:
+                thread.join(timeout)
+
+    def shard_for(self, key):
+        """
+        Map a key to its shard index.
+
+        The mapping is stable across processes, unlike the built-in hash().
+
+        Args:
+            key (str): Partition key, usually the ticker symbol
+
+        Returns:
+            int: Shard index
+        """
+        return zlib.crc32(str(key).encode("utf-8")) % self.shards
+
+    def submit(self, key, fn, *args, block=True, timeout=None, **kwargs):
+        """
+        Schedule a task on the shard that owns the given key.
+
+        Args:
+            key (str): Partition key, usually the ticker symbol
+            fn (callable): Function to execute
+            *args: Positional arguments for fn
+            block (bool, optional): Wait for a free slot when the shard queue
+                is full. Defaults to True.
+            timeout (float, optional): Seconds to wait for a free slot
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            Future: Future resolved with the result of fn
+
+        Raises:
+            RuntimeError: If the executor is not running
+            queue.Full: If the shard queue is full
+        """
+        if not self._running:
+            raise RuntimeError("Sharded executor is not running")
+
+        future = Future()
+        self._queues[self.shard_for(key)].put((future, fn, args, kwargs), block, timeout)
+        return future
+
+    def depth(self):
+        """
+        Get the number of pending tasks across all shards.
+
+        Returns:
+            int: Pending task count
+        """
+        return sum(q.qsize() for q in self._queues)
+
+    def oldest(self, age_key):
+        """
+        Find the oldest value of age_key among the tasks at the head of each shard.
+
+        Args:
+            age_key (callable): Function mapping a task's positional arguments to
+                a comparable age value, or None if the task has no age
+
+        Returns:
+            object: Smallest age value, or None if no shard has a pending task
+        """
+        oldest = None
+        for q in self._queues:
+            with q.mutex:
+                if not q.queue or q.queue[0] is _STOP:
+                    continue
+                value = age_key(q.queue[0][2])
+            if value is not None and (oldest is None or value < oldest):
+                oldest = value
+        return oldest
+
+    def get_stats(self):
+        """
+        Get per-shard queue depth and completed task counters.
+
+        Returns:
+            list: One dict per shard
+        """
+        return [
+            {
+                "shard": index,
+                "depth": q.qsize(),
+                "completed": self._completed[index]
+            }
+            for index, q in enumerate(self._queues)
+        ]
+
+    def _worker(self, index):
+        """
+        Worker loop running the tasks of a single shard in FIFO order.
+
+        Args:
+            index (int): Shard index
+        """
+        q = self._queues[index]
+
+        while True:
+            item = q.get()
+            if item is _STOP:
+                break
+
+            future, fn, args, kwargs = item
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+
+            # Only this thread writes to its slot
+            self._completed[index] += 1
@@ -0,0 +1,325 @@
+"""
+Micro-batching and netting of orders.
+
+Orders submitted within a short window are collected and, per ticker, netted
+into a single resulting order: buys add volume, sells subtract it, and
+opposing alerts that cancel out send nothing at all. All net orders of a
+window go to the broker in one submit_orders call. Every batch is recorded
+in an audit trail listing the alerts that were merged into it.
+"""
+import time
+import atexit
+import itertools
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+
+from trading_bot.utils.logger import setup_logger
+from trading_bot.services.broker.base import Order
+from trading_bot.services.broker.session import broker_session
+from trading_bot.config import settings
+
+# Configure logging
+logger = setup_logger("core.order_batcher")
+
+# Number of batch records kept in memory for the audit trail
+AUDIT_SIZE = 1000
+
+class OrderBatcher:
+    """
+    Collects orders for a few milliseconds and sends them as netted batches.
+    """
+
+    def __init__(self, broker, window=None, max_batch=None, timeout=None):
+        """
+        Initialize the order batcher.
+
+        Args:
+            broker (BrokerSession): Broker session the batches are sent to
+            window (float, optional): Seconds to collect orders after the first
+                one arrives. Defaults to ORDER_BATCH_WINDOW_MS.
+            max_batch (int, optional): Orders that close a batch early.
+                Defaults to ORDER_BATCH_MAX_SIZE.
+            timeout (float, optional): Seconds a caller waits for the result of
+                its batch. Defaults to ORDER_BATCH_TIMEOUT.
+        """
+        self.broker = broker
+        self.window = settings.ORDER_BATCH_WINDOW_MS / 1000.0 if window is None else window
+        self.max_batch = max(1, max_batch or settings.ORDER_BATCH_MAX_SIZE)
+        self.timeout = timeout or settings.ORDER_BATCH_TIMEOUT
+
+        self._pending = []
+        self._deadline = None
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+        self._exit_registered = False
+        self._ids = itertools.count(1)
+        self._audit = deque(maxlen=AUDIT_SIZE)
+
+        self.batches = 0
+        self.alerts = 0
+        self.orders_sent = 0
+        self.netted_out = 0
+        self.failed = 0
+
+    @property
+    def running(self):
+        """
+        bool: True if the batching thread is running.
+        """
+        return self._running
+
+    def start(self):
+        """
+        Start the batching thread.
+        """
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+
+        self._thread = threading.Thread(target=self._run, name="order-batcher", daemon=True)
+        self._thread.start()
+        if not self._exit_registered:
+            # Once, however often it is restarted
+            atexit.register(self.stop)
+            self._exit_registered = True
+        logger.info("Order batching started (window: %.1fms, max batch: %s)", self.window * 1000, self.max_batch)
+
+    def stop(self, timeout=None):
+        """
+        Stop the batching thread after flushing pending orders.
+
+        Args:
+            timeout (float, optional): Seconds to wait for the final flush
+        """
+        with self._cond:
+            if not self._running:
+                return
+            self._running = False
+            self._cond.notify()
+
+        self._thread.join(timeout)
+        self._thread = None
+        logger.info("Order batching stopped")
+
+    def submit(self, signal, order):
+        """
+        Add an order to the current batch.
+
+        Args:
+            signal (Signal): Alert the order came from, kept for the audit trail
+            order (Order): Order for this alert alone
+
+        Returns:
+            Future: Resolves to the response dict for this alert
+
+        Raises:
+            RuntimeError: If the batcher is not running
+        """
+        future = Future()
+        with self._cond:
+            if not self._running:
+                raise RuntimeError("Order batcher is not running")
+            if not self._pending:
+                self._deadline = time.monotonic() + self.window
+            self._pending.append((signal, order, future))
+            if len(self._pending) == 1 or len(self._pending) >= self.max_batch:
+                self._cond.notify()
+        return future
+
+    def audit_trail(self, limit=None):
+        """
+        Get recent batch records, newest last.
+
+        Args:
+            limit (int, optional): Maximum number of records. Defaults to all kept.
+
+        Returns:
+            list: Batch records with the merged alerts and the resulting order
+        """
+        with self._cond:
+            records = list(self._audit)
+        return records[-limit:] if limit else records
+
+    def get_stats(self):
+        """
+        Get batching counters.
+
+        Returns:
+            dict: Batching statistics
+        """
+        with self._cond:
+            return {
+                "running": self._running,
+                "window_ms": self.window * 1000,
+                "pending": len(self._pending),
+                "batches": self.batches,
+                "alerts": self.alerts,
+                "orders_sent": self.orders_sent,
+                "netted_out": self.netted_out,
+                "failed": self.failed
+            }
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running and not self._pending:
+                    self._cond.wait()
+                while self._running and len(self._pending) < self.max_batch:
+                    remaining = self._deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+
+                batch, self._pending = self._pending, []
+                stopping = not self._running
+
+            if batch:
+                try:
+                    self._flush(batch)
+                except Exception as e:
+                    # Answer every alert of the batch and keep the thread alive
+                    logger.exception("Batch of %d alerts failed: %s", len(batch), e)
+                    self._fail(batch, str(e))
+            if stopping:
+                return
+
+    def _flush(self, batch):
+        """
+        Net a batch per ticker and send the resulting orders in one call.
+        """
+        batch_id = next(self._ids)
+
+        # Group by ticker, keeping first-arrival order
+        groups = OrderedDict()
+        for entry in batch:
+            groups.setdefault(entry[1].symbol, []).append(entry)
+
+        orders = []
+        records = []
+        for symbol, entries in groups.items():
+            net = sum(order.volume if order.action == "buy" else -order.volume for _, order, _ in entries)
+            net = round(net, 8)
+
+            order = None
+            if net:
+                action = "buy" if net > 0 else "sell"
+                # Price and stops of the latest alert in the net direction: the
+                # last alert may be an opposite one, with its stops on the other side
+                protective = next(order for _, order, _ in reversed(entries) if order.action == action)
+                order = Order(
+                    symbol,
+                    action,
+                    abs(net),
+                    price=protective.price,
+                    sl=protective.sl,
+                    tp=protective.tp,
+                    comment=f"batch {batch_id}"
+                )
+                orders.append(order)
+
+            records.append({
+                "batch": batch_id,
+                "time": time.time(),
+                "symbol": symbol,
+                "alerts": [
+                    {
+                        "ticker": signal.ticker,
+                        "action": signal.action,
+                        "price": signal.price,
+                        "alert_id": signal.alert_id,
+                        "volume": alert_order.volume
+                    }
+                    for signal, alert_order, _ in entries
+                ],
+                "net_action": order.action if order else None,
+                "net_volume": order.volume if order else 0.0,
+                "order": None
+            })
+
+        results = []
+        error = None
+        if orders:
+            try:
+                results = self.broker.submit_orders(orders)
+            except Exception as e:
+                error = str(e)
+                logger.error("Batch %d failed: %s", batch_id, e)
+
+        results = iter(results)
+        for record, entries in zip(records, groups.values()):
+            if error is not None and record["net_volume"]:
+                record["order"] = {"success": False, "message": error}
+            elif record["net_volume"]:
+                result = next(results, None)
+                if result is None:
+                    record["order"] = {"success": False, "message": "No result from broker"}
+                else:
+                    record["order"] = result.to_dict()
+
+            logger.info(
+                "Batch %d %s: %d alerts netted to %s %s -> %s",
+                batch_id, record["symbol"], len(entries), record["net_action"] or "flat",
+                record["net_volume"], record["order"]
+            )
+            for signal, _, future in entries:
+                future.set_result(self._response(signal, record))
+
+        with self._cond:
+            self._audit.extend(records)
+            self.batches += 1
+            self.alerts += len(batch)
+            self.orders_sent += len(orders)
+            self.netted_out += sum(1 for record in records if not record["net_volume"])
+
+    def _fail(self, batch, message):
+        """
+        Resolve the futures of a batch that could not be flushed with a failure.
+        """
+        result = {
+            "success": False,
+            "message": f"Batch order failed: {message}"
+        }
+        for _, _, future in batch:
+            if not future.done():
+                future.set_result(result)
+        with self._cond:
+            self.failed += 1
+
+    def _response(self, signal, record):
+        """
+        Build the response for one alert of a batch.
+        """
+        batch = {
+            "id": record["batch"],
+            "alerts": len(record["alerts"]),
+            "net_action": record["net_action"],
+            "net_volume": record["net_volume"]
+        }
+        data = signal.to_dict()
+        data["batch"] = batch
+
+        order = record["order"]
+        if order is None:
+            return {
+                "success": True,
+                "message": f"Signal for {signal.ticker} netted out in batch {record['batch']}",
+                "data": data
+            }
+        if not order["success"]:
+            return {
+                "success": False,
+                "message": f"Batch order failed: {order['message']}"
+            }
+
+        data["order"] = order
+        return {
+            "success": True,
+            "message": f"Processed {signal.action} signal for {signal.ticker}",
+            "data": data
+        }
+
+# Create a singleton instance (started by the application when enabled)
+order_batcher = OrderBatcher(broker_session)
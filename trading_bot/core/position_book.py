@@ -0,0 +1,702 @@
+"""
+In-memory book of open positions with breakeven and trailing-stop management.
+
+Positions are stored per symbol in parallel NumPy arrays, so a price update
+only touches the positions on that symbol. All prices are kept in
+"favorable" coordinates (price for longs, -price for shorts), which lets
+longs and shorts share the same vectorized rules.
+
+For every symbol the book also keeps the price band inside which no
+position can reach a breakeven or trailing trigger, its stop loss or its
+take profit. A price update inside that band is answered with two float
+comparisons; only a crossing runs the vectorized evaluation.
+
+Breakeven and trailing thresholds are fractions of a position's target
+distance: the distance to its take profit, or, without one, its stop
+distance scaled by REWARD_PERCENTAGE / RISK_PERCENTAGE. Positions with
+neither a stop loss nor a take profit are tracked but not managed.
+
+The book follows a netting account: a fill first reduces or closes the
+opposite positions on its symbol, oldest first, and only the rest opens a
+new position. A position whose stop loss or take profit the price crossed is
+removed once the broker no longer holds it, so the book never manages a
+position the broker has closed, nor forgets one it still holds.
+"""
+import math
+import time
+import threading
+
+from trading_bot.utils.lazy import lazy_import
+from trading_bot.utils.logger import setup_logger
+from trading_bot.services.broker.base import BrokerError
+from trading_bot.services.broker.session import broker_session
+from trading_bot.config import settings
+from trading_bot.config.reloader import settings_reloader
+
+# Configure logging
+logger = setup_logger("core.position_book")
+
+# Loaded when the first position is tracked, not while the app boots
+np = lazy_import("numpy")
+
+# Initial rows allocated per symbol; arrays double when full
+INITIAL_CAPACITY = 16
+
+# Seconds between broker checks of a symbol while a price is beyond a stop
+RECONCILE_SECONDS = 1.0
+
+# Settings the stop management rules are built from
+STOP_SETTINGS = (
+    "ENABLE_BREAKEVEN", "BREAKEVEN_TRIGGER_PERCENTAGE", "ENABLE_TRAILING_STOP",
+    "TRAILING_STOP_TRIGGER_PERCENTAGE", "TRAILING_STOP_STEP_PERCENTAGE",
+    "REWARD_PERCENTAGE", "RISK_PERCENTAGE"
+)
+
+class _SymbolPositions:
+    """
+    Parallel arrays holding the open positions of one symbol.
+    """
+
+    # dtype names rather than np types, so importing the module doesn't load numpy
+    FIELDS = (
+        ("ticket", "int64"),
+        ("direction", "int8"),
+        ("volume", "float64"),
+        ("entry", "float64"),
+        ("sl", "float64"),
+        ("tp", "float64"),
+        ("target", "float64"),
+        ("breakeven_done", "bool"),
+        ("lo", "float64"),
+        ("hi", "float64"),
+    )
+
+    def __init__(self):
+        self.count = 0
+        self.lock = threading.Lock()
+        self.reconciled = -math.inf
+        for name, dtype in self.FIELDS:
+            setattr(self, name, np.zeros(INITIAL_CAPACITY, dtype=dtype))
+
+        # Quiet band per side: (lo, hi) in favorable coordinates
+        self.long_band = (-math.inf, math.inf)
+        self.short_band = (-math.inf, math.inf)
+
+    def append(self, values):
+        if self.count == len(self.ticket):
+            for name, _ in self.FIELDS:
+                array = getattr(self, name)
+                setattr(self, name, np.concatenate((array, np.zeros_like(array))))
+        row = self.count
+        for name, value in values.items():
+            getattr(self, name)[row] = value
+        self.count += 1
+        return row
+
+    def remove(self, row):
+        """
+        Remove a row by moving the last row into its place.
+
+        Returns:
+            int: Ticket of the row that moved, or None
+        """
+        last = self.count - 1
+        moved = None
+        if row != last:
+            for name, _ in self.FIELDS:
+                array = getattr(self, name)
+                array[row] = array[last]
+            moved = int(self.ticket[row])
+        self.count = last
+        return moved
+
+    def view(self, name):
+        return getattr(self, name)[:self.count]
+
+class PositionBook:
+    """
+    Open positions indexed by symbol, with stop management on price updates.
+    """
+
+    def __init__(self, broker=None, enable_breakeven=None, breakeven_trigger=None,
+                 enable_trailing=None, trailing_trigger=None, trailing_step=None, reward_ratio=None,
+                 confirm_closes=True):
+        """
+        Initialize the position book.
+
+        Args:
+            broker (BrokerSession, optional): Where stop modifications are sent.
+                Defaults to None (modifications are only returned).
+            enable_breakeven (bool, optional): Defaults to ENABLE_BREAKEVEN.
+            breakeven_trigger (float, optional): Fraction of the target distance
+                that moves the stop to entry. Defaults to BREAKEVEN_TRIGGER_PERCENTAGE.
+            enable_trailing (bool, optional): Defaults to ENABLE_TRAILING_STOP.
+            trailing_trigger (float, optional): Fraction of the target distance
+                that starts trailing. Defaults to TRAILING_STOP_TRIGGER_PERCENTAGE.
+            trailing_step (float, optional): Trailing distance and minimum stop
+                move as a fraction of the target distance. Defaults to
+                TRAILING_STOP_STEP_PERCENTAGE.
+            reward_ratio (float, optional): Target distance as a multiple of the
+                stop distance for positions without a take profit. Defaults to
+                REWARD_PERCENTAGE / RISK_PERCENTAGE.
+            confirm_closes (bool, optional): Remove a position whose stop loss or
+                take profit was crossed only once the broker no longer holds it.
+                Replay turns this off, its book standing in for the broker's
+                stops. Defaults to True (always off without a broker).
+        """
+        self.broker = broker
+        self.confirm_closes = confirm_closes and broker is not None
+        self.enable_breakeven = settings.ENABLE_BREAKEVEN if enable_breakeven is None else enable_breakeven
+        self.breakeven_trigger = settings.BREAKEVEN_TRIGGER_PERCENTAGE if breakeven_trigger is None else breakeven_trigger
+        self.enable_trailing = settings.ENABLE_TRAILING_STOP if enable_trailing is None else enable_trailing
+        self.trailing_trigger = settings.TRAILING_STOP_TRIGGER_PERCENTAGE if trailing_trigger is None else trailing_trigger
+        self.trailing_step = settings.TRAILING_STOP_STEP_PERCENTAGE if trailing_step is None else trailing_step
+        if reward_ratio is None:
+            reward_ratio = settings.REWARD_PERCENTAGE / settings.RISK_PERCENTAGE if settings.RISK_PERCENTAGE else 0.0
+        self.reward_ratio = reward_ratio
+
+        self._symbols = {}
+        self._tickets = {}
+        self._lock = threading.Lock()
+        self._close_listeners = []
+        self._reduce_listeners = []
+        self._modify_listeners = []
+
+        self.modifications = 0
+        self.closed = 0
+
+    def __len__(self):
+        return len(self._tickets)
+
+    def symbols(self):
+        """
+        Get the symbols with open positions.
+
+        Returns:
+            list: Symbols
+        """
+        return [symbol for symbol, book in self._symbols.items() if book.count]
+
+    def open(self, ticket, symbol, action, volume, entry, sl=0.0, tp=0.0):
+        """
+        Add an open position.
+
+        Args:
+            ticket (int): Position ticket
+            symbol (str): Symbol
+            action (str): "buy" or "sell"
+            volume (float): Volume in lots
+            entry (float): Entry price
+            sl (float, optional): Stop loss price. Defaults to 0.0 (none).
+            tp (float, optional): Take profit price. Defaults to 0.0 (none).
+        """
+        direction = 1 if action == "buy" else -1
+        f_entry = direction * entry
+        f_sl = direction * sl if sl else -math.inf
+        f_tp = direction * tp if tp else math.inf
+
+        if tp:
+            target = abs(tp - entry)
+        elif sl and self.reward_ratio:
+            target = abs(entry - sl) * self.reward_ratio
+        else:
+            target = math.nan
+
+        book = self._book(symbol)
+        with book.lock:
+            row = book.append({
+                "ticket": ticket,
+                "direction": direction,
+                "volume": volume,
+                "entry": f_entry,
+                "sl": f_sl,
+                "tp": f_tp,
+                "target": target,
+                "breakeven_done": False
+            })
+            with self._lock:
+                self._tickets[ticket] = symbol
+            self._update_bands(book, np.array([row]))
+
+    def close(self, ticket, price=None):
+        """
+        Remove a position.
+
+        Args:
+            ticket (int): Position ticket
+            price (float, optional): Exit price, used to report the realized
+                P&L to close listeners. Defaults to None (not reported).
+
+        Returns:
+            bool: True if the position was open
+        """
+        symbol = self._tickets.get(ticket)
+        if symbol is None:
+            return False
+
+        book = self._symbols[symbol]
+        with book.lock:
+            rows = np.flatnonzero(book.view("ticket") == ticket)
+            if not len(rows):
+                return False
+            closes = self._remove_rows(symbol, book, rows, price)
+            self._refresh_bands(book)
+
+        if price is not None:
+            self._notify_close(symbol, closes)
+        return True
+
+    def add_close_listener(self, callback):
+        """
+        Register a callback for closed positions.
+
+        Args:
+            callback (callable): Called as callback(symbol, ticket, pnl), where
+                pnl is the price difference times the volume in lots
+        """
+        self._close_listeners.append(callback)
+
+    def add_reduce_listener(self, callback):
+        """
+        Register a callback for positions partly closed by an opposite fill.
+
+        Args:
+            callback (callable): Called as callback(symbol, ticket, pnl), where
+                pnl is the price difference times the closed volume in lots
+        """
+        self._reduce_listeners.append(callback)
+
+    def add_modify_listener(self, callback):
+        """
+        Register a callback for stops moved at the broker.
+
+        Args:
+            callback (callable): Called as callback(symbol, ticket, sl)
+        """
+        self._modify_listeners.append(callback)
+
+    def unrealized(self, symbol, price):
+        """
+        Get the open P&L of the positions on a symbol.
+
+        Args:
+            symbol (str): Symbol
+            price (float): Current price
+
+        Returns:
+            float: Sum of price difference times volume in lots
+        """
+        book = self._symbols.get(symbol)
+        if book is None or not book.count:
+            return 0.0
+        with book.lock:
+            return float(np.dot(book.view("direction") * price - book.view("entry"), book.view("volume")))
+
+    def get(self, ticket):
+        """
+        Get a position.
+
+        Args:
+            ticket (int): Position ticket
+
+        Returns:
+            dict: Position, or None if not open
+        """
+        symbol = self._tickets.get(ticket)
+        if symbol is None:
+            return None
+        for position in self.positions(symbol):
+            if position["ticket"] == ticket:
+                return position
+        return None
+
+    def positions(self, symbol=None):
+        """
+        Get open positions.
+
+        Args:
+            symbol (str, optional): Only positions on this symbol
+
+        Returns:
+            list: Positions as dicts with prices in normal coordinates
+        """
+        symbols = [symbol] if symbol else list(self._symbols)
+        result = []
+        for name in symbols:
+            book = self._symbols.get(name)
+            if book is None:
+                continue
+            with book.lock:
+                for row in range(book.count):
+                    direction = int(book.direction[row])
+                    sl = book.sl[row]
+                    tp = book.tp[row]
+                    result.append({
+                        "ticket": int(book.ticket[row]),
+                        "symbol": name,
+                        "action": "buy" if direction > 0 else "sell",
+                        "volume": float(book.volume[row]),
+                        "entry": float(direction * book.entry[row]),
+                        "sl": float(direction * sl) if math.isfinite(sl) else 0.0,
+                        "tp": float(direction * tp) if math.isfinite(tp) else 0.0,
+                        "breakeven_done": bool(book.breakeven_done[row])
+                    })
+        return result
+
+    def on_fill(self, order, result):
+        """
+        Fill listener: net the fill against the opposite positions on its
+        symbol and add the position opened by the rest.
+
+        Args:
+            order (Order): Order request
+            result (OrderResult): Successful order result
+        """
+        price = result.price or order.price
+        volume = self._net(order.symbol, order.action, result.volume or order.volume, price)
+        if volume > 0:
+            self.open(result.order_id, order.symbol, order.action, volume, price, sl=order.sl, tp=order.tp)
+
+    def reconcile(self, symbol, price=None, tickets=None):
+        """
+        Remove the positions on a symbol the broker no longer holds.
+
+        Args:
+            symbol (str): Symbol
+            price (float, optional): Exit price reported to close listeners.
+                Defaults to None (not reported).
+            tickets (iterable, optional): Only check these positions. Defaults to all.
+
+        Returns:
+            list: Tickets of the removed positions
+        """
+        book = self._symbols.get(symbol)
+        if book is None or not book.count or self.broker is None:
+            return []
+
+        # Positions opened after this point are missing from the broker's
+        # answer for no other reason than timing, so they are left alone
+        with book.lock:
+            held = set(book.view("ticket").tolist())
+            book.reconciled = time.monotonic()
+        if tickets is not None:
+            held &= set(tickets)
+        if not held:
+            return []
+
+        try:
+            open_tickets = self.broker.get_open_tickets(symbol)
+        except BrokerError as e:
+            logger.warning("Could not check the %s positions at the broker: %s", symbol, e)
+            return []
+        gone = held - set(open_tickets)
+        if not gone:
+            return []
+
+        with book.lock:
+            rows = np.flatnonzero(np.isin(book.view("ticket"), list(gone)))
+            closes = self._remove_rows(symbol, book, rows, price)
+            self._refresh_bands(book)
+
+        self._notify_close(symbol, closes)
+        return [ticket for ticket, _ in closes]
+
+    def on_price(self, symbol, price):
+        """
+        Apply a price update to the positions on a symbol.
+
+        Moves stops to breakeven or trails them when a threshold is crossed,
+        sends the modifications to the broker and drops positions whose stop
+        loss or take profit was hit, once the broker has closed them.
+
+        Args:
+            symbol (str): Symbol
+            price (float): Current price
+
+        Returns:
+            list: (ticket, new stop loss) for every stop that moved
+        """
+        book = self._symbols.get(symbol)
+        if book is None or not book.count:
+            return []
+
+        # Fast path: price inside the band where nothing can trigger
+        long_lo, long_hi = book.long_band
+        short_lo, short_hi = book.short_band
+        if long_lo < price < long_hi and short_lo < -price < short_hi:
+            return []
+
+        closes = ()
+        hit = ()
+        with book.lock:
+            changes, closed = self._evaluate(book, price)
+            if len(closed) and self.confirm_closes:
+                # Checked at the broker at most every RECONCILE_SECONDS while
+                # the price stays beyond the stops
+                if time.monotonic() - book.reconciled >= RECONCILE_SECONDS:
+                    hit = book.ticket[closed].tolist()
+            elif len(closed):
+                closes = self._remove_rows(symbol, book, closed, price)
+            self._refresh_bands(book)
+
+        if closes:
+            self._notify_close(symbol, closes)
+        if hit:
+            self.reconcile(symbol, price, hit)
+        if changes and self.broker is not None:
+            self._send(symbol, book, changes)
+        return [(ticket, sl) for ticket, sl, _, _ in changes]
+
+    def on_settings(self, old, new):
+        """
+        Settings listener: apply new breakeven and trailing rules.
+
+        The quiet bands of the open positions are recomputed under each
+        symbol's lock so no price update is answered from a band built for
+        the old rules. Target distances of open positions are kept.
+        """
+        if all(getattr(old, name) == getattr(new, name) for name in STOP_SETTINGS):
+            return
+        self.enable_breakeven = new.ENABLE_BREAKEVEN
+        self.breakeven_trigger = new.BREAKEVEN_TRIGGER_PERCENTAGE
+        self.enable_trailing = new.ENABLE_TRAILING_STOP
+        self.trailing_trigger = new.TRAILING_STOP_TRIGGER_PERCENTAGE
+        self.trailing_step = new.TRAILING_STOP_STEP_PERCENTAGE
+        self.reward_ratio = new.REWARD_PERCENTAGE / new.RISK_PERCENTAGE if new.RISK_PERCENTAGE else 0.0
+
+        for book in list(self._symbols.values()):
+            with book.lock:
+                if book.count:
+                    self._refresh_bands(book)
+        logger.info("Stop management rules updated (breakeven: %s, trailing stop: %s)",
+                    self.enable_breakeven, self.enable_trailing)
+
+    def get_stats(self):
+        """
+        Get position book counters.
+
+        Returns:
+            dict: Position book statistics
+        """
+        return {
+            "positions": len(self._tickets),
+            "symbols": len(self.symbols()),
+            "modifications": self.modifications,
+            "closed": self.closed,
+            "breakeven": self.enable_breakeven,
+            "trailing_stop": self.enable_trailing
+        }
+
+    def _book(self, symbol):
+        book = self._symbols.get(symbol)
+        if book is None:
+            with self._lock:
+                book = self._symbols.setdefault(symbol, _SymbolPositions())
+        return book
+
+    def _evaluate(self, book, price):
+        """
+        Vectorized breakeven, trailing and exit checks for one symbol.
+        """
+        direction = book.view("direction")
+        entry = book.view("entry")
+        sl = book.view("sl")
+        tp = book.view("tp")
+        target = book.view("target")
+        breakeven_done = book.view("breakeven_done")
+
+        x = direction * price
+        previous_breakeven = breakeven_done.copy()
+        closed = (x <= sl) | (x >= tp)
+        favorable = x - entry
+        new_sl = sl.copy()
+
+        with np.errstate(invalid="ignore"):
+            if self.enable_breakeven:
+                hit = ~breakeven_done & (favorable >= self.breakeven_trigger * target) & ~closed
+                new_sl = np.where(hit, np.maximum(new_sl, entry), new_sl)
+                breakeven_done |= hit
+
+            if self.enable_trailing:
+                step = self.trailing_step * target
+                candidate = x - step
+                move = (favorable >= self.trailing_trigger * target) & (candidate - new_sl >= step) & ~closed
+                new_sl = np.where(move, candidate, new_sl)
+
+        changed = np.flatnonzero(new_sl > sl)
+        changes = [
+            (int(book.ticket[row]), float(direction[row] * new_sl[row]), float(sl[row]), bool(previous_breakeven[row]))
+            for row in changed
+        ]
+        sl[changed] = new_sl[changed]
+        return changes, np.flatnonzero(closed)
+
+    def _send(self, symbol, book, changes):
+        """
+        Send stop modifications to the broker.
+
+        Failed modifications are rolled back so they are retried on the next
+        crossing.
+        """
+        try:
+            info = self.broker.get_symbol_info(symbol)
+        except BrokerError:
+            info = None
+
+        failed = {}
+        for ticket, sl, old_sl, old_breakeven in changes:
+            if info is not None:
+                sl = info.normalize_price(sl)
+            try:
+                result = self.broker.modify_position(ticket, sl=sl)
+                success = result.success
+                message = result.message
+            except BrokerError as e:
+                success = False
+                message = str(e)
+
+            if success:
+                self.modifications += 1
+                logger.info("Moved stop of %s position %s to %s", symbol, ticket, sl)
+                for callback in self._modify_listeners:
+                    try:
+                        callback(symbol, ticket, sl)
+                    except Exception as e:
+                        logger.exception("Error in modify listener: %s", e)
+            else:
+                failed[ticket] = (old_sl, old_breakeven)
+                logger.warning("Failed to move stop of %s position %s: %s", symbol, ticket, message)
+
+        if failed:
+            with book.lock:
+                tickets = book.view("ticket")
+                for ticket, (old_sl, old_breakeven) in failed.items():
+                    rows = np.flatnonzero(tickets == ticket)
+                    if len(rows):
+                        book.sl[rows[0]] = old_sl
+                        book.breakeven_done[rows[0]] = old_breakeven
+                self._refresh_bands(book)
+
+    def _net(self, symbol, action, volume, price):
+        """
+        Reduce or close the opposite positions on a symbol, oldest first.
+
+        Returns:
+            float: Volume left to open a new position with
+        """
+        book = self._symbols.get(symbol)
+        if book is None or not book.count:
+            return volume
+
+        direction = 1 if action == "buy" else -1
+        reduced = []
+        with book.lock:
+            rows = np.flatnonzero(book.view("direction") == -direction)
+            if not len(rows):
+                return volume
+            full = []
+            for row in rows[np.argsort(book.ticket[rows], kind="stable")]:
+                if volume <= 0:
+                    break
+                held = float(book.volume[row])
+                if held <= volume:
+                    full.append(row)
+                else:
+                    book.volume[row] = round(held - volume, 8)
+                    pnl = float((-direction * price - book.entry[row]) * volume)
+                    reduced.append((int(book.ticket[row]), pnl))
+                volume = round(volume - held, 8)
+            closes = self._remove_rows(symbol, book, full, price)
+            self._refresh_bands(book)
+
+        self._notify_close(symbol, closes)
+        for ticket, pnl in reduced:
+            logger.debug("Position %s on %s reduced by an opposite fill", ticket, symbol)
+            for callback in self._reduce_listeners:
+                try:
+                    callback(symbol, ticket, pnl)
+                except Exception as e:
+                    logger.exception("Error in reduce listener: %s", e)
+        return max(volume, 0.0)
+
+    def _remove_rows(self, symbol, book, rows, price=None):
+        """
+        Remove rows and return (ticket, pnl) for each, pnl None without a price.
+        """
+        closes = []
+        # Remove from the highest row down so swapped-in rows are still valid
+        for row in sorted(rows, reverse=True):
+            ticket = int(book.ticket[row])
+            pnl = None
+            if price is not None:
+                pnl = float((book.direction[row] * price - book.entry[row]) * book.volume[row])
+            book.remove(row)
+            with self._lock:
+                self._tickets.pop(ticket, None)
+            self.closed += 1
+            closes.append((ticket, pnl))
+            logger.debug("Position %s on %s closed", ticket, symbol)
+        return closes
+
+    def _notify_close(self, symbol, closes):
+        for ticket, pnl in closes:
+            for callback in self._close_listeners:
+                try:
+                    callback(symbol, ticket, pnl)
+                except Exception as e:
+                    logger.exception("Error in close listener: %s", e)
+
+    def _update_bands(self, book, rows):
+        """
+        Compute the levels of newly added rows and narrow the symbol bands to
+        include them.
+        """
+        self._levels(book, rows)
+        direction = book.direction[rows]
+        for side, band_name in ((1, "long_band"), (-1, "short_band")):
+            mask = direction == side
+            if not mask.any():
+                continue
+            lo, hi = getattr(book, band_name)
+            setattr(book, band_name, (max(lo, book.lo[rows][mask].max()), min(hi, book.hi[rows][mask].min())))
+
+    def _refresh_bands(self, book):
+        rows = np.arange(book.count)
+        self._levels(book, rows)
+        direction = book.view("direction")
+        lo = book.view("lo")
+        hi = book.view("hi")
+        for side, band_name in ((1, "long_band"), (-1, "short_band")):
+            mask = direction == side
+            if mask.any():
+                setattr(book, band_name, (lo[mask].max(), hi[mask].min()))
+            else:
+                setattr(book, band_name, (-math.inf, math.inf))
+
+    def _levels(self, book, rows):
+        """
+        Quiet band per position: below lo the stop is hit, above hi the take
+        profit is hit or a breakeven/trailing threshold is crossed.
+        """
+        entry = book.entry[rows]
+        sl = book.sl[rows]
+        target = book.target[rows]
+        managed = ~np.isnan(target)
+        next_trigger = np.full(len(rows), math.inf)
+
+        if self.enable_breakeven:
+            pending = managed & ~book.breakeven_done[rows]
+            next_trigger = np.where(pending, np.minimum(next_trigger, entry + self.breakeven_trigger * target), next_trigger)
+
+        if self.enable_trailing:
+            step = self.trailing_step * target
+            trailing = np.maximum(entry + self.trailing_trigger * target, sl + 2 * step)
+            next_trigger = np.where(managed, np.minimum(next_trigger, trailing), next_trigger)
+
+        book.lo[rows] = sl
+        book.hi[rows] = np.minimum(next_trigger, book.tp[rows])
+
+# Create a singleton instance and track fills and settings from the shared services
+position_book = PositionBook(broker_session)
+broker_session.add_fill_listener(position_book.on_fill)
+settings_reloader.add_listener(position_book.on_settings)
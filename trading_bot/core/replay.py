@@ -0,0 +1,509 @@
+"""
+Event-driven replay of recorded webhooks and historical bars.
+
+Recorded signals (signal journal segments or JSON lines of raw webhook
+payloads) and closed bars are merged into one time-ordered event stream and
+fed through the same code the live bot runs: WebhookHandler.process_signal
+for signals, and the scheduler's per-bar steps (indicator update, ATR
+sizing, breakeven and trailing stops, open P&L) for bars. Time comes from a
+simulated clock, orders fill on a SimulatedBroker and nothing sleeps, so a
+replay runs as fast as the events can be processed.
+
+Indicator warm-up and event ordering are vectorized with NumPy; parameter
+sweeps over ATR_MULTIPLIER, RISK_PERCENTAGE and the breakeven and trailing
+settings run one replay per combination on a process pool.
+
+Usage:
+    python -m trading_bot replay --signals logs/journal --bars csv --timeframe M15
+    python -m trading_bot replay --signals alerts.jsonl --atr-multiplier 1.5,2,3 --risk-percentage 0.5,1
+"""
+import os
+import sys
+import glob
+import json
+import time
+import logging
+import argparse
+import datetime
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from trading_bot.utils.logger import setup_logger
+from trading_bot.api.signal import Signal, SignalError
+from trading_bot.api.webhook_handler import WebhookHandler
+from trading_bot.api.events import EventBroadcaster
+from trading_bot.core.trading_calendar import trading_calendar
+from trading_bot.core.order_batcher import OrderBatcher
+from trading_bot.core.position_book import PositionBook
+from trading_bot.core.risk_gate import RiskGate
+from trading_bot.services.broker.session import BrokerSession
+from trading_bot.services.broker.simulated_broker import SimulatedBroker
+from trading_bot.services.history.history_store import HistoryStore
+from trading_bot.services.market_data.mt5_data_service import (
+    CSVBarSource, SyntheticBarSource, MT5BarSource, timeframe_seconds
+)
+from trading_bot.services.market_data.indicators import IndicatorEngine
+from trading_bot.services.notifications.notification_service import NotificationService
+from trading_bot.config import settings
+
+# Configure logging
+logger = setup_logger("core.replay")
+
+# Parameters that can be swept, with their settings defaults
+PARAMETERS = {
+    "atr_multiplier": lambda: settings.ATR_MULTIPLIER,
+    "risk_percentage": lambda: settings.RISK_PERCENTAGE,
+    "enable_breakeven": lambda: settings.ENABLE_BREAKEVEN,
+    "breakeven_trigger": lambda: settings.BREAKEVEN_TRIGGER_PERCENTAGE,
+    "enable_trailing": lambda: settings.ENABLE_TRAILING_STOP,
+    "trailing_trigger": lambda: settings.TRAILING_STOP_TRIGGER_PERCENTAGE,
+    "trailing_step": lambda: settings.TRAILING_STOP_STEP_PERCENTAGE,
+}
+
+# Bars used to warm up the indicators before events are replayed
+DEFAULT_WARMUP = 100
+
+class SimulatedClock:
+    """
+    Replay time in epoch seconds, moved forward by the event loop.
+    """
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def datetime(self):
+        """
+        Get the current replay time.
+
+        Returns:
+            datetime: Timezone-aware UTC datetime
+        """
+        return datetime.datetime.fromtimestamp(self.now, datetime.timezone.utc)
+
+class _ReplayCalendar:
+    """
+    Trading calendar that answers for the replay time instead of now.
+    """
+
+    def __init__(self, calendar, clock):
+        self.calendar = calendar
+        self.clock = clock
+
+    def is_trading_allowed(self, when=None, symbol=None):
+        return self.calendar.is_trading_allowed(when or self.clock.datetime(), symbol)
+
+def _parse_time(value):
+    if isinstance(value, (int, float)):
+        return float(value)
+    when = datetime.datetime.fromisoformat(value)
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=datetime.timezone.utc)
+    return when.timestamp()
+
+def load_signals(path, passphrase=None):
+    """
+    Load recorded signals.
+
+    Accepts signal journal segments and JSON lines files whose records hold
+    a "time" (epoch seconds or ISO 8601) and either a journaled "signal" or
+    the raw webhook "payload".
+
+    Args:
+        path (str): File, or directory of *.log / *.jsonl files
+        passphrase (str, optional): Passphrase raw payloads are validated
+            against. Defaults to WEBHOOK_PASSPHRASE.
+
+    Returns:
+        tuple: (list of (time, Signal) sorted by time, number of invalid records)
+    """
+    passphrase = settings.WEBHOOK_PASSPHRASE if passphrase is None else passphrase
+    if os.path.isdir(path):
+        paths = sorted(glob.glob(os.path.join(path, "*.log")) + glob.glob(os.path.join(path, "*.jsonl")))
+    else:
+        paths = [path]
+
+    signals = []
+    invalid = 0
+    for name in paths:
+        with open(name) as records:
+            for line in records:
+                try:
+                    record = json.loads(line)
+                    if "signal" in record:
+                        data = record["signal"]
+                        signal = Signal(data["ticker"], data["action"], data["price"], data.get("alert_id"))
+                    elif "payload" in record:
+                        signal = Signal.from_payload(record["payload"], passphrase)
+                    else:
+                        # Journaled results and other records
+                        continue
+                    signals.append((_parse_time(record["time"]), signal))
+                except (ValueError, KeyError, TypeError, SignalError):
+                    invalid += 1
+
+    signals.sort(key=lambda item: item[0])
+    return signals, invalid
+
+def load_bars(source, symbols, timeframe, start, end):
+    """
+    Load the bars of each symbol that closed between start and end.
+
+    Args:
+        source (BarSource): Bar source
+        symbols (list): Symbols
+        timeframe (str): Timeframe such as "M15"
+        start (float): First bar open time in epoch seconds
+        end (float): Last bar close time in epoch seconds
+
+    Returns:
+        dict: Symbol to bar array, oldest first
+    """
+    seconds = timeframe_seconds(timeframe)
+    count = int((end - start) // seconds) + 1
+    bars = {}
+    for symbol in symbols:
+        data = source.fetch_bars(symbol, timeframe, since=int(start) - 1, count=count)
+        bars[symbol] = data[(data["time"] >= start) & (data["time"] + seconds <= end)]
+    return bars
+
+def default_parameters():
+    """
+    Get the sweepable parameters at their current settings.
+
+    Returns:
+        dict: Parameter name to value
+    """
+    return {name: default() for name, default in PARAMETERS.items()}
+
+class ReplayEngine:
+    """
+    Replays signals and bars through the trading logic on a simulated clock.
+    """
+
+    def __init__(self, bars, signals, timeframe, parameters=None, equity=10000.0, warmup=DEFAULT_WARMUP):
+        """
+        Initialize the replay engine.
+
+        Args:
+            bars (dict): Symbol to bar array, oldest first
+            signals (list): (time, Signal) tuples sorted by time
+            timeframe (str): Timeframe of the bars
+            parameters (dict, optional): Overrides of the sweepable parameters
+            equity (float, optional): Starting account equity. Defaults to 10000.0.
+            warmup (int, optional): Bars per symbol used only to warm up the
+                indicators. Defaults to DEFAULT_WARMUP.
+        """
+        self.bars = bars
+        self.signals = signals
+        self.timeframe = timeframe
+        self.parameters = default_parameters()
+        self.parameters.update(parameters or {})
+        self.equity = equity
+        self.warmup = warmup
+
+    def run(self):
+        """
+        Run the replay.
+
+        Returns:
+            dict: Fills, P&L and throughput
+        """
+        params = self.parameters
+        clock = SimulatedClock()
+        broker = SimulatedBroker(equity=self.equity)
+        session = BrokerSession(broker)
+        session.ensure_connected()
+
+        book = PositionBook(
+            session,
+            enable_breakeven=params["enable_breakeven"],
+            breakeven_trigger=params["breakeven_trigger"],
+            enable_trailing=params["enable_trailing"],
+            trailing_trigger=params["trailing_trigger"],
+            trailing_step=params["trailing_step"],
+            confirm_closes=False
+        )
+        gate = RiskGate(
+            session, book,
+            risk_percentage=params["risk_percentage"],
+            atr_multiplier=params["atr_multiplier"]
+        )
+        session.add_fill_listener(book.on_fill)
+        session.add_fill_listener(gate.on_fill)
+        book.add_close_listener(gate.on_close)
+        book.add_reduce_listener(gate.on_close)
+
+        # The live handler, wired to this replay's broker, book and clock
+        handler = WebhookHandler()
+        handler.broker = session
+        handler.batcher = OrderBatcher(session)
+        handler.risk_gate = gate
+        handler.notifier = NotificationService(enabled=False)
+        handler.history = HistoryStore(enabled=False)
+        handler.events = EventBroadcaster(enabled=False)
+        handler.calendar = _ReplayCalendar(trading_calendar, clock)
+        handler.dedup_cache = None
+
+        contract_sizes = {}
+        trades = []
+
+        def on_close(symbol, ticket, pnl):
+            if pnl is not None:
+                trades.append(pnl * contract_sizes[symbol])
+                # Size later trades from the equity after this one
+                broker.equity += trades[-1]
+
+        book.add_close_listener(on_close)
+        book.add_reduce_listener(on_close)
+
+        # Warm up the indicators on the first bars of each symbol in one pass
+        indicators = IndicatorEngine()
+        seconds = timeframe_seconds(self.timeframe)
+        symbols = list(self.bars)
+        columns = []
+        event_times = []
+        event_kinds = []
+        event_refs = []
+        for index, symbol in enumerate(symbols):
+            bars = self.bars[symbol]
+            contract_sizes[symbol] = session.get_symbol_info(symbol).contract_size
+            warm = bars[:self.warmup]
+            stream = bars[self.warmup:]
+            if len(warm):
+                indicators.warm_up(symbol, warm["high"], warm["low"], warm["close"])
+                gate.update_atr(symbol, indicators.atr(symbol))
+            columns.append(tuple(stream[name].tolist() for name in ("open", "high", "low", "close")))
+
+            # A bar is known once it has closed
+            event_times.append(stream["time"].astype(np.float64) + seconds)
+            event_kinds.append(np.zeros(len(stream), dtype=np.int8))
+            event_refs.append(np.stack([np.full(len(stream), index), np.arange(len(stream))], axis=1))
+
+        event_times.append(np.array([t for t, _ in self.signals], dtype=np.float64))
+        event_kinds.append(np.ones(len(self.signals), dtype=np.int8))
+        event_refs.append(np.stack([np.full(len(self.signals), -1), np.arange(len(self.signals))], axis=1))
+
+        times = np.concatenate(event_times)
+        kinds = np.concatenate(event_kinds)
+        refs = np.concatenate(event_refs).reshape(-1, 2)
+        # Time order; a bar closing at the same instant as a signal comes first
+        order = np.lexsort((kinds, times))
+
+        results = {"accepted": 0, "rejected": 0}
+        last_close = {}
+        day = None
+        bar_events = 0
+        start = time.perf_counter()
+
+        for event in order.tolist():
+            now = times[event]
+            clock.now = now
+            if day != int(now // 86400):
+                if day is not None:
+                    gate.reset_day()
+                day = int(now // 86400)
+
+            index, row = refs[event]
+            if kinds[event]:
+                result = handler.process_signal(self.signals[row][1])
+                results["accepted" if result.get("success") else "rejected"] += 1
+                continue
+
+            symbol = symbols[index]
+            opens, highs, lows, closes = columns[index]
+            o, h, l, c = opens[row], highs[row], lows[row], closes[row]
+
+            # Walk the bar the pessimistic way: toward the adverse extreme first
+            for price in ((o, l, h, c) if c >= o else (o, h, l, c)):
+                book.on_price(symbol, price)
+
+            indicators.update(symbol, h, l, c)
+            gate.update_atr(symbol, indicators.atr(symbol))
+            gate.on_price(symbol, c)
+            last_close[symbol] = c
+            bar_events += 1
+
+        elapsed = time.perf_counter() - start
+
+        realized = float(sum(trades))
+        unrealized = sum(
+            book.unrealized(symbol, price) * contract_sizes[symbol] for symbol, price in last_close.items()
+        )
+        curve = self.equity + np.cumsum(trades) if trades else np.array([self.equity])
+        drawdown = float(np.max(np.maximum.accumulate(np.concatenate([[self.equity], curve])) [1:] - curve))
+        simulated = float(times.max() - times.min()) if len(times) else 0.0
+
+        return {
+            "parameters": params,
+            "events": len(order),
+            "bars": bar_events,
+            "signals": len(self.signals),
+            "fills": len(broker.orders),
+            "accepted": results["accepted"],
+            "rejected": results["rejected"],
+            "stop_modifications": book.modifications,
+            "closed_trades": len(trades),
+            "win_rate": round(sum(1 for pnl in trades if pnl > 0) / len(trades), 4) if trades else 0.0,
+            "realized_pnl": round(realized, 2),
+            "unrealized_pnl": round(unrealized, 2),
+            "net_pnl": round(realized + unrealized, 2),
+            "max_drawdown": round(drawdown, 2),
+            "open_positions": len(book),
+            "elapsed": round(elapsed, 4),
+            "events_per_second": round(len(order) / elapsed) if elapsed else 0,
+            "speedup": round(simulated / elapsed) if elapsed else 0
+        }
+
+# Replay inputs of a sweep worker process, set once by the pool initializer
+_worker_inputs = None
+
+def _init_worker(bars, signals, timeframe, equity, warmup):
+    global _worker_inputs
+    _worker_inputs = (bars, signals, timeframe, equity, warmup)
+
+def _run_worker(parameters):
+    bars, signals, timeframe, equity, warmup = _worker_inputs
+    return ReplayEngine(bars, signals, timeframe, parameters, equity, warmup).run()
+
+def run_sweep(bars, signals, timeframe, grid, workers=None, equity=10000.0, warmup=DEFAULT_WARMUP):
+    """
+    Replay every combination of parameter values.
+
+    Args:
+        bars (dict): Symbol to bar array
+        signals (list): (time, Signal) tuples sorted by time
+        timeframe (str): Timeframe of the bars
+        grid (dict): Parameter name to list of values
+        workers (int, optional): Worker processes. Defaults to the CPU count.
+        equity (float, optional): Starting account equity. Defaults to 10000.0.
+        warmup (int, optional): Indicator warm-up bars. Defaults to DEFAULT_WARMUP.
+
+    Returns:
+        list: One replay report per combination
+    """
+    names = list(grid)
+    combinations = [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+    workers = min(workers or os.cpu_count() or 1, len(combinations))
+
+    if workers <= 1:
+        return [ReplayEngine(bars, signals, timeframe, params, equity, warmup).run() for params in combinations]
+
+    # Inputs are sent once per worker process, not once per combination
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(bars, signals, timeframe, equity, warmup)
+    ) as pool:
+        return list(pool.map(_run_worker, combinations))
+
+def _values(text, kind):
+    if kind is bool:
+        return [value.strip().lower() in ("true", "1", "yes", "on") for value in text.split(",")]
+    return [kind(value) for value in text.split(",")]
+
+def parse_args(argv=None):
+    """
+    Parse replay command line arguments.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m trading_bot replay",
+        description="Replay recorded webhooks and historical bars through the trading logic"
+    )
+    parser.add_argument("--signals", help="Signal journal directory or JSON lines file of recorded webhooks")
+    parser.add_argument("--bars", default=settings.MARKET_DATA_SOURCE, choices=("csv", "synthetic", "mt5"),
+                        help="Bar source")
+    parser.add_argument("--csv-dir", default=settings.MARKET_DATA_CSV_DIR, help="Directory of CSV bars")
+    parser.add_argument("--symbols", help="Comma-separated symbols (defaults to the signal tickers or WATCHLIST)")
+    parser.add_argument("--timeframe", default=settings.MARKET_DATA_TIMEFRAME)
+    parser.add_argument("--start", help="Start time (ISO 8601, UTC unless given)")
+    parser.add_argument("--end", help="End time (ISO 8601, UTC unless given)")
+    parser.add_argument("--days", type=float, default=30, help="Replay length when there are no signals")
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP, help="Indicator warm-up bars per symbol")
+    parser.add_argument("--equity", type=float, default=10000.0)
+    parser.add_argument("--passphrase", default=None, help="Passphrase recorded payloads are checked against")
+    parser.add_argument("--workers", type=int, default=None, help="Processes for parameter sweeps")
+    parser.add_argument("--output", help="Write the reports as JSON to this file")
+    parser.add_argument("--atr-multiplier", type=lambda s: _values(s, float))
+    parser.add_argument("--risk-percentage", type=lambda s: _values(s, float))
+    parser.add_argument("--enable-breakeven", type=lambda s: _values(s, bool))
+    parser.add_argument("--breakeven-trigger", type=lambda s: _values(s, float))
+    parser.add_argument("--enable-trailing", type=lambda s: _values(s, bool))
+    parser.add_argument("--trailing-trigger", type=lambda s: _values(s, float))
+    parser.add_argument("--trailing-step", type=lambda s: _values(s, float))
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """
+    Entry point of `python -m trading_bot replay`.
+    """
+    args = parse_args(argv)
+
+    # Per-signal and per-stop log lines would dominate the replay time
+    for name in ("webhook_handler", "core.position_book", "core.risk_gate", "services.broker.session"):
+        logging.getLogger(name).setLevel(logging.ERROR)
+
+    signals, invalid = load_signals(args.signals, args.passphrase) if args.signals else ([], 0)
+    if args.symbols:
+        symbols = [symbol.strip() for symbol in args.symbols.split(",") if symbol.strip()]
+    elif signals:
+        symbols = sorted({signal.ticker for _, signal in signals})
+    else:
+        symbols = [symbol.strip() for symbol in settings.WATCHLIST.split(",") if symbol.strip()]
+    if not symbols:
+        sys.exit("No symbols to replay: pass --symbols or --signals")
+
+    seconds = timeframe_seconds(args.timeframe)
+    if args.end:
+        end = _parse_time(args.end)
+    elif signals:
+        end = signals[-1][0] + seconds
+    else:
+        end = (time.time() // seconds) * seconds
+    if args.start:
+        start = _parse_time(args.start)
+    elif signals:
+        start = signals[0][0] - args.warmup * seconds
+    else:
+        start = end - args.days * 86400
+    signals = [(t, signal) for t, signal in signals if start <= t <= end]
+
+    if args.bars == "csv":
+        source = CSVBarSource(args.csv_dir)
+    elif args.bars == "synthetic":
+        source = SyntheticBarSource(clock=lambda: end)
+    else:
+        source = MT5BarSource()
+
+    load_start = time.perf_counter()
+    bars = load_bars(source, symbols, args.timeframe, start, end)
+    print(f"Loaded {sum(len(b) for b in bars.values())} {args.timeframe} bars for {len(symbols)} symbols "
+          f"and {len(signals)} signals ({invalid} invalid records) in {time.perf_counter() - load_start:.2f}s")
+
+    grid = {}
+    for name in PARAMETERS:
+        values = getattr(args, name)
+        if values:
+            grid[name] = values
+
+    start_time = time.perf_counter()
+    reports = run_sweep(bars, signals, args.timeframe, grid, args.workers, args.equity, args.warmup)
+    wall = time.perf_counter() - start_time
+
+    swept = list(grid)
+    print(" ".join(f"{name:>17}" for name in swept) +
+          "    fills  trades   win%     net P&L   max DD     events/s")
+    for report in sorted(reports, key=lambda r: r["net_pnl"], reverse=True):
+        params = report["parameters"]
+        print(" ".join(f"{str(params[name]):>17}" for name in swept) +
+              f" {report['fills']:8d} {report['closed_trades']:7d} {report['win_rate'] * 100:6.1f} "
+              f"{report['net_pnl']:11.2f} {report['max_drawdown']:8.2f} {report['events_per_second']:12d}")
+
+    events = sum(report["events"] for report in reports)
+    print(f"{len(reports)} replays, {events} events in {wall:.2f}s ({events / wall:.0f} events/s overall)")
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(reports, output, indent=2)
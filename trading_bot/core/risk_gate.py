@@ -0,0 +1,350 @@
+"""
+Daily-loss risk gate and position sizing.
+
+Keeps a running daily P&L, updated incrementally from fills, closed
+positions and price updates instead of being recomputed from the trade
+history. Position sizes per symbol are precomputed from RISK_PERCENTAGE and
+the latest ATR whenever a new bar changes it.
+
+All writers serialize on one lock and publish an immutable snapshot; the
+webhook path only reads the current snapshot, so approving a signal is a
+single attribute load and a dict lookup with no locking.
+"""
+import datetime
+import threading
+
+from trading_bot.utils.logger import setup_logger
+from trading_bot.services.broker.base import BrokerError
+from trading_bot.services.broker.session import broker_session
+from trading_bot.core.position_book import position_book
+from trading_bot.core.trading_calendar import trading_calendar
+from trading_bot.services.notifications.notification_service import notification_service
+from trading_bot.config import settings
+from trading_bot.config.reloader import settings_reloader
+
+# Configure logging
+logger = setup_logger("core.risk_gate")
+
+# Settings the limit and position sizes are computed from
+RISK_SETTINGS = ("MAX_DAILY_LOSS_PERCENTAGE", "RISK_PERCENTAGE", "REWARD_PERCENTAGE", "ATR_MULTIPLIER")
+
+class PositionSize:
+    """
+    Precomputed order size and stop distances for a symbol.
+    """
+
+    __slots__ = ("volume", "stop_distance", "target_distance")
+
+    def __init__(self, volume, stop_distance, target_distance):
+        """
+        Initialize the position size.
+
+        Args:
+            volume (float): Order volume in lots
+            stop_distance (float): Stop loss distance in price units
+            target_distance (float): Take profit distance in price units
+        """
+        self.volume = volume
+        self.stop_distance = stop_distance
+        self.target_distance = target_distance
+
+    def __repr__(self):
+        return f"PositionSize({self.volume} lots, stop {self.stop_distance}, target {self.target_distance})"
+
+def _trading_day():
+    """
+    Get the current date in the trading timezone, the one the daily reset runs in.
+    """
+    return datetime.datetime.now(trading_calendar.timezone).date()
+
+class _RiskState:
+    """
+    Immutable snapshot read by the webhook path.
+    """
+
+    __slots__ = ("day", "halted", "sizes")
+
+    def __init__(self, day, halted, sizes):
+        self.day = day
+        self.halted = halted
+        self.sizes = sizes
+
+class RiskGate:
+    """
+    Approves or rejects new orders against the daily loss limit.
+    """
+
+    def __init__(self, broker, positions, max_daily_loss=None, risk_percentage=None,
+                 atr_multiplier=None, reward_ratio=None):
+        """
+        Initialize the risk gate.
+
+        Args:
+            broker (BrokerSession): Source of account equity and symbol info
+            positions (PositionBook): Open positions used for the open P&L
+            max_daily_loss (float, optional): Daily loss limit in percent of the
+                start-of-day equity. Defaults to MAX_DAILY_LOSS_PERCENTAGE.
+            risk_percentage (float, optional): Equity risked per trade in percent.
+                Defaults to RISK_PERCENTAGE.
+            atr_multiplier (float, optional): Stop distance in ATRs. Defaults to ATR_MULTIPLIER.
+            reward_ratio (float, optional): Take profit distance as a multiple of the
+                stop distance. Defaults to REWARD_PERCENTAGE / RISK_PERCENTAGE.
+        """
+        self.broker = broker
+        self.positions = positions
+        self.max_daily_loss = settings.MAX_DAILY_LOSS_PERCENTAGE if max_daily_loss is None else max_daily_loss
+        self.risk_percentage = settings.RISK_PERCENTAGE if risk_percentage is None else risk_percentage
+        self.atr_multiplier = settings.ATR_MULTIPLIER if atr_multiplier is None else atr_multiplier
+        if reward_ratio is None:
+            reward_ratio = settings.REWARD_PERCENTAGE / settings.RISK_PERCENTAGE if settings.RISK_PERCENTAGE else 0.0
+        self.reward_ratio = reward_ratio
+
+        self._lock = threading.Lock()
+        self._equity = None
+        self._realized = 0.0
+        self._unrealized = {}
+        self._unrealized_total = 0.0
+        self._unrealized_start = 0.0
+        self._last_price = {}
+        self._atr = {}
+        self._contracts = {}
+        self._state = _RiskState(_trading_day(), False, {})
+
+        self.rejected = 0
+
+    def approve(self, symbol):
+        """
+        Check whether a new order may be placed.
+
+        Args:
+            symbol (str): Symbol
+
+        Returns:
+            bool: False once the daily loss limit has been reached
+        """
+        if self._state.halted:
+            self.rejected += 1
+            return False
+        return True
+
+    def position_size(self, symbol):
+        """
+        Get the precomputed position size for a symbol.
+
+        Args:
+            symbol (str): Symbol
+
+        Returns:
+            PositionSize: Size and stop distances, or None before the first ATR
+        """
+        return self._state.sizes.get(symbol)
+
+    @property
+    def daily_pnl(self):
+        """
+        float: Realized plus open P&L since the start of the day, in account currency.
+        """
+        return self._realized + self._unrealized_total - self._unrealized_start
+
+    def on_fill(self, order, result):
+        """
+        Fill listener: mark the new position to the fill price.
+        """
+        if self._equity is None:
+            self._load_equity()
+        self.on_price(order.symbol, result.price or order.price)
+
+    def on_close(self, symbol, ticket, pnl):
+        """
+        Close and reduce listener: book the realized P&L of a closed or
+        partly closed position.
+        """
+        if pnl is None:
+            return
+        contract_size = self._contract_size(symbol)
+        with self._lock:
+            self._realized += pnl * contract_size
+            price = self._last_price.get(symbol)
+            if price is not None:
+                self._mark(symbol, price, contract_size)
+            self._check_limit()
+
+    def on_price(self, symbol, price):
+        """
+        Update the open P&L of a symbol.
+
+        Args:
+            symbol (str): Symbol
+            price (float): Current price
+        """
+        contract_size = self._contract_size(symbol)
+        with self._lock:
+            self._last_price[symbol] = price
+            self._mark(symbol, price, contract_size)
+            self._check_limit()
+
+    def update_atr(self, symbol, atr):
+        """
+        Recompute the position size of a symbol from a new ATR.
+
+        Args:
+            symbol (str): Symbol
+            atr (float): Latest ATR
+        """
+        if not atr or self._atr.get(symbol) == atr:
+            return
+        size = self._size(symbol, atr)
+        if size is None:
+            return
+        with self._lock:
+            self._atr[symbol] = atr
+            state = self._state
+            sizes = dict(state.sizes)
+            sizes[symbol] = size
+            self._state = _RiskState(state.day, state.halted, sizes)
+
+    def reset_day(self):
+        """
+        Start a new trading day: clear the daily P&L, lift the halt and
+        resize every symbol from the current equity, in one atomic swap.
+        """
+        equity = self._load_equity()
+        atrs = dict(self._atr)
+        sizes = {}
+        for symbol, atr in atrs.items():
+            size = self._size(symbol, atr, equity)
+            if size is not None:
+                sizes[symbol] = size
+
+        with self._lock:
+            if equity is not None:
+                self._equity = equity
+            self._realized = 0.0
+            self._unrealized_start = self._unrealized_total
+            self._state = _RiskState(_trading_day(), False, sizes)
+        self.rejected = 0
+
+        logger.info("Risk gate reset (equity: %s, sized symbols: %d)", equity, len(sizes))
+
+    def on_settings(self, old, new):
+        """
+        Settings listener: apply new risk parameters and resize every symbol.
+
+        A lower loss limit halts trading at once if it is already exceeded; a
+        higher one does not lift a halt before the daily reset.
+        """
+        if all(getattr(old, name) == getattr(new, name) for name in RISK_SETTINGS):
+            return
+        risk_percentage = new.RISK_PERCENTAGE
+        reward_ratio = new.REWARD_PERCENTAGE / risk_percentage if risk_percentage else 0.0
+
+        with self._lock:
+            self.max_daily_loss = new.MAX_DAILY_LOSS_PERCENTAGE
+            self.risk_percentage = risk_percentage
+            self.atr_multiplier = new.ATR_MULTIPLIER
+            self.reward_ratio = reward_ratio
+            atrs = dict(self._atr)
+
+        sizes = {}
+        for symbol, atr in atrs.items():
+            size = self._size(symbol, atr)
+            if size is not None:
+                sizes[symbol] = size
+
+        with self._lock:
+            state = self._state
+            self._state = _RiskState(state.day, state.halted, sizes)
+            self._check_limit()
+
+        logger.info("Risk parameters updated (risk %s%%, daily loss limit %s%%, resized symbols: %d)",
+                    risk_percentage, self.max_daily_loss, len(sizes))
+
+    def get_stats(self):
+        """
+        Get risk gate state.
+
+        Returns:
+            dict: Daily P&L, limit and sizing
+        """
+        state = self._state
+        return {
+            "day": state.day.isoformat(),
+            "halted": state.halted,
+            "equity": self._equity,
+            "daily_pnl": round(self.daily_pnl, 2),
+            "daily_loss_limit": round(self._loss_limit(), 2) if self._equity else None,
+            "realized": round(self._realized, 2),
+            "unrealized": round(self._unrealized_total, 2),
+            "rejected": self.rejected,
+            "sized_symbols": len(state.sizes)
+        }
+
+    def _mark(self, symbol, price, contract_size):
+        # Caller holds the lock
+        value = self.positions.unrealized(symbol, price) * contract_size
+        self._unrealized_total += value - self._unrealized.get(symbol, 0.0)
+        self._unrealized[symbol] = value
+
+    def _check_limit(self):
+        # Caller holds the lock
+        state = self._state
+        if state.halted or self._equity is None:
+            return
+        if -self.daily_pnl >= self._loss_limit():
+            self._state = _RiskState(state.day, True, state.sizes)
+            logger.warning(
+                "Daily loss limit reached (P&L %.2f, limit %.2f); rejecting new orders",
+                self.daily_pnl, self._loss_limit()
+            )
+            notification_service.notify(
+                "Daily loss limit reached",
+                "New orders are rejected until the daily reset",
+                level="error",
+                fields={"Daily P&L": round(self.daily_pnl, 2), "Limit": round(self._loss_limit(), 2)}
+            )
+
+    def _loss_limit(self):
+        return self._equity * self.max_daily_loss / 100.0
+
+    def _size(self, symbol, atr, equity=None):
+        """
+        Risk-based volume for one symbol, normalized to its volume step.
+        """
+        equity = equity or self._equity or self._load_equity()
+        if not equity:
+            return None
+        try:
+            info = self.broker.get_symbol_info(symbol)
+        except BrokerError as e:
+            logger.debug("No symbol info for %s, not sizing: %s", symbol, e)
+            return None
+
+        stop_distance = atr * self.atr_multiplier
+        volume = equity * self.risk_percentage / 100.0 / (stop_distance * info.contract_size)
+        return PositionSize(info.normalize_volume(volume), stop_distance, stop_distance * self.reward_ratio)
+
+    def _load_equity(self):
+        try:
+            equity = self.broker.call("get_account_equity")
+        except BrokerError as e:
+            logger.warning("Could not load account equity: %s", e)
+            return self._equity
+        if self._equity is None:
+            self._equity = equity
+        return equity
+
+    def _contract_size(self, symbol):
+        try:
+            contract_size = self.broker.get_symbol_info(symbol).contract_size
+        except BrokerError:
+            # Keep marking positions with the last known size while disconnected
+            return self._contracts.get(symbol, 1.0)
+        self._contracts[symbol] = contract_size
+        return contract_size
+
+# Create a singleton instance and track fills, closes, reductions, equity and settings from the shared services
+risk_gate = RiskGate(broker_session, position_book)
+broker_session.add_fill_listener(risk_gate.on_fill)
+position_book.add_close_listener(risk_gate.on_close)
+position_book.add_reduce_listener(risk_gate.on_close)
+settings_reloader.add_listener(risk_gate.on_settings)
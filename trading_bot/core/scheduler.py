@@ -1,17 +1,181 @@
 """
 Trading scheduler for automated market evaluation and trading.
+
+By default every watchlist symbol is evaluated every
+SCHEDULER_INTERVAL_SECONDS. With ENABLE_TICK_STREAM, a live tick feed moves
+stops and marks the open P&L as prices change (core/tick_stream.py), and
+the interval job becomes a sweep every TICK_SWEEP_SECONDS that refreshes
+bars, indicators and position sizes.
 """
+import time
 import logging
 import datetime
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.interval import IntervalTrigger
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
 
 from trading_bot.utils.logger import setup_logger
+from trading_bot.utils.metrics import metrics
+from trading_bot.utils.profiler import profiler
 from trading_bot.config import settings
+from trading_bot.config.reloader import settings_reloader
+from trading_bot.core.trading_calendar import trading_calendar
+from trading_bot.core.position_book import position_book
+from trading_bot.core.risk_gate import risk_gate
+from trading_bot.services.notifications.notification_service import notification_service
 
 # Configure logging
 logger = setup_logger("core.scheduler")
 
+# Number of slowest symbols reported in the metrics
+SLOWEST_SYMBOLS = 5
+
+CYCLE_SECONDS = metrics.histogram("scheduler_cycle_seconds", "Duration of market evaluation cycles")
+JOB_LAG_SECONDS = metrics.histogram(
+    "scheduler_job_lag_seconds", "Delay between a run's scheduled time and its submission"
+)
+
+def parse_watchlist(spec):
+    """
+    Parse a comma-separated watchlist.
+    
+    Args:
+        spec (str): Comma-separated symbols
+        
+    Returns:
+        list: Symbols
+    """
+    return [symbol.strip() for symbol in spec.split(",") if symbol.strip()]
+
+class SchedulerMetrics:
+    """
+    Cycle metrics of the market evaluation job.
+    """
+    
+    def __init__(self):
+        """
+        Initialize the metrics.
+        """
+        self._lock = threading.Lock()
+        self._cycle_listeners = []
+        self.reset()
+    
+    def reset(self):
+        """
+        Reset all counters.
+        """
+        with self._lock:
+            self.cycles = 0
+            self.last_duration = 0.0
+            self.max_duration = 0.0
+            self.total_duration = 0.0
+            self.deadline_exceeded = 0
+            self.last_lag = 0.0
+            self.max_lag = 0.0
+            self.missed_runs = 0
+            self.overlapping_runs = 0
+            self.skipped_symbols = 0
+            self.symbol_durations = {}
+    
+    def record_cycle(self, duration, timed_out, skipped):
+        """
+        Record a completed evaluation cycle.
+        
+        Args:
+            duration (float): Cycle duration in seconds
+            timed_out (int): Symbols still running when the deadline passed
+            skipped (int): Symbols skipped because their previous evaluation was still running
+        """
+        with self._lock:
+            self.cycles += 1
+            self.last_duration = duration
+            self.max_duration = max(self.max_duration, duration)
+            self.total_duration += duration
+            self.skipped_symbols += skipped
+            if timed_out:
+                self.deadline_exceeded += 1
+        CYCLE_SECONDS.observe(int(duration * 1e9))
+        for callback in self._cycle_listeners:
+            try:
+                callback(duration, timed_out, skipped)
+            except Exception as e:
+                logger.exception("Error in cycle listener: %s", e)
+    
+    def add_cycle_listener(self, callback):
+        """
+        Register a callback for completed evaluation cycles.
+        
+        Args:
+            callback (callable): Called as callback(duration, timed_out, skipped)
+                after the cycle has been recorded
+        """
+        self._cycle_listeners.append(callback)
+    
+    def record_lag(self, lag):
+        """
+        Record how late a run was submitted after its scheduled time.
+        
+        Args:
+            lag (float): Lag in seconds
+        """
+        with self._lock:
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+        JOB_LAG_SECONDS.observe(max(0, int(lag * 1e9)))
+    
+    def record_symbol(self, symbol, duration):
+        """
+        Record how long the last evaluation of a symbol took.
+        
+        Args:
+            symbol (str): Symbol
+            duration (float): Evaluation duration in seconds
+        """
+        with self._lock:
+            self.symbol_durations[symbol] = duration
+    
+    def record_missed(self):
+        """
+        Record a run APScheduler skipped because it was too late.
+        """
+        with self._lock:
+            self.missed_runs += 1
+    
+    def record_overlap(self):
+        """
+        Record a run APScheduler refused because the previous one was still running.
+        """
+        with self._lock:
+            self.overlapping_runs += 1
+    
+    def get_stats(self):
+        """
+        Get the cycle metrics.
+        
+        Returns:
+            dict: Scheduler metrics
+        """
+        with self._lock:
+            slowest = sorted(self.symbol_durations.items(), key=lambda item: item[1], reverse=True)
+            return {
+                "cycles": self.cycles,
+                "last_cycle_ms": round(self.last_duration * 1000, 3),
+                "max_cycle_ms": round(self.max_duration * 1000, 3),
+                "avg_cycle_ms": round(self.total_duration / self.cycles * 1000, 3) if self.cycles else 0.0,
+                "deadline_exceeded": self.deadline_exceeded,
+                "last_lag_ms": round(self.last_lag * 1000, 3),
+                "max_lag_ms": round(self.max_lag * 1000, 3),
+                "missed_runs": self.missed_runs,
+                "overlapping_runs": self.overlapping_runs,
+                "skipped_symbols": self.skipped_symbols,
+                "slowest_symbols": [
+                    {"symbol": symbol, "ms": round(duration * 1000, 3)}
+                    for symbol, duration in slowest[:SLOWEST_SYMBOLS]
+                ]
+            }
+
+# Create a singleton instance
+scheduler_metrics = SchedulerMetrics()
+
 class TradingScheduler:
     """
     Scheduler for automated trading operations.
@@ -24,16 +188,50 @@ class TradingScheduler:
         Args:
             disable_notifications (bool): Whether to disable notifications
         """
-        self.interval = settings.SCHEDULER_INTERVAL_SECONDS
+        config = settings.snapshot
         self.disable_notifications = disable_notifications
+        self.symbols = parse_watchlist(config.WATCHLIST)
+        
+        # Event-driven mode: ticks trigger evaluation and the interval job is a sweep
+        self.tick_stream = None
+        if config.ENABLE_TICK_STREAM:
+            self.tick_stream = self._create_tick_stream()
+        
+        self.interval = self._job_interval(config)
+        self.deadline = config.SCHEDULER_CYCLE_DEADLINE or self.interval * 0.8
+        self.metrics = scheduler_metrics
+        
+        # Bounded pool for per-symbol evaluation
+        self.executor = ThreadPoolExecutor(
+            max_workers=max(1, settings.SCHEDULER_WORKERS),
+            thread_name_prefix="market-eval"
+        )
+        self._in_flight = set()
+        self._in_flight_lock = threading.Lock()
+        
+        # Market data and indicators are created on first use
+        self._market_data = None
+        self._market_data_failed = False
+        self._indicators = None
+        self._last_bar_time = {}
         
         # Initialize scheduler
+        # Imported here so the web app can report scheduler metrics without loading APScheduler
+        from apscheduler.schedulers.background import BackgroundScheduler
+        from apscheduler.events import EVENT_JOB_MISSED, EVENT_JOB_MAX_INSTANCES, EVENT_JOB_SUBMITTED
+        
         self.scheduler = BackgroundScheduler()
+        self.scheduler.add_listener(
+            self._on_job_event, EVENT_JOB_MISSED | EVENT_JOB_MAX_INSTANCES | EVENT_JOB_SUBMITTED
+        )
         
         # Set up scheduled jobs
         self._setup_jobs()
+        profiler.register("evaluate_market", self, "_evaluate_market")
+        settings_reloader.add_listener(self.on_settings)
         
-        logger.info(f"Trading scheduler initialized (interval: {self.interval}s)")
+        mode = f", {self.tick_stream.feed.name} tick stream" if self.tick_stream is not None else ""
+        logger.info("Trading scheduler initialized (interval: %ss%s)", self.interval, mode)
     
     def start(self):
         """
@@ -41,6 +239,8 @@ class TradingScheduler:
         """
         if not self.scheduler.running:
             self.scheduler.start()
+            if self.tick_stream is not None:
+                self.tick_stream.start()
             logger.info("Trading scheduler started")
     
     def stop(self):
@@ -48,18 +248,98 @@ class TradingScheduler:
         Stop the scheduler.
         """
         if self.scheduler.running:
+            settings_reloader.remove_listener(self.on_settings)
+            if self.tick_stream is not None:
+                self.tick_stream.stop()
             self.scheduler.shutdown()
+            self.executor.shutdown(wait=False)
             logger.info("Trading scheduler stopped")
     
+    def on_settings(self, old, new):
+        """
+        Settings listener: re-arm the evaluation job when the interval
+        changed and pick up a new watchlist, cycle deadline or timezone.
+        
+        Args:
+            old (Settings): Previous settings
+            new (Settings): Published settings
+        """
+        if new.WATCHLIST != old.WATCHLIST:
+            self.symbols = parse_watchlist(new.WATCHLIST)
+            if self.tick_stream is not None:
+                self.tick_stream.subscribe(self.symbols)
+            logger.info("Watchlist updated: %s", ", ".join(self.symbols) or "empty")
+        
+        if self.tick_stream is not None:
+            self.tick_stream.threshold = new.TICK_THRESHOLD_PERCENTAGE
+        
+        interval = self._job_interval(new)
+        if interval != self.interval:
+            self.interval = interval
+            self.scheduler.modify_job("market_evaluation", misfire_grace_time=max(1, self.interval // 2))
+            self.scheduler.reschedule_job("market_evaluation", trigger="interval", seconds=self.interval)
+            logger.info("Market evaluation re-armed (interval: %ss)", self.interval)
+        self.deadline = new.SCHEDULER_CYCLE_DEADLINE or self.interval * 0.8
+        
+        if new.TRADING_TIMEZONE != old.TRADING_TIMEZONE:
+            self.scheduler.reschedule_job(
+                "daily_reset", trigger="cron", hour=0, minute=0, timezone=new.TRADING_TIMEZONE or None
+            )
+    
+    def _create_tick_stream(self):
+        """
+        Create the tick stream on the configured feed.
+        
+        Returns:
+            TickStream: Tick stream, or None if the feed is unavailable
+        """
+        # Imported here so polling mode never loads them
+        from trading_bot.core.tick_stream import TickStream
+        from trading_bot.services.market_data.tick_feed import create_tick_feed
+        
+        try:
+            return TickStream(create_tick_feed(self.symbols), self._on_tick)
+        except Exception as e:
+            logger.error("Tick feed unavailable, evaluating every interval instead: %s", e)
+            return None
+    
+    def _job_interval(self, config):
+        """
+        Interval of the market evaluation job: a sweep when ticks drive
+        evaluation, the evaluation itself otherwise.
+        """
+        if self.tick_stream is not None:
+            return config.TICK_SWEEP_SECONDS
+        return config.SCHEDULER_INTERVAL_SECONDS
+    
+    def _on_tick(self, symbol, price):
+        """
+        Tick stream callback: move stops and mark the open P&L at the new
+        price. Bars, indicators and position sizes are left to the sweep.
+        
+        Args:
+            symbol (str): Symbol
+            price (float): Latest price
+        """
+        if not trading_calendar.is_trading_allowed(symbol=symbol):
+            return
+        position_book.on_price(symbol, price)
+        risk_gate.on_price(symbol, price)
+    
     def _setup_jobs(self):
         """
         Set up scheduled jobs.
         """
+        from apscheduler.triggers.interval import IntervalTrigger
+        
         # Add market evaluation job
         self.scheduler.add_job(
-            self._evaluate_market,
+            self._run_evaluation,
             IntervalTrigger(seconds=self.interval),
             id="market_evaluation",
+            max_instances=1,
+            coalesce=True,
+            misfire_grace_time=max(1, self.interval // 2),
             replace_existing=True
         )
         
@@ -69,92 +349,193 @@ class TradingScheduler:
             trigger="cron",
             hour=0,
             minute=0,
+            timezone=settings.TRADING_TIMEZONE or None,
             id="daily_reset",
             replace_existing=True
         )
     
+    def _run_evaluation(self):
+        """
+        Job entry point. _evaluate_market is looked up on every run so the
+        profiler can wrap it while a trace is armed.
+        """
+        self._evaluate_market()
+    
     def _evaluate_market(self):
         """
         Evaluate the market and execute trades if needed.
+        
+        Symbols are evaluated in parallel on a bounded pool. The cycle waits
+        at most until the deadline; a symbol still running then is skipped in
+        the following cycles until it finishes.
         """
         try:
-            now = datetime.datetime.now()
+            now = datetime.datetime.now(trading_calendar.timezone)
             
-            # Check if trading is allowed currently
-            if not self._is_trading_allowed(now):
+            # Read once: a settings reload may replace them mid-cycle
+            symbols = self.symbols
+            deadline = self.deadline
+            
+            # Each symbol is gated on its own session only, so symbols with
+            # their own hours trade while the default session is closed
+            symbols = [symbol for symbol in symbols if trading_calendar.is_trading_allowed(now, symbol)]
+            if not symbols:
                 return
             
             logger.debug("Evaluating market conditions")
+            start = time.monotonic()
+            
+            futures = {}
+            skipped = 0
+            for symbol in symbols:
+                with self._in_flight_lock:
+                    if symbol in self._in_flight:
+                        skipped += 1
+                        continue
+                    self._in_flight.add(symbol)
+                
+                futures[self.executor.submit(self._run_symbol, symbol)] = symbol
             
-            # TODO: Implement market evaluation and trading logic
-            # This is a placeholder for the actual market evaluation
+            _, not_done = wait(futures, timeout=deadline)
+            duration = time.monotonic() - start
+            
+            if not_done:
+                logger.warning(
+                    "Market evaluation exceeded its %.1fs deadline; still running: %s",
+                    deadline,
+                    ", ".join(sorted(futures[future] for future in not_done))
+                )
+            
+            self.metrics.record_cycle(duration, len(not_done), skipped)
             
         except Exception as e:
-            logger.exception(f"Error during market evaluation: {str(e)}")
+            logger.exception("Error during market evaluation: %s", e)
     
-    def _daily_reset(self):
+    def _run_symbol(self, symbol):
         """
-        Reset daily counters and perform end-of-day operations.
+        Evaluate one symbol on the pool and time it.
+        
+        Args:
+            symbol (str): Symbol to evaluate
         """
+        start = time.monotonic()
         try:
-            logger.info("Performing daily reset")
-            
-            # TODO: Implement daily reset logic
-            # This is a placeholder for actual reset logic
-            
+            self._evaluate_symbol(symbol)
         except Exception as e:
-            logger.exception(f"Error during daily reset: {str(e)}")
+            logger.exception("Error evaluating %s: %s", symbol, e)
+        finally:
+            self.metrics.record_symbol(symbol, time.monotonic() - start)
+            with self._in_flight_lock:
+                self._in_flight.discard(symbol)
     
-    def _is_trading_allowed(self, current_time):
+    def _evaluate_symbol(self, symbol):
         """
-        Check if trading is allowed at the current time.
+        Refresh market data and indicators for a symbol.
         
         Args:
-            current_time (datetime): Current time
-            
+            symbol (str): Symbol to evaluate
+        """
+        market_data = self._get_market_data()
+        if market_data is None:
+            return
+        
+        bars = market_data.get_bars(symbol, settings.snapshot.MARKET_DATA_TIMEFRAME)
+        if not len(bars):
+            return
+        
+        # Feed only the bars the indicators have not seen yet
+        last_time = self._last_bar_time.get(symbol)
+        if last_time is None:
+            self._indicators.warm_up(symbol, bars["high"], bars["low"], bars["close"])
+        else:
+            for bar in bars[bars["time"] > last_time]:
+                self._indicators.update(symbol, bar["high"], bar["low"], bar["close"])
+        self._last_bar_time[symbol] = int(bars["time"][-1])
+        
+        # Resize from the latest ATR, move stops that crossed a breakeven or
+        # trailing threshold and mark the open P&L
+        price = float(bars["close"][-1])
+        if self.tick_stream is not None:
+            # The last tick is newer than the last bar's close
+            price = self.tick_stream.last_price(symbol) or price
+        risk_gate.update_atr(symbol, self._indicators.atr(symbol))
+        # Drop positions closed at the broker, by a stop or by hand
+        position_book.reconcile(symbol, price)
+        position_book.on_price(symbol, price)
+        risk_gate.on_price(symbol, price)
+        
+        # TODO: Implement market evaluation and trading logic
+        # This is a placeholder for the actual market evaluation
+    
+    def _get_market_data(self):
+        """
+        Get the market data service, creating it on first use.
+        
         Returns:
-            bool: True if trading is allowed, False otherwise
+            MarketDataService: Market data service, or None if unavailable
         """
-        # Check if it's a weekend (Saturday=5, Sunday=6)
-        is_weekend = current_time.weekday() >= 5
+        if self._market_data is None and not self._market_data_failed:
+            with self._in_flight_lock:
+                if self._market_data is None and not self._market_data_failed:
+                    # Imported here so the scheduler starts without NumPy or MT5 loaded
+                    from trading_bot.services.market_data.mt5_data_service import (
+                        MarketDataService, create_bar_source
+                    )
+                    from trading_bot.services.market_data.indicators import IndicatorEngine
+                    
+                    try:
+                        market_data = MarketDataService(create_bar_source())
+                        # Indicators first: the check above reads _market_data
+                        # without the lock and must not see it before them
+                        self._indicators = IndicatorEngine()
+                        self._market_data = market_data
+                    except Exception as e:
+                        self._market_data_failed = True
+                        logger.error("Market data unavailable, skipping evaluation: %s", e)
+        return self._market_data
+    
+    def _on_job_event(self, event):
+        """
+        Record the lag of evaluation runs and count the runs APScheduler
+        missed or refused to overlap.
         
-        if is_weekend and not settings.ALLOW_WEEKEND_TRADING:
-            logger.debug("Trading not allowed on weekends")
-            return False
+        Args:
+            event (JobEvent): APScheduler job event
+        """
+        from apscheduler.events import EVENT_JOB_MISSED, EVENT_JOB_MAX_INSTANCES, EVENT_JOB_SUBMITTED
         
-        # Parse trading hours
+        if event.job_id != "market_evaluation":
+            return
+        if event.code == EVENT_JOB_SUBMITTED:
+            scheduled = event.scheduled_run_times[-1]
+            self.metrics.record_lag((datetime.datetime.now(scheduled.tzinfo) - scheduled).total_seconds())
+        elif event.code == EVENT_JOB_MISSED:
+            self.metrics.record_missed()
+            logger.warning("Market evaluation run missed")
+        elif event.code == EVENT_JOB_MAX_INSTANCES:
+            self.metrics.record_overlap()
+            logger.warning("Market evaluation run skipped: previous run still in progress")
+    
+    def _daily_reset(self):
+        """
+        Reset daily counters and perform end-of-day operations.
+        """
         try:
-            start_hour, start_minute = map(int, settings.TRADING_HOURS_START.split(":"))
-            end_hour, end_minute = map(int, settings.TRADING_HOURS_END.split(":"))
+            logger.info("Performing daily reset")
             
-            trading_start = current_time.replace(
-                hour=start_hour, 
-                minute=start_minute, 
-                second=0, 
-                microsecond=0
-            )
+            # Report the day before its P&L is cleared
+            if not self.disable_notifications:
+                stats = risk_gate.get_stats()
+                notification_service.notify(
+                    "Daily summary",
+                    f"Trading day {stats['day']}",
+                    fields={"Daily P&L": stats["daily_pnl"], "Realized": stats["realized"],
+                            "Unrealized": stats["unrealized"], "Open positions": len(position_book),
+                            "Halted": stats["halted"]}
+                )
             
-            trading_end = current_time.replace(
-                hour=end_hour, 
-                minute=end_minute, 
-                second=0, 
-                microsecond=0
-            )
+            # Clear the daily P&L and lift a loss-limit halt in one swap
+            risk_gate.reset_day()
             
-            # Handle overnight trading hours
-            if trading_end < trading_start:
-                # End time is on the next day
-                if current_time < trading_start and current_time > trading_end:
-                    logger.debug("Outside of trading hours")
-                    return False
-            else:
-                # Regular trading hours
-                if current_time < trading_start or current_time > trading_end:
-                    logger.debug("Outside of trading hours")
-                    return False
-            
-        except ValueError:
-            logger.warning("Invalid trading hours format in settings")
-            # Default to allowing trading if the format is invalid
-        
-        return True
\ No newline at end of file
+        except Exception as e:
+            logger.exception("Error during daily reset: %s", e)
@@ -0,0 +1,184 @@
+"""
+Event-driven market evaluation from a live tick feed.
+
+The feed pushes ticks into a slot per symbol holding its latest price. A
+symbol is queued for evaluation only when its price moved more than the
+threshold away from the price it was last evaluated at. While an evaluation
+is queued or running, newer ticks only replace the price it will read, so a
+burst of ticks costs one evaluation at the latest price instead of a backlog
+of stale ones. Evaluations run on a sharded executor keyed by symbol: each
+symbol is evaluated in order and never concurrently with itself, while
+unrelated symbols run in parallel.
+"""
+import time
+
+from trading_bot.utils.logger import setup_logger
+from trading_bot.utils.metrics import metrics
+from trading_bot.core.executor import ShardedExecutor
+from trading_bot.config import settings
+
+# Configure logging
+logger = setup_logger("core.tick_stream")
+
+TICKS = metrics.counter("ticks_total", "Ticks received from the price feed")
+TICK_EVALUATIONS = metrics.counter("tick_evaluations_total", "Evaluations triggered by ticks")
+TICK_LATENCY_SECONDS = metrics.histogram(
+    "tick_to_evaluation_seconds", "Delay from a tick's arrival to the end of the evaluation it triggered"
+)
+
+class _SymbolState:
+    """
+    Latest tick and evaluation state of one symbol.
+    """
+
+    __slots__ = ("symbol", "price", "received", "evaluated_price", "pending", "ticks", "evaluations")
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+        self.price = None
+        self.received = 0
+        self.evaluated_price = None
+        self.pending = False
+        self.ticks = 0
+        self.evaluations = 0
+
+class TickStream:
+    """
+    Dispatches price moves from a tick feed to an evaluation callback.
+    """
+
+    def __init__(self, feed, evaluate, threshold=None, workers=None):
+        """
+        Initialize the tick stream.
+
+        Args:
+            feed (TickFeed): Source of ticks
+            evaluate (callable): Called as evaluate(symbol, price) on a worker thread
+            threshold (float, optional): Relative price move that triggers an
+                evaluation, in percent. Defaults to TICK_THRESHOLD_PERCENTAGE.
+            workers (int, optional): Evaluation threads. Defaults to TICK_WORKERS.
+        """
+        self.feed = feed
+        self.evaluate = evaluate
+        self.threshold = settings.TICK_THRESHOLD_PERCENTAGE if threshold is None else threshold
+        self.executor = ShardedExecutor(workers or settings.TICK_WORKERS, name="tick-eval")
+
+        self._symbols = {}
+        self.filtered = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    @property
+    def running(self):
+        """
+        bool: True while ticks are being dispatched.
+        """
+        return self.executor.running
+
+    def start(self):
+        """
+        Start the evaluation workers and the feed.
+        """
+        self.executor.start()
+        self.feed.start(self.on_tick)
+
+    def stop(self):
+        """
+        Stop the feed, then let the queued evaluations finish.
+        """
+        self.feed.stop()
+        self.executor.shutdown(wait=True, timeout=5)
+
+    def subscribe(self, symbols):
+        """
+        Replace the symbols the feed publishes.
+
+        Args:
+            symbols (iterable): Symbols
+        """
+        self.feed.subscribe(symbols)
+
+    def on_tick(self, symbol, price):
+        """
+        Feed callback: record a tick and queue an evaluation if the price
+        moved past the threshold.
+
+        Args:
+            symbol (str): Symbol
+            price (float): Latest price
+        """
+        state = self._symbols.get(symbol)
+        if state is None:
+            state = self._symbols.setdefault(symbol, _SymbolState(symbol))
+
+        # Publish the price before checking pending: a running evaluation
+        # clears pending before it reads the price, so either it sees this
+        # tick or this tick queues the next evaluation
+        state.price = price
+        state.received = time.perf_counter_ns()
+        state.ticks += 1
+        TICKS.inc()
+
+        reference = state.evaluated_price
+        if reference is not None and abs(price - reference) * 100.0 <= abs(reference) * self.threshold:
+            self.filtered += 1
+            return
+        if state.pending:
+            self.coalesced += 1
+            return
+
+        state.pending = True
+        try:
+            self.executor.submit(symbol, self._evaluate, state, block=False)
+        except RuntimeError:
+            # Stopped between the feed's last tick and its shutdown
+            state.pending = False
+
+    def last_price(self, symbol):
+        """
+        Get the latest tick price of a symbol.
+
+        Args:
+            symbol (str): Symbol
+
+        Returns:
+            float: Latest price, or None before the first tick
+        """
+        state = self._symbols.get(symbol)
+        return state.price if state is not None else None
+
+    def get_stats(self):
+        """
+        Get tick and evaluation counters.
+
+        Returns:
+            dict: Tick stream statistics
+        """
+        ticks = sum(state.ticks for state in list(self._symbols.values()))
+        evaluations = sum(state.evaluations for state in list(self._symbols.values()))
+        return {
+            "feed": self.feed.name,
+            "symbols": len(self._symbols),
+            "ticks": ticks,
+            "evaluations": evaluations,
+            "filtered": self.filtered,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "threshold_pct": self.threshold,
+            "queued": self.executor.depth(),
+            "latency": TICK_LATENCY_SECONDS.get_stats()
+        }
+
+    def _evaluate(self, state):
+        state.pending = False
+        price = state.price
+        received = state.received
+        state.evaluated_price = price
+        try:
+            self.evaluate(state.symbol, price)
+        except Exception as e:
+            self.errors += 1
+            logger.exception("Error evaluating tick for %s: %s", state.symbol, e)
+        state.evaluations += 1
+        TICK_EVALUATIONS.inc()
+        TICK_LATENCY_SECONDS.since(received)
@@ -0,0 +1,289 @@
+"""
+Compiled trading calendar.
+
+Trading sessions, weekend rules, holidays and the trading timezone are parsed
+once at startup into per-weekday tables of sorted intervals, so checking
+whether trading is allowed is a timezone conversion plus one binary search.
+A settings reload compiles a new calendar and swaps its tables into the
+shared instance in one assignment.
+"""
+import bisect
+import datetime
+from dateutil import tz
+
+from trading_bot.utils.logger import setup_logger
+from trading_bot.config import settings
+from trading_bot.config.reloader import settings_reloader
+
+# Configure logging
+logger = setup_logger("core.trading_calendar")
+
+# Seconds in a day; session ends are inclusive
+DAY_SECONDS = 24 * 60 * 60
+
+# Settings the calendar is compiled from
+CALENDAR_SETTINGS = (
+    "ALLOW_WEEKEND_TRADING", "TRADING_HOURS_START", "TRADING_HOURS_END", "TRADING_SESSIONS",
+    "SYMBOL_SESSIONS", "TRADING_HOLIDAYS", "TRADING_TIMEZONE"
+)
+
+def parse_sessions(spec):
+    """
+    Parse a session list such as "08:00-12:00,13:30-17:00".
+
+    A session whose end is before its start runs overnight.
+
+    Args:
+        spec (str): Comma-separated HH:MM-HH:MM sessions
+
+    Returns:
+        list: (start, end) tuples in seconds since midnight
+
+    Raises:
+        ValueError: If the format is invalid
+    """
+    sessions = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        start, end = part.split("-")
+        sessions.append((_parse_time(start), _parse_time(end)))
+
+    if not sessions:
+        raise ValueError(f"No trading sessions in {spec!r}")
+    return sessions
+
+def parse_symbol_sessions(spec):
+    """
+    Parse per-symbol sessions such as "US30=14:30-21:00;XAUUSD=01:00-12:00,13:00-23:00".
+
+    Args:
+        spec (str): Semicolon-separated SYMBOL=sessions entries
+
+    Returns:
+        dict: Symbol to list of (start, end) tuples
+
+    Raises:
+        ValueError: If the format is invalid
+    """
+    result = {}
+    for entry in spec.split(";"):
+        entry = entry.strip()
+        if not entry:
+            continue
+        symbol, sessions = entry.split("=", 1)
+        result[symbol.strip().upper()] = parse_sessions(sessions)
+    return result
+
+def parse_holidays(spec):
+    """
+    Parse a holiday list such as "2024-12-25,2025-01-01".
+
+    Args:
+        spec (str): Comma-separated YYYY-MM-DD dates
+
+    Returns:
+        frozenset: Holiday dates
+
+    Raises:
+        ValueError: If the format is invalid
+    """
+    return frozenset(
+        datetime.date.fromisoformat(part.strip())
+        for part in spec.split(",")
+        if part.strip()
+    )
+
+def _parse_time(value):
+    hour, minute = map(int, value.strip().split(":"))
+    if not (0 <= hour < 24 and 0 <= minute < 60):
+        raise ValueError(f"Invalid time: {value!r}")
+    return hour * 3600 + minute * 60
+
+class _SessionTable:
+    """
+    Sorted, merged trading intervals for each weekday.
+    """
+
+    __slots__ = ("starts", "ends")
+
+    def __init__(self, sessions, trading_days):
+        """
+        Compile sessions into per-weekday interval tables.
+
+        Args:
+            sessions (list): (start, end) tuples in seconds since midnight
+            trading_days (set): Weekdays (Monday=0) on which sessions open
+        """
+        days = [[] for _ in range(7)]
+
+        for start, end in sessions:
+            for day in trading_days:
+                if end >= start:
+                    days[day].append((start, end))
+                else:
+                    # Overnight session: the tail belongs to the same weekday,
+                    # matching the previous single-window behaviour
+                    days[day].append((start, DAY_SECONDS - 1))
+                    days[day].append((0, end))
+
+        self.starts = []
+        self.ends = []
+        for intervals in days:
+            merged = []
+            for start, end in sorted(intervals):
+                if merged and start <= merged[-1][1] + 1:
+                    merged[-1][1] = max(merged[-1][1], end)
+                else:
+                    merged.append([start, end])
+            self.starts.append([start for start, _ in merged])
+            self.ends.append([end for _, end in merged])
+
+    def contains(self, weekday, seconds):
+        index = bisect.bisect_right(self.starts[weekday], seconds) - 1
+        return index >= 0 and seconds <= self.ends[weekday][index]
+
+class _CalendarState:
+    """
+    Compiled tables read together by is_trading_allowed.
+    """
+
+    __slots__ = ("timezone", "holidays", "default", "symbols")
+
+    def __init__(self, timezone, holidays, default, symbols):
+        self.timezone = timezone
+        self.holidays = holidays
+        self.default = default
+        self.symbols = symbols
+
+class TradingCalendar:
+    """
+    Answers whether trading is allowed at a given time, optionally per symbol.
+    """
+
+    def __init__(self, sessions, symbol_sessions=None, holidays=(), allow_weekends=False, timezone=None):
+        """
+        Initialize and compile the calendar.
+
+        Args:
+            sessions (list): Default (start, end) sessions in seconds since midnight
+            symbol_sessions (dict, optional): Symbol to sessions overriding the default
+            holidays (iterable, optional): Dates on which trading is not allowed
+            allow_weekends (bool, optional): Whether sessions also open on weekends. Defaults to False.
+            timezone (tzinfo, optional): Timezone the sessions are expressed in.
+                Defaults to None (naive local time).
+        """
+        trading_days = set(range(7) if allow_weekends else range(5))
+
+        self._state = _CalendarState(
+            timezone,
+            frozenset(holidays),
+            _SessionTable(sessions, trading_days),
+            {
+                symbol.upper(): _SessionTable(symbol_table, trading_days)
+                for symbol, symbol_table in (symbol_sessions or {}).items()
+            }
+        )
+
+    @property
+    def timezone(self):
+        """
+        tzinfo: Timezone the sessions are expressed in, or None for local time.
+        """
+        return self._state.timezone
+
+    @property
+    def holidays(self):
+        """
+        frozenset: Dates on which trading is not allowed.
+        """
+        return self._state.holidays
+
+    @classmethod
+    def from_settings(cls, config=None):
+        """
+        Build the calendar from the trading settings.
+
+        Invalid settings are logged and fall back to allowing trading at all
+        times, as before.
+
+        Args:
+            config (Settings, optional): Settings snapshot. Defaults to the current one.
+
+        Returns:
+            TradingCalendar: Compiled calendar
+        """
+        config = config or settings.snapshot
+        timezone = None
+        if config.TRADING_TIMEZONE:
+            timezone = tz.gettz(config.TRADING_TIMEZONE)
+            if timezone is None:
+                logger.warning("Unknown trading timezone: %s", config.TRADING_TIMEZONE)
+
+        try:
+            sessions = parse_sessions(
+                config.TRADING_SESSIONS
+                or f"{config.TRADING_HOURS_START}-{config.TRADING_HOURS_END}"
+            )
+        except ValueError:
+            logger.warning("Invalid trading hours format in settings")
+            sessions = [(0, DAY_SECONDS - 1)]
+
+        try:
+            symbol_sessions = parse_symbol_sessions(config.SYMBOL_SESSIONS)
+        except ValueError:
+            logger.warning("Invalid symbol sessions format in settings")
+            symbol_sessions = {}
+
+        try:
+            holidays = parse_holidays(config.TRADING_HOLIDAYS)
+        except ValueError:
+            logger.warning("Invalid trading holidays format in settings")
+            holidays = ()
+
+        return cls(
+            sessions,
+            symbol_sessions=symbol_sessions,
+            holidays=holidays,
+            allow_weekends=config.ALLOW_WEEKEND_TRADING,
+            timezone=timezone
+        )
+
+    def on_settings(self, old, new):
+        """
+        Settings listener: recompile the calendar when a trading hours
+        setting changed.
+        """
+        if any(getattr(old, name) != getattr(new, name) for name in CALENDAR_SETTINGS):
+            self._state = TradingCalendar.from_settings(new)._state
+            logger.info("Trading calendar recompiled")
+
+    def is_trading_allowed(self, when=None, symbol=None):
+        """
+        Check whether trading is allowed.
+
+        Args:
+            when (datetime, optional): Time to check. Naive datetimes are taken to
+                be in the calendar timezone. Defaults to now.
+            symbol (str, optional): Symbol with its own sessions, if any
+
+        Returns:
+            bool: True if trading is allowed, False otherwise
+        """
+        state = self._state
+        if when is None:
+            when = datetime.datetime.now(state.timezone)
+        elif state.timezone is not None and when.tzinfo is not None:
+            when = when.astimezone(state.timezone)
+
+        if state.holidays and when.date() in state.holidays:
+            return False
+
+        table = state.symbols.get(symbol.upper(), state.default) if symbol else state.default
+        seconds = when.hour * 3600 + when.minute * 60 + when.second
+        return table.contains(when.weekday(), seconds)
+
+# Create a singleton instance and recompile it when the trading hours are reloaded
+trading_calendar = TradingCalendar.from_settings()
+settings_reloader.add_listener(trading_calendar.on_settings)
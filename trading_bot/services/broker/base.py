@@ -0,0 +1,256 @@
+"""
+Broker interface for the trading bot.
+
+Brokers implement BrokerService. Execution code talks to a broker only
+through this interface, so the MetaTrader 5 integration and the local
+simulated broker are interchangeable.
+"""
+import abc
+
+class BrokerError(Exception):
+    """
+    Raised when the broker rejects a request.
+    """
+
+class BrokerConnectionError(BrokerError):
+    """
+    Raised when the broker cannot be reached.
+    """
+
+class SymbolInfo:
+    """
+    Trading properties of a symbol.
+    """
+
+    __slots__ = ("symbol", "tick_size", "contract_size", "volume_min", "volume_max", "volume_step", "digits")
+
+    def __init__(self, symbol, tick_size, contract_size, volume_min, volume_max, volume_step, digits):
+        """
+        Initialize the symbol info.
+
+        Args:
+            symbol (str): Symbol
+            tick_size (float): Minimum price change
+            contract_size (float): Units per lot
+            volume_min (float): Minimum order volume in lots
+            volume_max (float): Maximum order volume in lots
+            volume_step (float): Volume increment in lots
+            digits (int): Price decimal places
+        """
+        self.symbol = symbol
+        self.tick_size = tick_size
+        self.contract_size = contract_size
+        self.volume_min = volume_min
+        self.volume_max = volume_max
+        self.volume_step = volume_step
+        self.digits = digits
+
+    def normalize_volume(self, volume):
+        """
+        Round a volume down to the volume step and clamp it to the allowed range.
+
+        Args:
+            volume (float): Requested volume in lots
+
+        Returns:
+            float: Tradable volume in lots
+        """
+        steps = int(volume / self.volume_step + 1e-9)
+        volume = round(steps * self.volume_step, 8)
+        return min(max(volume, self.volume_min), self.volume_max)
+
+    def normalize_price(self, price):
+        """
+        Round a price to the symbol's tick size.
+
+        Args:
+            price (float): Price
+
+        Returns:
+            float: Rounded price
+        """
+        if not price:
+            return price
+        return round(round(price / self.tick_size) * self.tick_size, self.digits)
+
+    def to_dict(self):
+        """
+        Convert the symbol info to a dict.
+
+        Returns:
+            dict: Symbol info
+        """
+        return {name: getattr(self, name) for name in self.__slots__}
+
+class Order:
+    """
+    Market order request.
+    """
+
+    __slots__ = ("symbol", "action", "volume", "price", "sl", "tp", "comment")
+
+    def __init__(self, symbol, action, volume, price=0.0, sl=0.0, tp=0.0, comment=""):
+        """
+        Initialize the order.
+
+        Args:
+            symbol (str): Symbol
+            action (str): "buy" or "sell"
+            volume (float): Volume in lots
+            price (float, optional): Reference price. Defaults to 0.0 (market).
+            sl (float, optional): Stop loss price. Defaults to 0.0 (none).
+            tp (float, optional): Take profit price. Defaults to 0.0 (none).
+            comment (str, optional): Order comment. Defaults to "".
+        """
+        self.symbol = symbol
+        self.action = action
+        self.volume = volume
+        self.price = price
+        self.sl = sl
+        self.tp = tp
+        self.comment = comment
+
+    def __repr__(self):
+        return f"Order({self.action} {self.volume} {self.symbol} at {self.price})"
+
+class OrderResult:
+    """
+    Result of an order request.
+    """
+
+    __slots__ = ("success", "order_id", "price", "volume", "message")
+
+    def __init__(self, success, order_id=None, price=0.0, volume=0.0, message=""):
+        """
+        Initialize the order result.
+
+        Args:
+            success (bool): Whether the order was filled
+            order_id (int, optional): Broker order or position ticket
+            price (float, optional): Fill price
+            volume (float, optional): Filled volume in lots
+            message (str, optional): Broker message
+        """
+        self.success = success
+        self.order_id = order_id
+        self.price = price
+        self.volume = volume
+        self.message = message
+
+    def to_dict(self):
+        """
+        Convert the order result to a dict.
+
+        Returns:
+            dict: Order result
+        """
+        return {name: getattr(self, name) for name in self.__slots__}
+
+class BrokerService(abc.ABC):
+    """
+    Interface every broker integration implements.
+    """
+
+    @abc.abstractmethod
+    def connect(self):
+        """
+        Open the broker connection and log in.
+
+        Raises:
+            BrokerConnectionError: If the connection fails
+        """
+
+    @abc.abstractmethod
+    def disconnect(self):
+        """
+        Close the broker connection.
+        """
+
+    @abc.abstractmethod
+    def ping(self):
+        """
+        Check that the connection is alive.
+
+        Returns:
+            bool: True if the broker is reachable and logged in
+        """
+
+    @abc.abstractmethod
+    def get_symbol_info(self, symbol):
+        """
+        Get the trading properties of a symbol.
+
+        Args:
+            symbol (str): Symbol
+
+        Returns:
+            SymbolInfo: Symbol info
+
+        Raises:
+            BrokerError: If the symbol is unknown
+        """
+
+    @abc.abstractmethod
+    def submit_order(self, order):
+        """
+        Send a market order.
+
+        Args:
+            order (Order): Order request
+
+        Returns:
+            OrderResult: Order result
+        """
+
+    def submit_orders(self, orders):
+        """
+        Send several market orders.
+
+        Brokers that accept batches override this; the default sends them
+        one by one.
+
+        Args:
+            orders (list): Order requests
+
+        Returns:
+            list: OrderResult per order, in the same order
+        """
+        return [self.submit_order(order) for order in orders]
+
+    @abc.abstractmethod
+    def modify_position(self, position_id, sl=None, tp=None):
+        """
+        Change the stop loss or take profit of an open position.
+
+        Args:
+            position_id (int): Position ticket
+            sl (float, optional): New stop loss price
+            tp (float, optional): New take profit price
+
+        Returns:
+            OrderResult: Modification result
+        """
+
+    @abc.abstractmethod
+    def get_open_tickets(self, symbol=None):
+        """
+        Get the tickets of the open positions.
+
+        Args:
+            symbol (str, optional): Only positions on this symbol
+
+        Returns:
+            set: Position tickets
+
+        Raises:
+            BrokerError: If the positions cannot be read
+        """
+
+    @abc.abstractmethod
+    def get_account_equity(self):
+        """
+        Get the current account equity.
+
+        Returns:
+            float: Account equity
+        """
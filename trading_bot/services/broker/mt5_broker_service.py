@@ -0,0 +1,175 @@
+"""
+MetaTrader 5 broker integration.
+
+The MetaTrader5 package talks to a single terminal through a process-wide
+connection and is not thread-safe, so every call is serialized through one
+lock. Connection lifetime, health checks and reconnects are handled by
+BrokerSession; this class only translates requests.
+"""
+import threading
+
+from trading_bot.utils.logger import setup_logger
+from trading_bot.services.broker.base import (
+    BrokerService, BrokerError, BrokerConnectionError, SymbolInfo, OrderResult
+)
+from trading_bot.config import settings
+
+# Configure logging
+logger = setup_logger("services.broker.mt5")
+
+# Maximum price deviation in points for market orders
+DEFAULT_DEVIATION = 20
+
+class MT5BrokerService(BrokerService):
+    """
+    Broker backed by the MetaTrader 5 terminal.
+    """
+
+    def __init__(self, username=None, password=None, server=None, deviation=DEFAULT_DEVIATION, magic=0):
+        """
+        Initialize the MetaTrader 5 broker.
+
+        Args:
+            username (str, optional): Account login. Defaults to MT5_USERNAME.
+            password (str, optional): Account password. Defaults to MT5_PASSWORD.
+            server (str, optional): Trade server. Defaults to MT5_SERVER.
+            deviation (int, optional): Maximum slippage in points. Defaults to DEFAULT_DEVIATION.
+            magic (int, optional): Magic number attached to orders. Defaults to 0.
+        """
+        self.username = settings.MT5_USERNAME if username is None else username
+        self.password = settings.MT5_PASSWORD if password is None else password
+        self.server = settings.MT5_SERVER if server is None else server
+        self.deviation = deviation
+        self.magic = magic
+
+        self.mt5 = None
+        self._lock = threading.Lock()
+
+    def connect(self):
+        with self._lock:
+            if self.mt5 is None:
+                try:
+                    # Imported here so the rest of the bot runs without the MT5 terminal
+                    import MetaTrader5 as mt5
+                except ImportError as e:
+                    raise BrokerConnectionError(f"MetaTrader5 package not available: {e}") from e
+                self.mt5 = mt5
+
+            if not self.mt5.initialize(
+                login=int(self.username) if self.username.isdigit() else None,
+                password=self.password,
+                server=self.server
+            ):
+                raise BrokerConnectionError(f"MetaTrader 5 initialization failed: {self.mt5.last_error()}")
+
+        logger.info("Connected to MetaTrader 5 server %s", self.server)
+
+    def disconnect(self):
+        with self._lock:
+            if self.mt5 is not None:
+                self.mt5.shutdown()
+
+    def ping(self):
+        if self.mt5 is None:
+            return False
+        with self._lock:
+            terminal = self.mt5.terminal_info()
+            return terminal is not None and terminal.connected and self.mt5.account_info() is not None
+
+    def get_symbol_info(self, symbol):
+        with self._lock:
+            mt5 = self._require()
+            info = mt5.symbol_info(symbol)
+            if info is None:
+                raise BrokerError(f"Unknown symbol: {symbol}")
+            if not info.visible and not mt5.symbol_select(symbol, True):
+                raise BrokerError(f"Failed to select symbol {symbol}: {mt5.last_error()}")
+
+        return SymbolInfo(
+            symbol,
+            tick_size=info.trade_tick_size or info.point,
+            contract_size=info.trade_contract_size,
+            volume_min=info.volume_min,
+            volume_max=info.volume_max,
+            volume_step=info.volume_step,
+            digits=info.digits
+        )
+
+    def submit_order(self, order):
+        with self._lock:
+            mt5 = self._require()
+            tick = mt5.symbol_info_tick(order.symbol)
+            if tick is None:
+                raise BrokerError(f"No price for {order.symbol}: {mt5.last_error()}")
+
+            buy = order.action == "buy"
+            request = {
+                "action": mt5.TRADE_ACTION_DEAL,
+                "symbol": order.symbol,
+                "volume": float(order.volume),
+                "type": mt5.ORDER_TYPE_BUY if buy else mt5.ORDER_TYPE_SELL,
+                "price": tick.ask if buy else tick.bid,
+                "deviation": self.deviation,
+                "magic": self.magic,
+                "comment": order.comment[:31],
+                "type_time": mt5.ORDER_TIME_GTC,
+                "type_filling": mt5.ORDER_FILLING_IOC,
+            }
+            if order.sl:
+                request["sl"] = float(order.sl)
+            if order.tp:
+                request["tp"] = float(order.tp)
+
+            result = mt5.order_send(request)
+            return self._to_result(result)
+
+    def modify_position(self, position_id, sl=None, tp=None):
+        with self._lock:
+            mt5 = self._require()
+            positions = mt5.positions_get(ticket=position_id)
+            if not positions:
+                raise BrokerError(f"Unknown position: {position_id}")
+
+            position = positions[0]
+            request = {
+                "action": mt5.TRADE_ACTION_SLTP,
+                "position": position_id,
+                "symbol": position.symbol,
+                "sl": float(position.sl if sl is None else sl),
+                "tp": float(position.tp if tp is None else tp),
+            }
+            return self._to_result(mt5.order_send(request))
+
+    def get_open_tickets(self, symbol=None):
+        with self._lock:
+            mt5 = self._require()
+            positions = mt5.positions_get(symbol=symbol) if symbol else mt5.positions_get()
+            if positions is None:
+                raise BrokerError(f"Failed to get positions: {mt5.last_error()}")
+            return {position.ticket for position in positions}
+
+    def get_account_equity(self):
+        with self._lock:
+            account = self._require().account_info()
+            if account is None:
+                raise BrokerConnectionError(f"Failed to get account info: {self.mt5.last_error()}")
+            return account.equity
+
+    def _require(self):
+        if self.mt5 is None:
+            raise BrokerConnectionError("MetaTrader 5 is not connected")
+        return self.mt5
+
+    def _to_result(self, result):
+        if result is None:
+            # order_send returns None when the terminal connection is gone
+            raise BrokerConnectionError(f"MetaTrader 5 order_send failed: {self.mt5.last_error()}")
+
+        success = result.retcode == self.mt5.TRADE_RETCODE_DONE
+        return OrderResult(
+            success,
+            order_id=result.order or None,
+            price=result.price,
+            volume=result.volume,
+            message=result.comment
+        )
@@ -0,0 +1,355 @@
+"""
+Persistent broker session.
+
+Keeps one long-lived broker connection for the whole process instead of
+connecting and logging in per signal. A background thread pings the broker
+and reconnects with exponential backoff; requests made while the broker is
+down fail fast instead of waiting for a login. Symbol info is cached and
+shared by all requests.
+"""
+import time
+import atexit
+import random
+import threading
+
+from trading_bot.utils.logger import setup_logger
+from trading_bot.utils.ttl_cache import TTLCache
+from trading_bot.utils.metrics import metrics
+from trading_bot.services.broker.base import BrokerConnectionError
+from trading_bot.config import settings
+
+# Configure logging
+logger = setup_logger("services.broker.session")
+
+# Order round trips, batched or not
+BROKER_SECONDS = metrics.histogram("stage_seconds", "Latency of webhook processing stages", stage="broker")
+
+class BrokerUnavailableError(BrokerConnectionError):
+    """
+    Raised when a request is made while the broker is disconnected.
+    """
+
+class BrokerSession:
+    """
+    Shared, self-healing connection to a broker.
+    """
+
+    def __init__(self, broker, health_interval=None, backoff_initial=None, backoff_max=None,
+                 symbol_ttl=None, clock=time.monotonic):
+        """
+        Initialize the broker session.
+
+        Args:
+            broker (BrokerService): Broker to manage
+            health_interval (float, optional): Seconds between health checks.
+                Defaults to BROKER_HEALTH_INTERVAL.
+            backoff_initial (float, optional): First reconnect delay in seconds.
+                Defaults to BROKER_BACKOFF_INITIAL.
+            backoff_max (float, optional): Maximum reconnect delay in seconds.
+                Defaults to BROKER_BACKOFF_MAX.
+            symbol_ttl (float, optional): Seconds symbol info stays cached.
+                Defaults to BROKER_SYMBOL_CACHE_TTL.
+            clock (callable, optional): Time source. Defaults to time.monotonic.
+        """
+        self.broker = broker
+        self.health_interval = health_interval or settings.BROKER_HEALTH_INTERVAL
+        self.backoff_initial = backoff_initial or settings.BROKER_BACKOFF_INITIAL
+        self.backoff_max = backoff_max or settings.BROKER_BACKOFF_MAX
+        self.symbols = TTLCache(1000, symbol_ttl or settings.BROKER_SYMBOL_CACHE_TTL, clock)
+        self._clock = clock
+
+        self._connected = False
+        self._failures = 0
+        self._next_attempt = 0.0
+        self._last_error = None
+        self._connect_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+        self._exit_registered = False
+
+        self._fill_listeners = []
+
+        self.connects = 0
+        self.disconnects = 0
+
+    @property
+    def connected(self):
+        """
+        bool: Whether the broker connection is believed to be up.
+        """
+        return self._connected
+
+    def start(self):
+        """
+        Connect and start the health check thread.
+        """
+        if self._thread is not None:
+            return
+
+        self._stop.clear()
+        self.ensure_connected()
+        self._thread = threading.Thread(target=self._health_loop, name="broker-health", daemon=True)
+        self._thread.start()
+        if not self._exit_registered:
+            # Once, however often it is restarted
+            atexit.register(self.stop)
+            self._exit_registered = True
+
+    def stop(self):
+        """
+        Stop the health check thread and disconnect.
+        """
+        thread = self._thread
+        if thread is None:
+            return
+
+        self._thread = None
+        self._stop.set()
+        self._wake.set()
+        thread.join(timeout=5)
+
+        if self._connected:
+            self._connected = False
+            try:
+                self.broker.disconnect()
+            except Exception as e:
+                logger.warning("Error disconnecting from broker: %s", e)
+
+    def ensure_connected(self):
+        """
+        Connect if disconnected and the backoff delay has passed.
+
+        Only one thread connects at a time; the others fail fast.
+
+        Returns:
+            bool: True if connected
+        """
+        if self._connected:
+            return True
+        if self._clock() < self._next_attempt:
+            return False
+        if not self._connect_lock.acquire(blocking=False):
+            return False
+
+        try:
+            if self._connected:
+                return True
+            self.broker.connect()
+        except Exception as e:
+            self._failures += 1
+            delay = min(self.backoff_max, self.backoff_initial * 2 ** (self._failures - 1))
+            # Jitter so several workers don't reconnect in lockstep
+            delay *= random.uniform(0.5, 1.0)
+            self._next_attempt = self._clock() + delay
+            self._last_error = str(e)
+            logger.warning("Broker connection failed (attempt %d), retrying in %.1fs: %s",
+                           self._failures, delay, e)
+            return False
+        else:
+            if self._failures:
+                logger.info("Broker reconnected after %d failed attempts", self._failures)
+            self._failures = 0
+            self._next_attempt = 0.0
+            self._last_error = None
+            self._connected = True
+            self.connects += 1
+            return True
+        finally:
+            self._connect_lock.release()
+
+    def call(self, method, *args, **kwargs):
+        """
+        Call a broker method on the live connection.
+
+        A connection error marks the session as down and wakes the health
+        thread to reconnect.
+
+        Args:
+            method (str): BrokerService method name
+            *args: Positional arguments for the method
+            **kwargs: Keyword arguments for the method
+
+        Returns:
+            object: Method result
+
+        Raises:
+            BrokerUnavailableError: If the broker is disconnected
+            BrokerError: If the broker rejects the request
+        """
+        if not self._connected and not self.ensure_connected():
+            raise BrokerUnavailableError(f"Broker unavailable: {self._last_error or 'not connected'}")
+
+        try:
+            return getattr(self.broker, method)(*args, **kwargs)
+        except BrokerConnectionError as e:
+            self._mark_down(str(e))
+            raise
+
+    def add_fill_listener(self, callback):
+        """
+        Register a callback for filled orders.
+
+        Args:
+            callback (callable): Called as callback(order, result) for every
+                successful order, on the thread that submitted it
+        """
+        self._fill_listeners.append(callback)
+
+    def get_symbol_info(self, symbol):
+        """
+        Get symbol info, served from the shared cache when possible.
+
+        Args:
+            symbol (str): Symbol
+
+        Returns:
+            SymbolInfo: Symbol info
+        """
+        info = self.symbols.get(symbol)
+        if info is None:
+            info = self.call("get_symbol_info", symbol)
+            self.symbols.set(symbol, info)
+        return info
+
+    def submit_order(self, order):
+        """
+        Send a market order.
+
+        Args:
+            order (Order): Order request
+
+        Returns:
+            OrderResult: Order result
+        """
+        start = time.perf_counter_ns()
+        try:
+            result = self.call("submit_order", order)
+        finally:
+            BROKER_SECONDS.since(start)
+        if result.success:
+            self._notify_fill(order, result)
+        return result
+
+    def submit_orders(self, orders):
+        """
+        Send several market orders in one broker call where supported.
+
+        Args:
+            orders (list): Order requests
+
+        Returns:
+            list: OrderResult per order
+        """
+        start = time.perf_counter_ns()
+        try:
+            results = self.call("submit_orders", orders)
+        finally:
+            BROKER_SECONDS.since(start)
+        for order, result in zip(orders, results):
+            if result.success:
+                self._notify_fill(order, result)
+        return results
+
+    def modify_position(self, position_id, sl=None, tp=None):
+        """
+        Change the stop loss or take profit of an open position.
+
+        Args:
+            position_id (int): Position ticket
+            sl (float, optional): New stop loss price
+            tp (float, optional): New take profit price
+
+        Returns:
+            OrderResult: Modification result
+        """
+        return self.call("modify_position", position_id, sl=sl, tp=tp)
+
+    def get_open_tickets(self, symbol=None):
+        """
+        Get the tickets of the open positions.
+
+        Args:
+            symbol (str, optional): Only positions on this symbol
+
+        Returns:
+            set: Position tickets
+        """
+        return self.call("get_open_tickets", symbol)
+
+    def get_stats(self):
+        """
+        Get session statistics.
+
+        Returns:
+            dict: Connection state, counters and symbol cache stats
+        """
+        return {
+            "connected": self._connected,
+            "connects": self.connects,
+            "disconnects": self.disconnects,
+            "failed_attempts": self._failures,
+            "last_error": self._last_error,
+            "symbol_cache": self.symbols.get_stats()
+        }
+
+    def _notify_fill(self, order, result):
+        for callback in self._fill_listeners:
+            try:
+                callback(order, result)
+            except Exception as e:
+                logger.exception("Error in fill listener: %s", e)
+
+    def _mark_down(self, reason):
+        if self._connected:
+            self._connected = False
+            self.disconnects += 1
+            self._last_error = reason
+            logger.warning("Broker connection lost: %s", reason)
+        self._wake.set()
+
+    def _health_loop(self):
+        while not self._stop.is_set():
+            if self._connected:
+                timeout = self.health_interval
+            else:
+                timeout = max(0.05, self._next_attempt - self._clock())
+            self._wake.wait(timeout)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+
+            if self._connected:
+                try:
+                    alive = self.broker.ping()
+                except Exception as e:
+                    alive = False
+                    logger.debug("Broker ping failed: %s", e)
+                if not alive:
+                    self._mark_down("health check failed")
+                    self._wake.clear()
+
+            if not self._connected:
+                self.ensure_connected()
+
+def create_broker(name=None):
+    """
+    Create the broker selected in the settings.
+
+    Args:
+        name (str, optional): "mt5" or "simulated". Defaults to BROKER.
+
+    Returns:
+        BrokerService: Broker
+    """
+    name = (name or settings.BROKER).lower()
+    if name == "mt5":
+        from trading_bot.services.broker.mt5_broker_service import MT5BrokerService
+        return MT5BrokerService()
+    if name == "simulated":
+        from trading_bot.services.broker.simulated_broker import SimulatedBroker
+        return SimulatedBroker(latency=settings.SIMULATED_BROKER_LATENCY)
+    raise ValueError(f"Unknown broker: {name}")
+
+# Create a singleton instance
+broker_session = BrokerSession(create_broker())
@@ -0,0 +1,164 @@
+"""
+Local simulated broker.
+
+Fills every order immediately at the requested price after a configurable
+round-trip latency. Open positions are netted like on a netting account: an
+order first reduces or closes the opposite positions on its symbol, oldest
+first, and only the rest opens a new position. Stops are never triggered.
+Used for tests, benchmarks and replay.
+"""
+import time
+import itertools
+import threading
+
+from trading_bot.services.broker.base import (
+    BrokerService, BrokerConnectionError, BrokerError, SymbolInfo, OrderResult
+)
+
+class SimulatedBroker(BrokerService):
+    """
+    In-process broker stand-in.
+    """
+
+    def __init__(self, latency=0.0, connect_latency=0.0, equity=10000.0, symbols=None, serial=False):
+        """
+        Initialize the simulated broker.
+
+        Args:
+            latency (float, optional): Seconds per order round trip. Defaults to 0.0.
+            connect_latency (float, optional): Seconds per connect/login. Defaults to 0.0.
+            equity (float, optional): Account equity. Defaults to 10000.0.
+            symbols (dict, optional): Symbol to SymbolInfo. Unknown symbols get
+                forex-style defaults.
+            serial (bool, optional): Handle one request at a time, like a single
+                MetaTrader 5 terminal connection. Defaults to False.
+        """
+        self.latency = latency
+        self.connect_latency = connect_latency
+        self.equity = equity
+        self.symbols = symbols or {}
+        self.connected = False
+        self.fail_next_connects = 0
+
+        self.orders = []
+        self.modifications = []
+        # Ticket to [symbol, action, volume] of the open positions
+        self.positions = {}
+        self.connects = 0
+        self.batches = 0
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._wire = threading.Lock() if serial else None
+
+    def connect(self):
+        time.sleep(self.connect_latency)
+        self.connects += 1
+        if self.fail_next_connects:
+            self.fail_next_connects -= 1
+            raise BrokerConnectionError("Simulated connection failure")
+        self.connected = True
+
+    def disconnect(self):
+        self.connected = False
+
+    def ping(self):
+        return self.connected
+
+    def get_symbol_info(self, symbol):
+        self._check_connected()
+        info = self.symbols.get(symbol)
+        if info is None:
+            info = SymbolInfo(symbol, 0.00001, 100000.0, 0.01, 100.0, 0.01, 5)
+        return info
+
+    def submit_order(self, order):
+        self._check_connected()
+        if order.action not in ("buy", "sell"):
+            raise BrokerError(f"Invalid order action: {order.action}")
+        self._round_trip()
+
+        with self._lock:
+            order_id = next(self._ids)
+            self.orders.append(order)
+            self._fill(order_id, order)
+
+        return OrderResult(True, order_id=order_id, price=order.price, volume=order.volume, message="Filled")
+
+    def submit_orders(self, orders):
+        # One round trip for the whole batch
+        self._check_connected()
+        self._round_trip()
+
+        results = []
+        with self._lock:
+            for order in orders:
+                if order.action not in ("buy", "sell"):
+                    results.append(OrderResult(False, message=f"Invalid order action: {order.action}"))
+                    continue
+                order_id = next(self._ids)
+                self.orders.append(order)
+                self._fill(order_id, order)
+                results.append(OrderResult(True, order_id=order_id, price=order.price,
+                                           volume=order.volume, message="Filled"))
+        self.batches += 1
+        return results
+
+    def modify_position(self, position_id, sl=None, tp=None):
+        self._check_connected()
+        self._round_trip()
+        with self._lock:
+            self.modifications.append((position_id, sl, tp))
+        return OrderResult(True, order_id=position_id, message="Modified")
+
+    def get_open_tickets(self, symbol=None):
+        self._check_connected()
+        with self._lock:
+            return {ticket for ticket, position in self.positions.items()
+                    if symbol is None or position[0] == symbol}
+
+    def close_position(self, ticket):
+        """
+        Close a position at the broker, as a stop loss or take profit would.
+
+        Args:
+            ticket (int): Position ticket
+
+        Returns:
+            bool: True if the position was open
+        """
+        with self._lock:
+            return self.positions.pop(ticket, None) is not None
+
+    def get_account_equity(self):
+        self._check_connected()
+        return self.equity
+
+    def _fill(self, order_id, order):
+        # Caller holds the lock
+        remaining = order.volume
+        for ticket, position in list(self.positions.items()):
+            if remaining <= 0:
+                break
+            symbol, action, volume = position
+            if symbol != order.symbol or action == order.action:
+                continue
+            if volume <= remaining:
+                del self.positions[ticket]
+            else:
+                position[2] = round(volume - remaining, 8)
+            remaining = round(remaining - volume, 8)
+        if remaining > 0:
+            self.positions[order_id] = [order.symbol, order.action, remaining]
+
+    def _round_trip(self):
+        if not self.latency:
+            return
+        if self._wire is None:
+            time.sleep(self.latency)
+            return
+        with self._wire:
+            time.sleep(self.latency)
+
+    def _check_connected(self):
+        if not self.connected:
+            raise BrokerConnectionError("Simulated broker is not connected")
@@ -0,0 +1,3 @@
+"""
+Trade history storage for the trading bot.
+"""
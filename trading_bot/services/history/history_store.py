@@ -0,0 +1,402 @@
+"""
+Trade and signal history in SQLite.
+
+Signals with their outcome, filled orders (trades) and positions are kept in
+an SQLite database in WAL mode, so the dashboard and the /api endpoints can
+read while the bot writes. Nothing is written on the request thread:
+records are appended to an in-memory queue and a writer thread inserts
+whatever accumulated every HISTORY_FLUSH_MS, in one transaction of up to
+HISTORY_BATCH_SIZE rows. When the queue is full, records are dropped and
+counted rather than slowing down trading.
+
+Lists are paginated with a keyset cursor on (time, id) and served from the
+(ticker, time), (status, time) and (time) indexes, so a page costs the same
+at row ten million as at row ten.
+"""
+import os
+import time
+import sqlite3
+import threading
+from collections import deque
+
+from trading_bot.utils.logger import setup_logger
+from trading_bot.services.broker.session import broker_session
+from trading_bot.core.position_book import position_book
+from trading_bot.config import settings
+
+# Configure logging
+logger = setup_logger("services.history")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS signals (
+    id INTEGER PRIMARY KEY,
+    time INTEGER NOT NULL,
+    ticker TEXT NOT NULL,
+    action TEXT NOT NULL,
+    price REAL,
+    alert_id TEXT,
+    status TEXT NOT NULL,
+    message TEXT
+);
+CREATE INDEX IF NOT EXISTS signals_ticker_time ON signals (ticker, time);
+CREATE INDEX IF NOT EXISTS signals_status_time ON signals (status, time);
+CREATE INDEX IF NOT EXISTS signals_time ON signals (time);
+
+CREATE TABLE IF NOT EXISTS trades (
+    id INTEGER PRIMARY KEY,
+    time INTEGER NOT NULL,
+    ticker TEXT NOT NULL,
+    action TEXT NOT NULL,
+    volume REAL,
+    price REAL,
+    sl REAL,
+    tp REAL,
+    order_id INTEGER,
+    status TEXT NOT NULL,
+    comment TEXT
+);
+CREATE INDEX IF NOT EXISTS trades_ticker_time ON trades (ticker, time);
+CREATE INDEX IF NOT EXISTS trades_status_time ON trades (status, time);
+CREATE INDEX IF NOT EXISTS trades_time ON trades (time);
+
+CREATE TABLE IF NOT EXISTS positions (
+    id INTEGER PRIMARY KEY,
+    time INTEGER NOT NULL,
+    ticket INTEGER NOT NULL UNIQUE,
+    ticker TEXT NOT NULL,
+    action TEXT NOT NULL,
+    volume REAL,
+    entry REAL,
+    sl REAL,
+    tp REAL,
+    status TEXT NOT NULL,
+    closed_time INTEGER,
+    pnl REAL
+);
+CREATE INDEX IF NOT EXISTS positions_ticker_time ON positions (ticker, time);
+CREATE INDEX IF NOT EXISTS positions_status_time ON positions (status, time);
+CREATE INDEX IF NOT EXISTS positions_time ON positions (time);
+"""
+
+INSERT_SIGNAL = (
+    "INSERT INTO signals (time, ticker, action, price, alert_id, status, message) VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+INSERT_TRADE = (
+    "INSERT INTO trades (time, ticker, action, volume, price, sl, tp, order_id, status, comment) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+INSERT_POSITION = (
+    "INSERT OR IGNORE INTO positions (time, ticket, ticker, action, volume, entry, sl, tp, status) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'open')"
+)
+CLOSE_POSITION = "UPDATE positions SET status = 'closed', closed_time = ?, pnl = ? WHERE ticket = ?"
+
+# Columns returned per table, and the statuses a list can be filtered on
+COLUMNS = {
+    "signals": ("id", "time", "ticker", "action", "price", "alert_id", "status", "message"),
+    "trades": ("id", "time", "ticker", "action", "volume", "price", "sl", "tp", "order_id", "status", "comment"),
+    "positions": ("id", "time", "ticket", "ticker", "action", "volume", "entry", "sl", "tp",
+                  "status", "closed_time", "pnl"),
+}
+
+# Largest page a caller may ask for
+MAX_PAGE_SIZE = 500
+
+def _now_ms():
+    return int(time.time() * 1000)
+
+def encode_cursor(row):
+    """
+    Cursor pointing after a row of a page.
+
+    Args:
+        row (dict): Last row of the page
+
+    Returns:
+        str: Opaque cursor
+    """
+    return f"{row['time']}.{row['id']}"
+
+def decode_cursor(cursor):
+    """
+    Parse a cursor returned with a page.
+
+    Args:
+        cursor (str): Cursor
+
+    Returns:
+        tuple: (time, id)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        row_time, row_id = cursor.split(".")
+        return int(row_time), int(row_id)
+    except (AttributeError, ValueError):
+        raise ValueError(f"Invalid cursor: {cursor!r}") from None
+
+class HistoryStore:
+    """
+    Batched SQLite writer and paginated reader of the trading history.
+    """
+
+    def __init__(self, path=None, enabled=None, batch_size=None, flush_interval=None, max_queue=None):
+        """
+        Initialize the history store.
+
+        Args:
+            path (str, optional): Database file. Defaults to HISTORY_DB.
+            enabled (bool, optional): Defaults to ENABLE_HISTORY.
+            batch_size (int, optional): Rows per transaction. Defaults to HISTORY_BATCH_SIZE.
+            flush_interval (float, optional): Seconds between writes. Defaults to HISTORY_FLUSH_MS.
+            max_queue (int, optional): Records kept while the writer is behind.
+                Defaults to HISTORY_QUEUE_SIZE.
+        """
+        self.path = path or settings.HISTORY_DB
+        self.enabled = settings.ENABLE_HISTORY if enabled is None else enabled
+        self.batch_size = max(1, batch_size or settings.HISTORY_BATCH_SIZE)
+        self.flush_interval = (settings.HISTORY_FLUSH_MS if flush_interval is None else flush_interval * 1000) / 1000.0
+        self.max_queue = max(1, max_queue or settings.HISTORY_QUEUE_SIZE)
+
+        # Appended from any thread and drained by the writer; deque operations are atomic
+        self._queue = deque()
+        self._stop = threading.Event()
+        self._thread = None
+        self._readers = threading.local()
+
+        self.written = 0
+        self.dropped = 0
+        self.errors = 0
+        self.batches = 0
+
+    @property
+    def running(self):
+        """
+        bool: True while the writer thread runs.
+        """
+        return self._thread is not None
+
+    def start(self):
+        """
+        Create the database if needed and start the writer.
+        """
+        if not self.enabled or self._thread is not None:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = self.connect()
+        connection.executescript(SCHEMA)
+        connection.close()
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="history-writer", daemon=True)
+        self._thread.start()
+        logger.info("History store started (%s)", self.path)
+
+    def stop(self, timeout=5.0):
+        """
+        Write what is queued, then stop the writer.
+
+        Args:
+            timeout (float, optional): Seconds to wait for the writer. Defaults to 5.
+        """
+        thread = self._thread
+        if thread is None:
+            return
+        self._stop.set()
+        thread.join(timeout)
+        self._thread = None
+        logger.info("History store stopped (%d rows written, %d dropped)", self.written, self.dropped)
+
+    def connect(self):
+        """
+        Open a connection to the database in WAL mode.
+
+        Returns:
+            sqlite3.Connection: New connection
+        """
+        connection = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        # Durable at each checkpoint; the signal journal covers the last moments before a crash
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def record_signal(self, signal, result):
+        """
+        Queue a processed signal and its outcome.
+
+        Args:
+            signal (Signal): Signal
+            result (dict): Response returned for the signal
+        """
+        self._put(INSERT_SIGNAL, (
+            _now_ms(), signal.ticker, signal.action, signal.price, signal.alert_id,
+            "executed" if result.get("success") else "rejected", result.get("message")
+        ))
+
+    def on_fill(self, order, result):
+        """
+        Fill listener: queue the trade and the position it opened.
+        """
+        now = _now_ms()
+        volume = result.volume or order.volume
+        price = result.price or order.price
+        self._put(INSERT_TRADE, (
+            now, order.symbol, order.action, volume, price, order.sl, order.tp, result.order_id, "filled", order.comment
+        ))
+        self._put(INSERT_POSITION, (now, result.order_id, order.symbol, order.action, volume, price, order.sl, order.tp))
+
+    def on_close(self, symbol, ticket, pnl):
+        """
+        Close listener: queue the closing of a position.
+        """
+        self._put(CLOSE_POSITION, (_now_ms(), pnl, ticket))
+
+    def signals(self, **filters):
+        """
+        Get a page of signals, newest first. See page() for the filters.
+        """
+        return self.page("signals", **filters)
+
+    def trades(self, **filters):
+        """
+        Get a page of trades, newest first. See page() for the filters.
+        """
+        return self.page("trades", **filters)
+
+    def positions(self, **filters):
+        """
+        Get a page of positions, newest first. See page() for the filters.
+        """
+        return self.page("positions", **filters)
+
+    def page(self, table, ticker=None, status=None, cursor=None, limit=50):
+        """
+        Get a page of a history table, newest first.
+
+        Args:
+            table (str): "signals", "trades" or "positions"
+            ticker (str, optional): Only rows for this ticker, matched exactly as stored
+            status (str, optional): Only rows with this status
+            cursor (str, optional): Cursor returned with the previous page
+            limit (int, optional): Rows per page, at most MAX_PAGE_SIZE. Defaults to 50.
+
+        Returns:
+            dict: Rows under the table name and the cursor of the next page
+                ("next", None on the last page)
+
+        Raises:
+            ValueError: If the limit or the cursor is invalid
+        """
+        columns = COLUMNS[table]
+        limit = int(limit)
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+
+        # Equality on at most one indexed column, then a range on (time, id)
+        # that the same index serves in order
+        where = []
+        params = []
+        if ticker:
+            where.append("ticker = ?")
+            params.append(ticker)
+        if status:
+            where.append("status = ?")
+            params.append(status)
+        if cursor:
+            where.append("(time, id) < (?, ?)")
+            params.extend(decode_cursor(cursor))
+        index = f"{table}_ticker_time" if ticker else f"{table}_status_time" if status else f"{table}_time"
+
+        query = f"SELECT {', '.join(columns)} FROM {table} INDEXED BY {index}"
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query += " ORDER BY time DESC, id DESC LIMIT ?"
+        params.append(limit + 1)
+
+        rows = [dict(zip(columns, row)) for row in self._reader().execute(query, params)]
+        more = len(rows) > limit
+        rows = rows[:limit]
+        return {table: rows, "next": encode_cursor(rows[-1]) if more else None}
+
+    def get_stats(self):
+        """
+        Get writer counters.
+
+        Returns:
+            dict: History store statistics
+        """
+        return {
+            "enabled": self.enabled,
+            "queued": len(self._queue),
+            "written": self.written,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "errors": self.errors
+        }
+
+    def _put(self, statement, params):
+        # Nothing is kept while the writer is stopped (or disabled)
+        if self._thread is None:
+            return
+        if len(self._queue) >= self.max_queue:
+            self.dropped += 1
+            return
+        self._queue.append((statement, params))
+
+    def _reader(self):
+        # One connection per reading thread; WAL lets them read while the writer writes
+        connection = getattr(self._readers, "connection", None)
+        if connection is None:
+            connection = self._readers.connection = self.connect()
+        return connection
+
+    def _run(self):
+        connection = self.connect()
+        try:
+            while not self._stop.wait(self.flush_interval):
+                while len(self._queue) and not self._stop.is_set():
+                    self._write(connection)
+            # Final drain
+            while len(self._queue):
+                self._write(connection)
+        finally:
+            connection.close()
+
+    def _write(self, connection):
+        """
+        Write up to batch_size queued records in one transaction, grouping
+        consecutive records of the same statement into one executemany.
+        """
+        queue = self._queue
+        batch = []
+        for _ in range(min(self.batch_size, len(queue))):
+            batch.append(queue.popleft())
+
+        try:
+            connection.execute("BEGIN")
+            start = 0
+            while start < len(batch):
+                statement = batch[start][0]
+                end = start + 1
+                while end < len(batch) and batch[end][0] is statement:
+                    end += 1
+                connection.executemany(statement, [params for _, params in batch[start:end]])
+                start = end
+            connection.execute("COMMIT")
+        except sqlite3.Error as e:
+            self.errors += 1
+            logger.error("Could not write %d history records: %s", len(batch), e)
+            if connection.in_transaction:
+                connection.execute("ROLLBACK")
+            return
+        self.written += len(batch)
+        self.batches += 1
+
+# Create a singleton instance recording fills from the shared broker session
+# and closes from the shared position book
+history_store = HistoryStore()
+broker_session.add_fill_listener(history_store.on_fill)
+position_book.add_close_listener(history_store.on_close)
@@ -0,0 +1,369 @@
+"""
+Incremental indicator engine.
+
+Keeps per-symbol indicator state and updates ATR, SMA and EMA in O(1) per
+new bar instead of recomputing them over a full DataFrame. Recent values are
+kept in NumPy-backed ring buffers. Results match the `ta` library:
+AverageTrueRange (Wilder smoothing seeded with the mean of the first window),
+SMAIndicator and EMAIndicator (adjust=False).
+"""
+import math
+import threading
+import numpy as np
+
+from trading_bot.config import settings
+
+# Default number of bars kept per symbol
+DEFAULT_CAPACITY = 500
+
+class RingBuffer:
+    """
+    Fixed-capacity float ring buffer backed by a NumPy array.
+    """
+
+    __slots__ = ("_data", "_head", "_count")
+
+    def __init__(self, capacity):
+        """
+        Initialize the ring buffer.
+
+        Args:
+            capacity (int): Maximum number of values kept
+        """
+        self._data = np.full(max(1, int(capacity)), np.nan)
+        self._head = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def capacity(self):
+        """
+        int: Maximum number of values kept.
+        """
+        return len(self._data)
+
+    def append(self, value):
+        """
+        Append a value, overwriting the oldest one when full.
+
+        Args:
+            value (float): Value to append
+        """
+        self._data[self._head] = value
+        self._head = (self._head + 1) % len(self._data)
+        if self._count < len(self._data):
+            self._count += 1
+
+    def extend(self, values):
+        """
+        Append many values at once.
+
+        Args:
+            values (array-like): Values to append, oldest first
+        """
+        capacity = len(self._data)
+        values = np.asarray(values, dtype=float)[-capacity:]
+        self._data[(self._head + np.arange(len(values))) % capacity] = values
+        self._head = (self._head + len(values)) % capacity
+        self._count = min(capacity, self._count + len(values))
+
+    def last(self, n=1):
+        """
+        Get the most recent values, oldest first.
+
+        Args:
+            n (int, optional): Number of values. Defaults to 1.
+
+        Returns:
+            numpy.ndarray: Up to n most recent values
+        """
+        n = min(n, self._count)
+        index = (self._head - n + np.arange(n)) % len(self._data)
+        return self._data[index]
+
+    def to_array(self):
+        """
+        Get all stored values, oldest first.
+
+        Returns:
+            numpy.ndarray: Stored values
+        """
+        return self.last(self._count)
+
+    def __getitem__(self, index):
+        """
+        Get a value by position from the end (-1 is the most recent).
+        """
+        if not -self._count <= index < 0:
+            raise IndexError("ring buffer index out of range")
+        return self._data[(self._head + index) % len(self._data)]
+
+class SymbolIndicators:
+    """
+    Incremental indicator state for one symbol and timeframe.
+    """
+
+    def __init__(self, atr_period, ma_period, capacity):
+        """
+        Initialize the indicator state.
+
+        Args:
+            atr_period (int): ATR window
+            ma_period (int): SMA and EMA window
+            capacity (int): Number of bars kept in the ring buffers
+        """
+        self.atr_period = atr_period
+        self.ma_period = ma_period
+        self.bars = 0
+
+        self.high = RingBuffer(capacity)
+        self.low = RingBuffer(capacity)
+        self.close = RingBuffer(capacity)
+        self.atr = RingBuffer(capacity)
+        self.sma = RingBuffer(capacity)
+        self.ema = RingBuffer(capacity)
+
+        # Recent raw values needed for the O(1) updates
+        self._true_ranges = RingBuffer(atr_period)
+        self._closes = RingBuffer(ma_period)
+
+        self._prev_close = math.nan
+        self._atr = 0.0
+        self._sma_sum = 0.0
+        self._ema = math.nan
+        self._ema_alpha = 2.0 / (ma_period + 1)
+
+    def update(self, high, low, close):
+        """
+        Add a completed bar and update all indicators.
+
+        Args:
+            high (float): Bar high
+            low (float): Bar low
+            close (float): Bar close
+
+        Returns:
+            dict: Latest indicator values
+        """
+        # True range; the first bar has no previous close
+        true_range = high - low
+        if not math.isnan(self._prev_close):
+            true_range = max(true_range, abs(high - self._prev_close), abs(low - self._prev_close))
+        self._prev_close = close
+        self._true_ranges.append(true_range)
+
+        # ATR: zero until the first full window, then Wilder smoothing
+        period = self.atr_period
+        if self.bars == period - 1:
+            self._atr = float(self._true_ranges.to_array().mean())
+        elif self.bars >= period:
+            self._atr = (self._atr * (period - 1) + true_range) / float(period)
+
+        # SMA over a running sum
+        period = self.ma_period
+        if len(self._closes) == period:
+            self._sma_sum -= self._closes[-period]
+        self._closes.append(close)
+        self._sma_sum += close
+        sma = self._sma_sum / period if self.bars >= period - 1 else math.nan
+
+        # EMA seeded with the first close
+        if math.isnan(self._ema):
+            self._ema = close
+        else:
+            self._ema = (1 - self._ema_alpha) * self._ema + self._ema_alpha * close
+        ema = self._ema if self.bars >= period - 1 else math.nan
+
+        self.bars += 1
+        self.high.append(high)
+        self.low.append(low)
+        self.close.append(close)
+        self.atr.append(self._atr)
+        self.sma.append(sma)
+        self.ema.append(ema)
+
+        return self.values()
+
+    def warm_up(self, high, low, close):
+        """
+        Initialize the state from a block of historical bars.
+
+        Indicators are computed over the whole block with vectorized NumPy and
+        pandas operations; later bars are then added with update().
+
+        Args:
+            high (array-like): Bar highs, oldest first
+            low (array-like): Bar lows, oldest first
+            close (array-like): Bar closes, oldest first
+        """
+        # Imported here so the live path doesn't pay for pandas
+        import pandas as pd
+
+        high = np.asarray(high, dtype=float)
+        low = np.asarray(low, dtype=float)
+        close = np.asarray(close, dtype=float)
+        count = len(close)
+        if count == 0:
+            return
+
+        # True range, vectorized
+        prev_close = np.concatenate(([np.nan], close[:-1]))
+        true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+        # ATR: Wilder smoothing is an EWM with alpha 1/period seeded with the first window mean
+        period = self.atr_period
+        atr = np.zeros(count)
+        if count >= period:
+            seeded = np.concatenate(([true_range[:period].mean()], true_range[period:]))
+            atr[period - 1:] = pd.Series(seeded).ewm(alpha=1.0 / period, adjust=False).mean().to_numpy()
+
+        period = self.ma_period
+        closes = pd.Series(close)
+        sma = closes.rolling(window=period, min_periods=period).mean().to_numpy()
+        ema = closes.ewm(span=period, min_periods=period, adjust=False).mean().to_numpy()
+
+        self.high.extend(high)
+        self.low.extend(low)
+        self.close.extend(close)
+        self.atr.extend(atr)
+        self.sma.extend(sma)
+        self.ema.extend(ema)
+        self._true_ranges.extend(true_range)
+        self._closes.extend(close)
+
+        self.bars = count
+        self._prev_close = close[-1]
+        self._atr = float(atr[-1])
+        self._sma_sum = float(close[-min(count, period):].sum())
+        self._ema = float(closes.ewm(span=period, adjust=False).mean().iloc[-1])
+
+    @property
+    def last_atr(self):
+        """
+        float: Latest ATR, or 0.0 while warming up.
+        """
+        return self._atr
+
+    def values(self):
+        """
+        Get the latest indicator values.
+
+        Returns:
+            dict: Latest close, ATR, SMA and EMA (NaN while warming up)
+        """
+        return {
+            "bars": self.bars,
+            "close": self._prev_close,
+            "atr": self._atr,
+            "sma": self.sma[-1] if len(self.sma) else math.nan,
+            "ema": self.ema[-1] if len(self.ema) else math.nan
+        }
+
+class IndicatorEngine:
+    """
+    Incremental indicators for many symbols.
+
+    Updates for one symbol must come from one thread at a time (for example
+    the symbol's shard); different symbols can be updated concurrently.
+    """
+
+    def __init__(self, atr_period=None, ma_period=20, capacity=DEFAULT_CAPACITY):
+        """
+        Initialize the indicator engine.
+
+        Args:
+            atr_period (int, optional): ATR window. Defaults to ATR_PERIOD.
+            ma_period (int, optional): SMA and EMA window. Defaults to 20.
+            capacity (int, optional): Bars kept per symbol. Defaults to DEFAULT_CAPACITY.
+        """
+        self.atr_period = atr_period or settings.ATR_PERIOD
+        self.ma_period = ma_period
+        self.capacity = capacity
+        self._symbols = {}
+        self._lock = threading.Lock()
+
+    def symbols(self):
+        """
+        Get the symbols with indicator state.
+
+        Returns:
+            list: Symbols
+        """
+        return list(self._symbols)
+
+    def state(self, symbol):
+        """
+        Get or create the indicator state for a symbol.
+
+        Args:
+            symbol (str): Symbol (optionally with a timeframe suffix)
+
+        Returns:
+            SymbolIndicators: Indicator state
+        """
+        state = self._symbols.get(symbol)
+        if state is None:
+            with self._lock:
+                state = self._symbols.get(symbol)
+                if state is None:
+                    state = SymbolIndicators(self.atr_period, self.ma_period, self.capacity)
+                    self._symbols[symbol] = state
+        return state
+
+    def update(self, symbol, high, low, close):
+        """
+        Add a completed bar for a symbol.
+
+        Args:
+            symbol (str): Symbol
+            high (float): Bar high
+            low (float): Bar low
+            close (float): Bar close
+
+        Returns:
+            dict: Latest indicator values
+        """
+        return self.state(symbol).update(high, low, close)
+
+    def warm_up(self, symbol, high, low, close):
+        """
+        Replace a symbol's state with indicators computed from history.
+
+        Args:
+            symbol (str): Symbol
+            high (array-like): Bar highs, oldest first
+            low (array-like): Bar lows, oldest first
+            close (array-like): Bar closes, oldest first
+        """
+        state = SymbolIndicators(self.atr_period, self.ma_period, self.capacity)
+        state.warm_up(high, low, close)
+        with self._lock:
+            self._symbols[symbol] = state
+
+    def get(self, symbol):
+        """
+        Get the latest indicator values for a symbol.
+
+        Args:
+            symbol (str): Symbol
+
+        Returns:
+            dict: Latest indicator values, or None if the symbol has no data
+        """
+        state = self._symbols.get(symbol)
+        return state.values() if state is not None else None
+
+    def atr(self, symbol):
+        """
+        Get the latest ATR for a symbol.
+
+        Args:
+            symbol (str): Symbol
+
+        Returns:
+            float: Latest ATR, or 0.0 if not available yet
+        """
+        state = self._symbols.get(symbol)
+        return state.last_atr if state is not None else 0.0
@@ -0,0 +1,461 @@
+"""
+Market data service with a persistent OHLCV bar cache.
+
+Bars are kept per symbol and timeframe in an append-only columnar store: one
+raw binary file per column, read back through NumPy memory maps. Each call
+only fetches the bars closed since the last cached one, so a restart reuses
+the history on disk instead of downloading it again.
+
+The bar source is pluggable: MetaTrader 5 in production, CSV files or a
+synthetic random walk for tests and benchmarks.
+"""
+import os
+import abc
+import time
+import zlib
+import threading
+import numpy as np
+
+from trading_bot.utils.logger import setup_logger
+from trading_bot.config import settings
+
+# Configure logging
+logger = setup_logger("services.market_data")
+
+# Columnar bar layout; time is the bar open time in epoch seconds, in the
+# time base of the source (broker server time for MetaTrader 5)
+BAR_COLUMNS = (
+    ("time", "<i8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("volume", "<f8"),
+)
+BAR_DTYPE = np.dtype(list(BAR_COLUMNS))
+
+# Timeframe names and their length in seconds
+TIMEFRAMES = {
+    "M1": 60,
+    "M5": 300,
+    "M15": 900,
+    "M30": 1800,
+    "H1": 3600,
+    "H4": 14400,
+    "D1": 86400,
+}
+
+def timeframe_seconds(timeframe):
+    """
+    Get the length of a timeframe.
+
+    Args:
+        timeframe (str): Timeframe name, e.g. "M15"
+
+    Returns:
+        int: Length in seconds
+
+    Raises:
+        ValueError: If the timeframe is unknown
+    """
+    try:
+        return TIMEFRAMES[timeframe.upper()]
+    except KeyError:
+        raise ValueError(f"Unknown timeframe: {timeframe}") from None
+
+def connect_mt5():
+    """
+    Import MetaTrader5 and connect to the terminal if it is not connected yet.
+
+    Returns:
+        module: The MetaTrader5 module
+
+    Raises:
+        ConnectionError: If the terminal cannot be initialized
+    """
+    # Imported here so the rest of the bot runs without the MT5 terminal
+    import MetaTrader5 as mt5
+
+    if mt5.terminal_info() is None:
+        if not mt5.initialize(
+            login=int(settings.MT5_USERNAME) if settings.MT5_USERNAME.isdigit() else None,
+            password=settings.MT5_PASSWORD,
+            server=settings.MT5_SERVER
+        ):
+            raise ConnectionError(f"MetaTrader 5 initialization failed: {mt5.last_error()}")
+    return mt5
+
+class BarSource(abc.ABC):
+    """
+    Source of historical OHLCV bars.
+    """
+
+    @abc.abstractmethod
+    def fetch_bars(self, symbol, timeframe, since=None, count=1000):
+        """
+        Fetch bars for a symbol.
+
+        Args:
+            symbol (str): Symbol
+            timeframe (str): Timeframe name
+            since (int, optional): Only return bars opened after this epoch time.
+                Defaults to None (the most recent count bars).
+            count (int, optional): Maximum number of bars when since is None
+
+        Returns:
+            numpy.ndarray: Bars with BAR_DTYPE, oldest first
+        """
+
+    def server_time(self, symbol, now):
+        """
+        Get the current time in the time base of the source's bar times.
+
+        Args:
+            symbol (str): Symbol
+            now (float): Current epoch time from the caller's clock
+
+        Returns:
+            float: Current time comparable with bar times
+        """
+        return now
+
+class MT5BarSource(BarSource):
+    """
+    Bars from the MetaTrader 5 terminal.
+    """
+
+    def __init__(self):
+        """
+        Initialize the MetaTrader 5 bar source.
+        """
+        mt5 = connect_mt5()
+
+        self.mt5 = mt5
+        self._timeframes = {
+            name: getattr(mt5, f"TIMEFRAME_{name}")
+            for name in TIMEFRAMES
+        }
+
+    def fetch_bars(self, symbol, timeframe, since=None, count=1000):
+        timeframe = timeframe.upper()
+        if since is None:
+            rates = self.mt5.copy_rates_from_pos(symbol, self._timeframes[timeframe], 0, count)
+        else:
+            rates = self.mt5.copy_rates_range(
+                symbol,
+                self._timeframes[timeframe],
+                since + 1,
+                int(self.server_time(symbol, time.time())) + timeframe_seconds(timeframe)
+            )
+
+        if rates is None:
+            raise ConnectionError(f"Failed to fetch {symbol} {timeframe} bars: {self.mt5.last_error()}")
+
+        bars = np.empty(len(rates), dtype=BAR_DTYPE)
+        for name in ("time", "open", "high", "low", "close"):
+            bars[name] = rates[name]
+        bars["volume"] = rates["tick_volume"]
+        return bars[bars["time"] > since] if since is not None else bars
+
+    def server_time(self, symbol, now):
+        # MT5 bar times are in the broker's server time zone, not UTC; the
+        # latest tick is stamped in the same time base
+        tick = self.mt5.symbol_info_tick(symbol)
+        if tick is None:
+            raise ConnectionError(f"Failed to get the {symbol} server time: {self.mt5.last_error()}")
+        return tick.time
+
+class CSVBarSource(BarSource):
+    """
+    Bars from CSV files named {symbol}_{timeframe}.csv.
+
+    Files need a header with time (epoch seconds), open, high, low, close and
+    volume columns.
+    """
+
+    def __init__(self, directory):
+        """
+        Initialize the CSV bar source.
+
+        Args:
+            directory (str): Directory containing the CSV files
+        """
+        self.directory = directory
+        self._cache = {}
+
+    def fetch_bars(self, symbol, timeframe, since=None, count=1000):
+        path = os.path.join(self.directory, f"{symbol}_{timeframe.upper()}.csv")
+        bars = self._cache.get(path)
+        if bars is None:
+            data = np.genfromtxt(path, delimiter=",", names=True)
+            bars = np.empty(data.shape[0] if data.shape else 1, dtype=BAR_DTYPE)
+            for name, _ in BAR_COLUMNS:
+                bars[name] = data[name]
+            bars.sort(order="time")
+            self._cache[path] = bars
+
+        if since is None:
+            return bars[-count:].copy()
+        return bars[bars["time"] > since].copy()
+
+class SyntheticBarSource(BarSource):
+    """
+    Deterministic random-walk bars up to the current time.
+    """
+
+    def __init__(self, start_price=1.1, volatility=0.0005, seed=0, clock=time.time):
+        """
+        Initialize the synthetic bar source.
+
+        Args:
+            start_price (float, optional): Price of the first bar. Defaults to 1.1.
+            volatility (float, optional): Standard deviation of bar returns. Defaults to 0.0005.
+            seed (int, optional): Random seed mixed with the symbol. Defaults to 0.
+            clock (callable, optional): Time source. Defaults to time.time.
+        """
+        self.start_price = start_price
+        self.volatility = volatility
+        self.seed = seed
+        self.clock = clock
+        self.calls = 0
+
+    def fetch_bars(self, symbol, timeframe, since=None, count=1000):
+        self.calls += 1
+        seconds = timeframe_seconds(timeframe)
+        last_open = (int(self.clock()) // seconds) * seconds
+
+        if since is None:
+            first_open = last_open - (count - 1) * seconds
+        else:
+            first_open = since + seconds
+        if first_open > last_open:
+            return np.empty(0, dtype=BAR_DTYPE)
+
+        times = np.arange(first_open, last_open + 1, seconds, dtype=np.int64)
+        bars = np.empty(len(times), dtype=BAR_DTYPE)
+        bars["time"] = times
+
+        # Each bar's path depends only on symbol, timeframe and open time,
+        # so repeated and delta fetches agree with each other
+        for i, bar_time in enumerate(times):
+            rng = np.random.default_rng([self.seed, zlib.crc32(symbol.encode()), seconds, int(bar_time)])
+            base = self.start_price * (1 + 0.01 * np.sin(bar_time / (seconds * 500.0)))
+            moves = base * (1 + np.cumsum(rng.normal(0, self.volatility, 4)))
+            bars[i]["open"] = moves[0]
+            bars[i]["close"] = moves[3]
+            bars[i]["high"] = moves.max()
+            bars[i]["low"] = moves.min()
+            bars[i]["volume"] = rng.integers(10, 1000)
+
+        return bars
+
+class BarStore:
+    """
+    Append-only columnar bar store for one symbol and timeframe.
+
+    Each column is a raw little-endian file under directory/. Columns are
+    read back as read-only memory maps; after a crash the shortest column
+    defines the number of complete bars.
+    """
+
+    def __init__(self, directory):
+        """
+        Open or create the store.
+
+        Args:
+            directory (str): Directory holding the column files
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._paths = {name: os.path.join(directory, f"{name}.bin") for name, _ in BAR_COLUMNS}
+        self._columns = {}
+        self._remap()
+
+        # Drop a partially written last bar left behind by a crash
+        for name, dtype in BAR_COLUMNS:
+            path = self._paths[name]
+            if os.path.exists(path) and os.path.getsize(path) > self._length * np.dtype(dtype).itemsize:
+                self._columns[name] = None
+                with open(path, "r+b") as f:
+                    f.truncate(self._length * np.dtype(dtype).itemsize)
+        self._remap()
+
+    def __len__(self):
+        return self._length
+
+    @property
+    def last_time(self):
+        """
+        int: Open time of the last stored bar, or None if empty.
+        """
+        return int(self._columns["time"][self._length - 1]) if self._length else None
+
+    def append(self, bars):
+        """
+        Append bars newer than the last stored bar.
+
+        Args:
+            bars (numpy.ndarray): Bars with BAR_DTYPE, oldest first
+        """
+        if self.last_time is not None:
+            bars = bars[bars["time"] > self.last_time]
+        if not len(bars):
+            return
+
+        for name, dtype in BAR_COLUMNS:
+            with open(self._paths[name], "ab") as f:
+                f.write(np.ascontiguousarray(bars[name], dtype=dtype).tobytes())
+        self._remap()
+
+    def read(self, count=None):
+        """
+        Read the most recent bars.
+
+        Args:
+            count (int, optional): Number of bars. Defaults to None (all bars).
+
+        Returns:
+            numpy.ndarray: Bars with BAR_DTYPE, oldest first
+        """
+        start = 0 if count is None else max(0, self._length - count)
+        bars = np.empty(self._length - start, dtype=BAR_DTYPE)
+        for name, _ in BAR_COLUMNS:
+            bars[name] = self._columns[name][start:self._length]
+        return bars
+
+    def column(self, name, count=None):
+        """
+        Get a read-only view of one column.
+
+        Args:
+            name (str): Column name
+            count (int, optional): Number of most recent values. Defaults to None (all).
+
+        Returns:
+            numpy.ndarray: Column values, oldest first
+        """
+        start = 0 if count is None else max(0, self._length - count)
+        return self._columns[name][start:self._length]
+
+    def _remap(self):
+        lengths = []
+        for name, dtype in BAR_COLUMNS:
+            path = self._paths[name]
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            itemsize = np.dtype(dtype).itemsize
+            length = size // itemsize
+            lengths.append(length)
+            self._columns[name] = (
+                np.memmap(path, dtype=dtype, mode="r", shape=(length,))
+                if length else np.empty(0, dtype=dtype)
+            )
+        self._length = min(lengths)
+
+class MarketDataService:
+    """
+    OHLCV bar cache in front of a bar source.
+    """
+
+    def __init__(self, source, cache_dir=None, history_bars=None, clock=time.time):
+        """
+        Initialize the market data service.
+
+        Args:
+            source (BarSource): Source of bars
+            cache_dir (str, optional): Directory of the on-disk store.
+                Defaults to MARKET_DATA_CACHE_DIR.
+            history_bars (int, optional): Bars fetched for a symbol with no
+                cached history. Defaults to MARKET_DATA_HISTORY_BARS.
+            clock (callable, optional): Time source. Defaults to time.time.
+        """
+        self.source = source
+        self.cache_dir = cache_dir or settings.MARKET_DATA_CACHE_DIR
+        self.history_bars = history_bars or settings.MARKET_DATA_HISTORY_BARS
+        self.clock = clock
+        self._stores = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def get_bars(self, symbol, timeframe, count=None):
+        """
+        Get the most recent closed bars, fetching only what is missing.
+
+        Args:
+            symbol (str): Symbol
+            timeframe (str): Timeframe name
+            count (int, optional): Number of bars. Defaults to None (all cached bars).
+
+        Returns:
+            numpy.ndarray: Bars with BAR_DTYPE, oldest first
+        """
+        store = self.refresh(symbol, timeframe)
+        return store.read(count)
+
+    def refresh(self, symbol, timeframe):
+        """
+        Fetch and persist the bars closed since the last cached bar.
+
+        Args:
+            symbol (str): Symbol
+            timeframe (str): Timeframe name
+
+        Returns:
+            BarStore: Up-to-date store for the symbol and timeframe
+        """
+        timeframe = timeframe.upper()
+        store, lock = self._store(symbol, timeframe)
+
+        with lock:
+            seconds = timeframe_seconds(timeframe)
+            last_time = store.last_time
+            now = self.source.server_time(symbol, self.clock())
+
+            # Nothing new can have closed yet
+            if last_time is not None and last_time + 2 * seconds > now:
+                return store
+
+            bars = self.source.fetch_bars(
+                symbol,
+                timeframe,
+                since=last_time,
+                count=self.history_bars
+            )
+
+            # Only keep closed bars; the forming bar is fetched again next time
+            bars = bars[bars["time"] + seconds <= now]
+            if len(bars):
+                store.append(bars)
+                logger.debug("Cached %d new %s %s bars", len(bars), symbol, timeframe)
+
+        return store
+
+    def _store(self, symbol, timeframe):
+        key = (symbol, timeframe)
+        store = self._stores.get(key)
+        if store is None:
+            with self._lock:
+                store = self._stores.get(key)
+                if store is None:
+                    store = BarStore(os.path.join(self.cache_dir, symbol, timeframe))
+                    self._locks[key] = threading.Lock()
+                    self._stores[key] = store
+        return store, self._locks[key]
+
+def create_bar_source(name=None):
+    """
+    Create the bar source selected in the settings.
+
+    Args:
+        name (str, optional): "mt5", "csv" or "synthetic". Defaults to MARKET_DATA_SOURCE.
+
+    Returns:
+        BarSource: Bar source
+    """
+    name = (name or settings.MARKET_DATA_SOURCE).lower()
+    if name == "mt5":
+        return MT5BarSource()
+    if name == "csv":
+        return CSVBarSource(settings.MARKET_DATA_CSV_DIR)
+    if name == "synthetic":
+        return SyntheticBarSource()
+    raise ValueError(f"Unknown market data source: {name}")
@@ -0,0 +1,192 @@
+"""
+Live price feeds pushing ticks to a callback.
+
+A feed runs on its own thread and calls on_tick(symbol, price) for every new
+quote of the subscribed symbols. MetaTrader 5 has no push API, so its feed
+polls symbol_info_tick every TICK_POLL_MS and forwards only quotes whose
+time changed. The synthetic feed generates a seeded random walk at a fixed
+rate, for tests and latency benchmarks.
+"""
+import abc
+import time
+import random
+import threading
+
+from trading_bot.utils.logger import setup_logger
+from trading_bot.config import settings
+
+# Configure logging
+logger = setup_logger("services.tick_feed")
+
+class TickFeed(abc.ABC):
+    """
+    Source of live ticks running on a background thread.
+    """
+
+    name = "feed"
+
+    def __init__(self, symbols=()):
+        """
+        Initialize the feed.
+
+        Args:
+            symbols (iterable, optional): Symbols to publish ticks for
+        """
+        self.symbols = tuple(symbols)
+        self.ticks = 0
+        self._on_tick = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        """
+        bool: True while the feed thread runs.
+        """
+        return self._thread is not None
+
+    def subscribe(self, symbols):
+        """
+        Replace the subscribed symbols.
+
+        Args:
+            symbols (iterable): Symbols to publish ticks for
+        """
+        self.symbols = tuple(symbols)
+
+    def start(self, on_tick):
+        """
+        Start publishing ticks.
+
+        Args:
+            on_tick (callable): Called as on_tick(symbol, price) from the feed thread
+        """
+        if self._thread is not None:
+            return
+        self._on_tick = on_tick
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name=f"{self.name}-ticks", daemon=True)
+        self._thread.start()
+        logger.info("%s tick feed started (%d symbols)", self.name, len(self.symbols))
+
+    def stop(self, timeout=5):
+        """
+        Stop publishing ticks.
+
+        Args:
+            timeout (float, optional): Seconds to wait for the feed thread. Defaults to 5.
+        """
+        thread = self._thread
+        if thread is None:
+            return
+        self._stop.set()
+        thread.join(timeout)
+        self._thread = None
+        logger.info("%s tick feed stopped after %d ticks", self.name, self.ticks)
+
+    def _loop(self):
+        try:
+            self._run()
+        except Exception as e:
+            logger.exception("%s tick feed failed: %s", self.name, e)
+
+    @abc.abstractmethod
+    def _run(self):
+        """
+        Publish ticks until the stop event is set.
+        """
+
+class SyntheticTickFeed(TickFeed):
+    """
+    Seeded random-walk ticks at a fixed rate.
+    """
+
+    name = "synthetic"
+
+    def __init__(self, symbols=(), rate=None, volatility=0.0001, start_prices=None, seed=0):
+        """
+        Initialize the synthetic feed.
+
+        Args:
+            symbols (iterable, optional): Symbols to publish ticks for
+            rate (float, optional): Ticks per second per symbol. Defaults to SYNTHETIC_TICK_RATE.
+            volatility (float, optional): Standard deviation of tick returns. Defaults to 0.0001.
+            start_prices (dict, optional): Symbol to first price. Defaults to 1.1 for every symbol.
+            seed (int, optional): Random seed. Defaults to 0.
+        """
+        super().__init__(symbols)
+        self.rate = rate or settings.SYNTHETIC_TICK_RATE
+        self.volatility = volatility
+        self.prices = dict(start_prices or {})
+        self._random = random.Random(seed)
+
+    def _run(self):
+        interval = 1.0 / self.rate
+        next_time = time.monotonic()
+        gauss = self._random.gauss
+        while not self._stop.is_set():
+            for symbol in self.symbols:
+                price = self.prices.get(symbol, 1.1) * (1 + gauss(0, self.volatility))
+                self.prices[symbol] = price
+                self.ticks += 1
+                self._on_tick(symbol, price)
+
+            next_time += interval
+            delay = next_time - time.monotonic()
+            if delay > 0:
+                self._stop.wait(delay)
+            else:
+                # Behind schedule: carry on from now instead of bursting to catch up
+                next_time = time.monotonic()
+
+class MT5TickFeed(TickFeed):
+    """
+    Ticks polled from the MetaTrader 5 terminal.
+    """
+
+    name = "mt5"
+
+    def __init__(self, symbols=(), poll_interval=None):
+        """
+        Initialize the MetaTrader 5 feed.
+
+        Args:
+            symbols (iterable, optional): Symbols to publish ticks for
+            poll_interval (float, optional): Seconds between polls. Defaults to TICK_POLL_MS.
+        """
+        # Imported here so the tick stream runs without NumPy or MT5 when synthetic
+        from trading_bot.services.market_data.mt5_data_service import connect_mt5
+
+        super().__init__(symbols)
+        self.mt5 = connect_mt5()
+        self.poll_interval = poll_interval or settings.TICK_POLL_MS / 1000.0
+
+    def _run(self):
+        last = {}
+        while not self._stop.wait(self.poll_interval):
+            for symbol in self.symbols:
+                tick = self.mt5.symbol_info_tick(symbol)
+                if tick is None or last.get(symbol) == tick.time_msc:
+                    continue
+                last[symbol] = tick.time_msc
+                self.ticks += 1
+                # Bid, like the bars the sweep evaluates
+                self._on_tick(symbol, tick.bid)
+
+def create_tick_feed(symbols, name=None):
+    """
+    Create the tick feed selected in the settings.
+
+    Args:
+        symbols (iterable): Symbols to publish ticks for
+        name (str, optional): "mt5" or "synthetic". Defaults to TICK_FEED.
+
+    Returns:
+        TickFeed: Tick feed, not started
+    """
+    name = (name or settings.TICK_FEED).lower()
+    if name == "mt5":
+        return MT5TickFeed(symbols)
+    if name == "synthetic":
+        return SyntheticTickFeed(symbols)
+    raise ValueError(f"Unknown tick feed: {name}")
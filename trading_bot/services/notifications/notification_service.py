@@ -0,0 +1,365 @@
+"""
+Discord notification service.
+
+Notifications are queued in memory and sent by a background thread, so the
+trade path never waits on Discord. The dispatcher coalesces bursts into
+messages of up to ten embeds and 6000 characters, paces requests with a
+token bucket that follows Discord's rate-limit headers, and reuses pooled
+connections. When Discord is slow or down the bounded queue overflows: the
+oldest notifications are dropped and replaced by a single summary embed.
+"""
+import time
+import atexit
+import threading
+from collections import deque
+
+from trading_bot.utils.logger import setup_logger
+from trading_bot.utils.metrics import metrics
+from trading_bot.config import settings
+
+# Configure logging
+logger = setup_logger("services.notifications")
+
+# Time spent queueing on the caller's thread, and Discord round trips
+NOTIFY_SECONDS = metrics.histogram("stage_seconds", "Latency of webhook processing stages", stage="notification")
+SEND_SECONDS = metrics.histogram("notification_send_seconds", "Latency of Discord webhook requests")
+
+# Discord accepts at most 10 embeds per message, holding at most 6000
+# characters of titles, descriptions and fields in total
+MAX_EMBEDS = 10
+MAX_MESSAGE_CHARS = 6000
+
+# Embed colors per level
+COLORS = {
+    "info": 0x3498DB,
+    "success": 0x2ECC71,
+    "warning": 0xF1C40F,
+    "error": 0xE74C3C,
+}
+
+def _embed_size(embed):
+    """
+    Count the characters of an embed that Discord's message limit applies to.
+    """
+    return (
+        len(embed.get("title", ""))
+        + len(embed.get("description", ""))
+        + sum(len(field["name"]) + len(field["value"]) for field in embed.get("fields", ()))
+    )
+
+class TokenBucket:
+    """
+    Token bucket pacing requests, corrected by the server's rate-limit headers.
+    """
+
+    def __init__(self, capacity, refill_seconds, clock=time.monotonic):
+        """
+        Initialize the token bucket.
+
+        Args:
+            capacity (int): Requests allowed per refill period
+            refill_seconds (float): Length of the refill period
+            clock (callable, optional): Time source. Defaults to time.monotonic.
+        """
+        self.capacity = capacity
+        self.rate = capacity / refill_seconds
+        self.tokens = float(capacity)
+        self._clock = clock
+        self._updated = clock()
+        self._blocked_until = 0.0
+
+    def delay(self):
+        """
+        Get the time until a request may be sent.
+
+        Returns:
+            float: Seconds to wait (0 if a token is available)
+        """
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        wait = self._blocked_until - now
+        if self.tokens < 1:
+            wait = max(wait, (1 - self.tokens) / self.rate)
+        return max(0.0, wait)
+
+    def take(self):
+        """
+        Consume a token for a request being sent now.
+        """
+        self.delay()
+        self.tokens -= 1
+
+    def update(self, headers):
+        """
+        Follow the X-RateLimit headers of a response.
+
+        Args:
+            headers (Mapping): Response headers
+        """
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset_after = headers.get("X-RateLimit-Reset-After")
+        limit = headers.get("X-RateLimit-Limit")
+        try:
+            if limit is not None and reset_after is not None and float(reset_after) > 0:
+                self.capacity = max(1, int(limit))
+            if remaining is not None:
+                self.tokens = min(self.tokens, float(remaining))
+                if float(remaining) < 1 and reset_after is not None:
+                    self.block(float(reset_after))
+        except ValueError:
+            pass
+
+    def block(self, seconds):
+        """
+        Send nothing for a number of seconds (e.g. after a 429 response).
+
+        Args:
+            seconds (float): Seconds to wait
+        """
+        self._blocked_until = max(self._blocked_until, self._clock() + seconds)
+
+class NotificationService:
+    """
+    Asynchronous, batched Discord webhook dispatcher.
+    """
+
+    def __init__(self, webhook_url=None, enabled=None, max_queue=None, linger=None, timeout=None,
+                 rate_limit=5, rate_period=2.0):
+        """
+        Initialize the notification service.
+
+        Args:
+            webhook_url (str, optional): Discord webhook URL. Defaults to DISCORD_WEBHOOK_URL.
+            enabled (bool, optional): Defaults to ENABLE_NOTIFICATIONS.
+            max_queue (int, optional): Notifications kept while Discord is slow.
+                Defaults to NOTIFICATION_QUEUE_SIZE.
+            linger (float, optional): Seconds to wait for more notifications
+                before sending a message. Defaults to NOTIFICATION_BATCH_SECONDS.
+            timeout (float, optional): HTTP timeout in seconds. Defaults to NOTIFICATION_TIMEOUT.
+            rate_limit (int, optional): Requests per rate period before the first
+                rate-limit headers arrive. Defaults to 5.
+            rate_period (float, optional): Rate period in seconds. Defaults to 2.0.
+        """
+        self.webhook_url = settings.DISCORD_WEBHOOK_URL if webhook_url is None else webhook_url
+        self.enabled = (settings.ENABLE_NOTIFICATIONS if enabled is None else enabled) and bool(self.webhook_url)
+        self.max_queue = max(1, max_queue or settings.NOTIFICATION_QUEUE_SIZE)
+        self.linger = settings.NOTIFICATION_BATCH_SECONDS if linger is None else linger
+        self.timeout = timeout or settings.NOTIFICATION_TIMEOUT
+        self.bucket = TokenBucket(rate_limit, rate_period)
+
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._session = None
+        self._stopping = False
+        self._exit_registered = False
+
+        self.sent = 0
+        self.messages = 0
+        self.dropped = 0
+        self.failed = 0
+        self._dropped_pending = 0
+
+    def disable(self):
+        """
+        Turn notifications off; queued ones are discarded.
+        """
+        with self._cond:
+            self.enabled = False
+            self._queue.clear()
+
+    def notify(self, title, description="", level="info", fields=None):
+        """
+        Queue a notification without blocking.
+
+        Args:
+            title (str): Embed title
+            description (str, optional): Embed text
+            level (str, optional): "info", "success", "warning" or "error". Defaults to "info".
+            fields (dict, optional): Name/value pairs shown in the embed
+        """
+        if not self.enabled:
+            return
+
+        start = time.perf_counter_ns()
+        embed = {
+            "title": title[:256],
+            "description": description[:4096],
+            "color": COLORS.get(level, COLORS["info"]),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        }
+        if fields:
+            embed["fields"] = [
+                {"name": str(name)[:256], "value": str(value)[:1024], "inline": True}
+                for name, value in list(fields.items())[:25]
+            ]
+
+        # A single embed must fit in a message: drop the last fields, then
+        # shorten the description
+        excess = _embed_size(embed) - MAX_MESSAGE_CHARS
+        while excess > 0 and embed.get("fields"):
+            field = embed["fields"].pop()
+            excess -= len(field["name"]) + len(field["value"])
+        if excess > 0:
+            embed["description"] = embed["description"][:-excess]
+
+        with self._cond:
+            if len(self._queue) >= self.max_queue:
+                # Keep the newest notifications; the rest are summarised
+                self._queue.popleft()
+                self.dropped += 1
+                self._dropped_pending += 1
+            self._queue.append(embed)
+            if self._thread is None:
+                self._start()
+            self._cond.notify()
+        NOTIFY_SECONDS.since(start)
+
+    def stop(self, timeout=5.0):
+        """
+        Send what is queued, then stop the dispatcher.
+
+        Args:
+            timeout (float, optional): Seconds to wait for the final sends. Defaults to 5.0.
+        """
+        with self._cond:
+            thread = self._thread
+            if thread is None:
+                return
+            self._stopping = True
+            self._cond.notify()
+        thread.join(timeout)
+
+        with self._cond:
+            self._thread = None
+            self._stopping = False
+
+    def get_stats(self):
+        """
+        Get dispatcher counters.
+
+        Returns:
+            dict: Notification statistics
+        """
+        with self._cond:
+            return {
+                "enabled": self.enabled,
+                "queued": len(self._queue),
+                "sent": self.sent,
+                "messages": self.messages,
+                "dropped": self.dropped,
+                "failed": self.failed
+            }
+
+    def _start(self):
+        # Caller holds the condition lock
+        self._thread = threading.Thread(target=self._run, name="notifications", daemon=True)
+        self._thread.start()
+        if not self._exit_registered:
+            # Once, however often it is restarted
+            atexit.register(self.stop)
+            self._exit_registered = True
+
+    def _get_session(self):
+        if self._session is None:
+            # Imported here so the webhook path doesn't load requests when notifications are off
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            self._session = requests.Session()
+            self._session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=2))
+            self._session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=2))
+        return self._session
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._stopping:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+
+                # Linger briefly so a burst goes out as one message
+                deadline = time.monotonic() + self.linger
+                while len(self._queue) < MAX_EMBEDS and not self._stopping:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+
+                embeds = []
+                size = 0
+                if self._dropped_pending:
+                    embeds.append({
+                        "title": "Notifications dropped",
+                        "description": f"{self._dropped_pending} notifications were dropped while Discord was unavailable",
+                        "color": COLORS["warning"]
+                    })
+                    self._dropped_pending = 0
+                    size = _embed_size(embeds[0])
+                while self._queue and len(embeds) < MAX_EMBEDS:
+                    embed_size = _embed_size(self._queue[0])
+                    if embeds and size + embed_size > MAX_MESSAGE_CHARS:
+                        break
+                    embeds.append(self._queue.popleft())
+                    size += embed_size
+                stopping = self._stopping
+
+            if not self._send(embeds, give_up=stopping):
+                with self._cond:
+                    self.failed += len(embeds)
+
+    def _send(self, embeds, give_up=False, attempts=5):
+        """
+        Post one message, waiting for the rate limit and retrying on 429.
+
+        Returns:
+            bool: True if Discord accepted the message
+        """
+        backoff = 1.0
+        for _ in range(attempts):
+            wait = self.bucket.delay()
+            if wait:
+                if give_up and wait > self.timeout:
+                    return False
+                time.sleep(wait)
+            self.bucket.take()
+
+            start = time.perf_counter_ns()
+            try:
+                response = self._get_session().post(
+                    self.webhook_url, json={"embeds": embeds}, timeout=self.timeout
+                )
+            except Exception as e:
+                logger.warning("Discord notification failed: %s", e)
+                if give_up:
+                    return False
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+                continue
+
+            SEND_SECONDS.since(start)
+            self.bucket.update(response.headers)
+            if response.status_code == 429:
+                retry_after = response.headers.get("Retry-After")
+                try:
+                    retry_after = float(response.json().get("retry_after", retry_after or 1))
+                except ValueError:
+                    retry_after = float(retry_after or 1)
+                self.bucket.block(retry_after)
+                continue
+            if response.status_code >= 400:
+                logger.warning("Discord rejected notification: %s %s", response.status_code, response.text[:200])
+                return False
+
+            with self._cond:
+                self.sent += len(embeds)
+                self.messages += 1
+            return True
+
+        logger.warning("Giving up on a Discord notification after %d attempts", attempts)
+        return False
+
+# Create a singleton instance
+notification_service = NotificationService()
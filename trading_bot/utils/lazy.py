@@ -0,0 +1,76 @@
+"""
+Deferred imports of heavy dependencies.
+
+lazy_import("numpy") returns a stand-in that imports the module on first
+attribute access, so modules on the webhook path can be imported at startup
+without paying for numpy until a position is actually tracked. Attributes
+are cached on the stand-in after the first lookup, so later accesses cost
+the same as on the module itself.
+"""
+import sys
+import importlib
+import threading
+
+class LazyModule:
+    """
+    Module stand-in that imports the real module on first use.
+    """
+
+    def __init__(self, name):
+        """
+        Initialize the stand-in.
+
+        Args:
+            name (str): Absolute module name
+        """
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+        self.__dict__["_lock"] = threading.Lock()
+
+    @property
+    def loaded(self):
+        """
+        bool: True once the real module has been imported.
+        """
+        return self._module is not None
+
+    def load(self):
+        """
+        Import the module now.
+
+        Returns:
+            module: The imported module
+        """
+        module = self._module
+        if module is None:
+            with self._lock:
+                if self._module is None:
+                    self.__dict__["_module"] = importlib.import_module(self._name)
+                module = self._module
+        return module
+
+    def __getattr__(self, attribute):
+        value = getattr(self.load(), attribute)
+        # Later lookups find the attribute without calling __getattr__
+        self.__dict__[attribute] = value
+        return value
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+def lazy_import(name):
+    """
+    Import a module on first use.
+
+    Args:
+        name (str): Absolute module name
+
+    Returns:
+        module or LazyModule: The module if it is already imported, otherwise
+            a stand-in that imports it on first attribute access
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
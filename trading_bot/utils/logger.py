@@ -1,51 +1,178 @@
 """
 Logging configuration for the trading bot.
+
+Output handlers are created once per process and shared by every logger.
+In async mode (LOG_ASYNC) loggers only put records on an in-memory queue;
+a background thread formats them and writes them out in batches, so request
+threads never block on console or file I/O.
 """
 import os
+import json
+import queue
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+import threading
+from logging.handlers import RotatingFileHandler, QueueHandler
+
+from trading_bot.config import settings
+
+# Maximum number of records written per batch in async mode
+BATCH_SIZE = 256
 
-def setup_logger(name, level=None, log_file=None):
+# Process-wide handlers keyed by log file and output mode, shared by all loggers
+_handlers = {}
+_writers = []
+_handlers_lock = threading.Lock()
+
+class JsonFormatter(logging.Formatter):
     """
-    Set up a logger with the specified name and configuration.
-    
+    Formatter producing one JSON object per line.
+    """
+
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record),
+            "logger": record.name,
+            "level": record.levelname,
+            "message": record.getMessage(),
+            "thread": record.threadName
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+class _LazyQueueHandler(QueueHandler):
+    """
+    Queue handler that leaves formatting to the background writer.
+
+    The standard QueueHandler formats every record in the calling thread so
+    it can be pickled; records here never leave the process.
+    """
+
+    def prepare(self, record):
+        return record
+
+class BatchWriter:
+    """
+    Background thread writing queued log records to handlers in batches.
+    """
+
+    def __init__(self, handlers, batch_size=BATCH_SIZE):
+        """
+        Initialize the batch writer.
+
+        Args:
+            handlers (list): Stream handlers records are written to
+            batch_size (int, optional): Maximum records per batch. Defaults to BATCH_SIZE.
+        """
+        self.queue = queue.SimpleQueue()
+        self.handlers = handlers
+        self.batch_size = batch_size
+        self._start()
+        atexit.register(self.stop)
+
+        # Threads don't survive fork(), so restart the writer in child processes
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._start)
+
+    def _start(self):
+        """
+        Start the writer thread.
+        """
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Write all pending records and stop the writer thread.
+        """
+        if self._thread.is_alive():
+            self.queue.put(None)
+            self._thread.join()
+
+    def _run(self):
+        while True:
+            record = self.queue.get()
+            batch = []
+            stop = record is None
+            if not stop:
+                batch.append(record)
+
+            # Take whatever else is already queued, up to the batch size
+            while not stop and len(batch) < self.batch_size:
+                try:
+                    record = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if record is None:
+                    stop = True
+                else:
+                    batch.append(record)
+
+            for handler in self.handlers:
+                _write_batch(handler, batch)
+
+            if stop:
+                break
+
+def _write_batch(handler, records):
+    """
+    Write records to a stream handler with a single flush.
+
     Args:
-        name (str): Name of the logger
-        level (str, optional): Log level. Defaults to None (uses env var or INFO).
-        log_file (str, optional): Path to log file. Defaults to None (uses env var or logs/trading_bot.log).
-    
+        handler (logging.StreamHandler): Target handler
+        records (list): Log records
+    """
+    handler.acquire()
+    try:
+        for record in records:
+            # The handler's own level and filters, as Handler.handle() would apply
+            if record.levelno < handler.level or not handler.filter(record):
+                continue
+            try:
+                if isinstance(handler, RotatingFileHandler) and handler.shouldRollover(record):
+                    handler.doRollover()
+                if handler.stream is None:
+                    handler.stream = handler._open()
+                handler.stream.write(handler.format(record) + handler.terminator)
+            except Exception:
+                handler.handleError(record)
+        if handler.stream is not None:
+            handler.flush()
+    finally:
+        handler.release()
+
+def _create_handlers(log_file, async_mode):
+    """
+    Create the process-wide handlers for a log file.
+
+    Args:
+        log_file (str): Path to log file, or empty for console only
+        async_mode (bool): Write through the background writer
+
     Returns:
-        logging.Logger: Configured logger
+        list: Handlers to attach to loggers
     """
-    # Get log level from environment variable or use INFO as default
-    if level is None:
-        level = os.getenv("LOG_LEVEL", "INFO").upper()
-    
-    # Get log file from environment variable or use default
-    if log_file is None:
-        log_file = os.getenv("LOG_FILE", "logs/trading_bot.log")
-    
-    # Create logger
-    logger = logging.getLogger(name)
-    logger.setLevel(getattr(logging, level))
-    
     # Create formatter
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    
+    if settings.LOG_FORMAT.lower() == "json":
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        )
+
     # Create console handler
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-    
+    handlers = [console_handler]
+
     # Create file handler if log file is specified
     if log_file:
         # Create logs directory if it doesn't exist
         log_dir = os.path.dirname(log_file)
         if log_dir and not os.path.exists(log_dir):
-            os.makedirs(log_dir)
-        
+            os.makedirs(log_dir, exist_ok=True)
+
         # Create file handler with rotation (10 MB max size, keep 5 backups)
         file_handler = RotatingFileHandler(
             log_file,
@@ -53,6 +180,63 @@ def setup_logger(name, level=None, log_file=None):
             backupCount=5
         )
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
-    
-    return logger
\ No newline at end of file
+        handlers.append(file_handler)
+
+    # In async mode loggers only enqueue; the writer thread does the I/O
+    if async_mode:
+        writer = BatchWriter(handlers)
+        _writers.append(writer)
+        return [_LazyQueueHandler(writer.queue)]
+
+    return handlers
+
+def setup_logger(name, level=None, log_file=None, async_mode=None):
+    """
+    Set up a logger with the specified name and configuration.
+
+    Calling this more than once for the same logger does not add duplicate
+    handlers.
+
+    Args:
+        name (str): Name of the logger
+        level (str, optional): Log level. Defaults to LOG_LEVEL.
+        log_file (str, optional): Path to log file. Defaults to LOG_FILE.
+        async_mode (bool, optional): Write through the background writer.
+            Defaults to LOG_ASYNC.
+
+    Returns:
+        logging.Logger: Configured logger
+    """
+    # Get log level and file from the settings
+    if level is None:
+        level = settings.LOG_LEVEL.upper()
+
+    if log_file is None:
+        log_file = settings.LOG_FILE
+
+    if async_mode is None:
+        async_mode = settings.LOG_ASYNC
+
+    # Create logger
+    logger = logging.getLogger(name)
+    logger.setLevel(getattr(logging, level))
+
+    # Attach the shared handlers once
+    with _handlers_lock:
+        key = (log_file, bool(async_mode))
+        handlers = _handlers.get(key)
+        if handlers is None:
+            handlers = _handlers[key] = _create_handlers(log_file, async_mode)
+
+        for handler in handlers:
+            if handler not in logger.handlers:
+                logger.addHandler(handler)
+
+    return logger
+
+def shutdown_logging():
+    """
+    Write all pending records and stop the background writers.
+    """
+    for writer in _writers:
+        writer.stop()
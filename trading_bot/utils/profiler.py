@@ -0,0 +1,294 @@
+"""
+On-demand profiling of the running bot.
+
+Two modes, started from the /admin/profile endpoint or a signal:
+
+- sample: a background thread records the stack of every thread every
+  PROFILE_SAMPLE_INTERVAL_MS for a number of seconds and writes them in the
+  folded format read by flamegraph.pl, speedscope and inferno
+  (logs/profiles/stacks-<time>.folded).
+- trace: the next K calls of a registered target (the webhook view or the
+  scheduler's market evaluation) run under cProfile; the merged stats are
+  written as a .prof file (snakeviz, flameprof, gprof2dot) and a text report.
+
+Nothing is installed until a profile is requested: targets are swapped for
+a profiling wrapper only while a trace is armed and restored afterwards, so
+the hot path is unchanged when profiling is idle or disabled.
+"""
+import io
+import os
+import sys
+import time
+import pstats
+import signal
+import cProfile
+import threading
+from collections import Counter
+
+from trading_bot.utils.logger import setup_logger
+from trading_bot.config import settings
+
+# Configure logging
+logger = setup_logger("utils.profiler")
+
+class ProfilerBusyError(RuntimeError):
+    """
+    Raised when a profile of the same kind is already running.
+    """
+
+class Profiler:
+    """
+    Stack sampler and call tracer writing to the profile directory.
+    """
+
+    def __init__(self, enabled=None, directory=None, interval=None):
+        """
+        Initialize the profiler.
+
+        Args:
+            enabled (bool, optional): Allow profiles to be started. Defaults to ENABLE_PROFILING.
+            directory (str, optional): Output directory. Defaults to PROFILE_DIR.
+            interval (float, optional): Seconds between stack samples.
+                Defaults to PROFILE_SAMPLE_INTERVAL_MS.
+        """
+        self.enabled = settings.ENABLE_PROFILING if enabled is None else enabled
+        self.directory = directory or settings.PROFILE_DIR
+        self.interval = interval or settings.PROFILE_SAMPLE_INTERVAL_MS / 1000.0
+
+        self._lock = threading.Lock()
+        self._targets = {}
+        self._sampling = None
+        self._traces = {}
+        self._labels = {}
+
+        self.outputs = []
+
+    def register(self, name, owner, attribute):
+        """
+        Register a callable that can be traced.
+
+        Args:
+            name (str): Target name used by trace()
+            owner (object): Object or dict holding the callable
+            attribute (str): Attribute name or dict key of the callable
+        """
+        with self._lock:
+            self._targets[name] = (owner, attribute)
+
+    def targets(self):
+        """
+        Get the names of the registered targets.
+
+        Returns:
+            list: Target names
+        """
+        with self._lock:
+            return sorted(self._targets)
+
+    def sample(self, seconds=None):
+        """
+        Sample the stacks of all threads in the background.
+
+        Args:
+            seconds (float, optional): Duration. Defaults to PROFILE_SAMPLE_SECONDS.
+
+        Returns:
+            str: Path the folded stacks will be written to
+
+        Raises:
+            ProfilerBusyError: If a sampling run is in progress
+        """
+        seconds = seconds or settings.PROFILE_SAMPLE_SECONDS
+        with self._lock:
+            if self._sampling is not None:
+                raise ProfilerBusyError(f"Stack sampling already running until {self._sampling}")
+            path = self._output_path("stacks", "folded")
+            self._sampling = path
+        thread = threading.Thread(target=self._sample, args=(seconds, path), name="profiler", daemon=True)
+        thread.start()
+        logger.info("Sampling stacks for %.1fs into %s", seconds, path)
+        return path
+
+    def trace(self, target, count=None):
+        """
+        Run the next calls of a target under cProfile.
+
+        Args:
+            target (str): Registered target name
+            count (int, optional): Number of calls. Defaults to PROFILE_TRACE_COUNT.
+
+        Returns:
+            str: Path the .prof file will be written to
+
+        Raises:
+            KeyError: If the target is not registered
+            ProfilerBusyError: If the target is already being traced
+        """
+        count = count or settings.PROFILE_TRACE_COUNT
+        with self._lock:
+            if target not in self._targets:
+                raise KeyError(f"Unknown profiling target: {target}")
+            if target in self._traces:
+                raise ProfilerBusyError(f"{target} is already being traced")
+
+            owner, attribute = self._targets[target]
+            original = owner[attribute] if isinstance(owner, dict) else getattr(owner, attribute)
+            path = self._output_path(target, "prof")
+            trace = {"remaining": count, "stats": None, "path": path, "original": original,
+                     "own": not isinstance(owner, dict) and attribute in vars(owner)}
+            self._traces[target] = trace
+            self._set(owner, attribute, self._wrap(target, trace))
+        logger.info("Tracing the next %d calls of %s into %s", count, target, path)
+        return path
+
+    def get_stats(self):
+        """
+        Get the profiler state.
+
+        Returns:
+            dict: Running profiles and recent output files
+        """
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "targets": sorted(self._targets),
+                "sampling": self._sampling,
+                "tracing": {name: trace["remaining"] for name, trace in self._traces.items()},
+                "outputs": self.outputs[-10:]
+            }
+
+    def install_signal_handlers(self):
+        """
+        Start a sample on SIGUSR1 and a trace of the webhook on SIGUSR2.
+
+        Only possible from the main thread on platforms with these signals;
+        otherwise the admin endpoint is the only trigger.
+        """
+        if not self.enabled or not hasattr(signal, "SIGUSR1"):
+            return
+        try:
+            signal.signal(signal.SIGUSR1, lambda signum, frame: self._start_from_signal(self.sample))
+            signal.signal(signal.SIGUSR2, lambda signum, frame: self._start_from_signal(self.trace, "webhook"))
+        except ValueError:
+            logger.warning("Profiling signals can only be installed from the main thread")
+            return
+        logger.info("Profiling signals installed (SIGUSR1: sample stacks, SIGUSR2: trace webhooks)")
+
+    def _start_from_signal(self, start, *args):
+        # Leave the interrupted frame quickly; the lock may be held by it
+        def run():
+            try:
+                start(*args)
+            except (KeyError, ProfilerBusyError) as e:
+                logger.warning("Profiling not started: %s", e)
+        threading.Thread(target=run, name="profiler-signal", daemon=True).start()
+
+    def _sample(self, seconds, path):
+        own = threading.get_ident()
+        stacks = Counter()
+        samples = 0
+        deadline = time.monotonic() + seconds
+        try:
+            while time.monotonic() < deadline:
+                names = {thread.ident: thread.name for thread in threading.enumerate()}
+                for ident, frame in sys._current_frames().items():
+                    if ident == own:
+                        continue
+                    stack = []
+                    while frame is not None:
+                        stack.append(self._label(frame.f_code))
+                        frame = frame.f_back
+                    stack.append(names.get(ident, str(ident)).replace(";", ":").replace(" ", "_"))
+                    stacks[";".join(reversed(stack))] += 1
+                samples += 1
+                time.sleep(self.interval)
+
+            os.makedirs(self.directory, exist_ok=True)
+            with open(path, "w") as output:
+                for stack, count in stacks.most_common():
+                    output.write(f"{stack} {count}\n")
+            logger.info("Wrote %d stack samples to %s", samples, path)
+            with self._lock:
+                self.outputs.append(path)
+        except Exception as e:
+            logger.exception("Error sampling stacks: %s", e)
+        finally:
+            with self._lock:
+                self._sampling = None
+
+    def _label(self, code):
+        label = self._labels.get(code)
+        if label is None:
+            filename = "/".join(code.co_filename.replace("\\", "/").split("/")[-2:])
+            label = f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(";", ":")
+            self._labels[code] = label
+        return label
+
+    def _wrap(self, target, trace):
+        original = trace["original"]
+
+        def profiled(*args, **kwargs):
+            profile = cProfile.Profile()
+            profile.enable()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                profile.disable()
+                self._record(target, trace, profile)
+
+        profiled.__name__ = getattr(original, "__name__", target)
+        profiled.__doc__ = getattr(original, "__doc__", None)
+        return profiled
+
+    def _record(self, target, trace, profile):
+        with self._lock:
+            if self._traces.get(target) is not trace or trace["remaining"] <= 0:
+                # Call that started just before the trace finished
+                return
+            if trace["stats"] is None:
+                trace["stats"] = pstats.Stats(profile)
+            else:
+                trace["stats"].add(profile)
+            trace["remaining"] -= 1
+            if trace["remaining"]:
+                return
+
+            owner, attribute = self._targets[target]
+            if trace["own"] or isinstance(owner, dict):
+                self._set(owner, attribute, trace["original"])
+            else:
+                delattr(owner, attribute)
+            del self._traces[target]
+
+        self._write_trace(trace)
+
+    def _write_trace(self, trace):
+        path = trace["path"]
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            trace["stats"].dump_stats(path)
+            report = io.StringIO()
+            trace["stats"].stream = report
+            trace["stats"].sort_stats("cumulative").print_stats(40)
+            with open(path[:-len(".prof")] + ".txt", "w") as output:
+                output.write(report.getvalue())
+        except OSError as e:
+            logger.error("Error writing profile %s: %s", path, e)
+            return
+        logger.info("Wrote profile to %s", path)
+        with self._lock:
+            self.outputs.append(path)
+
+    def _output_path(self, kind, extension):
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        return os.path.join(self.directory, f"{kind}-{stamp}-{os.getpid()}.{extension}")
+
+    @staticmethod
+    def _set(owner, attribute, value):
+        if isinstance(owner, dict):
+            owner[attribute] = value
+        else:
+            setattr(owner, attribute, value)
+
+# Create a singleton instance
+profiler = Profiler()
@@ -0,0 +1,102 @@
+"""
+Startup stage timings.
+
+Stages are timed from the moment the trading_bot package is imported, which
+is the first thing the process does. The report is logged once the server
+is about to accept webhooks and shown on /status, so a slow restart shows
+which stage (imports, broker connection, journal replay, ...) it spent its
+time in.
+"""
+import time
+import threading
+
+import trading_bot
+from trading_bot.utils.logger import setup_logger
+
+# Configure logging
+logger = setup_logger("utils.startup")
+
+class StartupTimer:
+    """
+    Durations of the startup stages.
+    """
+
+    def __init__(self, origin=None):
+        """
+        Initialize the timer.
+
+        Args:
+            origin (float, optional): time.perf_counter() reading the stages are
+                measured from. Defaults to now.
+        """
+        self.origin = time.perf_counter() if origin is None else origin
+        self._last = self.origin
+        self._lock = threading.Lock()
+        self.stages = []
+        self.background = []
+        self.ready_after = None
+        self.first_webhook_after = None
+
+    def mark(self, stage):
+        """
+        End a stage on the path to serving webhooks.
+
+        Args:
+            stage (str): Name of the stage that just finished
+        """
+        now = time.perf_counter()
+        with self._lock:
+            self.stages.append((stage, now - self._last))
+            self._last = now
+
+    def record(self, stage, seconds):
+        """
+        Record a stage that runs off the path to serving webhooks.
+
+        Args:
+            stage (str): Stage name
+            seconds (float): Duration
+        """
+        with self._lock:
+            self.background.append((stage, seconds))
+        logger.info("Startup: %s took %.0f ms in the background", stage, seconds * 1000)
+
+    def ready(self):
+        """
+        Mark the server as ready and log the stage report.
+        """
+        self.mark("ready")
+        with self._lock:
+            self.ready_after = self._last - self.origin
+            stages = ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in self.stages)
+        logger.info("Startup: %s; accepting webhooks %.0f ms after start", stages, self.ready_after * 1000)
+
+    def webhook_accepted(self):
+        """
+        Record the first accepted webhook.
+        """
+        with self._lock:
+            if self.first_webhook_after is not None:
+                return
+            self.first_webhook_after = time.perf_counter() - self.origin
+        logger.info("First webhook accepted %.0f ms after start", self.first_webhook_after * 1000)
+
+    def get_stats(self):
+        """
+        Get the stage timings.
+
+        Returns:
+            dict: Stage durations and milestones in milliseconds
+        """
+        with self._lock:
+            return {
+                "stages_ms": {name: round(seconds * 1000, 1) for name, seconds in self.stages},
+                "background_ms": {name: round(seconds * 1000, 1) for name, seconds in self.background},
+                "ready_ms": round(self.ready_after * 1000, 1) if self.ready_after is not None else None,
+                "first_webhook_ms": (
+                    round(self.first_webhook_after * 1000, 1) if self.first_webhook_after is not None else None
+                )
+            }
+
+# Create a singleton instance, timed from the package import
+startup = StartupTimer(trading_bot.STARTED)
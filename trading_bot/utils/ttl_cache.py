@@ -0,0 +1,167 @@
+"""
+Bounded LRU cache with per-entry time-to-live.
+"""
+import time
+import threading
+from collections import OrderedDict
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries expire after a fixed time window.
+
+    All operations are O(1). Memory is bounded by max_entries: inserting into
+    a full cache evicts the least recently used entry.
+    """
+
+    def __init__(self, max_entries, ttl, clock=time.monotonic):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries (int): Maximum number of entries
+            ttl (float): Seconds an entry stays valid after it was set
+            clock (callable, optional): Time source. Defaults to time.monotonic.
+        """
+        self.max_entries = max(1, int(max_entries))
+        self.ttl = ttl
+        self._clock = clock
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        """
+        Get a value if present and not expired.
+
+        Args:
+            key (hashable): Cache key
+
+        Returns:
+            object: Cached value, or None if missing or expired
+        """
+        with self._lock:
+            return self._get(key, self._clock())
+
+    def set(self, key, value):
+        """
+        Set a value, restarting its time window.
+
+        Args:
+            key (hashable): Cache key
+            value (object): Value to cache
+        """
+        with self._lock:
+            self._set(key, value, self._clock())
+
+    def get_or_set(self, key, value):
+        """
+        Atomically get an existing value or set a new one.
+
+        Args:
+            key (hashable): Cache key
+            value (object): Value to cache if the key is missing or expired
+
+        Returns:
+            object: Existing value, or None if value was set
+        """
+        with self._lock:
+            now = self._clock()
+            existing = self._get(key, now)
+            if existing is None:
+                self._set(key, value, now)
+            return existing
+
+    def delete(self, key):
+        """
+        Remove a key if present.
+
+        Args:
+            key (hashable): Cache key
+        """
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """
+        Remove all entries.
+        """
+        with self._lock:
+            self._data.clear()
+
+    def resize(self, max_entries, ttl):
+        """
+        Change the bound and the time to live of new entries.
+
+        Entries already cached keep their expiry; the oldest are evicted if
+        the new bound is smaller.
+
+        Args:
+            max_entries (int): Maximum number of entries
+            ttl (float): Seconds until an entry set from now on expires
+        """
+        with self._lock:
+            self.max_entries = max(1, int(max_entries))
+            self.ttl = ttl
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_stats(self):
+        """
+        Get cache counters.
+
+        Returns:
+            dict: Cache statistics
+        """
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations
+            }
+
+    def _get(self, key, now):
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, expires_at = entry
+        if expires_at <= now:
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def _set(self, key, value, now):
+        data = self._data
+        if key in data:
+            data.move_to_end(key)
+        data[key] = (value, now + self.ttl)
+
+        # Drop expired entries from the cold end first, then enforce the bound
+        while data:
+            oldest_key, (_, expires_at) = next(iter(data.items()))
+            if expires_at > now:
+                break
+            del data[oldest_key]
+            self.expirations += 1
+
+        while len(data) > self.max_entries:
+            data.popitem(last=False)
+            self.evictions += 1